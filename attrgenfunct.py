@@ -30,7 +30,7 @@
 
 import random
 
-import basefunctions, generator
+import basefunctions, generator, lookupcache
 
 import csv
 
@@ -273,12 +273,32 @@ def generate_state():
 # -----------------------------------------------------------------------------
 #
 
-def generate_address():
-  choice = random.randint(1,244118)
-  f = open('lookup_files/addresses.csv')
+# The file the street addresses are drawn from (the first column of each line
+# after the header line)
+#
+address_file_name = 'lookup_files/addresses.csv'
+
+def read_address_list():
+  """Read the list of street addresses from the address file."""
+
+  f = open(address_file_name)
   csv_f = csv.reader(f)
-  csv_f = list(csv_f)
-  address = csv_f[choice][0]
+  csv_f.next()  # Skip the header line
+  address_list = [row[0] for row in csv_f if row != []]
+  f.close()
+
+  return address_list
+
+def generate_address():
+  """Randomly select a street address from the address file.
+
+     The file is only read once, the list of addresses is kept in the shared
+     tables of lookupcache.py (and read again only if the file changes).
+  """
+
+  address_list = lookupcache.get_shared_table(address_file_name, None, True,
+                                              'address', read_address_list)
+  address = random.choice(address_list)
   return address
 
 # -----------------------------------------------------------------------------
@@ -592,12 +612,15 @@ def generate_normal_value(mu, sigma, min_val, max_val, val_type):
   if ((min_val != None) and (max_val != None)):
     assert min_val < max_val
 
+  float_to_str = basefunctions.get_float_formatter(val_type)
+
   if (min_val != None) or (max_val != None):
     in_range = False  # For testing if the random value is with the range
   else:
     in_range = True
 
   r = random.normalvariate(mu, sigma)
+  r_str = None
 
   while (in_range == False):
     if ((min_val == None) or ((min_val != None) and (r >= min_val))):
@@ -607,7 +630,7 @@ def generate_normal_value(mu, sigma, min_val, max_val, val_type):
       in_range = False
 
     if (in_range == True):
-      r_str = basefunctions.float_to_str(r, val_type)
+      r_str = float_to_str(r)
       r_test = float(r_str)
       if (min_val != None) and (r_test < min_val):
         in_range = False
@@ -622,7 +645,10 @@ def generate_normal_value(mu, sigma, min_val, max_val, val_type):
   if (max_val != None):
     assert r <= max_val
 
-  return basefunctions.float_to_str(r, val_type)
+  if (r_str == None):  # No range given, so the value was not formatted yet
+    r_str = float_to_str(r)
+
+  return r_str
 
 # -----------------------------------------------------------------------------
 #
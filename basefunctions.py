@@ -11,6 +11,8 @@
 # =============================================================================
 
 import codecs  # Used to read and write Unicode files
+import functools
+import operator
 import os
 from sys import version
 import types
@@ -402,6 +404,13 @@ def check_is_valid_format_str(variable, value):
 
 # -----------------------------------------------------------------------------
 
+# The string formatting operators for the valid format strings of numbers
+#
+float_format_dict = {'int':'%.0f', 'float1':'%.1f', 'float2':'%.2f',
+                     'float3':'%.3f', 'float4':'%.4f', 'float5':'%.5f',
+                     'float6':'%.6f', 'float7':'%.7f', 'float8':'%.8f',
+                     'float9':'%.9f'}
+
 def float_to_str(f, format_str):
   """Convert the given floating-point (or integer) number into a string
      according to the format string given.
@@ -416,30 +425,24 @@ def float_to_str(f, format_str):
   check_is_string('format_str', format_str)
   check_is_valid_format_str('format_str', format_str)
 
-  if (format_str == 'int'):
-    f_str = '%.0f' % (f)
-  elif (format_str == 'float1'):
-    f_str = '%.1f' % (f)
-  elif (format_str == 'float2'):
-    f_str = '%.2f' % (f)
-  elif (format_str == 'float3'):
-    f_str = '%.3f' % (f)
-  elif (format_str == 'float4'):
-    f_str = '%.4f' % (f)
-  elif (format_str == 'float5'):
-    f_str = '%.5f' % (f)
-  elif (format_str == 'float6'):
-    f_str = '%.6f' % (f)
-  elif (format_str == 'float7'):
-    f_str = '%.7f' % (f)
-  elif (format_str == 'float8'):
-    f_str = '%.8f' % (f)
-  elif (format_str == 'float9'):
-    f_str = '%.9f' % (f)
-  else:
-    raise Exception( 'Illegal string format given: "%s"' % (format_str))
+  return float_format_dict[format_str] % (f)
+
+# -----------------------------------------------------------------------------
+
+def get_float_formatter(format_str):
+  """Return a function that converts a floating-point (or integer) number into
+     a string according to the given format string (as float_to_str() does).
+
+     The format string is checked once when the function is created, and the
+     returned function does not check its argument, so it can be used where
+     many values of the same format are converted. The function can be
+     pickled, so it can be stored in attributes sent to worker processes.
+  """
+
+  check_is_string('format_str', format_str)
+  check_is_valid_format_str('format_str', format_str)
 
-  return f_str
+  return functools.partial(operator.mod, float_format_dict[format_str])
 
 # -----------------------------------------------------------------------------
 
@@ -588,3 +591,68 @@ def write_csv_file(file_name, encoding, header_list, file_data):
   out_file.close()
 
 # -----------------------------------------------------------------------------
+# Functions for the keys that identify original and duplicate records
+
+# The number of low bits of a record key that hold the duplicate number (plus
+# one, with 0 for the original record), so a record can have at most
+# 2**DUP_KEY_BITS - 1 duplicates
+#
+DUP_KEY_BITS = 16
+
+MAX_DUP_PER_REC = 2**DUP_KEY_BITS - 1
+
+def get_rec_key(org_index, dup_index=None):
+  """Return the integer key of the original record with the given index (a
+     non-negative integer), or, if a duplicate number is given, the key of
+     this duplicate of the original record.
+
+     Keys sort by original record first, with the key of an original record
+     before the keys of its duplicates (in the sequence of their numbers).
+  """
+
+  if (dup_index == None):
+    return org_index << DUP_KEY_BITS
+
+  return (org_index << DUP_KEY_BITS) | (dup_index + 1)
+
+# -----------------------------------------------------------------------------
+
+def get_dup_rec_key(org_rec_key, dup_index):
+  """Return the key of the duplicate with the given number of the original
+     record with the given key.
+  """
+
+  return org_rec_key | (dup_index + 1)
+
+# -----------------------------------------------------------------------------
+
+def split_rec_key(rec_key):
+  """Return the pair (org_index, dup_index) of the given record key, with
+     dup_index being None for an original record.
+  """
+
+  dup_num = rec_key & MAX_DUP_PER_REC
+
+  if (dup_num == 0):
+    return rec_key >> DUP_KEY_BITS, None
+
+  return rec_key >> DUP_KEY_BITS, dup_num - 1
+
+# -----------------------------------------------------------------------------
+
+def get_rec_id_str(rec_key, num_rec_num_digit):
+  """Return the record identifier written into output files for the given
+     record key, either 'rec-N-org' for an original record or 'rec-N-dup-D'
+     for a duplicate, with the record number N padded with zeros to
+     'num_rec_num_digit' digits.
+  """
+
+  dup_num = rec_key & MAX_DUP_PER_REC
+  rec_num_str = str(rec_key >> DUP_KEY_BITS).zfill(num_rec_num_digit)
+
+  if (dup_num == 0):
+    return 'rec-%s-org' % (rec_num_str)
+
+  return 'rec-%s-dup-%d' % (rec_num_str, dup_num - 1)
+
+# -----------------------------------------------------------------------------
@@ -9,6 +9,10 @@
 # - Blood pressure values that depend upon age values.
 # - Salary values that depend upon age values.
 # etc.
+#
+# For each function a version that works on NumPy arrays can be registered
+# with register_array_function(), so that compound attributes can generate
+# whole columns of dependent values with one call (see get_array_function()).
 
 # Peter Christen and Dinusha Vatsalan, January-March 2012
 # =============================================================================
@@ -21,6 +25,65 @@
 
 import random
 
+try:
+  import numpy
+except ImportError:
+  numpy = None
+
+# The registered array versions of dependency functions, with keys being the
+# (scalar) functions and values the functions that take and return NumPy
+# arrays
+#
+array_funct_dict = {}
+
+# -----------------------------------------------------------------------------
+#
+def register_array_function(funct, array_funct=None):
+  """Register a version of the given dependency function that takes a NumPy
+     array of values and returns a NumPy array with one dependent value for
+     each of them, drawn from the same distributions as the given function
+     would. If no array function is given, the function itself is registered
+     as being able to work on arrays.
+  """
+
+  if (array_funct == None):
+    array_funct = funct
+
+  array_funct_dict[funct] = array_funct
+
+# -----------------------------------------------------------------------------
+#
+def get_array_function(funct):
+  """Return the array version of the given dependency function, or None if
+     none has been registered or if NumPy is not available.
+  """
+
+  if (numpy == None):
+    return None
+
+  return array_funct_dict.get(funct)
+
+# -----------------------------------------------------------------------------
+#
+def check_age_array(age_array):
+  """Check once for a whole array that all age values are numbers between 0
+     and 130, and return them as a NumPy floating-point array.
+  """
+
+  age_array = numpy.asarray(age_array)
+
+  if (age_array.dtype.kind not in 'iuf'):
+    raise Exception( 'Age values given are not numbers: %s' % \
+                     (str(age_array.dtype)))
+
+  age_array = age_array.astype(numpy.float64)
+
+  if (len(age_array) > 0) and ((age_array.min() < 0) or \
+                               (age_array.max() > 130)):
+    raise Exception( 'Age value below 0 or above 130 given')
+
+  return age_array
+
 # -----------------------------------------------------------------------------
 #
 def blood_pressure_depending_on_age(age):
@@ -81,3 +144,44 @@ def salary_depending_on_age(age):
   return sal
 
 # -----------------------------------------------------------------------------
+
+def blood_pressure_depending_on_age_array(age_array):
+  """Array version of blood_pressure_depending_on_age(), which generates one
+     blood pressure value for each age value in the given NumPy array and
+     returns them as a NumPy array. A warning is printed once if any value
+     had to be set to 0.0.
+  """
+
+  age_array = check_age_array(age_array)
+
+  bp_array = numpy.random.normal(75.0 + age_array/100.0, 4.0)
+
+  if (len(bp_array) > 0) and (bp_array.min() < 0.0):
+    bp_array = numpy.maximum(bp_array, 0.0)
+    print( 'Warning, blood pressure value of 0.0 returned!')
+
+  return bp_array
+
+register_array_function(blood_pressure_depending_on_age,
+                        blood_pressure_depending_on_age_array)
+
+# -----------------------------------------------------------------------------
+
+def salary_depending_on_age_array(age_array):
+  """Array version of salary_depending_on_age(), which generates one salary
+     value for each age value in the given NumPy array and returns them as a
+     NumPy array.
+  """
+
+  age_array = check_age_array(age_array)
+
+  max_sal_array = 10000.0 + (numpy.maximum(age_array, 18.0)-18.0)*(140000./42)
+
+  sal_array = numpy.random.uniform(10000.0, max_sal_array)
+
+  return numpy.where(age_array < 18.0, 0.0, sal_array)
+
+register_array_function(salary_depending_on_age,
+                        salary_depending_on_age_array)
+
+# -----------------------------------------------------------------------------
@@ -23,6 +23,8 @@ import random
 from StringIO import StringIO
 
 import basefunctions
+import lookupcache
+import progress
 
 # =============================================================================
 # Helper functions to randomly select a position for where to apply a
@@ -594,9 +596,9 @@ class CorruptValueOCR(CorruptValue):
     # Load the OCR variations lookup file - - - - - - - - - - - - - - - - - - -
     #
     header_list, lookup_file_data = \
-                     basefunctions.read_csv_file(self.lookup_file_name,
-                                                 self.unicode_encoding,
-                                                 self.has_header_line)
+                     lookupcache.read_csv_file(self.lookup_file_name,
+                                               self.unicode_encoding,
+                                               self.has_header_line)
 
     # Process values from file and their frequencies
     #
@@ -787,9 +789,9 @@ class CorruptValuePhonetic(CorruptValue):
     # Load the misspelling lookup file - - - - - - - - - - - - - - - - - - - - -
     #
     header_list, lookup_file_data = \
-                     basefunctions.read_csv_file(self.lookup_file_name,
-                                                 self.unicode_encoding,
-                                                 self.has_header_line)
+                     lookupcache.read_csv_file(self.lookup_file_name,
+                                               self.unicode_encoding,
+                                               self.has_header_line)
 
     # Process values from file and misspellings
     #
@@ -1294,9 +1296,9 @@ class CorruptCategoricalValue(CorruptValue):
     # Load the misspelling lookup file - - - - - - - - - - - - - - - - - - - - -
     #
     header_list, lookup_file_data = \
-                     basefunctions.read_csv_file(self.lookup_file_name,
-                                                 self.unicode_encoding,
-                                                 self.has_header_line)
+                     lookupcache.read_csv_file(self.lookup_file_name,
+                                               self.unicode_encoding,
+                                               self.has_header_line)
 
     # Process values from file and misspellings
     #
@@ -1363,7 +1365,8 @@ class CorruptDataSet:
                             generated for each record.
 
      max_num_dup_per_rec    The maximum number of modified (corrupted) records
-                            that can be generated for a single original record.
+                            that can be generated for a single original record
+                            (at most basefunctions.MAX_DUP_PER_REC).
 
      num_dup_dist           The probability distribution used to create the
                             duplicate records for one original record (possible
@@ -1395,6 +1398,11 @@ class CorruptDataSet:
                             given in its list must sum to 1.0.
                             An example of such a dictionary is given below.
 
+     progress_reporter      An optional object of class
+                            progress.ProgressReporter (or a derived class)
+                            which is informed how many duplicate records have
+                            been generated. The default reporter is silent.
+
      Example for 'attr_mod_prob_dict':
 
      attr_mod_prob_dict = {'surname':0.4, 'address':0.6}
@@ -1434,6 +1442,7 @@ class CorruptDataSet:
     self.max_num_mod_per_attr =  None
     self.attr_mod_prob_dict =    None
     self.attr_mod_data_dict =    None
+    self.progress_reporter =     progress.ProgressReporter()  # Silent
     #self.corrupt_log = StringIO()
 
     # Process the keyword arguments
@@ -1483,6 +1492,12 @@ class CorruptDataSet:
         basefunctions.check_is_dictionary('attr_mod_data_dict', value)
         self.attr_mod_data_dict = value
 
+      elif (keyword.startswith('progress')):
+        if (not isinstance(value, progress.ProgressReporter)):
+          raise Exception( 'Value of "progress_reporter" is not a progress' + \
+                           ' reporter object: %s' % (type(value)))
+        self.progress_reporter = value
+
       else:
         raise Exception('Illegal constructor argument keyword: "%s"' % \
               (str(keyword)))
@@ -1503,6 +1518,10 @@ class CorruptDataSet:
                                    self.max_num_dup_per_rec)
     basefunctions.check_is_positive('max_num_dup_per_rec',
                                     self.max_num_dup_per_rec)
+    if (self.max_num_dup_per_rec > basefunctions.MAX_DUP_PER_REC):
+      raise Exception( 'Value of "max_num_dup_per_rec" must be at most ' + \
+                       '%d: %d' % (basefunctions.MAX_DUP_PER_REC,
+                                   self.max_num_dup_per_rec))
     basefunctions.check_is_string('num_dup_dist', self.num_dup_dist)
     basefunctions.check_is_integer('num_mod_per_rec',
                                    self.num_mod_per_rec)
@@ -1660,6 +1679,10 @@ class CorruptDataSet:
   def corrupt_records(self, rec_dict):
     """Method to corrupt modify the records in the given record dictionary
        according to the settings of the data set corruptor.
+
+       The keys of the given record dictionary are the integer keys of the
+       original records (see basefunctions.get_rec_key()), and duplicates are
+       added with the keys returned by basefunctions.get_dup_rec_key().
     """
 
     # Check if number of records given is what is expected
@@ -1745,6 +1768,10 @@ class CorruptDataSet:
     num_dup_rec_created = 0  # Count how many duplicate records have been
                              # generated
 
+    get_dup_rec_key = basefunctions.get_dup_rec_key  # Short-hand
+
+    self.progress_reporter.start('Corrupt records', self.number_of_mod_records)
+
     # Main loop over all original records for which to generate duplicates - -
     #
     for (org_rec_id_to_mod, num_dups) in dup_rec_num_dict.iteritems():
@@ -1768,8 +1795,7 @@ class CorruptDataSet:
         #
         dup_rec_list = rec_to_mod_list[:] # Make copy of original record
 
-        org_rec_num = org_rec_id_to_mod.split('-')[1]
-        dup_rec_id = 'rec-%s-dup-%d' % (org_rec_num, d)
+        dup_rec_id = get_dup_rec_key(org_rec_id_to_mod, d)
         # printing output to geco_log text file
         #self.corrupt_log.write('\n')
         #self.corrupt_log.write('\n')
@@ -1897,6 +1923,8 @@ class CorruptDataSet:
           d += 1
           num_dup_rec_created += 1
 
+          self.progress_reporter.update(num_dup_rec_created)
+
           # printing output to geco_log text file
           #self.corrupt_log.write('\n      Original record: ')
           #self.corrupt_log.write(str(rec_to_mod_list))
@@ -1915,6 +1943,8 @@ class CorruptDataSet:
           #      (num_dup_rec_created, self.number_of_mod_records))
           
 
+    self.progress_reporter.finish()
+
     return rec_dict
 
 # =============================================================================
@@ -7,11 +7,13 @@ import attrgenfunct   # Functions to generate independent attribute values
 import contdepfunct   # Functions to generate dependent continuous attribute
                       # values
 import generator      # Main classes to generate records and the data set
+import sampler        # Random samplers and seed derivation
 import corruptor      # Main classes to corrupt attribute values and records
 
 
 import random
 import csv
+import itertools
 import json
 import os
 import StringIO
@@ -61,6 +63,23 @@ max_modification_per_attr = 2
 #
 num_modification_per_record = 2
 
+# Set the attributes whose values are drawn once per household and shared by
+# all its members (see household_synth()).
+#
+household_attr_list = ['surname', 'street-address', 'city', 'state',
+                       'postcode']
+
+# Set the probability distribution of household sizes, as (size, weight)
+# pairs with positive integer weights (here the percentage of US households
+# of each size).
+#
+household_size_distribution = [(1, 28), (2, 35), (3, 15), (4, 13), (5, 6),
+                               (6, 3)]
+
+# Set how many households have their shared values generated in one batch.
+#
+household_chunk_size = 1000
+
 # Check if the given the unicode encoding selected is valid.
 #
 basefunctions.check_unicode_encoding_exists(unicode_encoding_used)
@@ -196,27 +215,69 @@ class AttrSet(object):
                                   'phone_num_cell','phone_num_work','phone_num_home',\
                                   'credit_card','social_security','passport','mother'])
 
+    def primary_plan(self):
+        '''generator.GenerationPlan of the attributes that do not depend on
+           other values, compiled on first use and reused for every row'''
+        if getattr(self, '_primary_plan', None) is None:
+            primary = [self.primary_ID_attr, self.gname_attr, self.mname_attr, 
+                      self.sname_attr, self.name_suffix_attr,
+                      self.name_prefix_attr, 
+                      self.sname_prev_attr, self.nickname_attr,
+                      self.new_age_attr, self.gender_attr, self.address_attr,
+                      self.city_attr, self.state_attr,
+                      self.postcode_attr, self.phone_num_cell_attr,
+                      self.phone_num_work_attr, self.phone_num_home_attr,
+                      self.credit_card_attr, self.social_security_attr,
+                      self.passport_attr, self.mother]
+            self._primary_plan = generator.GenerationPlan(
+                [attr.attribute_name for attr in primary], primary)
+        return self._primary_plan
+
     def output(self):
         'create synthetic output'
         #removed all compound attribute
         #single attr need create_attribute_values(), singular
         #compound attr need create_attribute_values(), plural!
         #must update compound context to USA
-        primary = [self.primary_ID_attr, self.gname_attr, self.mname_attr, 
-                  self.sname_attr, self.name_suffix_attr,
-                  self.name_prefix_attr, 
-                  self.sname_prev_attr, self.nickname_attr,
-                  self.new_age_attr, self.gender_attr, self.address_attr,
-                  self.city_attr, self.state_attr,
-                  self.postcode_attr, self.phone_num_cell_attr,
-                  self.phone_num_work_attr, self.phone_num_home_attr,
-                  self.credit_card_attr, self.social_security_attr,
-                  self.passport_attr, self.mother]
-        
-        out = [attr.create_attribute_value() for attr in primary]
-        
-        labels = [attr.attribute_name for attr in primary]
-        
+        plan = self.primary_plan()
+
+        out = plan.generate_record_values()
+
+        return self.dependent_output(out)
+
+    def household_plan(self, shared_names):
+        '''generator.GenerationPlan of the primary attributes that are not in
+           shared_names, compiled once per list of names and reused for every
+           household'''
+        plan_dict = self.__dict__.setdefault('_household_plan_dict', {})
+        key = tuple(shared_names)
+        if key not in plan_dict:
+            member = [attr for attr in self.primary_plan().attribute_data_list
+                      if attr.attribute_name not in key]
+            plan_dict[key] = generator.GenerationPlan(
+                [attr.attribute_name for attr in member], member)
+        return plan_dict[key]
+
+    def output_members(self, shared_names, shared_rows):
+        '''create synthetic output for one person per list in shared_rows,
+           which holds the values of shared_names drawn for the household of
+           that person, all other primary values are generated in one batch'''
+        plan = self.household_plan(shared_names)
+        labels = self.primary_plan().attribute_name_list
+
+        rows = []
+        for (rec, shared_row) in zip(plan.generate_record_chunk(
+                                         len(shared_rows)), shared_rows):
+            values = dict(zip(plan.attribute_name_list, rec))
+            values.update(zip(shared_names, shared_row))
+            rows.append(self.dependent_output([values[x] for x in labels]))
+        return rows
+
+    def dependent_output(self, out):
+        '''add the values that depend on other values to out, the list of
+           values of primary_plan(), and return the row as an OrderedDict'''
+        labels = list(self.primary_plan().attribute_name_list)
+
         self.email_attr = generator.GenerateFuncAttribute(attribute_name = 'email',
           function = attrgenfunct.generate_email_address,
           parameters = [str(out[1]), str(out[3])]
@@ -587,9 +648,95 @@ attr_mod_data_dictionary = {'surname':[(0.15, surname_misspell_corruptor),
                             #'age':[(1.0, edit_corruptor2)],
                           
 
-def row_synth(genfunct, row_count):
-    'genfunct is an AttrSet object, row_count is int'
-    return (genfunct.output() for x in xrange(row_count))
+def row_synth(genfunct, row_count, workers=None, seed=None):
+    '''genfunct is an AttrSet object, row_count is int
+       if workers is given, rows are generated in seeded shards by that many
+       processes, the rows only depend on seed and not on workers'''
+    if workers is None:
+        return (genfunct.output() for x in xrange(row_count))
+
+    if seed is None:
+        seed = random.randrange(2**32)
+
+    return (row for shard_rows in generator.generate_sharded(output_shard,
+                                       genfunct, row_count, workers, seed)
+            for row in shard_rows)
+
+def household_synth(genfunct_list, household_count, size_dist=None,
+                    shared_names=None):
+    '''genfunct_list is a list of AttrSet objects (e.g. [AttrSet(), AttrSetM()]),
+       household_count is int, yields one list of rows per household
+       household sizes are drawn from size_dist (default
+       household_size_distribution), each member from a randomly picked
+       genfunct, the values of shared_names (default household_attr_list) are
+       drawn once per household and given to all its members'''
+    if size_dist is None:
+        size_dist = household_size_distribution
+    if shared_names is None:
+        shared_names = household_attr_list
+
+    for (size, weight) in size_dist:
+        basefunctions.check_is_integer('size', size)
+        basefunctions.check_is_positive('size', size)
+
+    primary = genfunct_list[0].primary_plan()
+    shared = [attr for attr in primary.attribute_data_list
+              if attr.attribute_name in shared_names]
+    if len(shared) != len(set(shared_names)):
+        raise Exception('Not all household attributes are generated: %s' % \
+                        (str(shared_names)))
+
+    shared_plan = generator.GenerationPlan(
+        [attr.attribute_name for attr in shared], shared)
+    size_table = sampler.AliasTable(list(size_dist))
+
+    shared_names = shared_plan.attribute_name_list
+    num_genfunct = len(genfunct_list)
+
+    for start_num in xrange(0, household_count, household_chunk_size):
+        chunk_count = min(household_chunk_size, household_count-start_num)
+
+        # Pick the genfunct of every member of the households in the chunk,
+        # then generate the members of each genfunct in one batch
+        #
+        picks = []
+        member_shared_rows = [[] for x in xrange(num_genfunct)]
+        for (shared_row, size) in zip(
+                shared_plan.generate_record_chunk(chunk_count),
+                size_table.draw_many(chunk_count)):
+            pick = [random.randrange(num_genfunct) for x in xrange(size)]
+            for i in pick:
+                member_shared_rows[i].append(shared_row)
+            picks.append(pick)
+
+        member_rows = [iter(genfunct.output_members(shared_names,
+                                                    member_shared_rows[i]))
+                       for (i, genfunct) in enumerate(genfunct_list)]
+
+        for pick in picks:
+            yield [member_rows[i].next() for i in pick]
+
+def row_synth_households(genfunct_list, row_count, size_dist=None):
+    '''like row_synth but the rows come in households (see household_synth),
+       the last household is cut short so exactly row_count rows are made'''
+    rows = (row for household in household_synth(genfunct_list, row_count,
+                                                 size_dist)
+            for row in household)
+    return itertools.islice(rows, row_count)
+
+def output_shard(genfunct, start_num, row_count):
+    'shard function for generator.generate_sharded(), returns list of rows'
+    return [genfunct.output() for x in xrange(row_count)]
+
+def row_at(genfunct, row_num, seed):
+    '''regenerate the row with number row_num, its randomness only depends
+       on seed and row_num, not on any row generated before it'''
+    generator.seed_random_state(sampler.derive_seed(seed, row_num))
+    return genfunct.output()
+
+def row_synth_seeded(genfunct, row_count, seed):
+    'genfunct is an AttrSet object, each row seeded from seed and its number'
+    return (row_at(genfunct, x, seed) for x in xrange(row_count))
 
 def row_synth_alt(genfunct, row_count):
     'genfunct is an AttrSet object, row_count is int'
@@ -601,13 +748,13 @@ def row_keys(genfunct):
 
 def to_corruptor(genfunct, row_count):
     'create output structured on GenerateDataSet generate()'
-    return dict(('rec-'+str(y)+'-org', genfunct.output().values()) for y in range(row_count))
+    return dict((basefunctions.get_rec_key(y), genfunct.output().values()) for y in range(row_count))
 
 def to_corruptor_gf(genfunct_input):
     'input is already generated'
     g_list = list(genfunct_input)
     g_len = len(g_list)
-    counter = ['rec-'+str(y)+'-org' for y in range(g_len)]
+    counter = [basefunctions.get_rec_key(y) for y in range(g_len)]
     value_list = [x.values() for x in g_list]
     return dict(zip(counter,value_list))
 
@@ -615,11 +762,11 @@ def to_corruptor_csv(genfunct, row_count):
     'this has no header, flattens and retains id from to_corruptor'
     corrupt_out = to_corruptor(genfunct, row_count)
     corrupt_out = test_data_corruptor.corrupt_records(corrupt_out)
-    return (([k]+v) for k,v in corrupt_out.iteritems())
+    return from_tdc(corrupt_out)
 
 def from_tdc(tdc_in):
-    'use input from test_data_corruptor.corrupt_records()'
-    return (([k]+v) for k,v in tdc_in.iteritems())
+    'use input from test_data_corruptor.corrupt_records(), ids formatted here'
+    return (([basefunctions.get_rec_id_str(k, 0)]+v) for k,v in tdc_in.iteritems())
 
 def to_corruptor_write(corruptor_csv, file_name='English_corrupt_output.csv'):
     'write corruptor data with id row'
@@ -0,0 +1,922 @@
+# freqbuilder.py - Python module providing functions to build look-up files
+#                  from large CSV source files.
+#
+#                  Part of a flexible data generation system.
+#
+# =============================================================================
+#
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# =============================================================================
+
+"""Module containing functions that count the values (or combinations of
+   values) in one or more large CSV source files, and that write the counts
+   into look-up files in the formats parsed by the attribute classes in
+   generator.py.
+
+   The source files are read in chunks (byte ranges of a file, where each
+   chunk processes the lines that start within its range), so a file is
+   never loaded into memory as a whole, and the memory used only depends on
+   the number of different values (or value combinations) counted. The
+   chunks can be counted in a pool of worker processes, in which case the
+   partial counts of the chunks are merged in the main process.
+
+   Each record in a source file must be on one line (quoted values containing
+   line breaks are not supported).
+
+   The look-up file formats that can be written are:
+
+   freq            One value and its count per line, as used by
+                   GenerateFreqAttribute.
+   cate-cate       The values of two attributes, as used by
+                   GenerateCateCateCompoundAttribute.
+   chain           The values of two or more attributes and their count per
+                   line, as used by GenerateConditionalChainAttribute.
+   cate-cont       One categorical value, its count and a normal distribution
+                   fitted to the continuous values for this categorical value
+                   per line, as used by GenerateCateContCompoundAttribute.
+   cate-cate-cont  The values of two categorical attributes and normal
+                   distributions fitted to the continuous values for each pair
+                   of categorical values, as used by
+                   GenerateCateCateContCompoundAttribute.
+   tree            A tree of dependencies between two or more categorical
+                   attributes learned from the counts of the values in each
+                   pair of attributes (a Chow-Liu tree), with the counts of
+                   the values of each attribute for each value of its parent
+                   attribute, as used by GenerateDependencyTreeAttribute.
+
+   This module can also be run as a program, for example:
+
+     python freqbuilder.py -f cate-cate -c gender,city -o gender-city.csv \\
+                           -w 4 census-part1.csv census-part2.csv
+"""
+
+# -----------------------------------------------------------------------------
+# Import necessary modules
+
+import csv
+import itertools
+import math
+import multiprocessing
+import optparse
+import os
+import sys
+
+import basefunctions
+
+# -----------------------------------------------------------------------------
+
+# The default size (in bytes) of the chunks source files are split into
+#
+DEFAULT_CHUNK_SIZE = 16*1024*1024
+
+# The look-up file formats that can be written
+#
+FILE_FORMAT_LIST = ['freq', 'cate-cate', 'chain', 'cate-cont',
+                    'cate-cate-cont', 'tree']
+
+# The maximum number of values of the second attribute written on one line of
+# a cate-cate look-up file (further values go onto continuation lines)
+#
+CATE_CATE_VALUES_PER_LINE = 5
+
+# -----------------------------------------------------------------------------
+
+def get_chunk_list(file_name, chunk_size):
+  """Return a list of tuples (file_name, start_offset, end_offset) that split
+     the given file into byte ranges of at most 'chunk_size' bytes.
+  """
+
+  try:
+    file_size = os.path.getsize(file_name)
+  except:
+    raise IOError( 'Cannot read CSV file "%s"' % (file_name))
+
+  chunk_list = []
+
+  for start_offset in range(0, file_size, chunk_size):
+    chunk_list.append((file_name, start_offset,
+                       min(start_offset+chunk_size, file_size)))
+
+  return chunk_list
+
+# -----------------------------------------------------------------------------
+
+def read_chunk_lines(file_name, start_offset, end_offset):
+  """Yield the lines (as byte strings) of the given file that start within
+     the byte range from 'start_offset' (inclusive) to 'end_offset'
+     (exclusive). Together, the chunks of a file yield each of its lines
+     exactly once.
+  """
+
+  in_file = open(file_name, 'rb')
+
+  try:
+    if (start_offset > 0):
+
+      # Skip the end of the line that started in the previous chunk (if the
+      # chunk starts at the beginning of a line only its line break is read)
+      #
+      in_file.seek(start_offset-1)
+      in_file.readline()
+
+    line_offset = in_file.tell()
+
+    while (line_offset < end_offset):
+      line_str = in_file.readline()
+      if (line_str == ''):  # End of file
+        break
+
+      yield line_str
+
+      line_offset += len(line_str)
+
+  finally:
+    in_file.close()
+
+# -----------------------------------------------------------------------------
+
+def count_chunk(chunk_task):
+  """Count the values in the given columns for the lines of one chunk.
+
+     The argument is a tuple (file_name, start_offset, end_offset, count_spec)
+     where count_spec is a tuple (encoding, has_header_line, key_column_list,
+     value_column, count_pairs) as described in count_file_values().
+
+     Returns a tuple (count_dict, stats_dict, num_lines, num_skipped), where
+     count_dict contains the count for each tuple of key values, stats_dict
+     contains for each tuple of key values a list [num_val, sum, sum_squares,
+     min_val, max_val] of the numbers in the value column (or is empty if no
+     value column is given), num_lines is the number of records processed and
+     num_skipped the number of records that were skipped because they were
+     too short or contained an empty key value or an illegal number. If
+     count_pairs is True, count_dict contains the counts of the values in
+     each pair of key columns instead (see get_pair_counts()).
+  """
+
+  file_name, start_offset, end_offset, count_spec = chunk_task
+  encoding, has_header_line, key_column_list, value_column, count_pairs = \
+                                                                   count_spec
+
+  count_dict = {}
+  stats_dict = {}
+  num_lines =   0
+  num_skipped = 0
+
+  if (value_column == None):
+    min_len = max(key_column_list)+1
+  else:
+    min_len = max(max(key_column_list), value_column)+1
+
+  line_iter = read_chunk_lines(file_name, start_offset, end_offset)
+
+  if (has_header_line == True) and (start_offset == 0):
+    for line_str in line_iter:  # Skip the header line
+      break
+
+  for rec_list in csv.reader(line_iter):
+    if (rec_list == []) or (rec_list[0].lstrip().startswith('#')):
+      continue  # Empty or comment line
+
+    num_lines += 1
+
+    if (len(rec_list) < min_len):
+      num_skipped += 1
+      continue
+
+    key_val_list = []
+    for col_num in key_column_list:
+      key_val = rec_list[col_num].strip()
+      if (key_val == ''):
+        break
+      key_val_list.append(key_val)
+
+    if (len(key_val_list) < len(key_column_list)):
+      num_skipped += 1
+      continue
+
+    key = tuple(key_val_list)
+
+    if (value_column != None):
+      try:
+        num_val = float(rec_list[value_column])
+      except:
+        num_val = None
+      if (num_val == None) or (num_val != num_val) or \
+         (abs(num_val) == float('inf')):  # Illegal number, NaN or infinity
+        num_skipped += 1
+        continue
+
+      stats_list = stats_dict.get(key)
+      if (stats_list == None):
+        stats_dict[key] = [1, num_val, num_val*num_val, num_val, num_val]
+      else:
+        stats_list[0] += 1
+        stats_list[1] += num_val
+        stats_list[2] += num_val*num_val
+        if (num_val < stats_list[3]):
+          stats_list[3] = num_val
+        elif (num_val > stats_list[4]):
+          stats_list[4] = num_val
+
+    count_dict[key] = count_dict.get(key, 0) + 1
+
+  # Decode the values only once for each different key
+  #
+  count_dict = dict([(tuple([val.decode(encoding) for val in key]), count) \
+                     for (key, count) in count_dict.iteritems()])
+  stats_dict = dict([(tuple([val.decode(encoding) for val in key]), stats) \
+                     for (key, stats) in stats_dict.iteritems()])
+
+  # The combinations of values are only kept for the lines of this chunk
+  #
+  if (count_pairs == True):
+    count_dict = get_pair_counts(count_dict, len(key_column_list))
+
+  return count_dict, stats_dict, num_lines, num_skipped
+
+# -----------------------------------------------------------------------------
+
+def get_pair_counts(count_dict, num_attr):
+  """Return the counts of the values in each pair of the attributes whose
+     combinations of values are counted in the given dictionary (with keys
+     being tuples of 'num_attr' values), as a dictionary with keys (attr1,
+     attr2, val1, val2), where attr1 <= attr2 are attribute numbers. The keys
+     with attr1 equal to attr2 (and so val1 equal to val2) contain the counts
+     of the values of single attributes.
+  """
+
+  pair_count_dict = {}
+
+  for (key, count) in count_dict.iteritems():
+    for j in range(num_attr):
+      for k in range(j, num_attr):
+        pair_key = (j, k, key[j], key[k])
+        pair_count_dict[pair_key] = pair_count_dict.get(pair_key, 0) + count
+
+  return pair_count_dict
+
+# -----------------------------------------------------------------------------
+
+def merge_counts(count_dict, stats_dict, chunk_count_dict, chunk_stats_dict):
+  """Merge the counts and statistics of one chunk into the given dictionaries.
+  """
+
+  for (key, count) in chunk_count_dict.iteritems():
+    count_dict[key] = count_dict.get(key, 0) + count
+
+  for (key, chunk_stats_list) in chunk_stats_dict.iteritems():
+    stats_list = stats_dict.get(key)
+    if (stats_list == None):
+      stats_dict[key] = chunk_stats_list
+    else:
+      stats_list[0] += chunk_stats_list[0]
+      stats_list[1] += chunk_stats_list[1]
+      stats_list[2] += chunk_stats_list[2]
+      stats_list[3] = min(stats_list[3], chunk_stats_list[3])
+      stats_list[4] = max(stats_list[4], chunk_stats_list[4])
+
+# -----------------------------------------------------------------------------
+
+def get_column_numbers(file_name, encoding, has_header_line, column_list):
+  """Return the list of column numbers for the given list of columns, which
+     can be column numbers (starting with 0) or, if the file has a header
+     line, column names.
+  """
+
+  header_list = None
+
+  if (has_header_line == True):
+    in_file = open(file_name, 'rb')
+    for rec_list in csv.reader(in_file):
+      header_list = [col_name.decode(encoding or 'ascii').strip() \
+                     for col_name in rec_list]
+      break
+    in_file.close()
+
+  col_num_list = []
+
+  for column in column_list:
+    if (isinstance(column, int)):
+      basefunctions.check_is_not_negative('column', column)
+      col_num_list.append(column)
+    elif (header_list != None) and (column in header_list):
+      col_num_list.append(header_list.index(column))
+    else:
+      raise Exception( 'Column "%s" not in header line of CSV file "%s"' % \
+                       (column, file_name))
+
+  return col_num_list
+
+# -----------------------------------------------------------------------------
+
+def count_file_values(file_name_list, key_column_list, value_column=None,
+                      encoding='ascii', has_header_line=True, workers=1,
+                      chunk_size=DEFAULT_CHUNK_SIZE, min_count=1,
+                      count_pairs=False):
+  """Count the values, or combinations of values, in the given columns of the
+     given CSV files.
+
+     Arguments:
+     file_name_list   A list with the names of the CSV files to read.
+
+     key_column_list  A list with the columns whose values (or combinations
+                      of values) are counted. Columns are given as numbers
+                      (starting with 0) or as names from the header line.
+
+     value_column     An optional column with numbers, for which the number of
+                      values, their sum, sum of squares, minimum and maximum
+                      are calculated for each combination of key values
+                      (records without a number are skipped).
+
+     encoding         The name of the Unicode encoding of the files (an
+                      encoding which is compatible with ASCII, such as
+                      'utf-8' or 'iso-8859-1').
+
+     has_header_line  A flag, set to True or False, if the files start with a
+                      header line or not.
+
+     workers          The number of processes that count chunks of the files
+                      in parallel. If 1, the chunks are counted in this
+                      process.
+
+     chunk_size       The size (in bytes) of the chunks the files are split
+                      into.
+
+     min_count        Combinations of values that occur less often than this
+                      are removed from the counts.
+
+     count_pairs      A flag, set to True or False, if the values in each pair
+                      of key columns (see get_pair_counts()) are counted
+                      instead of the combinations of values in all key
+                      columns (which cannot be combined with a value column).
+                      The combinations are then only counted for each chunk,
+                      and min_count applies to the pairs of values.
+
+     Returns a tuple (count_dict, stats_dict, num_lines, num_skipped) as
+     described in count_chunk(), for all files.
+  """
+
+  basefunctions.check_is_list('file_name_list', file_name_list)
+  basefunctions.check_is_list('key_column_list', key_column_list)
+  if (file_name_list == []):
+    raise Exception( 'No CSV files given')
+  if (key_column_list == []):
+    raise Exception( 'No key columns given')
+  basefunctions.check_is_flag('has_header_line', has_header_line)
+  basefunctions.check_is_integer('workers', workers)
+  basefunctions.check_is_positive('workers', workers)
+  basefunctions.check_is_integer('chunk_size', chunk_size)
+  basefunctions.check_is_positive('chunk_size', chunk_size)
+  basefunctions.check_is_integer('min_count', min_count)
+  basefunctions.check_is_positive('min_count', min_count)
+  basefunctions.check_is_flag('count_pairs', count_pairs)
+  if (count_pairs == True) and (value_column != None):
+    raise Exception( 'Pairs of values cannot be counted with a value column')
+
+  if (encoding == None):
+    encoding = 'ascii'
+  basefunctions.check_unicode_encoding_exists(encoding)
+
+  chunk_task_list = []
+
+  for file_name in file_name_list:
+    basefunctions.check_is_non_empty_string('file_name', file_name)
+
+    key_col_num_list = get_column_numbers(file_name, encoding,
+                                          has_header_line, key_column_list)
+    if (value_column != None):
+      value_col_num = get_column_numbers(file_name, encoding,
+                                         has_header_line, [value_column])[0]
+      if (value_col_num in key_col_num_list):
+        raise Exception( 'Value column is also a key column')
+    else:
+      value_col_num = None
+
+    count_spec = (encoding, has_header_line, key_col_num_list, value_col_num,
+                  count_pairs)
+
+    for (chunk_file_name, start_offset, end_offset) in \
+        get_chunk_list(file_name, chunk_size):
+      chunk_task_list.append((chunk_file_name, start_offset, end_offset,
+                              count_spec))
+
+  count_dict = {}
+  stats_dict = {}
+  num_lines =   0
+  num_skipped = 0
+
+  # Count the chunks lazily, so only one chunk counter is held in memory
+  # before it is merged
+  #
+  if (workers == 1) or (len(chunk_task_list) < 2):
+    chunk_res_iter = itertools.imap(count_chunk, chunk_task_list)
+    pool = None
+  else:
+    pool = multiprocessing.Pool(workers)
+    chunk_res_iter = pool.imap_unordered(count_chunk, chunk_task_list)
+
+  try:
+    for (chunk_count_dict, chunk_stats_dict, chunk_num_lines,
+         chunk_num_skipped) in chunk_res_iter:
+      merge_counts(count_dict, stats_dict, chunk_count_dict, chunk_stats_dict)
+      num_lines +=   chunk_num_lines
+      num_skipped += chunk_num_skipped
+
+    if (pool != None):
+      pool.close()
+  finally:
+    if (pool != None):
+      pool.terminate()
+      pool.join()
+
+  if (min_count > 1):
+    for (key, count) in count_dict.items():
+      if (count < min_count):
+        del count_dict[key]
+        if (key in stats_dict):
+          del stats_dict[key]
+
+  return count_dict, stats_dict, num_lines, num_skipped
+
+# -----------------------------------------------------------------------------
+
+def check_lookup_value(val):
+  """Check that the given value can be written into a look-up file, i.e. that
+     it does not contain a comma and is not read as a comment or continuation
+     mark.
+  """
+
+  if (',' in val) or (val.startswith('#')) or (val == '\\'):
+    raise Exception( 'Value "%s" cannot be written into a look-up file' % \
+                     (val))
+
+# -----------------------------------------------------------------------------
+
+def get_sorted_items(count_dict):
+  """Return the list of (key, count) pairs of the given dictionary sorted by
+     decreasing counts (and keys for the same count).
+  """
+
+  return sorted(count_dict.items(), key=lambda item: (-item[1], item[0]))
+
+# -----------------------------------------------------------------------------
+
+def get_normal_params(stats_list):
+  """Return the list of strings [mu, sigma, min_val, max_val] of a normal
+     distribution fitted to the given statistics list [num_val, sum,
+     sum_squares, min_val, max_val]. The minimum and maximum of the values
+     are used as the limits of the distribution.
+  """
+
+  num_val, val_sum, val_sum_squares, min_val, max_val = stats_list
+
+  mu = val_sum / num_val
+  if (num_val > 1):
+    variance = (val_sum_squares - val_sum*mu) / (num_val-1)
+  else:
+    variance = 0.0
+  sigma = math.sqrt(max(variance, 0.0))
+
+  # A normal distribution needs a positive standard deviation, with the
+  # minimum and maximum value limits it still only returns the single value
+  #
+  if (sigma <= 0.0) or (max_val <= min_val):
+    sigma = max(abs(mu)*1e-9, 1e-9)
+
+  mu = min(max(mu, min_val), max_val)
+
+  return [repr(mu), repr(sigma), repr(min_val), repr(max_val)]
+
+# -----------------------------------------------------------------------------
+
+def write_freq_file(file_name, count_dict, encoding='ascii'):
+  """Write a look-up file with one value and its count per line, as used by
+     GenerateFreqAttribute (with has_header_line set to False). The keys of
+     the count dictionary must be tuples with one value.
+  """
+
+  file_data = []
+
+  for (key, count) in get_sorted_items(count_dict):
+    if (len(key) != 1):
+      raise Exception( 'A frequency file needs counts of single values')
+    check_lookup_value(key[0])
+    file_data.append([key[0], str(count)])
+
+  basefunctions.write_csv_file(file_name, encoding, None, file_data)
+
+# -----------------------------------------------------------------------------
+
+def write_cate_cate_file(file_name, count_dict, encoding='ascii'):
+  """Write a look-up file with the values of two categorical attributes, as
+     used by GenerateCateCateCompoundAttribute (with has_header_line set to
+     False). The keys of the count dictionary must be pairs of values.
+  """
+
+  cate_val2_count_dict = {}  # Counts of attribute 2 values for each value of
+                             # attribute 1
+
+  for ((cate_val1, cate_val2), count) in count_dict.iteritems():
+    check_lookup_value(cate_val1)
+    check_lookup_value(cate_val2)
+    this_count_dict = cate_val2_count_dict.setdefault(cate_val1, {})
+    this_count_dict[cate_val2] = count
+
+  cate_val1_count_dict = {}
+  for (cate_val1, this_count_dict) in cate_val2_count_dict.iteritems():
+    cate_val1_count_dict[cate_val1] = sum(this_count_dict.values())
+
+  file_data = []
+
+  for (cate_val1, cate_val1_count) in get_sorted_items(cate_val1_count_dict):
+    rec_list = [cate_val1, str(cate_val1_count)]
+
+    val2_item_list = get_sorted_items(cate_val2_count_dict[cate_val1])
+
+    for i in range(0, len(val2_item_list), CATE_CATE_VALUES_PER_LINE):
+      if (i > 0):  # Continue the values of attribute 2 on the next line
+        rec_list.append('\\')
+        file_data.append(rec_list)
+        rec_list = []
+
+      for (cate_val2, count) in val2_item_list[i:i+CATE_CATE_VALUES_PER_LINE]:
+        rec_list += [cate_val2, str(count)]
+
+    file_data.append(rec_list)
+
+  basefunctions.write_csv_file(file_name, encoding, None, file_data)
+
+# -----------------------------------------------------------------------------
+
+def write_chain_file(file_name, count_dict, encoding='ascii',
+                     header_list=None):
+  """Write a look-up file with two or more values and their count per line,
+     as used by GenerateConditionalChainAttribute. If a header list (the
+     names of the attributes) is given, a header line is written with these
+     names and 'count' (so the file has to be loaded with has_header_line set
+     to True).
+  """
+
+  file_data = []
+
+  for (key, count) in sorted(count_dict.items()):
+    if (len(key) < 2):
+      raise Exception( 'A chain file needs counts of at least two values')
+    for val in key:
+      check_lookup_value(val)
+    file_data.append(list(key)+[str(count)])
+
+  if (header_list != None):
+    header_list = list(header_list)+['count']
+
+  basefunctions.write_csv_file(file_name, encoding, header_list, file_data)
+
+# -----------------------------------------------------------------------------
+
+def write_cate_cont_file(file_name, count_dict, stats_dict, encoding='ascii'):
+  """Write a look-up file with one categorical value, its count and a normal
+     distribution fitted to its continuous values per line, as used by
+     GenerateCateContCompoundAttribute (with has_header_line set to False).
+     The keys of the count and statistics dictionaries must be tuples with
+     one value.
+  """
+
+  file_data = []
+
+  for (key, count) in get_sorted_items(count_dict):
+    if (len(key) != 1):
+      raise Exception( 'A categorical-continuous file needs counts of ' + \
+                       'single values')
+    if (key not in stats_dict):
+      continue  # No continuous values for this categorical value
+    check_lookup_value(key[0])
+    file_data.append([key[0], str(stats_dict[key][0]), 'normal'] + \
+                     get_normal_params(stats_dict[key]))
+
+  basefunctions.write_csv_file(file_name, encoding, None, file_data)
+
+# -----------------------------------------------------------------------------
+
+def write_cate_cate_cont_file(file_name, count_dict, stats_dict,
+                              encoding='ascii'):
+  """Write a look-up file with the values of two categorical attributes and
+     normal distributions fitted to the continuous values of each pair of
+     categorical values, as used by GenerateCateCateContCompoundAttribute
+     (with has_header_line set to False). The keys of the count and
+     statistics dictionaries must be pairs of values.
+  """
+
+  cate_val2_stats_dict = {}  # Statistics of attribute 2 values for each value
+                             # of attribute 1
+
+  for (key, stats_list) in stats_dict.iteritems():
+    if (len(key) != 2):
+      raise Exception( 'A categorical-categorical-continuous file needs ' + \
+                       'counts of pairs of values')
+    if (key not in count_dict):
+      continue  # Removed because of its small count
+    check_lookup_value(key[0])
+    check_lookup_value(key[1])
+    this_stats_dict = cate_val2_stats_dict.setdefault(key[0], {})
+    this_stats_dict[key[1]] = stats_list
+
+  cate_val1_count_dict = {}
+  for (cate_val1, this_stats_dict) in cate_val2_stats_dict.iteritems():
+    cate_val1_count_dict[cate_val1] = \
+                 sum([stats_list[0] for stats_list in this_stats_dict.values()])
+
+  file_data = []
+
+  for (cate_val1, cate_val1_count) in get_sorted_items(cate_val1_count_dict):
+    file_data.append([cate_val1, str(cate_val1_count)])
+
+    this_stats_dict = cate_val2_stats_dict[cate_val1]
+    this_count_dict = dict([(cate_val2, stats_list[0]) for \
+                            (cate_val2, stats_list) in \
+                            this_stats_dict.iteritems()])
+
+    for (cate_val2, count) in get_sorted_items(this_count_dict):
+      file_data.append([cate_val2, str(count), 'normal'] + \
+                       get_normal_params(this_stats_dict[cate_val2]))
+
+  basefunctions.write_csv_file(file_name, encoding, None, file_data)
+
+# -----------------------------------------------------------------------------
+
+def get_pair_table_dict(pair_count_dict):
+  """Return a dictionary with pairs (attr1, attr2) of attribute numbers as
+     keys and dictionaries with the counts of the pairs of their values as
+     values, from a dictionary of counts as returned by get_pair_counts().
+  """
+
+  pair_table_dict = {}
+
+  for ((attr1, attr2, val1, val2), count) in pair_count_dict.iteritems():
+    pair_table_dict.setdefault((attr1, attr2), {})[(val1, val2)] = count
+
+  return pair_table_dict
+
+# -----------------------------------------------------------------------------
+
+def get_dependency_tree(pair_table_dict, num_attr):
+  """Learn a tree of dependencies between 'num_attr' attributes from the
+     counts of the values in each pair of attributes (as returned by
+     get_pair_table_dict()), as the tree that connects all attributes with
+     the largest sum of the mutual information between the attributes it
+     connects (a Chow-Liu tree). The tree is built with the algorithm of Prim
+     starting from the first attribute as its root.
+
+     Returns a list with the attribute numbers in the order they were added
+     to the tree (so each attribute comes after its parent attribute), and a
+     list with the number of the parent attribute of each attribute (None for
+     the root attribute).
+  """
+
+  def get_mutual_info(attr1, attr2):
+    pair_table = pair_table_dict.get((min(attr1, attr2), max(attr1, attr2)),
+                                     {})
+    if (pair_table == {}):
+      return 0.0
+
+    total_count = float(sum(pair_table.values()))
+
+    val_count_dict1 = {}
+    val_count_dict2 = {}
+    for ((val1, val2), count) in pair_table.iteritems():
+      val_count_dict1[val1] = val_count_dict1.get(val1, 0) + count
+      val_count_dict2[val2] = val_count_dict2.get(val2, 0) + count
+
+    mutual_info = 0.0
+    for ((val1, val2), count) in pair_table.iteritems():
+      mutual_info += count / total_count * \
+                     math.log(count * total_count / \
+                              (val_count_dict1[val1]*val_count_dict2[val2]))
+    return mutual_info
+
+  attr_order_list =  [0]
+  parent_attr_list = [None]*num_attr
+
+  # For each attribute not in the tree yet, the largest mutual information
+  # with an attribute in the tree and this attribute
+  #
+  best_link_dict = dict([(j, (get_mutual_info(0, j), 0)) for j in \
+                         range(1, num_attr)])
+
+  while (best_link_dict != {}):
+    new_attr = max(best_link_dict,
+                   key=lambda j: (best_link_dict[j][0], -j))
+    parent_attr_list[new_attr] = best_link_dict.pop(new_attr)[1]
+    attr_order_list.append(new_attr)
+
+    for j in best_link_dict:
+      mutual_info = get_mutual_info(new_attr, j)
+      if (mutual_info > best_link_dict[j][0]):
+        best_link_dict[j] = (mutual_info, new_attr)
+
+  return attr_order_list, parent_attr_list
+
+# -----------------------------------------------------------------------------
+
+def write_tree_file(file_name, pair_count_dict, attr_name_list,
+                    encoding='ascii'):
+  """Write a look-up file with a tree of dependencies between the attributes
+     with the given names learned from the counts of the values in each pair
+     of attributes (as returned by get_pair_counts(), see
+     get_dependency_tree()), as used by GenerateDependencyTreeAttribute (with
+     has_header_line set to False).
+
+     For the root attribute the counts of its values are written, and for
+     every other attribute the counts of its values together with each value
+     of its parent attribute.
+  """
+
+  num_attr = len(attr_name_list)
+
+  if (num_attr < 2):
+    raise Exception( 'A tree file needs counts of at least two values')
+  for attr_name in attr_name_list:
+    check_lookup_value(attr_name)
+  for key in pair_count_dict:
+    if (len(key) != 4) or (not (0 <= key[0] <= key[1] < num_attr)):
+      raise Exception( 'A tree file needs counts of the values in pairs ' + \
+                       'of %d attributes' % (num_attr))
+    check_lookup_value(key[2])
+    check_lookup_value(key[3])
+
+  pair_table_dict = get_pair_table_dict(pair_count_dict)
+
+  attr_order_list, parent_attr_list = get_dependency_tree(pair_table_dict,
+                                                          num_attr)
+
+  file_data = []
+
+  for j in attr_order_list:
+    parent_attr = parent_attr_list[j]
+
+    if (parent_attr == None):
+      parent_name = ''
+      val_count_list = [(('', val), count) for ((val, same_val), count) in \
+                        pair_table_dict.get((j, j), {}).iteritems()]
+    elif (parent_attr < j):
+      parent_name = attr_name_list[parent_attr]
+      val_count_list = pair_table_dict.get((parent_attr, j), {}).items()
+    else:
+      parent_name = attr_name_list[parent_attr]
+      val_count_list = [((parent_val, val), count) for \
+                        ((val, parent_val), count) in \
+                        pair_table_dict.get((j, parent_attr), {}).iteritems()]
+
+    for ((parent_val, val), count) in sorted(val_count_list):
+      file_data.append([attr_name_list[j], parent_name, parent_val, val,
+                        str(count)])
+
+  basefunctions.write_csv_file(file_name, encoding, None, file_data)
+
+# -----------------------------------------------------------------------------
+
+def build_lookup_file(out_file_name, file_format, file_name_list,
+                      key_column_list, value_column=None, encoding='ascii',
+                      has_header_line=True, workers=1,
+                      chunk_size=DEFAULT_CHUNK_SIZE, min_count=1,
+                      out_encoding=None):
+  """Count the values in the given columns of the given CSV files (see
+     count_file_values()) and write a look-up file of the given format (one
+     of the formats in FILE_FORMAT_LIST). The look-up file is written with
+     the given output encoding (if None the encoding of the source files).
+
+     The cate-cont and cate-cate-cont formats need a value column, the other
+     formats must not have one. For the chain format a header line is written
+     if the key columns are given by their names. For the tree format the key
+     columns must be given by their names, which are used as the attribute
+     names in the look-up file, the first key column becomes the root of the
+     tree, and the values in each pair of key columns are counted (so
+     min_count applies to the pairs of values).
+
+     Returns the pair (num_lines, num_skipped).
+  """
+
+  if (file_format not in FILE_FORMAT_LIST):
+    raise Exception( 'Illegal look-up file format: "%s"' % (file_format))
+
+  num_key_columns = {'freq':1, 'cate-cate':2, 'cate-cont':1,
+                     'cate-cate-cont':2}.get(file_format)
+  if (num_key_columns != None) and (len(key_column_list) != num_key_columns):
+    raise Exception( 'Look-up file format "%s" needs %d key column(s)' % \
+                     (file_format, num_key_columns))
+  if (file_format in ['chain', 'tree']) and (len(key_column_list) < 2):
+    raise Exception( 'Look-up file format "%s" needs at least two key ' % \
+                     (file_format) + 'columns')
+  if (file_format == 'tree') and \
+     (False in [isinstance(column, basestring) for column in \
+                key_column_list]):
+    raise Exception( 'Look-up file format "tree" needs key columns given ' + \
+                     'by their names')
+
+  if (file_format in ['cate-cont', 'cate-cate-cont']):
+    if (value_column == None):
+      raise Exception( 'Look-up file format "%s" needs a value column' % \
+                       (file_format))
+  elif (value_column != None):
+    raise Exception( 'Look-up file format "%s" does not use a value column' % \
+                     (file_format))
+
+  if (out_encoding == None):
+    out_encoding = encoding
+
+  count_dict, stats_dict, num_lines, num_skipped = \
+            count_file_values(file_name_list, key_column_list, value_column,
+                              encoding, has_header_line, workers, chunk_size,
+                              min_count, file_format == 'tree')
+
+  if (file_format == 'freq'):
+    write_freq_file(out_file_name, count_dict, out_encoding)
+  elif (file_format == 'cate-cate'):
+    write_cate_cate_file(out_file_name, count_dict, out_encoding)
+  elif (file_format == 'chain'):
+    if (False not in [isinstance(column, basestring) for column in \
+                      key_column_list]):
+      header_list = key_column_list
+    else:
+      header_list = None
+    write_chain_file(out_file_name, count_dict, out_encoding, header_list)
+  elif (file_format == 'cate-cont'):
+    write_cate_cont_file(out_file_name, count_dict, stats_dict, out_encoding)
+  elif (file_format == 'tree'):
+    write_tree_file(out_file_name, count_dict, key_column_list, out_encoding)
+  else:
+    write_cate_cate_cont_file(out_file_name, count_dict, stats_dict,
+                              out_encoding)
+
+  return num_lines, num_skipped
+
+# -----------------------------------------------------------------------------
+
+def main(argv):
+  """Build a look-up file from the command line arguments.
+  """
+
+  parser = optparse.OptionParser(usage='%prog [options] CSV_FILE ...')
+  parser.add_option('-f', '--format', dest='file_format', default='freq',
+                    help='look-up file format, one of: %s' % \
+                         (', '.join(FILE_FORMAT_LIST)))
+  parser.add_option('-c', '--columns', dest='columns',
+                    help='comma separated names or numbers of the key columns')
+  parser.add_option('-v', '--value-column', dest='value_column',
+                    help='name or number of the continuous value column')
+  parser.add_option('-o', '--output', dest='out_file_name',
+                    help='name of the look-up file to write')
+  parser.add_option('-e', '--encoding', dest='encoding', default='ascii',
+                    help='encoding of the CSV files (default: ascii)')
+  parser.add_option('-n', '--no-header', dest='has_header_line',
+                    action='store_false', default=True,
+                    help='the CSV files have no header line')
+  parser.add_option('-w', '--workers', dest='workers', type='int', default=1,
+                    help='number of worker processes (default: 1)')
+  parser.add_option('-s', '--chunk-size', dest='chunk_size', type='int',
+                    default=DEFAULT_CHUNK_SIZE/(1024*1024),
+                    help='chunk size in megabytes (default: %d)' % \
+                         (DEFAULT_CHUNK_SIZE/(1024*1024)))
+  parser.add_option('-m', '--min-count', dest='min_count', type='int',
+                    default=1, help='minimum count of values written')
+
+  options, file_name_list = parser.parse_args(argv)
+
+  if (file_name_list == []) or (options.columns == None) or \
+     (options.out_file_name == None):
+    parser.error('CSV files, key columns and output file must be given')
+
+  def get_column(column_str):
+    column_str = column_str.strip()
+    if (column_str.isdigit()):
+      return int(column_str)
+    return column_str.decode(options.encoding)
+
+  key_column_list = [get_column(column_str) for column_str in \
+                     options.columns.split(',')]
+
+  if (options.value_column != None):
+    value_column = get_column(options.value_column)
+  else:
+    value_column = None
+
+  num_lines, num_skipped = build_lookup_file(options.out_file_name,
+                                             options.file_format,
+                                             file_name_list, key_column_list,
+                                             value_column, options.encoding,
+                                             options.has_header_line,
+                                             options.workers,
+                                             options.chunk_size*1024*1024,
+                                             options.min_count)
+
+  print 'Counted %d records (%d skipped), wrote look-up file "%s"' % \
+        (num_lines, num_skipped, options.out_file_name)
+
+# -----------------------------------------------------------------------------
+
+if (__name__ == '__main__'):
+  main(sys.argv[1:])
+
+# =============================================================================
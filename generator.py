@@ -18,9 +18,394 @@
 # -----------------------------------------------------------------------------
 # Import necessary modules
 
+import codecs
+import copy
+import itertools
+import multiprocessing
+import os
 import random
 
+try:
+  import numpy  # Optional, used to generate many values at once
+except ImportError:
+  numpy = None
+
 import basefunctions
+import contdepfunct
+import lookupcache
+import progress
+import sampler
+import uniquefilter
+
+# =============================================================================
+# Helper functions to generate many continuous values at once
+# =============================================================================
+
+# Truncated normal samplers shared by all compound attributes, with keys being
+# tuples (mu, sigma, min_val, max_val)
+#
+truncated_normal_dict = {}
+
+def get_truncated_normal(mu, sigma, min_val, max_val):
+  """Return the sampler.TruncatedNormal object for the given parameters,
+     creating it the first time it is needed.
+  """
+
+  funct_key = (mu, sigma, min_val, max_val)
+
+  if (funct_key not in truncated_normal_dict):
+    truncated_normal_dict[funct_key] = sampler.TruncatedNormal(mu, sigma,
+                                                               min_val, max_val)
+  return truncated_normal_dict[funct_key]
+
+# -----------------------------------------------------------------------------
+
+def generate_cont_values_batch(funct_name, funct_param_list, n):
+  """Generate n continuous values using the function with the given name and
+     its parameters, as used in the compound attributes:
+
+     - uniform:  [min_val, max_val]
+     - normal:   [mu, sigma, min_val, max_val]
+                 (min_val and max_val can be set to None in which case no
+                 minimum or maximum is enforced)
+
+     The values are returned as a NumPy floating-point array if NumPy is
+     available, otherwise as a list.
+  """
+
+  if (funct_name == 'uniform'):
+    min_val, max_val = funct_param_list[0], funct_param_list[1]
+
+    if (numpy != None):
+      return numpy.random.uniform(min_val, max_val, n)
+    return [random.uniform(min_val, max_val) for i in range(n)]
+
+  elif (funct_name == 'normal'):
+    mu, sigma, min_val, max_val = funct_param_list[:4]
+
+    return get_truncated_normal(mu, sigma, min_val, max_val).draw_many(n)
+
+  else:
+    raise Exception( ('Illegal continuous function given:', funct_name))
+
+# -----------------------------------------------------------------------------
+
+def float_to_str_batch(val_seq, format_str):
+  """Convert the given list or NumPy array of numbers into a list of strings
+     according to the given format string (see basefunctions.float_to_str()).
+
+     The format string is resolved once for all values. NumPy arrays of
+     non-negative numbers converted to 'int' strings are rounded and converted
+     as integer numbers, which gives the same strings faster.
+  """
+
+  formatter = basefunctions.get_float_formatter(format_str)
+
+  if (numpy != None) and isinstance(val_seq, numpy.ndarray):
+    if ((format_str == 'int') and (len(val_seq) > 0) and
+        (not numpy.signbit(val_seq).any()) and (val_seq.max() < 2**53)):
+      return map(str, numpy.rint(val_seq).astype(numpy.int64).tolist())
+
+    val_seq = val_seq.tolist()
+
+  return map(formatter, val_seq)
+
+# -----------------------------------------------------------------------------
+
+def group_by_code(code_array, num_codes):
+  """Group the positions in the given NumPy array of integer codes (between 0
+     and num_codes-1) by their code, sorting the array only once, and return a
+     list of pairs (code, NumPy array of positions) for all codes that occur.
+  """
+
+  rec_order =        numpy.argsort(code_array, kind='mergesort')
+  code_count_array = numpy.bincount(code_array, minlength=num_codes)
+  group_end_array =  numpy.cumsum(code_count_array)
+
+  group_list = []
+
+  for code in numpy.flatnonzero(code_count_array).tolist():
+    end_i =   int(group_end_array[code])
+    start_i = end_i - int(code_count_array[code])
+    group_list.append((code, rec_order[start_i:end_i]))
+
+  return group_list
+
+# =============================================================================
+# Helper functions to load frequency and distribution files
+# =============================================================================
+
+def read_freq_file(freq_file_name, unicode_encoding, has_header_line):
+  """Load a frequency file, where each line contains an attribute value and
+     its count, and return a list of pairs (value, count) in file order.
+
+     The values and counts are validated (values must not be empty or occur
+     twice, counts must be positive integer numbers). The validated list is
+     stored in the look-up table cache (see lookupcache.py), so an unchanged
+     file is only parsed and validated once.
+  """
+
+  def build_val_count_list(header_list, freq_file_data):
+    val_dict = {}   # The attribute values to be loaded from file and their
+                    # counts or frequencies
+    val_count_list = []  # The same values and counts, in file order
+
+    # Process values from file and their frequencies
+    #
+    for rec_list in freq_file_data:
+      if (len(rec_list) != 2):
+        raise Exception( 'Illegal format in frequency file %s: %s' % \
+                         (freq_file_name, str(rec_list)))
+      line_val =  rec_list[0].strip()
+      try:
+        line_count = int(rec_list[1])
+      except:
+        raise Exception( 'Value count given is not an integer number: %s' % \
+                         (rec_list[1]))
+
+      if (line_val == ''):
+        raise Exception( 'Empty attribute value in frequency file %s' % \
+                         (freq_file_name))
+      basefunctions.check_is_positive('line_count', line_count)
+
+      if (line_val in val_dict):
+        raise Exception( 'Attribute values "%s" occurs twice in ' % \
+                         (line_val) + 'frequency file %s' % \
+                         (freq_file_name))
+
+      val_dict[line_val] = line_count
+      val_count_list.append((line_val, line_count))
+
+    if (val_count_list == []):
+      raise Exception( 'No attribute values in frequency file %s' % \
+                       (freq_file_name))
+
+    return val_count_list
+
+  return lookupcache.load_table(freq_file_name, unicode_encoding,
+                                has_header_line, 'freq',
+                                build_val_count_list)
+
+# -----------------------------------------------------------------------------
+
+def read_empirical_file(lookup_file_name, unicode_encoding, has_header_line,
+                        table_type):
+  """Load a histogram or quantile file that describes the distribution of a
+     continuous attribute, and return a list of pairs (value, cumulative
+     probability) as used by sampler.EmpiricalDistribution.
+
+     For a table type 'histogram' each line contains the minimum and maximum
+     value of a bin and its count (a non-negative number), with bins sorted by
+     their values and not overlapping. For a table type 'quantile' each line
+     contains a cumulative probability and its value, sorted by probability
+     and starting with probability 0.0 and ending with 1.0.
+
+     The point list is stored in the look-up table cache (see lookupcache.py),
+     so an unchanged file is only parsed and validated once.
+  """
+
+  if (table_type not in ['histogram', 'quantile']):
+    raise Exception( 'Illegal table type given: "%s"' % (str(table_type)))
+
+  def build_point_list(header_list, lookup_file_data):
+    point_list = []
+
+    if (table_type == 'histogram'):
+      cumu_count = 0.0
+      for rec_list in lookup_file_data:
+        if (len(rec_list) != 3):
+          raise Exception( 'Illegal format in histogram file %s: %s' % \
+                           (lookup_file_name, str(rec_list)))
+        try:
+          bin_min_val = float(rec_list[0])
+          bin_max_val = float(rec_list[1])
+          bin_count =   float(rec_list[2])
+        except:
+          raise Exception( 'Bin values and count given are not numbers: %s' \
+                           % (str(rec_list)))
+        basefunctions.check_is_not_negative('bin_count', bin_count)
+
+        if (bin_min_val >= bin_max_val):
+          raise Exception( 'Bin minimum is not smaller than its maximum ' + \
+                           'in histogram file %s: %s' % \
+                           (lookup_file_name, str(rec_list)))
+        if (point_list != []) and (bin_min_val < point_list[-1][0]):
+          raise Exception( 'Bins are not sorted or overlap in histogram ' + \
+                           'file %s: %s' % (lookup_file_name, str(rec_list)))
+
+        if (point_list == []) or (bin_min_val > point_list[-1][0]):
+          point_list.append((bin_min_val, cumu_count))  # Start or after a gap
+        cumu_count += bin_count
+        point_list.append((bin_max_val, cumu_count))
+
+      if (cumu_count <= 0.0):
+        raise Exception( 'No counts in histogram file %s' % \
+                         (lookup_file_name))
+
+      point_list = [(val, val_count/cumu_count) for (val, val_count) in \
+                    point_list]
+
+    else:  # Quantile file
+      for rec_list in lookup_file_data:
+        if (len(rec_list) != 2):
+          raise Exception( 'Illegal format in quantile file %s: %s' % \
+                           (lookup_file_name, str(rec_list)))
+        try:
+          point_list.append((float(rec_list[1]), float(rec_list[0])))
+        except:
+          raise Exception( 'Probability and value given are not numbers: ' + \
+                           '%s' % (str(rec_list)))
+
+    sampler.EmpiricalDistribution(point_list)  # Check the points
+
+    return point_list
+
+  return lookupcache.load_table(lookup_file_name, unicode_encoding,
+                                has_header_line, table_type, build_point_list)
+
+# =============================================================================
+# Helper functions to generate records in shards, possibly in parallel
+# =============================================================================
+
+# The data given to a worker process when it is started, so it does not need
+# to be sent again with every shard
+#
+worker_shard_data = None
+
+def get_random_state():
+  """Return the state of the random number generators of the 'random' module
+     and (if available) of NumPy, as a pair.
+  """
+
+  if (numpy != None):
+    return (random.getstate(), numpy.random.get_state())
+  return (random.getstate(), None)
+
+# -----------------------------------------------------------------------------
+
+def set_random_state(random_state):
+  """Set the state of the random number generators to the given pair of
+     states, as returned by get_random_state().
+  """
+
+  random.setstate(random_state[0])
+  if (numpy != None):
+    numpy.random.set_state(random_state[1])
+
+# -----------------------------------------------------------------------------
+
+def seed_random_state(seed):
+  """Seed the random number generators of the 'random' module and (if
+     available) of NumPy with the given seed.
+  """
+
+  random.seed(seed)
+  if (numpy != None):
+    numpy.random.seed(seed)
+
+# -----------------------------------------------------------------------------
+
+def init_shard_worker(shard_data):
+  """Initialise a worker process of a process pool with the data that is
+     needed to generate shards.
+  """
+
+  global worker_shard_data
+
+  worker_shard_data = shard_data
+
+# -----------------------------------------------------------------------------
+
+def run_shard(shard_funct, shard_data, start_num, num_items, shard_seed):
+  """Seed the random number generators with the given seed and then call
+     the given shard function with arguments (shard_data, start_num,
+     num_items), and return its result.
+  """
+
+  random.seed(shard_seed)
+  if (numpy != None):
+    numpy.random.seed(shard_seed)
+
+  return shard_funct(shard_data, start_num, num_items)
+
+# -----------------------------------------------------------------------------
+
+def run_shard_in_worker(shard_args):
+  """Run one shard in a worker process, using the data the worker process
+     was initialised with.
+  """
+
+  shard_funct, start_num, num_items, shard_seed = shard_args
+
+  return run_shard(shard_funct, worker_shard_data, start_num, num_items,
+                   shard_seed)
+
+# -----------------------------------------------------------------------------
+
+def generate_sharded(shard_funct, shard_data, num_items, workers, seed,
+                     shard_size=10000):
+  """Split the range of 'num_items' items (such as records) into shards of
+     'shard_size' items each, and for each shard call the given function as
+     shard_funct(shard_data, start_num, num_items_in_shard), with the random
+     number generators seeded with a seed derived from the master seed and the
+     shard number. The shard results are yielded in the order of the shards.
+
+     If 'workers' is larger than 1 the shards are run in a pool of this many
+     worker processes, otherwise they are run in this process. Because the
+     shards and their seeds do not depend on the number of workers, the
+     results are the same for any number of workers. The shard function must
+     be defined at the top level of a module, and the shard data must be
+     picklable, so they can be sent to the worker processes.
+
+     When the shards are run in this process, the state of the random number
+     generators is restored after each shard.
+  """
+
+  basefunctions.check_is_function_or_method('shard_funct', shard_funct)
+  basefunctions.check_is_integer('num_items', num_items)
+  basefunctions.check_is_not_negative('num_items', num_items)
+  basefunctions.check_is_integer('workers', workers)
+  basefunctions.check_is_positive('workers', workers)
+  basefunctions.check_is_integer('shard_size', shard_size)
+  basefunctions.check_is_positive('shard_size', shard_size)
+
+  shard_args_list = []
+  for start_num in range(0, num_items, shard_size):
+    shard_args_list.append((shard_funct, start_num,
+                            min(shard_size, num_items-start_num),
+                            sampler.derive_seed(seed, len(shard_args_list))))
+
+  if (workers == 1):
+    for (shard_funct, start_num, num_shard_items, shard_seed) in \
+        shard_args_list:
+      random_state = get_random_state()
+      try:
+        shard_res = run_shard(shard_funct, shard_data, start_num,
+                              num_shard_items, shard_seed)
+      finally:
+        set_random_state(random_state)
+
+      yield shard_res
+
+  else:
+    pool = multiprocessing.Pool(workers, init_shard_worker, (shard_data,))
+    try:
+      for shard_res in pool.imap(run_shard_in_worker, shard_args_list):
+        yield shard_res
+      pool.close()
+    finally:
+      pool.terminate()
+      pool.join()
+
+# -----------------------------------------------------------------------------
+
+def generate_data_set_shard(data_set, start_rec_id, num_recs):
+  """Shard function (see generate_sharded()) which generates 'num_recs'
+     records with the given GenerateDataSet object, and returns them as a list
+     of lists of attribute values.
+  """
+
+  return data_set.generate_record_list(start_rec_id, num_recs)
 
 # =============================================================================
 # Classes for generating a single attribute (field) of the data set
@@ -90,6 +475,57 @@ class GenerateAttribute:
 
     raise Exception( 'Override abstract method in derived class')
 
+  # ---------------------------------------------------------------------------
+
+  def get_attribute_name_list(self):
+    """Method which returns a list with the name of this attribute.
+    """
+
+    return [self.attribute_name]
+
+  # ---------------------------------------------------------------------------
+
+  def create_attribute_values_batch(self, n):
+    """Method which creates and returns n attribute values, either as a list
+       or, in derived classes that can use NumPy, as a NumPy array.
+
+       This default implementation calls create_attribute_value() n times.
+    """
+
+    basefunctions.check_is_integer('n', n)
+    basefunctions.check_is_not_negative('n', n)
+
+    create_attribute_value = self.create_attribute_value  # Short-hand
+
+    return [create_attribute_value() for i in range(n)]
+
+  # ---------------------------------------------------------------------------
+
+  def get_stratum_list(self, num_strata_attr):
+    """Method which returns a list of pairs (stratum values, weight), one for
+       each stratum of records formed by the values of the first
+       'num_strata_attr' attributes generated by this object, with the stratum
+       values being a tuple and the weight proportional to the probability of
+       the stratum.
+
+       This default implementation raises an exception, as only attributes
+       with look-up tables can be used to stratify records.
+    """
+
+    raise Exception( 'Attribute "%s" cannot be used to stratify records' % \
+                     (self.attribute_name))
+
+  # ---------------------------------------------------------------------------
+
+  def create_attribute_values_for_stratum(self, stratum_val_tuple, n):
+    """Method which creates n attribute values for records in the stratum
+       with the given values (see get_stratum_list()). See implementations in
+       derived classes for details.
+    """
+
+    raise Exception( 'Attribute "%s" cannot be used to stratify records' % \
+                     (self.attribute_name))
+
 # =============================================================================
 
 class GenerateFreqAttribute(GenerateAttribute):
@@ -114,6 +550,22 @@ class GenerateFreqAttribute(GenerateAttribute):
                        line or not.
 
      unicode_encoding  The Unicode encoding (a string name) of the file.
+
+     The following argument is optional:
+
+     without_replacement  A flag, set to True or False, if each value drawn
+                          decreases its count by one, so a value is drawn at
+                          most as many times as its count in the frequency
+                          file. Default is False.
+
+     Values are drawn from an alias table built over the distinct values in
+     the frequency file, so memory use and construction time do not depend on
+     the size of the counts.
+
+     If values are drawn without replacement, or counts are changed with
+     set_value_count(), values are instead drawn from a Fenwick table (see
+     sampler.FenwickTable) private to this attribute, where each draw and
+     each change of a count takes time logarithmic in the number of values.
   """
 
   # ---------------------------------------------------------------------------
@@ -127,7 +579,9 @@ class GenerateFreqAttribute(GenerateAttribute):
     self.freq_file_name =   None
     self.has_header_line =  None
     self.unicode_encoding = None
-    self.attr_value_list =  []  # The list of attribute values to be loaded
+    self.attr_alias_table = None  # Alias table over the loaded values
+    self.without_replacement = False
+    self.attr_fenwick_table =  None  # Fenwick table if counts change
 
     # Process all keyword arguments
     #
@@ -147,6 +601,10 @@ class GenerateFreqAttribute(GenerateAttribute):
         basefunctions.check_is_non_empty_string('unicode_encoding', value)
         self.unicode_encoding = value
 
+      elif (keyword.startswith('without')):
+        basefunctions.check_is_flag('without_replacement', value)
+        self.without_replacement = value
+
       else:
         base_kwargs[keyword] = value
 
@@ -160,74 +618,123 @@ class GenerateFreqAttribute(GenerateAttribute):
     basefunctions.check_is_non_empty_string('unicode_encoding',
                                             self.unicode_encoding)
 
-    # Load the frequency file - - - - - - - - - - - - - - - - - - - - - - - -
+    # Load the frequency file (or its validated values from the cache) and
+    # build an alias table over the distinct values instead of a list with
+    # each value repeated according to its count. The alias table is shared
+    # with all other attributes that use the same frequency file.
     #
-    header_list, freq_file_data = \
-                     basefunctions.read_csv_file(self.freq_file_name,
-                                                 self.unicode_encoding,
-                                                 self.has_header_line)
+    def build_alias_table():
+      return sampler.AliasTable(read_freq_file(self.freq_file_name,
+                                               self.unicode_encoding,
+                                               self.has_header_line))
+
+    self.attr_alias_table = \
+           lookupcache.get_shared_table(self.freq_file_name,
+                                        self.unicode_encoding,
+                                        self.has_header_line, 'alias',
+                                        build_alias_table)
+
+    if (self.without_replacement == True):
+      self.attr_fenwick_table = \
+            sampler.FenwickTable(zip(self.attr_alias_table.value_list,
+                                     self.attr_alias_table.count_list))
 
-    val_dict = {}   # The attribute values to be loaded from file and their
-                    # counts or frequencies
+  # ---------------------------------------------------------------------------
 
-    # Process values from file and their frequencies
-    #
-    for rec_list in freq_file_data:
-      if (len(rec_list) != 2):
-        raise Exception( 'Illegal format in frequency file %s: %s' % \
-                         (self.freq_file_name, line))
-      line_val =  rec_list[0].strip()
-      try:
-        line_count = int(rec_list[1])
-      except:
-        raise Exception( 'Value count given is not an integer number: %s' % \
-                         (rec_list[1]))
+  def set_value_count(self, attr_val, val_count):
+    """Method which sets the count of the given attribute value (which is
+       added if it is not in the frequency file), so later values are drawn
+       according to the changed counts.
 
-      if (line_val == ''):
-        raise Exception( 'Empty attribute value in frequency file %s' % \
-                         (self.freq_file_name))
-      basefunctions.check_is_positive('line_count', line_count)
+       The first change copies the counts into a Fenwick table private to this
+       attribute, later changes only update this table.
+    """
 
-      if (line_val in val_dict):
-        raise Exception( 'Attribute values "%s" occurs twice in ' % \
-                         (line_val) + 'frequency file %s' % \
-                         (self.freq_file_name))
+    basefunctions.check_is_string_or_unicode_string('attr_val', attr_val)
+    if (attr_val.strip() == ''):
+      raise Exception( 'Empty attribute value given')
 
-      val_dict[line_val] = line_count
+    if (self.attr_fenwick_table == None):
+      self.attr_fenwick_table = \
+            sampler.FenwickTable(zip(self.attr_alias_table.value_list,
+                                     self.attr_alias_table.count_list))
 
-    val_list = []  # The list of attribute values, with values repeated
-                   # according to their frequencies
+    self.attr_fenwick_table.set_count(attr_val, val_count)
 
-    # Generate a list of values according to their counts
-    #
-    for (attr_val, val_count) in val_dict.iteritems():
+  # ---------------------------------------------------------------------------
 
-      # Append value as many times as given in their counts
-      #
-      new_list = [attr_val]*val_count
-      val_list += new_list
+  def create_attribute_value(self):
+    """Method which creates and returns one attribute value randomly selected
+       from the attribute value lookup table.
+    """
 
-    #random.shuffle(val_list)  # Randomly shuffle the list of values
+    assert self.attr_alias_table != None
 
-    self.attr_value_list = val_list
+    if (self.attr_fenwick_table != None):
+      if (self.without_replacement == True):
+        return self.attr_fenwick_table.draw_without_replacement()
+      return self.attr_fenwick_table.draw()
+
+    return self.attr_alias_table.draw()
 
   # ---------------------------------------------------------------------------
 
-  def create_attribute_value(self):
-    """Method which creates and returns one attribute value randomly selected
-       from the attribute value lookup table.
+  def create_attribute_values_batch(self, n):
+    """Method which creates and returns n attribute values randomly selected
+       from the attribute value lookup table, as a NumPy array if NumPy is
+       available (and values are drawn with replacement), otherwise as a
+       list.
+    """
+
+    assert self.attr_alias_table != None
+
+    if (self.attr_fenwick_table != None):
+      if (self.without_replacement == True):
+        return self.attr_fenwick_table.draw_many_without_replacement(n)
+      return self.attr_fenwick_table.draw_many(n)
+
+    return self.attr_alias_table.draw_many(n)
+
+  # ---------------------------------------------------------------------------
+
+  def get_stratum_list(self, num_strata_attr):
+    """Method which returns a list of pairs (stratum values, weight) with one
+       stratum for each value in the frequency file (with a positive count),
+       and its count as weight.
+    """
+
+    assert num_strata_attr == 1
+
+    if (self.attr_fenwick_table != None):
+      return [((attr_val,), val_count) for (attr_val, val_count) in \
+              zip(self.attr_fenwick_table.value_list,
+                  self.attr_fenwick_table.count_list) if val_count > 0]
+
+    return [((attr_val,), val_count) for (attr_val, val_count) in \
+            zip(self.attr_alias_table.value_list,
+                self.attr_alias_table.count_list)]
+
+  # ---------------------------------------------------------------------------
+
+  def create_attribute_values_for_stratum(self, stratum_val_tuple, n):
+    """Method which returns a list with n times the value of the given
+       stratum. If values are drawn without replacement, the count of the
+       value is decreased by n.
     """
 
-    assert self.attr_value_list != []
+    if (self.without_replacement == True):
+      self.attr_fenwick_table.add_count(stratum_val_tuple[0], -n)
 
-    return random.choice(self.attr_value_list)
+    return [stratum_val_tuple[0]]*n
 
 # =============================================================================
 
 class GenerateFreqAlt(GenerateAttribute):
   """This is a revision to the GenerateFreqAttribute class.
   The original class implementation has uncessary steps.
-  This will use the cumulative distribution to resolve some issues.
+  This will use the cumulative distribution to resolve some issues: values are
+  drawn by binary search over integer cumulative counts that are computed once
+  when the frequency file is loaded.
 
   Generate an attribute where values are retrieved from a lookup table that
      contains categorical attribute values and their frequencies.
@@ -250,6 +757,18 @@ class GenerateFreqAlt(GenerateAttribute):
                        line or not.
 
      unicode_encoding  The Unicode encoding (a string name) of the file.
+
+     The following argument is optional:
+
+     without_replacement  A flag, set to True or False, if each value drawn
+                          decreases its count by one, so a value is drawn at
+                          most as many times as its count in the frequency
+                          file. Default is False.
+
+     If values are drawn without replacement, or counts are changed with
+     set_value_count(), values are drawn from a Fenwick table (see
+     sampler.FenwickTable) private to this attribute instead of the
+     cumulative counts.
   """
 
   # ---------------------------------------------------------------------------
@@ -265,7 +784,10 @@ class GenerateFreqAlt(GenerateAttribute):
     self.unicode_encoding = None
     self.attr_value_list =  []  # The list of attribute values to be loaded
     self.attr_probability_list = []
+    self.attr_cumulative_table = None  # Cumulative counts to draw values
     self.total_items = 0
+    self.without_replacement = False
+    self.attr_fenwick_table =  None  # Fenwick table if counts change
 
     # Process all keyword arguments
     #
@@ -285,6 +807,10 @@ class GenerateFreqAlt(GenerateAttribute):
         basefunctions.check_is_non_empty_string('unicode_encoding', value)
         self.unicode_encoding = value
 
+      elif (keyword.startswith('without')):
+        basefunctions.check_is_flag('without_replacement', value)
+        self.without_replacement = value
+
       else:
         base_kwargs[keyword] = value
 
@@ -298,100 +824,136 @@ class GenerateFreqAlt(GenerateAttribute):
     basefunctions.check_is_non_empty_string('unicode_encoding',
                                             self.unicode_encoding)
 
-    # Load the frequency file - - - - - - - - - - - - - - - - - - - - - - - -
+    # Load the frequency file (or its validated values from the cache), and
+    # build the integer cumulative counts used to draw values and the list of
+    # probabilities. These are shared with all other attributes that use the
+    # same frequency file.
     #
-    header_list, freq_file_data = \
-                     basefunctions.read_csv_file(self.freq_file_name,
-                                                 self.unicode_encoding,
-                                                 self.has_header_line)
+    def build_cumulative_tables():
+      val_count_list = read_freq_file(self.freq_file_name,
+                                      self.unicode_encoding,
+                                      self.has_header_line)
 
-    val_dict = {}   # The attribute values to be loaded from file and their
-                    # counts or frequencies
+      cumulative_table = sampler.CumulativeTable(val_count_list)
 
-    # Process values from file and their frequencies
-    #
-    
-    for rec_list in freq_file_data:
-      if (len(rec_list) != 2):
-        raise Exception( 'Illegal format in frequency file %s: %s' % \
-                         (self.freq_file_name, line))
-      line_val =  rec_list[0].strip()
-      try:
-        line_count = int(rec_list[1])
-      except:
-        raise Exception( 'Value count given is not an integer number: %s' % \
-                         (rec_list[1]))
+      total_items = float(cumulative_table.total_count)
+      probability_list = [(attr_val, val_count/total_items) \
+                          for (attr_val, val_count) in val_count_list]
 
-      if (line_val == ''):
-        raise Exception( 'Empty attribute value in frequency file %s' % \
-                         (self.freq_file_name))
-      basefunctions.check_is_positive('line_count', line_count)
+      return cumulative_table, probability_list, \
+             tuple(cumulative_table.value_list)
 
-      if (line_val in val_dict):
-        raise Exception( 'Attribute values "%s" occurs twice in ' % \
-                         (line_val) + 'frequency file %s' % \
-                         (self.freq_file_name))
+    self.attr_cumulative_table, self.attr_probability_list, \
+      self.attr_value_list = \
+           lookupcache.get_shared_table(self.freq_file_name,
+                                        self.unicode_encoding,
+                                        self.has_header_line, 'cumulative',
+                                        build_cumulative_tables)
 
-      val_dict[line_val] = line_count
-      self.total_items += line_count
-
-    #Generate list of probabilities from file
-    freq_list = list()
-    for (attr_val, val_count) in val_dict.iteritems():
-      if val_count >= 1:
-          freq_list.append((attr_val,float(val_count)/float(self.total_items)))
-    #freq_list.sort(key=lambda x: x[1])
-    self.attr_probability_list = freq_list
-
-    
-    val_list = tuple(attr_val for (attr_val, val_count) in val_dict.iteritems())  # The list of attribute values, with values repeated
-                   # according to their frequencies
-
-    #Generate a list of values according to their counts
-    
-    #for (attr_val, val_count) in val_dict.iteritems():
-    #  if val_count > 10000:
-
-        # Append value as many times as given in their counts
-        #
-        #new_list = [attr_val]*int((val_count/10000))
+    self.total_items = self.attr_cumulative_table.total_count
+
+    if (self.without_replacement == True):
+      self.attr_fenwick_table = \
+            sampler.FenwickTable(zip(self.attr_cumulative_table.value_list,
+                                     self.get_count_list()))
+
+  # ---------------------------------------------------------------------------
 
-    #    val_list.append((attr_val, val_count))
+  def get_count_list(self):
+    """Method which returns the list of counts of the attribute values, in
+       the sequence of the frequency file.
+    """
+
+    cumu_list = self.attr_cumulative_table.cumu_list
+
+    return [cumu_list[0]] + [cumu_list[i] - cumu_list[i-1] for i in \
+                             range(1, len(cumu_list))]
+
+  # ---------------------------------------------------------------------------
+
+  def set_value_count(self, attr_val, val_count):
+    """Method which sets the count of the given attribute value (which is
+       added if it is not in the frequency file), so later values are picked
+       according to the changed counts.
+
+       The first change copies the counts into a Fenwick table private to this
+       attribute, later changes only update this table. The list of
+       probabilities is not changed.
+    """
 
-    #random.shuffle(val_list)  # Randomly shuffle the list of values
+    basefunctions.check_is_string_or_unicode_string('attr_val', attr_val)
+    if (attr_val.strip() == ''):
+      raise Exception( 'Empty attribute value given')
 
-    self.attr_value_list = val_list
+    if (self.attr_fenwick_table == None):
+      self.attr_fenwick_table = \
+            sampler.FenwickTable(zip(self.attr_cumulative_table.value_list,
+                                     self.get_count_list()))
+
+    self.attr_fenwick_table.set_count(attr_val, val_count)
 
   # ---------------------------------------------------------------------------
 
   def create_attribute_value(self):
     """Method which creates and returns one attribute value randomly selected
-       from the attribute value lookup table.
+       from the attribute value lookup table according to the value
+       frequencies.
     """
 
-    assert self.attr_value_list != []
+    assert self.attr_cumulative_table != None
 
-    return random.choice(self.attr_value_list)
+    return self.random_pick()
 
+  # ---------------------------------------------------------------------------
 
   def random_pick(self):
-    '''Python Cookbook, 4.21. Randomly Picking Items with Given Probabilities
-    
-    '''
-    x = random.random()
-    cumulative_probability = 0.0
-    for item, item_probability in self.attr_probability_list:
-      cumulative_probability += item_probability
-      if x < cumulative_probability: break
-    return item
+    """Method which randomly picks and returns one attribute value according
+       to the value frequencies.
 
+       A binary search over the integer cumulative counts (or a descent of
+       the Fenwick tree, if counts change) is used, so a pick takes time
+       logarithmic in the number of values.
+    """
 
+    if (self.attr_fenwick_table != None):
+      if (self.without_replacement == True):
+        return self.attr_fenwick_table.draw_without_replacement()
+      return self.attr_fenwick_table.draw()
 
-# =============================================================================
+    return self.attr_cumulative_table.draw()
 
-class GenerateFuncAttribute(GenerateAttribute):
-  """Generate an attribute where values are retrieved from a function that
-     creates values according to some specification.
+  # ---------------------------------------------------------------------------
+
+  def random_pick_many(self, n):
+    """Method which randomly picks n attribute values according to the value
+       frequencies, and returns them in a list.
+    """
+
+    if (self.attr_fenwick_table != None):
+      if (self.without_replacement == True):
+        return self.attr_fenwick_table.draw_many_without_replacement(n)
+      return self.attr_fenwick_table.draw_many(n)
+
+    return self.attr_cumulative_table.draw_many(n)
+
+  # ---------------------------------------------------------------------------
+
+  def create_attribute_values_batch(self, n):
+    """Method which creates and returns n attribute values randomly selected
+       from the attribute value lookup table according to the value
+       frequencies, as a NumPy array if NumPy is available (and values are
+       drawn with replacement), otherwise as a list.
+    """
+
+    assert self.attr_cumulative_table != None
+
+    return self.random_pick_many(n)
+
+# =============================================================================
+
+class GenerateFuncAttribute(GenerateAttribute):
+  """Generate an attribute where values are retrieved from a function that
+     creates values according to some specification.
 
      Such functions include creating telephone numbers or social security
      numbers with a certain structure, or numerical values normally or
@@ -492,118 +1054,84 @@ class GenerateFuncAttribute(GenerateAttribute):
                                 self.parameters[4])
     return funct_ret
 
-# =============================================================================
-# Classes for generating compound attributes (fields) of the data set
-# =============================================================================
-
-class GenerateCompoundAttribute:
-  """Base class for the definition of compound attributes (fields) to be
-     generated.
-
-     This class and all of its derived classes provide methods that allow the
-     definition of several (are least two) attributes and the parameters
-     necessary for their generation.
-
-     This base class does not have any generic variables that need to be set.
-  """
-
   # ---------------------------------------------------------------------------
 
-  def __init__(self, base_kwargs):
-    """Constructor. See implementations in derived classes for details.
-    """
+  def create_attribute_values_batch(self, n):
+    """Method which creates and returns a list of n attribute values
+       generated by the function provided.
 
-    raise Exception( 'Override abstract method in derived class')
+       The function is called once for each value, but without the checks on
+       the number of parameters done for each single value.
+    """
 
-  # ---------------------------------------------------------------------------
+    basefunctions.check_is_integer('n', n)
+    basefunctions.check_is_not_negative('n', n)
 
-  def create_attribute_value(self):
-    """Method which creates and returns several (compound) attribute values.
-       See implementations in derived classes for details.
-    """
+    funct = self.function
+    if (self.parameters == None):
+      funct_param_list = []
+    else:
+      funct_param_list = self.parameters
 
-    raise Exception( 'Override abstract method in derived class')
+    return [funct(*funct_param_list) for i in range(n)]
 
 # =============================================================================
 
-class GenerateCateCateCompoundAttribute(GenerateCompoundAttribute):
-  """Generate two attributes, both containing categorical values, where the
-     values of the second attribute depend upon the values in the first
-     attribute.
+class GenerateEmpiricalAttribute(GenerateAttribute):
+  """Generate an attribute with continuous values drawn from an empirical
+     distribution, given in a look-up file either as a histogram or as a
+     table of quantiles. This allows skewed distributions (such as of income,
+     height or weight values) to be generated as fast as uniform values.
 
-     This for example allows the modelling of:
-     - city location values that depend upon gender values, or
-     - medication name values that depend upon gender values.
+     Values are drawn with the inverse cumulative distribution function, which
+     is linear between the points given in the look-up file, so within a
+     histogram bin (or between two quantiles) values are uniformly
+     distributed.
 
-     The arguments that have to be set when this attribute type is initialised
-     are:
+     The additional arguments (besides the base class argument
+     'attribute_name') that have to be set when this attribute type is
+     initialised are:
 
-     categorical1_attribute_name  The name of the first categorical attribute
-                                  that will be generated. This name will be
-                                  used in the header line to be written into
-                                  the output file.
+     lookup_file_name       The name of the file which contains the histogram
+                            or the quantiles (see below).
 
-     categorical2_attribute_name  The name of the second categorical attribute
-                                  that will be generated. This name will be
-                                  used in the header line to be written into
-                                  the output file.
+     table_type             The format of the look-up file, either
+                            'histogram' or 'quantile'.
 
-     lookup_file_name             Name of the file which contains the values of
-                                  the first categorical attribute, and for each
-                                  of these values the names of the categories
-                                  and their counts of the second categorical
-                                  attribute. This file format is further
-                                  explained below.
+     has_header_line        A flag, set to True or False, that has to be set
+                            according to if the look-up file starts with a
+                            header line or not.
 
-     has_header_line              A flag, set to True or False, that has to be
-                                  set according to if the look-up file starts
-                                  with a header line or not.
+     unicode_encoding       The Unicode encoding (a string name) of the file.
 
-     unicode_encoding             The Unicode encoding (a string name) of the
-                                  file.
+     continuous_value_type  The format of how continuous values are returned
+                            when they are generated. Possible values are
+                            'int', so integer values are returned; or
+                            'float1', 'float2', to 'float9', in which case
+                            floating-point values with the specified number
+                            of digits behind the comma are returned.
 
-     The format of the look-up file is:
+     The format of a histogram file is:
 
      # Comment lines start with the # character
-     cate_attr1_val,count,cate_attr2_val1,count1,cate_attr2_val2,count2, \
-     cate_attr2_val3,count3,cate_attr2_val4,count4, ...
-
-     The look-up file is a comma separated values (CSV) file which contains
-     two types of rows:
-     A) The first type of row contains the following columns:
-        1) A categorical value. For all possible values of the first
-           categorical attribute, one row must be specified in this look-up
-           file.
-        2) Count of this categorical value (a positive integer number). This
-           determines the likelihood of how often a certain categorical value
-           will be chosen. This count must be a positive integer number.
-        3) The first categorical value of the second attribute.
-        4) The count (positive integer number) of this first categorical
-           value.
-        5) The second categorical value of the second attribute.
-        6) The count of this second categorical value.
+     bin_min_val,bin_max_val,count
 
-        ...
+     with one line per bin, bins sorted by their values and not overlapping,
+     and counts being non-negative numbers. No values are generated in gaps
+     between bins.
 
-        X) A '\' character, which indicates that the following line (row)
-           contains further categorical values and their counts from the
-           second attribute.
+     The format of a quantile file is:
 
-     B) The second type of row contains the following columns:
-        1) A categorical value of the second attribute.
-        2) The count of this categorical value.
-        3) Another categorical value of the second attribute.
-        4) The count of this categorical value.
+     # Comment lines start with the # character
+     cumulative_probability,value
 
-        ...
+     with lines sorted by probability, the first probability being 0.0 (with
+     the minimum value) and the last 1.0 (with the maximum value).
 
-     Example:
-       male,60,canberra,7, \
-       sydney,30,melbourne,45, \
-       perth,18
-       female,40,canberra,10,sydney,40, \
-       melbourne,20,brisbane,30,hobart,5,\
-       perth,20
+     Example (histogram):
+       0,20000,25
+       20000,50000,40
+       50000,150000,35
   """
 
   # ---------------------------------------------------------------------------
@@ -613,27 +1141,30 @@ class GenerateCateCateCompoundAttribute(GenerateCompoundAttribute):
        class constructor.
     """
 
-    # General attributes for all data set generators
+    self.attribute_type =        'Empirical'
+    self.lookup_file_name =      None
+    self.table_type =            None
+    self.has_header_line =       None
+    self.unicode_encoding =      None
+    self.continuous_value_type = None
+    self.empirical_dist =        None  # Sampler of the loaded distribution
+
+    # Process all keyword arguments
     #
-    self.number_of_atttributes = 2
-    self.attribute_type =        'Compound-Categorical-Categorical'
+    base_kwargs = {}  # Dictionary, will contain unprocessed arguments
 
     for (keyword, value) in kwargs.items():
 
-      if (keyword.startswith('categorical1')):
-        basefunctions.check_is_non_empty_string('categorical1_attribute_name',
-                                                value)
-        self.categorical1_attribute_name = value
-
-      elif (keyword.startswith('categorical2')):
-        basefunctions.check_is_non_empty_string('categorical2_attribute_name',
-                                                value)
-        self.categorical2_attribute_name = value
-
-      elif (keyword.startswith('look')):
+      if (keyword.startswith('look')):
         basefunctions.check_is_non_empty_string('lookup_file_name', value)
         self.lookup_file_name = value
 
+      elif (keyword.startswith('table')):
+        basefunctions.check_is_non_empty_string('table_type', value)
+        if (value not in ['histogram', 'quantile']):
+          raise Exception( 'Illegal table type given: "%s"' % (value))
+        self.table_type = value
+
       elif (keyword.startswith('has')):
         basefunctions.check_is_flag('has_header_line', value)
         self.has_header_line = value
@@ -642,241 +1173,2091 @@ class GenerateCateCateCompoundAttribute(GenerateCompoundAttribute):
         basefunctions.check_is_non_empty_string('unicode_encoding', value)
         self.unicode_encoding = value
 
+      elif (keyword.startswith('continuous')):
+        basefunctions.check_is_non_empty_string('continuous_value_type',
+                                                value)
+        basefunctions.check_is_valid_format_str('continuous_value_type',
+                                                value)
+        self.continuous_value_type = value
+
       else:
-        raise Exception( 'Illegal constructor argument keyword: "%s"' % \
-              (str(keyword)))
+        base_kwargs[keyword] = value
+
+    GenerateAttribute.__init__(self, base_kwargs)  # Process base arguments
 
     # Check if the necessary variables have been set
     #
-    basefunctions.check_is_non_empty_string('categorical1_attribute_name',
-                                            self.categorical1_attribute_name)
-    basefunctions.check_is_non_empty_string('categorical2_attribute_name',
-                                            self.categorical2_attribute_name)
     basefunctions.check_is_non_empty_string('lookup_file_name',
                                             self.lookup_file_name)
+    basefunctions.check_is_non_empty_string('table_type', self.table_type)
     basefunctions.check_is_flag('has_header_line', self.has_header_line)
     basefunctions.check_is_non_empty_string('unicode_encoding',
                                             self.unicode_encoding)
+    basefunctions.check_is_valid_format_str('continuous_value_type',
+                                            self.continuous_value_type)
 
-    if (self.categorical1_attribute_name == self.categorical2_attribute_name):
-      raise Exception( 'Both attribute names are the same')
+    self.continuous_value_formatter = \
+                basefunctions.get_float_formatter(self.continuous_value_type)
 
-    # Load the lookup file - - - - - - - - - - - - - - - - - - - - - - - - - -
+    # Load the look-up file (or its validated points from the cache) and
+    # build the sampler, which is shared with all other attributes that use
+    # the same look-up file.
     #
-    header_list, lookup_file_data = \
-                     basefunctions.read_csv_file(self.lookup_file_name,
-                                                 self.unicode_encoding,
-                                                 self.has_header_line)
+    def build_empirical_dist():
+      return sampler.EmpiricalDistribution(read_empirical_file(
+                                                    self.lookup_file_name,
+                                                    self.unicode_encoding,
+                                                    self.has_header_line,
+                                                    self.table_type))
+
+    self.empirical_dist = \
+           lookupcache.get_shared_table(self.lookup_file_name,
+                                        self.unicode_encoding,
+                                        self.has_header_line, self.table_type,
+                                        build_empirical_dist)
 
-    cate_val1_dict = {}  # The categorical values from attribute 1 to be loaded
-                         # from file and their counts.
+  # ---------------------------------------------------------------------------
 
-    cate_val2_dict = {}  # The categorical values from attribute 1 to be loaded
-                         # as keys and lists of categorical values (according
-                         # to their counts) from attribute 2 as values.
+  def create_attribute_value(self):
+    """Method which creates and returns one attribute value drawn from the
+       empirical distribution.
+    """
 
-    # Process attribute values from file and their details
-    #
-    i = 0  # Line counter in file data
+    assert self.empirical_dist != None
 
-    while i < len(lookup_file_data):
-      rec_list = lookup_file_data[i]
+    return self.continuous_value_formatter(self.empirical_dist.draw())
 
-      # First line must contain categorical value of the first attribute
-      #
-      if (len(rec_list) < 2):  # Need at least two values in each line
-        raise Exception( 'Illegal format in lookup file %s: %s' % \
-                         (self.freq_file_name, str(rec_list)))
-      cate_attr1_val =  rec_list[0].strip()
-      try:
-        cate_attr1_count = int(rec_list[1])
-      except:
-        raise Exception( 'Value count given for attribute 1 is not an ' + \
-                         'integer number: %s' % (rec_list[1]))
+  # ---------------------------------------------------------------------------
 
-      if (cate_attr1_val == ''):
-        raise Exception( 'Empty categorical attribute 1 value in lookup ' + \
-                         'file %s' % (self.lookup_file_name))
-      basefunctions.check_is_positive('cate_attr1_count', cate_attr1_count)
+  def create_attribute_values_batch(self, n):
+    """Method which creates and returns a list of n attribute values drawn
+       from the empirical distribution, all drawn and interpolated at once if
+       NumPy is available.
+    """
 
-      if (cate_attr1_val in cate_val1_dict):
-        raise Exception( 'Attribute 1 value "%s" occurs twice in ' % \
-                         (cate_attr1_val) + 'lookup file %s' % \
-                         (self.lookup_file_name))
+    assert self.empirical_dist != None
 
-      cate_val1_dict[cate_attr1_val] = cate_attr1_count
+    return float_to_str_batch(self.empirical_dist.draw_many(n),
+                              self.continuous_value_type)
 
-      # Process values for second categorical attribute in this line
-      #
-      cate_attr2_data = rec_list[2:]  # All values and counts of attribute 2
+# =============================================================================
 
-      this_cate_val2_dict = {}  # Values in second categorical attribute for
-                                # this categorical value from first attribute
+class GenerateNgramNameAttribute(GenerateAttribute):
+  """Generate an attribute with names (or other words) drawn from a frequency
+     file for its most frequent values, and synthesised with a character
+     n-gram (Markov) model trained on all values of the file otherwise. This
+     allows many more distinct values to be generated than the file contains,
+     while the most frequent values keep their frequencies.
 
-      while (cate_attr2_data != []):
-        if (len(cate_attr2_data) == 1):
-          if (cate_attr2_data[0] != '\\'):
-            raise Exception( 'Line in categorical look-up file has illegal' + \
-                             'format.')
-          # Get the next record from file data with a continuation of the
-          # categorical values from the second attribute
-          #
-          i += 1
-          cate_attr2_data = lookup_file_data[i]
-          if (len(cate_attr2_data) < 2):
-            raise Exception( 'Illegal format in lookup file %s: %s' % \
-                             (self.freq_file_name, str(cate_attr2_data)))
+     The additional arguments (besides the base class argument
+     'attribute_name') that have to be set when this attribute type is
+     initialised are:
 
-        cate_attr2_val =   cate_attr2_data[0]
-        try:
-          cate_attr2_count = int(cate_attr2_data[1])
-        except:
-          raise Exception( 'Value count given for attribute 2 is not an ' + \
-                           'integer number: %s' % (cate_attr2_data[1]))
+     freq_file_name    The name of the file which contains the attribute
+                       values and their frequencies, in the format used by
+                       GenerateFreqAttribute.
 
-        if (cate_attr2_val == ''):
-          raise Exception( 'Empty categorical attribute 2 value in lookup' \
-                           + ' file %s' % (self.lookup_file_name))
-        basefunctions.check_is_positive('cate_attr2_count', cate_attr2_count)
+     has_header_line   A flag, set to True or False, that has to be set
+                       according to if the frequency file starts with a header
+                       line or not.
 
-        if (cate_attr2_val in cate_val2_dict):
-          raise Exception( 'Attribute 2 value "%s" occurs twice in ' % \
-                           (cate_attr2_val) + 'lookup file %s' % \
-                           (self.lookup_file_name))
+     unicode_encoding  The Unicode encoding (a string name) of the file.
 
-        this_cate_val2_dict[cate_attr2_val] = cate_attr2_count
+     The following arguments are optional:
 
-        cate_attr2_data = cate_attr2_data[2:]
+     ngram_length      The number of characters of the n-grams of the model
+                       (at least 2), i.e. each character depends upon the
+                       'ngram_length'-1 characters before it. Default is 3.
 
-      # Generate a list of values according to their counts
-      #
-      cate_attr2_val_list = []
+     head_fraction     The fraction of the total count of the frequency file
+                       (a number between 0 and 1) covered by its most frequent
+                       values (the head). Default is 0.5.
 
-      for (cate_attr2_val, val2_count) in this_cate_val2_dict.iteritems():
+     A value is drawn from the head with the probability of the summed counts
+     of the head values, and then according to the counts of these values, so
+     each head value is generated with the same frequency as in the file.
+     Otherwise a name is synthesised one character after the other by the
+     model (trained on each distinct value of the file once), where names that
+     are head values or longer than the longest value in the file are
+     synthesised again.
 
-        # Append value as many times as given in their counts
-        #
-        new_list = [cate_attr2_val]* val2_count
-        cate_attr2_val_list += new_list
+     The model has one alias table per context of 'ngram_length'-1
+     characters, and with NumPy the tables are packed together (see
+     sampler.ConditionalAliasTable) so that the names of a whole batch are
+     synthesised in parallel, one character position at a time.
+  """
 
-      random.shuffle(cate_attr2_val_list) # Randomly shuffle the list of values
+  # ---------------------------------------------------------------------------
 
-      cate_val2_dict[cate_attr1_val] = cate_attr2_val_list
+  def __init__(self, **kwargs):
+    """Constructor. Process the derived keywords first, then call the base
+       class constructor.
+    """
 
-      # Go to next line in file data
-      #
-      i += 1
+    self.attribute_type =   'Ngram-Name'
+    self.freq_file_name =   None
+    self.has_header_line =  None
+    self.unicode_encoding = None
+    self.ngram_length =     3
+    self.head_fraction =    0.5
 
-    # Generate a list of values according to their counts
+    # Process all keyword arguments
     #
-    cate_attr1_val_list = []
-
-    for (cate_attr1_val, val1_count) in cate_val1_dict.iteritems():
-
-      # Append value as many times as given in their counts
-      #
-      new_list = [cate_attr1_val]* val1_count
-      cate_attr1_val_list += new_list
+    base_kwargs = {}  # Dictionary, will contain unprocessed arguments
 
-    random.shuffle(cate_attr1_val_list)  # Randomly shuffle the list of values
+    for (keyword, value) in kwargs.items():
 
-    self.cate_attr1_val_list = cate_attr1_val_list
-    self.cate_val2_dict =      cate_val2_dict
+      if (keyword.startswith('freq')):
+        basefunctions.check_is_non_empty_string('freq_file_name', value)
+        self.freq_file_name = value
 
-  # ---------------------------------------------------------------------------
+      elif (keyword.startswith('has')):
+        basefunctions.check_is_flag('has_header_line', value)
+        self.has_header_line = value
 
-  def create_attribute_values(self):
-    """Method which creates and returns two categorical attribute values, where
-       the second value depends upon the first value. Both categorical values
-       are randomly selected according to the provided frequency distributions.
-    """
+      elif (keyword.startswith('unicode')):
+        basefunctions.check_is_non_empty_string('unicode_encoding', value)
+        self.unicode_encoding = value
 
-    assert self.cate_attr1_val_list != []
-    assert self.cate_val2_dict != {}
+      elif (keyword.startswith('ngram')):
+        basefunctions.check_is_integer('ngram_length', value)
+        if (value < 2):
+          raise Exception( 'Value of "ngram_length" must be at least 2: %d' % \
+                           (value))
+        self.ngram_length = value
 
-    cate_attr1_val = random.choice(self.cate_attr1_val_list)
+      elif (keyword.startswith('head')):
+        basefunctions.check_is_normalised('head_fraction', value)
+        self.head_fraction = value
 
-    cate_attr2_list = self.cate_val2_dict[cate_attr1_val]
+      else:
+        base_kwargs[keyword] = value
 
-    cate_attr2_val = random.choice(cate_attr2_list)
- 
-    return cate_attr1_val, cate_attr2_val
+    GenerateAttribute.__init__(self, base_kwargs)  # Process base arguments
+
+    # Check if the necessary variables have been set
+    #
+    basefunctions.check_is_non_empty_string('freq_file_name',
+                                            self.freq_file_name)
+    basefunctions.check_is_flag('has_header_line', self.has_header_line)
+    basefunctions.check_is_non_empty_string('unicode_encoding',
+                                            self.unicode_encoding)
+
+    val_count_list = read_freq_file(self.freq_file_name,
+                                    self.unicode_encoding,
+                                    self.has_header_line)
+
+    # The head are the most frequent values whose counts sum up to at least
+    # the head fraction of the total count
+    #
+    total_count = sum([count for (val, count) in val_count_list])
+
+    head_val_count_list = []
+    head_count = 0
+    for (val, count) in sorted(val_count_list, key=lambda item: -item[1]):
+      if (head_count >= self.head_fraction*total_count):
+        break
+      head_val_count_list.append((val, count))
+      head_count += count
+
+    self.head_prob = float(head_count) / total_count
+    self.head_val_set = set([val for (val, count) in head_val_count_list])
+
+    if (head_val_count_list != []):
+      self.head_alias_table = sampler.AliasTable(head_val_count_list)
+    else:
+      self.head_alias_table = None
+
+    # Train the model (or get it from the registry), it is shared with all
+    # other attributes that use the same frequency file and n-gram length
+    #
+    self.char_list, self.trans_char_list, self.trans_context_list, \
+      self.context_table, self.max_name_length = \
+           lookupcache.get_shared_table(self.freq_file_name,
+                                        self.unicode_encoding,
+                                        self.has_header_line,
+                                        'ngram-%d' % (self.ngram_length),
+                                        self.build_ngram_tables)
+
+    # NumPy versions of the tables, only built when values are generated in
+    # bulk
+    #
+    self.char_array =          None
+    self.trans_char_array =    None
+    self.trans_context_array = None
+
+  # ---------------------------------------------------------------------------
+
+  def build_ngram_tables(self):
+    """Method which trains the character n-gram model on the distinct values
+       of the frequency file and returns a tuple made of:
+
+       - The list of characters, identified by their index in this list, with
+         index 0 being the empty string that marks the end of a name.
+       - A list with the character index of each transition (a pair of a
+         context and a character following it).
+       - A list with the index of the context each transition leads to (or -1
+         for transitions that end a name).
+       - A conditional alias table (see sampler.ConditionalAliasTable) with
+         one context per 'ngram_length'-1 characters (context 0 being the
+         start of a name), drawing the index of a transition according to how
+         often the character follows the context.
+       - The length of the longest value.
+    """
+
+    val_count_list = read_freq_file(self.freq_file_name,
+                                    self.unicode_encoding,
+                                    self.has_header_line)
+
+    context_length = self.ngram_length - 1
+
+    char_list =       ['']  # Index 0 marks the end of a name
+    char_index_dict = {}
+
+    start_context = (-1,)*context_length  # Before the first character
+
+    context_dict =       {start_context:0}  # Context indices
+    context_count_list = [{}]  # Per context the counts of the following
+                               # characters
+
+    max_name_length = 0
+
+    for (val, count) in val_count_list:
+      max_name_length = max(max_name_length, len(val))
+
+      char_index_list = []
+      for char in val:
+        if (char not in char_index_dict):
+          char_index_dict[char] = len(char_list)
+          char_list.append(char)
+        char_index_list.append(char_index_dict[char])
+
+      context = start_context
+      for char_index in char_index_list+[0]:
+        context_index = context_dict[context]
+        char_count_dict = context_count_list[context_index]
+        char_count_dict[char_index] = char_count_dict.get(char_index, 0) + 1
+
+        context = context[1:]+(char_index,)
+        if (char_index != 0) and (context not in context_dict):
+          context_dict[context] = len(context_count_list)
+          context_count_list.append({})
+
+    # One transition for each context and following character
+    #
+    index_context_list = [None]*len(context_dict)
+    for (context, context_index) in context_dict.iteritems():
+      index_context_list[context_index] = context
+
+    trans_char_list =    []
+    trans_context_list = []
+
+    context_value_count_list = []
+
+    for (context_index, char_count_dict) in enumerate(context_count_list):
+      context = index_context_list[context_index]
+      trans_count_list = []
+
+      for (char_index, char_count) in sorted(char_count_dict.items()):
+        trans_count_list.append((len(trans_char_list), char_count))
+        trans_char_list.append(char_index)
+        if (char_index == 0):
+          trans_context_list.append(-1)
+        else:
+          trans_context_list.append(context_dict[context[1:]+(char_index,)])
+
+      context_value_count_list.append(trans_count_list)
+
+    return char_list, trans_char_list, trans_context_list, \
+           sampler.ConditionalAliasTable(context_value_count_list), \
+           max_name_length
+
+  # ---------------------------------------------------------------------------
+
+  def synthesise_name(self):
+    """Method which synthesises and returns one name with the model, which is
+       neither a head value nor longer than the longest value in the file.
+    """
+
+    char_list =          self.char_list  # Short-hands to increase speed
+    trans_char_list =    self.trans_char_list
+    trans_context_list = self.trans_context_list
+    context_table =      self.context_table
+
+    while True:
+      name_char_list = []
+      context_index = 0
+
+      while (context_index >= 0) and \
+            (len(name_char_list) <= self.max_name_length):
+        trans_index = context_table.draw(context_index)
+        name_char_list.append(char_list[trans_char_list[trans_index]])
+        context_index = trans_context_list[trans_index]
+
+      name = u''.join(name_char_list)
+
+      if (context_index < 0) and (name not in self.head_val_set):
+        return name
+
+  # ---------------------------------------------------------------------------
+
+  def synthesise_names_batch(self, n):
+    """Method which synthesises n names with the model (see
+       synthesise_name()) in parallel, and returns them as a NumPy array of
+       objects.
+    """
+
+    if (self.char_array is None):
+      self.char_array =          sampler.object_array(self.char_list)
+      self.trans_char_array =    numpy.array(self.trans_char_list,
+                                             dtype=numpy.int64)
+      self.trans_context_array = numpy.array(self.trans_context_list,
+                                             dtype=numpy.int64)
+
+    name_array = numpy.empty(n, dtype=object)
+
+    redraw_index_array = numpy.arange(n)  # Names still to be synthesised
+
+    while (len(redraw_index_array) > 0):
+      name_array[redraw_index_array] = u''
+
+      # Add one character to all unfinished names at a time
+      #
+      rec_index_array =     redraw_index_array
+      context_index_array = numpy.zeros(len(rec_index_array),
+                                        dtype=numpy.int64)
+      name_length = 0
+
+      while (len(rec_index_array) > 0) and \
+            (name_length <= self.max_name_length):
+        trans_index_array = self.context_table.draw_many(context_index_array)
+        name_array[rec_index_array] = name_array[rec_index_array] + \
+                     self.char_array[self.trans_char_array[trans_index_array]]
+
+        context_index_array = self.trans_context_array[trans_index_array]
+        unfinished_array =    context_index_array >= 0
+        rec_index_array =     rec_index_array[unfinished_array]
+        context_index_array = context_index_array[unfinished_array]
+        name_length += 1
+
+      # Names that are too long (still unfinished) or head values are
+      # synthesised again
+      #
+      head_val_set = self.head_val_set
+      redraw_mask_array = numpy.array([name in head_val_set for name in \
+                                       name_array[redraw_index_array]],
+                                      dtype=bool)
+      redraw_index_array = numpy.union1d(redraw_index_array[redraw_mask_array],
+                                         rec_index_array)
+
+    return name_array
+
+  # ---------------------------------------------------------------------------
+
+  def create_attribute_value(self):
+    """Method which creates and returns one attribute value, either a head
+       value of the frequency file or a synthesised name.
+    """
+
+    if (self.head_alias_table != None) and (random.random() < self.head_prob):
+      return self.head_alias_table.draw()
+
+    return self.synthesise_name()
+
+  # ---------------------------------------------------------------------------
+
+  def create_attribute_values_batch(self, n):
+    """Method which creates n attribute values, and returns them as a NumPy
+       array if NumPy is available, otherwise as a list. The head values are
+       drawn and the other names synthesised all at once.
+    """
+
+    if (numpy == None):
+      return GenerateAttribute.create_attribute_values_batch(self, n)
+
+    basefunctions.check_is_integer('n', n)
+    basefunctions.check_is_not_negative('n', n)
+
+    if (self.head_alias_table != None):
+      head_mask_array = numpy.random.random(n) < self.head_prob
+    else:
+      head_mask_array = numpy.zeros(n, dtype=bool)
+    num_head = int(head_mask_array.sum())
+
+    val_array = numpy.empty(n, dtype=object)
+    if (num_head > 0):
+      val_array[head_mask_array] = self.head_alias_table.draw_many(num_head)
+    if (num_head < n):
+      val_array[~head_mask_array] = self.synthesise_names_batch(n - num_head)
+
+    return val_array
+
+# =============================================================================
+# Classes for generating compound attributes (fields) of the data set
+# =============================================================================
+
+class GenerateCompoundAttribute:
+  """Base class for the definition of compound attributes (fields) to be
+     generated.
+
+     This class and all of its derived classes provide methods that allow the
+     definition of several (are least two) attributes and the parameters
+     necessary for their generation.
+
+     This base class does not have any generic variables that need to be set.
+  """
+
+  # ---------------------------------------------------------------------------
+
+  def __init__(self, base_kwargs):
+    """Constructor. See implementations in derived classes for details.
+    """
+
+    raise Exception( 'Override abstract method in derived class')
+
+  # ---------------------------------------------------------------------------
+
+  def create_attribute_value(self):
+    """Method which creates and returns several (compound) attribute values.
+       See implementations in derived classes for details.
+    """
+
+    raise Exception( 'Override abstract method in derived class')
+
+  # ---------------------------------------------------------------------------
+
+  def get_attribute_name_list(self):
+    """Method which returns the list of the names of the attributes generated,
+       in the sequence their values are created. See implementations in
+       derived classes for details.
+    """
+
+    raise Exception( 'Override abstract method in derived class')
+
+  # ---------------------------------------------------------------------------
+
+  def create_attribute_values_batch(self, n):
+    """Method which creates n records of compound attribute values, and
+       returns them as a tuple with one column (a list or, in derived classes
+       that can use NumPy, a NumPy array) of n values for each attribute.
+
+       This default implementation calls create_attribute_values() n times.
+    """
+
+    basefunctions.check_is_integer('n', n)
+    basefunctions.check_is_not_negative('n', n)
+
+    if (n == 0):
+      return tuple([[] for i in range(self.number_of_atttributes)])
+
+    create_attribute_values = self.create_attribute_values  # Short-hand
+
+    val_tuple_list = [create_attribute_values() for i in range(n)]
+
+    return tuple([list(col_tuple) for col_tuple in zip(*val_tuple_list)])
+
+  # ---------------------------------------------------------------------------
+
+  def get_stratum_list(self, num_strata_attr):
+    """Method which returns a list of pairs (stratum values, weight), one for
+       each stratum of records formed by the values of the first
+       'num_strata_attr' attributes generated by this object, with the stratum
+       values being a tuple and the weight proportional to the probability of
+       the stratum.
+
+       This default implementation raises an exception, as only attributes
+       with look-up tables can be used to stratify records.
+    """
+
+    raise Exception( 'Attributes "%s" cannot be used to stratify records' % \
+                     (','.join(self.get_attribute_name_list())))
+
+  # ---------------------------------------------------------------------------
+
+  def create_attribute_values_for_stratum(self, stratum_val_tuple, n):
+    """Method which creates n records of compound attribute values in the
+       stratum with the given values (see get_stratum_list()), and returns
+       them as a tuple of columns like create_attribute_values_batch(). See
+       implementations in derived classes for details.
+    """
+
+    raise Exception( 'Attributes "%s" cannot be used to stratify records' % \
+                     (','.join(self.get_attribute_name_list())))
+
+# =============================================================================
+
+class GenerateCateCateCompoundAttribute(GenerateCompoundAttribute):
+  """Generate two attributes, both containing categorical values, where the
+     values of the second attribute depend upon the values in the first
+     attribute.
+
+     This for example allows the modelling of:
+     - city location values that depend upon gender values, or
+     - medication name values that depend upon gender values.
+
+     The arguments that have to be set when this attribute type is initialised
+     are:
+
+     categorical1_attribute_name  The name of the first categorical attribute
+                                  that will be generated. This name will be
+                                  used in the header line to be written into
+                                  the output file.
+
+     categorical2_attribute_name  The name of the second categorical attribute
+                                  that will be generated. This name will be
+                                  used in the header line to be written into
+                                  the output file.
+
+     lookup_file_name             Name of the file which contains the values of
+                                  the first categorical attribute, and for each
+                                  of these values the names of the categories
+                                  and their counts of the second categorical
+                                  attribute. This file format is further
+                                  explained below.
+
+     has_header_line              A flag, set to True or False, that has to be
+                                  set according to if the look-up file starts
+                                  with a header line or not.
+
+     unicode_encoding             The Unicode encoding (a string name) of the
+                                  file.
+
+     The format of the look-up file is:
+
+     # Comment lines start with the # character
+     cate_attr1_val,count,cate_attr2_val1,count1,cate_attr2_val2,count2, \
+     cate_attr2_val3,count3,cate_attr2_val4,count4, ...
+
+     The look-up file is a comma separated values (CSV) file which contains
+     two types of rows:
+     A) The first type of row contains the following columns:
+        1) A categorical value. For all possible values of the first
+           categorical attribute, one row must be specified in this look-up
+           file.
+        2) Count of this categorical value (a positive integer number). This
+           determines the likelihood of how often a certain categorical value
+           will be chosen. This count must be a positive integer number.
+        3) The first categorical value of the second attribute.
+        4) The count (positive integer number) of this first categorical
+           value.
+        5) The second categorical value of the second attribute.
+        6) The count of this second categorical value.
+
+        ...
+
+        X) A '\' character, which indicates that the following line (row)
+           contains further categorical values and their counts from the
+           second attribute.
+
+     B) The second type of row contains the following columns:
+        1) A categorical value of the second attribute.
+        2) The count of this categorical value.
+        3) Another categorical value of the second attribute.
+        4) The count of this categorical value.
+
+        ...
+
+     Example:
+       male,60,canberra,7, \
+       sydney,30,melbourne,45, \
+       perth,18
+       female,40,canberra,10,sydney,40, \
+       melbourne,20,brisbane,30,hobart,5,\
+       perth,20
+  """
+
+  # ---------------------------------------------------------------------------
+
+  def __init__(self, **kwargs):
+    """Constructor. Process the derived keywords first, then call the base
+       class constructor.
+    """
+
+    # General attributes for all data set generators
+    #
+    self.number_of_atttributes = 2
+    self.attribute_type =        'Compound-Categorical-Categorical'
+
+    for (keyword, value) in kwargs.items():
+
+      if (keyword.startswith('categorical1')):
+        basefunctions.check_is_non_empty_string('categorical1_attribute_name',
+                                                value)
+        self.categorical1_attribute_name = value
+
+      elif (keyword.startswith('categorical2')):
+        basefunctions.check_is_non_empty_string('categorical2_attribute_name',
+                                                value)
+        self.categorical2_attribute_name = value
+
+      elif (keyword.startswith('look')):
+        basefunctions.check_is_non_empty_string('lookup_file_name', value)
+        self.lookup_file_name = value
+
+      elif (keyword.startswith('has')):
+        basefunctions.check_is_flag('has_header_line', value)
+        self.has_header_line = value
+
+      elif (keyword.startswith('unicode')):
+        basefunctions.check_is_non_empty_string('unicode_encoding', value)
+        self.unicode_encoding = value
+
+      else:
+        raise Exception( 'Illegal constructor argument keyword: "%s"' % \
+              (str(keyword)))
+
+    # Check if the necessary variables have been set
+    #
+    basefunctions.check_is_non_empty_string('categorical1_attribute_name',
+                                            self.categorical1_attribute_name)
+    basefunctions.check_is_non_empty_string('categorical2_attribute_name',
+                                            self.categorical2_attribute_name)
+    basefunctions.check_is_non_empty_string('lookup_file_name',
+                                            self.lookup_file_name)
+    basefunctions.check_is_flag('has_header_line', self.has_header_line)
+    basefunctions.check_is_non_empty_string('unicode_encoding',
+                                            self.unicode_encoding)
+
+    if (self.categorical1_attribute_name == self.categorical2_attribute_name):
+      raise Exception( 'Both attribute names are the same')
+
+    # Load the lookup file and build one alias table for the first attribute
+    # and one for the second attribute per value of the first attribute, all
+    # directly from the counts in the file (so their size depends upon the
+    # number of distinct values, not upon the counts). The tables are shared
+    # with all other attributes that use the same look-up file.
+    #
+    self.cate_attr1_table, self.cate_val2_table_dict = \
+           lookupcache.get_shared_table(self.lookup_file_name,
+                                        self.unicode_encoding,
+                                        self.has_header_line, 'cate-cate-alias',
+                                        self.build_alias_tables)
+
+    # NumPy version of the first values, and the alias tables of the second
+    # values in the same order, only built when values are generated in bulk
+    #
+    self.cate_attr1_array =     None
+    self.cate_val2_table_list = None
+
+  # ---------------------------------------------------------------------------
+
+  def build_alias_tables(self):
+    """Method which loads the look-up file and returns a pair made of the
+       alias table of the values of the first categorical attribute and a
+       dictionary with the values of the first attribute as keys and the alias
+       tables of the values of the second attribute as values.
+    """
+
+    header_list, lookup_file_data = \
+                     lookupcache.read_csv_file(self.lookup_file_name,
+                                               self.unicode_encoding,
+                                               self.has_header_line)
+
+    cate_val1_dict = {}  # The categorical values from attribute 1 to be loaded
+                         # from file and their counts.
+
+    cate_val1_list = []  # Pairs (value, count) of attribute 1 in file order
+
+    cate_val2_table_dict = {}  # The categorical values from attribute 1 as
+                               # keys and alias tables over the categorical
+                               # values from attribute 2 as values.
+
+    # Process attribute values from file and their details
+    #
+    i = 0  # Line counter in file data
+
+    while i < len(lookup_file_data):
+      rec_list = lookup_file_data[i]
+
+      # First line must contain categorical value of the first attribute
+      #
+      if (len(rec_list) < 2):  # Need at least two values in each line
+        raise Exception( 'Illegal format in lookup file %s: %s' % \
+                         (self.lookup_file_name, str(rec_list)))
+      cate_attr1_val =  rec_list[0].strip()
+      try:
+        cate_attr1_count = int(rec_list[1])
+      except:
+        raise Exception( 'Value count given for attribute 1 is not an ' + \
+                         'integer number: %s' % (rec_list[1]))
+
+      if (cate_attr1_val == ''):
+        raise Exception( 'Empty categorical attribute 1 value in lookup ' + \
+                         'file %s' % (self.lookup_file_name))
+      basefunctions.check_is_positive('cate_attr1_count', cate_attr1_count)
+
+      if (cate_attr1_val in cate_val1_dict):
+        raise Exception( 'Attribute 1 value "%s" occurs twice in ' % \
+                         (cate_attr1_val) + 'lookup file %s' % \
+                         (self.lookup_file_name))
+
+      cate_val1_dict[cate_attr1_val] = cate_attr1_count
+      cate_val1_list.append((cate_attr1_val, cate_attr1_count))
+
+      # Process values for second categorical attribute in this line
+      #
+      cate_attr2_data = rec_list[2:]  # All values and counts of attribute 2
+
+      this_cate_val2_dict = {}  # Values in second categorical attribute for
+                                # this categorical value from first attribute
+
+      this_cate_val2_list = []  # Pairs (value, count) in file order
+
+      while (cate_attr2_data != []):
+        if (len(cate_attr2_data) == 1):
+          if (cate_attr2_data[0] != '\\'):
+            raise Exception( 'Line in categorical look-up file has illegal' + \
+                             'format.')
+          # Get the next record from file data with a continuation of the
+          # categorical values from the second attribute
+          #
+          i += 1
+          cate_attr2_data = lookup_file_data[i]
+          if (len(cate_attr2_data) < 2):
+            raise Exception( 'Illegal format in lookup file %s: %s' % \
+                             (self.lookup_file_name, str(cate_attr2_data)))
+
+        cate_attr2_val =   cate_attr2_data[0]
+        try:
+          cate_attr2_count = int(cate_attr2_data[1])
+        except:
+          raise Exception( 'Value count given for attribute 2 is not an ' + \
+                           'integer number: %s' % (cate_attr2_data[1]))
+
+        if (cate_attr2_val == ''):
+          raise Exception( 'Empty categorical attribute 2 value in lookup' \
+                           + ' file %s' % (self.lookup_file_name))
+        basefunctions.check_is_positive('cate_attr2_count', cate_attr2_count)
+
+        if (cate_attr2_val in this_cate_val2_dict):
+          raise Exception( 'Attribute 2 value "%s" occurs twice in ' % \
+                           (cate_attr2_val) + 'lookup file %s' % \
+                           (self.lookup_file_name))
+
+        this_cate_val2_dict[cate_attr2_val] = cate_attr2_count
+        this_cate_val2_list.append((cate_attr2_val, cate_attr2_count))
+
+        cate_attr2_data = cate_attr2_data[2:]
+
+      cate_val2_table_dict[cate_attr1_val] = \
+                                        sampler.AliasTable(this_cate_val2_list)
+
+      # Go to next line in file data
+      #
+      i += 1
+
+    return sampler.AliasTable(cate_val1_list), cate_val2_table_dict
+
+  # ---------------------------------------------------------------------------
+
+  def get_attribute_name_list(self):
+    """Method which returns the list of the names of the attributes generated,
+       in the sequence their values are created.
+    """
+
+    return [self.categorical1_attribute_name,
+            self.categorical2_attribute_name]
+
+  # ---------------------------------------------------------------------------
+
+  def create_attribute_values(self):
+    """Method which creates and returns two categorical attribute values, where
+       the second value depends upon the first value. Both categorical values
+       are randomly selected according to the provided frequency distributions.
+    """
+
+    assert self.cate_attr1_table != None
+    assert self.cate_val2_table_dict != {}
+
+    cate_attr1_val = self.cate_attr1_table.draw()
+
+    cate_attr2_val = self.cate_val2_table_dict[cate_attr1_val].draw()
+
+    return cate_attr1_val, cate_attr2_val
+
+  # ---------------------------------------------------------------------------
+
+  def create_attribute_values_batch(self, n):
+    """Method which creates n pairs of categorical attribute values, and
+       returns them as a tuple of two columns, as NumPy arrays if NumPy is
+       available, otherwise as lists.
+
+       The first values are drawn all at once, then the second values for all
+       pairs with the same first value are drawn at once from its alias table.
+       With NumPy the first values are drawn as indices into the alias table
+       of the first attribute, and the pairs are grouped by sorting these
+       indices once.
+    """
+
+    assert self.cate_attr1_table != None
+    assert self.cate_val2_table_dict != {}
+
+    if (numpy == None):
+      cate_attr1_col = self.cate_attr1_table.draw_many(n)
+      cate_attr2_col = [None]*n
+
+      rec_index_dict = {}  # Indices of the pairs for each first value
+      for (rec_i, cate_attr1_val) in enumerate(cate_attr1_col):
+        rec_index_dict.setdefault(cate_attr1_val, []).append(rec_i)
+
+      for (cate_attr1_val, rec_index_list) in rec_index_dict.items():
+        cate_attr2_list = self.cate_val2_table_dict[cate_attr1_val].draw_many(
+                                                           len(rec_index_list))
+        for (rec_i, cate_attr2_val) in zip(rec_index_list, cate_attr2_list):
+          cate_attr2_col[rec_i] = cate_attr2_val
+
+      return cate_attr1_col, cate_attr2_col
+
+    if (self.cate_attr1_array is None):
+      self.cate_attr1_array = \
+                        sampler.object_array(self.cate_attr1_table.value_list)
+      self.cate_val2_table_list = [self.cate_val2_table_dict[cate_attr1_val] \
+                                   for cate_attr1_val in \
+                                   self.cate_attr1_table.value_list]
+
+    cate_attr1_index_col = self.cate_attr1_table.draw_index_many(n)
+    cate_attr2_col = numpy.empty(n, dtype=object)
+
+    for (cate_attr1_index, rec_index_array) in \
+        group_by_code(cate_attr1_index_col, self.cate_attr1_table.num_values):
+      cate_attr2_table = self.cate_val2_table_list[cate_attr1_index]
+      cate_attr2_col[rec_index_array] = \
+                            cate_attr2_table.draw_many(len(rec_index_array))
+
+    return self.cate_attr1_array[cate_attr1_index_col], cate_attr2_col
+
+  # ---------------------------------------------------------------------------
+
+  def get_stratum_list(self, num_strata_attr):
+    """Method which returns a list of pairs (stratum values, weight) with one
+       stratum for each value of the first attribute (if 'num_strata_attr' is
+       1) or for each pair of values of both attributes (if it is 2).
+    """
+
+    assert num_strata_attr in [1,2]
+
+    stratum_list = []
+
+    for (cate_attr1_val, cate_attr1_count) in \
+        zip(self.cate_attr1_table.value_list,
+            self.cate_attr1_table.count_list):
+
+      if (num_strata_attr == 1):
+        stratum_list.append(((cate_attr1_val,), cate_attr1_count))
+
+      else:
+        cate_attr2_table = self.cate_val2_table_dict[cate_attr1_val]
+        for (cate_attr2_val, cate_attr2_count) in \
+            zip(cate_attr2_table.value_list, cate_attr2_table.count_list):
+          stratum_list.append(((cate_attr1_val, cate_attr2_val),
+                               float(cate_attr1_count) * cate_attr2_count / \
+                               cate_attr2_table.total_count))
+
+    return stratum_list
+
+  # ---------------------------------------------------------------------------
+
+  def create_attribute_values_for_stratum(self, stratum_val_tuple, n):
+    """Method which creates n pairs of categorical attribute values with the
+       given value of the first attribute (and, if given, of the second
+       attribute), and returns them as a tuple of two columns.
+    """
+
+    cate_attr1_val = stratum_val_tuple[0]
+
+    if (cate_attr1_val not in self.cate_val2_table_dict):
+      raise Exception( 'Value "%s" is not in lookup file %s' % \
+                       (cate_attr1_val, self.lookup_file_name))
+
+    if (len(stratum_val_tuple) == 1):
+      return [cate_attr1_val]*n, \
+             self.cate_val2_table_dict[cate_attr1_val].draw_many(n)
+
+    return [cate_attr1_val]*n, [stratum_val_tuple[1]]*n
+
+# =============================================================================
+
+class GenerateCateContCompoundAttribute(GenerateCompoundAttribute):
+  """Generate two attributes, one containing categorical values and the other
+     continuous values, where the continuous values depend upon the categorical
+     values.
+
+     This for example allows the modelling of:
+     - salary values that depend upon gender values, or
+     - blood pressure values that depend upon age values.
+
+     The arguments that have to be set when this attribute type is initialised
+     are:
+
+     categorical_attribute_name  The name of the categorical attribute that
+                                 will be generated. This name will be used in
+                                 the header line to be written into the output
+                                 file.
+
+     continuous_attribute_name   The name of the continuous attribute that will
+                                 be generated. This name will be used in the
+                                 header line to be written into the output
+                                 file.
+
+     lookup_file_name            Name of the file which contains the values of
+                                 the continuous attribute, and for each of these
+                                 values the name of a function (and its
+                                 parameters) that is used to generate the
+                                 continuous values. This file format is further
+                                 explained below.
+
+     has_header_line             A flag, set to True or False, that has to be
+                                 set according to if the look-up file starts
+                                 with a header line or not.
+
+     unicode_encoding            The Unicode encoding (a string name) of the
+                                 file.
+
+     continuous_value_type       The format of how continuous values are
+                                 returned when they are generated. Possible
+                                 values are 'int', so integer values are
+                                 returned; or 'float1', 'float2', to 'float9',
+                                 in which case floating-point values with the
+                                 specified number of digits behind the comma
+                                 are returned.
+
+     The format of the look-up file is:
+
+     # Comment lines start with the # character
+     cate_val,count,funct_name,funct_param_1,...,funct_param_N
+
+     The look-up file is a comma separated values (CSV) file with the following
+     columns:
+     1) A categorical value. For all possible categorical values of an
+        attribute, one row must be specified in this look-up file.
+
+     2) Count of this categorical value (a positive integer number). This
+        determines the likelihood of how often a certain categorical value will
+        be chosen.
+
+     3) A function which generates the continuous value for this categorical
+        value. Implemented functions currently are:
+        - uniform
+        - normal
+
+     4) The parameters required for the function that generates the continuous
+        values. They are:
+        - uniform:  min_val, max_val
+        - normal:   mu, sigma, min_val, max_val
+                    (min_val and max_val can be set to None in which case no
+                    minimum or maximum is enforced)
+
+     Example:
+       male,60,uniform,20000,100000  
+       female,40,normal,35000,100000,10000,None
+  """
+
+  # ---------------------------------------------------------------------------
+
+  def __init__(self, **kwargs):
+    """Constructor. Process the derived keywords first, then call the base
+       class constructor.
+    """
+
+    # General attributes for all data set generators
+    #
+    self.number_of_atttributes = 2
+    self.attribute_type =        'Compound-Categorical-Continuous'
+
+    for (keyword, value) in kwargs.items():
+
+      if (keyword.startswith('cate')):
+        basefunctions.check_is_non_empty_string('categorical_attribute_name',
+                                                value)
+        self.categorical_attribute_name = value
+
+      elif (keyword.startswith('continuous_a')):
+        basefunctions.check_is_non_empty_string('continuous_attribute_name',
+                                                value)
+        self.continuous_attribute_name = value
+
+      elif (keyword.startswith('continuous_v')):
+        basefunctions.check_is_non_empty_string('continuous_value_type',
+                                                value)
+        basefunctions.check_is_valid_format_str('continuous_value_type',
+                                                value)
+        self.continuous_value_type = value
+
+      elif (keyword.startswith('look')):
+        basefunctions.check_is_non_empty_string('lookup_file_name', value)
+        self.lookup_file_name = value
+
+      elif (keyword.startswith('has')):
+        basefunctions.check_is_flag('has_header_line', value)
+        self.has_header_line = value
+
+      elif (keyword.startswith('unicode')):
+        basefunctions.check_is_non_empty_string('unicode_encoding', value)
+        self.unicode_encoding = value
+
+      else:
+        raise Exception( 'Illegal constructor argument keyword: "%s"' % \
+              (str(keyword)))
+
+    # Check if the necessary variables have been set
+    #
+    basefunctions.check_is_non_empty_string('categorical_attribute_name',
+                                            self.categorical_attribute_name)
+    basefunctions.check_is_non_empty_string('continuous_attribute_name',
+                                            self.continuous_attribute_name)
+    basefunctions.check_is_non_empty_string('lookup_file_name',
+                                            self.lookup_file_name)
+    basefunctions.check_is_flag('has_header_line', self.has_header_line)
+    basefunctions.check_is_non_empty_string('unicode_encoding',
+                                            self.unicode_encoding)
+
+    if (self.categorical_attribute_name == self.continuous_attribute_name):
+      raise Exception( 'Both attribute names are the same')
+
+    basefunctions.check_is_valid_format_str('continuous_value_type',
+                                            self.continuous_value_type)
+
+    self.continuous_value_formatter = \
+                basefunctions.get_float_formatter(self.continuous_value_type)
+
+    # Load the lookup file - - - - - - - - - - - - - - - - - - - - - - - - - -
+    #
+    header_list, lookup_file_data = \
+                     lookupcache.read_csv_file(self.lookup_file_name,
+                                               self.unicode_encoding,
+                                               self.has_header_line)
+
+    cate_val_dict = {}    # The categorical attribute values to be loaded from
+                          # file and their counts.
+    cont_funct_dict = {}  # For each categorical attribute value the details of
+                          # the function used for the continuous attribute.
+
+    # Process attribute values from file and their details
+    #
+    for rec_list in lookup_file_data:
+      if (len(rec_list) not in [5,7]):
+        raise Exception( 'Illegal format in lookup file %s: %s' % \
+                         (self.lookup_file_name, str(rec_list)))
+      cate_attr_val =  rec_list[0].strip()
+      try:
+        cate_attr_count = int(rec_list[1])
+      except:
+        raise Exception( 'Value count given for categorical attribute is ' + \
+                         'not an integer number: %s' % (rec_list[1]))
+      cont_attr_funct = rec_list[2].strip()
+
+      if (cate_attr_val == ''):
+        raise Exception( 'Empty categorical attribute value in lookup file %s'\
+                         % (self.lookup_file_name))
+      if (cate_attr_count <= 0):
+        raise Exception( 'Count given for categorical attribute is not ' + \
+                         'positive for value "%s" in lookup ' % \
+                         (cate_attr_val) + 'file %s' % (self.lookup_file_name))
+
+      if (cate_attr_val in cate_val_dict):
+        raise Exception( 'Attribute values "%s" occurs twice in ' % \
+                         (cate_attr_val) + 'lookup file %s' % \
+                         (self.lookup_file_name))
+
+      if (cont_attr_funct not in ['uniform','normal']):
+        raise Exception( 'Illegal continuous attribute function given: "%s"' % \
+                         (cont_attr_funct) + ' in lookup file %s' % \
+                         (self.lookup_file_name))
+
+      cate_val_dict[cate_attr_val] = cate_attr_count
+
+      # Get function parameters from file data
+      #
+      if (cont_attr_funct == 'uniform'):
+        cont_attr_funct_min_val = float(rec_list[3])
+        basefunctions.check_is_number('cont_attr_funct_min_val',
+                                      cont_attr_funct_min_val)
+
+        cont_attr_funct_max_val = float(rec_list[4])
+        basefunctions.check_is_number('cont_attr_funct_max_val',
+                                      cont_attr_funct_max_val)
+
+        cont_funct_dict[cate_attr_val] = [cont_attr_funct,
+                                          cont_attr_funct_min_val,
+                                          cont_attr_funct_max_val]
+
+      elif (cont_attr_funct == 'normal'):
+        cont_attr_funct_mu =    float(rec_list[3])
+        basefunctions.check_is_number('cont_attr_funct_mu',
+                                      cont_attr_funct_mu)
+
+        cont_attr_funct_sigma = float(rec_list[4])
+        basefunctions.check_is_number('cont_attr_funct_sigma',
+                                      cont_attr_funct_sigma)
+        try:
+          cont_attr_funct_min_val = float(rec_list[5])
+        except:
+          cont_attr_funct_min_val = None
+        if (cont_attr_funct_min_val != None):
+          basefunctions.check_is_number('cont_attr_funct_min_val',
+                                        cont_attr_funct_min_val)
+        try:
+          cont_attr_funct_max_val = float(rec_list[6])
+        except:
+          cont_attr_funct_max_val = None
+        if (cont_attr_funct_max_val != None):
+          basefunctions.check_is_number('cont_attr_funct_max_val',
+                                        cont_attr_funct_max_val)
+
+        cont_funct_dict[cate_attr_val] = [cont_attr_funct,
+                                          cont_attr_funct_mu,
+                                          cont_attr_funct_sigma,
+                                          cont_attr_funct_min_val,
+                                          cont_attr_funct_max_val]
+
+    # Alias table over the values and their counts, in the sorted order of
+    # the values
+    #
+    self.cate_attr_table = sampler.AliasTable(sorted(cate_val_dict.items()))
+    self.cont_funct_dict = cont_funct_dict
+
+    # NumPy version of the values of the alias table, only built when values
+    # are generated in bulk
+    #
+    self.cate_attr_val_array = None
+
+  # ---------------------------------------------------------------------------
+
+  def get_attribute_name_list(self):
+    """Method which returns the list of the names of the attributes generated,
+       in the sequence their values are created.
+    """
+
+    return [self.categorical_attribute_name, self.continuous_attribute_name]
+
+  # ---------------------------------------------------------------------------
+
+  def create_attribute_values(self):
+    """Method which creates and returns two attribute values, one categorical
+       and one continuous, with the categorical value randomly selected
+       according to the provided frequency distribution, and the continuous
+       value according to the selected function and its parameters.
+    """
+
+    cate_attr_val = self.cate_attr_table.draw()
+
+    # Get the details of the function and generate the continuous value
+    #
+    funct_details = self.cont_funct_dict[cate_attr_val]
+    funct_name = funct_details[0]
+
+    if (funct_name == 'uniform'):
+      cont_attr_val = random.uniform(funct_details[1], funct_details[2])
+
+    elif (funct_name == 'normal'):
+      mu =      funct_details[1]
+      sigma =   funct_details[2]
+      min_val = funct_details[3]
+      max_val = funct_details[4]
+
+      cont_attr_val = get_truncated_normal(mu, sigma, min_val, max_val).draw()
+
+      if (min_val != None):
+        assert cont_attr_val >= min_val
+      if (max_val != None):
+        assert cont_attr_val <= max_val
+
+    else:
+      raise Exception( ('Illegal continuous function given:', funct_name))
+
+    cont_attr_val_str = self.continuous_value_formatter(cont_attr_val)
+
+    return cate_attr_val, cont_attr_val_str
+
+  # ---------------------------------------------------------------------------
+
+  def create_attribute_values_batch(self, n):
+    """Method which creates n pairs of categorical and continuous attribute
+       values, and returns them as a tuple of two columns, with the
+       categorical column a NumPy array if NumPy is available and otherwise a
+       list, and the continuous column a list of strings.
+    """
+
+    if (numpy == None):
+      return GenerateCompoundAttribute.create_attribute_values_batch(self, n)
+
+    basefunctions.check_is_integer('n', n)
+    basefunctions.check_is_not_negative('n', n)
+
+    if (self.cate_attr_val_array is None):
+      self.cate_attr_val_array = \
+                           sampler.object_array(self.cate_attr_table.value_list)
+
+    # Draw the codes (indices into the values of the alias table) of the
+    # categorical values
+    #
+    cate_attr_code_col = self.cate_attr_table.draw_index_many(n)
+    cont_attr_col = numpy.empty(n)
+
+    # Generate the continuous values for all records with the same categorical
+    # value at once, with the records grouped by sorting their codes once
+    #
+    for (cate_attr_code, rec_index_array) in \
+        group_by_code(cate_attr_code_col, self.cate_attr_table.num_values):
+      cate_attr_val = self.cate_attr_val_array[cate_attr_code]
+      funct_details = self.cont_funct_dict[cate_attr_val]
+      cont_attr_col[rec_index_array] = \
+          generate_cont_values_batch(funct_details[0], funct_details[1:],
+                                     len(rec_index_array))
+
+    return self.cate_attr_val_array[cate_attr_code_col], \
+           float_to_str_batch(cont_attr_col, self.continuous_value_type)
+
+  # ---------------------------------------------------------------------------
+
+  def get_stratum_list(self, num_strata_attr):
+    """Method which returns a list of pairs (stratum values, weight) with one
+       stratum for each categorical value, and its count as weight.
+    """
+
+    assert num_strata_attr == 1
+
+    return [((cate_attr_val,), val_count) for (cate_attr_val, val_count) in \
+            zip(self.cate_attr_table.value_list,
+                self.cate_attr_table.count_list)]
+
+  # ---------------------------------------------------------------------------
+
+  def create_attribute_values_for_stratum(self, stratum_val_tuple, n):
+    """Method which creates n pairs of categorical and continuous attribute
+       values with the given categorical value, and returns them as a tuple of
+       two columns.
+    """
+
+    cate_attr_val = stratum_val_tuple[0]
+
+    if (cate_attr_val not in self.cont_funct_dict):
+      raise Exception( 'Value "%s" is not in lookup file %s' % \
+                       (cate_attr_val, self.lookup_file_name))
+
+    funct_details = self.cont_funct_dict[cate_attr_val]
+
+    cont_attr_col = generate_cont_values_batch(funct_details[0],
+                                               funct_details[1:], n)
+
+    return [cate_attr_val]*n, float_to_str_batch(cont_attr_col,
+                                                 self.continuous_value_type)
+
+# =============================================================================
+
+class GenerateCateCateContCompoundAttribute(GenerateCompoundAttribute):
+  """Generate three attributes, thefirst two containing categorical values and
+     the third containing continuous values, where the values of the second
+     attribute depend upon the values in the first attribute, and the values
+     of the third attribute depend upon both the values of the first and second
+     attribute.
+
+     This for example allows the modelling of:
+     - blood pressure depending upon gender and city of residence values, or
+     - salary depending upon gender and profession values.
+
+     The arguments that have to be set when this attribute type is initialised
+     are:
+
+     categorical1_attribute_name  The name of the first categorical attribute
+                                  that will be generated. This name will be
+                                  used in the header line to be written into
+                                  the output file.
+
+     categorical2_attribute_name  The name of the second categorical attribute
+                                  that will be generated. This name will be
+                                  used in the header line to be written into
+                                  the output file.
+
+     continuous_attribute_name    The name of the continuous attribute that
+                                  will be generated. This name will be used in
+                                  the header line to be written into the output
+                                  file.
+
+     lookup_file_name              Name of the file which contains the values
+                                   of the first categorical attribute, and for
+                                   each of these values the names of the
+                                   categories and their counts of the second
+                                   categorical attribute, and for each of these
+                                   values the name of a function (and its
+                                   parameters) that is used to generate the
+                                   continuous values. This file format is
+                                   further explained below.
+
+     has_header_line               A flag, set to True or False, that has to be
+                                   set according to if the look-up file starts
+                                   with a header line or not.
+
+     unicode_encoding              The Unicode encoding (a string name) of the
+                                   file.
+
+     continuous_value_type         The format of how continuous values are
+                                   returned when they are generated. Possible
+                                   values are 'int', so integer values are
+                                   returned; or 'float1', 'float2', to
+                                   'float9', in which case floating-point
+                                   values with the specified number of digits
+                                   behind the comma are returned.
+
+     The format of the look-up file is:
+
+     # Comment lines start with the # character
+     cate_attr1_val1,count
+     cate_attr2_val1,count,funct_name,funct_param_1,...,funct_param_N
+     cate_attr2_val2,count,funct_name,funct_param_1,...,funct_param_N
+     cate_attr2_val3,count,funct_name,funct_param_1,...,funct_param_N
+     ...
+     cate_attr2_valX,count,funct_name,funct_param_1,...,funct_param_N
+     cate_attr1_val2,count
+     cate_attr2_val1,count,funct_name,funct_param_1,...,funct_param_N
+     cate_attr2_val2,count,funct_name,funct_param_1,...,funct_param_N
+     cate_attr2_val3,count,funct_name,funct_param_1,...,funct_param_N
+     ...
+     cate_attr2_valX,count,funct_name,funct_param_1,...,funct_param_N
+     cate_attr1_val3,count
+     ...
+
+
+     The look-up file is a comma separated values (CSV) file with the following
+     structure:
+
+     A) One row that contains two values:
+        1) A categorical value of the first attribute. For all possible values
+           of the first categorical attribute, one row must be specified in
+           this look-up file.
+        2) The count of this categorical value (a positive integer number).
+           This determines the likelihood of how often a certain categorical
+           value will be chosen.
+
+     B) After a row with two values, as described under A), one or more rows
+        containing the following values in columns must be given:
+        1) A categorical value from the second categorical attribute.
+        2) The count of this categorical value (a positive integer number).
+           This determines the likelihood of how often a certain categorical
+           value will be chosen.
+       3) A function which generates the continuous value for this categorical
+          value. Implemented functions currently are:
+          - uniform
+          - normal
+       4) The parameters required for the function that generates the
+          continuous values. They are:
+          - uniform:  min_val, max_val
+          - normal:   mu, sigma, min_val, max_val
+                      (min_val and max_val can be set to None in which case no
+                      minimum or maximum is enforced)
+
+     Example:
+       male,60
+       canberra,20,uniform,50000,90000
+       sydney,30,normal,75000,50000,20000,None
+       melbourne,30,uniform,35000,200000
+       perth,20,normal,55000,250000,15000,None
+       female,40
+       canberra,10,normal,45000,10000,None,150000
+       sydney,40,uniform,60000,200000
+       melbourne,20,uniform,50000,1750000
+       brisbane,30,normal,55000,20000,20000,100000
+  """
+
+  # ---------------------------------------------------------------------------
+
+  def __init__(self, **kwargs):
+    """Constructor. Process the derived keywords first, then call the base
+       class constructor.
+    """
+
+    # General attributes for all data set generators
+    #
+    self.number_of_atttributes = 3
+    self.attribute_type =        'Compound-Categorical-Categorical-Continuous'
+
+    for (keyword, value) in kwargs.items():
+
+      if (keyword.startswith('categorical1')):
+        basefunctions.check_is_non_empty_string('categorical1_attribute_name',
+                                                value)
+        self.categorical1_attribute_name = value
+
+      elif (keyword.startswith('categorical2')):
+        basefunctions.check_is_non_empty_string('categorical2_attribute_name',
+                                                value)
+        self.categorical2_attribute_name = value
+
+      elif (keyword.startswith('continuous_a')):
+        basefunctions.check_is_non_empty_string('continuous_attribute_name',
+                                                value)
+        self.continuous_attribute_name = value
+
+      elif (keyword.startswith('continuous_v')):
+        basefunctions.check_is_non_empty_string('continuous_value_type',
+                                                value)
+        basefunctions.check_is_valid_format_str('continuous_value_type',
+                                                value)
+        self.continuous_value_type = value
+
+      elif (keyword.startswith('look')):
+        basefunctions.check_is_non_empty_string('lookup_file_name', value)
+        self.lookup_file_name = value
+
+      elif (keyword.startswith('has')):
+        basefunctions.check_is_flag('has_header_line', value)
+        self.has_header_line = value
+
+      elif (keyword.startswith('unicode')):
+        basefunctions.check_is_non_empty_string('unicode_encoding', value)
+        self.unicode_encoding = value
+
+      else:
+        raise Exception( 'Illegal constructor argument keyword: "%s"' % \
+              (str(keyword)))
+
+    # Check if the necessary variables have been set
+    #
+    basefunctions.check_is_non_empty_string('categorical1_attribute_name',
+                                            self.categorical1_attribute_name)
+    basefunctions.check_is_non_empty_string('categorical2_attribute_name',
+                                            self.categorical2_attribute_name)
+    basefunctions.check_is_non_empty_string('continuous_attribute_name',
+                                            self.continuous_attribute_name)
+    basefunctions.check_is_non_empty_string('lookup_file_name',
+                                            self.lookup_file_name)
+    basefunctions.check_is_flag('has_header_line', self.has_header_line)
+    basefunctions.check_is_non_empty_string('unicode_encoding',
+                                            self.unicode_encoding)
+
+    if (self.categorical1_attribute_name == self.categorical2_attribute_name) \
+       or \
+       (self.categorical1_attribute_name == self.continuous_attribute_name) \
+       or \
+       (self.categorical2_attribute_name == self.continuous_attribute_name):
+      raise Exception( 'Not all attribute names are different.')
+
+    basefunctions.check_is_valid_format_str('continuous_value_type',
+                                            self.continuous_value_type)
+
+    self.continuous_value_formatter = \
+                basefunctions.get_float_formatter(self.continuous_value_type)
+
+    # Load the lookup file - - - - - - - - - - - - - - - - - - - - - - - - - -
+    #
+    header_list, lookup_file_data = \
+                     lookupcache.read_csv_file(self.lookup_file_name,
+                                               self.unicode_encoding,
+                                               self.has_header_line)
+
+    cate_val1_dict = {}   # The categorical values from attribute 1 to be
+                          # loaded from file, and their counts.
+
+    cate_val2_dict = {}   # The categorical values from attribute 1 as keys
+                          # and lists of categorical values (according to their
+                          # counts) from attribute 2 as values.
+
+    cont_funct_dict = {}  # For each pair of categorical attribute values the
+                          # details of the function used for the continuous
+                          # attribute.
+
+    # Process attribute values from file and their details
+    #
+    list_counter = 0  # Counter in the list of lookup file data
+    num_file_rows = len(lookup_file_data)
+    rec_list = lookup_file_data[list_counter]
+
+    while list_counter < num_file_rows:  # Process one row after another
+
+      if (len(rec_list) < 2):  # Need at least one categorical value and count
+        raise Exception( 'Illegal format in lookup file %s: %s' % \
+                         (self.lookup_file_name, str(rec_list)))
+      cate_attr1_val =  rec_list[0].strip()
+      try:
+        cate_attr1_count = int(rec_list[1])
+      except:
+        raise Exception( 'Value count given for attribute 1 is not an ' + \
+                         'integer number: %s' % (rec_list[1]))
+
+      if (cate_attr1_val == ''):
+        raise Exception( 'Empty categorical attribute value 1 in lookup ' + \
+                         'file %s' % (self.lookup_file_name))
+      basefunctions.check_is_positive('cate_attr1_count', cate_attr1_count)
+
+      if (cate_attr1_val in cate_val1_dict):
+        raise Exception( 'Attribute value "%s" occurs twice in ' % \
+                         (cate_attr1_val) + 'lookup file %s' % \
+                         (self.lookup_file_name))
+
+      cate_val1_dict[cate_attr1_val] = cate_attr1_count
+
+      # Loop to process values of the second categorical attribute and the
+      # corresponding continuous functions
+      #
+      list_counter += 1
+      rec_list = lookup_file_data[list_counter]  # Get values from next line
+
+      this_cate_val2_dict = {}  # Values of categorical attribute 2
+      this_cont_funct_dict = {}
+
+      # As long as there are data from the second categorical attribute 
+      #
+      while (len(rec_list) > 2):
+        cate_attr2_val =  rec_list[0].strip()
+        try:
+          cate_attr2_count = int(rec_list[1])
+        except:
+          raise Exception( 'Value count given for categorical attribute 2 ' + \
+                           'is not an integer number: %s' % (rec_list[1]))
+        cont_attr_funct = rec_list[2].strip()
+
+        if (cate_attr2_val == ''):
+          raise Exception( 'Empty categorical attribute 2 value in lookup ' + \
+                           'file %s' % (self.lookup_file_name))
+        basefunctions.check_is_positive('cate_attr2_count', cate_attr2_count)
+
+        if (cate_attr2_val in this_cate_val2_dict):
+          raise Exception( 'Attribute value "%s" occurs twice in ' % \
+                           (cate_attr2_val) + 'lookup file %s' % \
+                           (self.lookup_file_name))
+
+        if (cont_attr_funct not in ['uniform','normal']):
+          raise Exception( 'Illegal continuous attribute function ' + \
+                           'given: "%s"' % (cont_attr_funct) + \
+                           ' in lookup file %s' % (self.lookup_file_name))
+
+        this_cate_val2_dict[cate_attr2_val] = cate_attr2_count
+
+        # Get function parameters from file data
+        #
+        if (cont_attr_funct == 'uniform'):
+          cont_attr_funct_min_val = float(rec_list[3])
+          basefunctions.check_is_number('cont_attr_funct_min_val',
+                                        cont_attr_funct_min_val)
+          cont_attr_funct_max_val = float(rec_list[4])
+          basefunctions.check_is_number('cont_attr_funct_max_val',
+                                        cont_attr_funct_max_val)
+
+          this_cont_funct_dict[cate_attr2_val] = [cont_attr_funct,
+                                                  cont_attr_funct_min_val,
+                                                  cont_attr_funct_max_val]
+        elif (cont_attr_funct == 'normal'):
+          cont_attr_funct_mu =    float(rec_list[3])
+          cont_attr_funct_sigma = float(rec_list[4])
+          try:
+            cont_attr_funct_min_val = float(rec_list[5])
+          except:
+            cont_attr_funct_min_val = None
+          if (cont_attr_funct_min_val != None):
+            basefunctions.check_is_number('cont_attr_funct_min_val',
+                                          cont_attr_funct_min_val)
+          try:
+            cont_attr_funct_max_val = float(rec_list[6])
+          except:
+            cont_attr_funct_max_val = None
+          if (cont_attr_funct_max_val != None):
+            basefunctions.check_is_number('cont_attr_funct_max_val',
+                                          cont_attr_funct_max_val)
+          this_cont_funct_dict[cate_attr2_val] = [cont_attr_funct,
+                                                  cont_attr_funct_mu,
+                                                  cont_attr_funct_sigma,
+                                                  cont_attr_funct_min_val,
+                                                  cont_attr_funct_max_val]
+
+        list_counter += 1
+        if (list_counter < num_file_rows):
+          rec_list = lookup_file_data[list_counter]
+        else:
+          rec_list = []
+
+      cate_val2_dict[cate_attr1_val] = this_cate_val2_dict
+
+      # Store function data for each combination of categorial values
+      #
+      for cate_attr2_val in this_cont_funct_dict:
+        cont_dict_key = cate_attr1_val+'-'+cate_attr2_val
+        cont_funct_dict[cont_dict_key] = this_cont_funct_dict[cate_attr2_val]
+
+    # Number the pairs of categorical values in the sorted order of their
+    # values, and build an alias table over the first values and their
+    # counts, and for each first value (in the same order) an alias table over
+    # the codes of its pairs and the counts of their second values
+    #
+    cate_pair_val1_list =  []
+    cate_pair_val2_list =  []
+    cate_pair_funct_list = []
+    cate_pair_table_list = []
+
+    for cate_attr1_val in sorted(cate_val1_dict):
+      cate_pair_count_list = []
+
+      for (cate_attr2_val, val2_count) in \
+          sorted(cate_val2_dict[cate_attr1_val].items()):
+        cate_pair_count_list.append((len(cate_pair_funct_list), val2_count))
+        cate_pair_val1_list.append(cate_attr1_val)
+        cate_pair_val2_list.append(cate_attr2_val)
+        cate_pair_funct_list.append(
+                             cont_funct_dict[cate_attr1_val+'-'+cate_attr2_val])
+
+      cate_pair_table_list.append(sampler.AliasTable(cate_pair_count_list))
+
+    self.cate_attr1_table = sampler.AliasTable(sorted(cate_val1_dict.items()))
+    self.cate_pair_table_list = cate_pair_table_list
+    self.cate_pair_val1_list =  cate_pair_val1_list
+    self.cate_pair_val2_list =  cate_pair_val2_list
+    self.cate_pair_funct_list = cate_pair_funct_list
+    self.cont_funct_dict =      cont_funct_dict
+
+    # NumPy versions of the values of the pairs, only built when values are
+    # generated in bulk
+    #
+    self.cate_pair_val1_array = None
+    self.cate_pair_val2_array = None
+
+  # ---------------------------------------------------------------------------
+
+  def get_attribute_name_list(self):
+    """Method which returns the list of the names of the attributes generated,
+       in the sequence their values are created.
+    """
+
+    return [self.categorical1_attribute_name,
+            self.categorical2_attribute_name, self.continuous_attribute_name]
+
+  # ---------------------------------------------------------------------------
+
+  def create_attribute_values(self):
+    """Method which creates and returns two categorical attribute values and
+       one continuous value, where the second categorical value depends upon
+       the first value, andthe continuous value depends on both categorical
+       values. The two categorical values are randomly selected according to
+       the provided frequency distributions, while  the continuous value is
+       generated according to the selected function and its parameters.
+    """
+
+    cate_attr1_code = self.cate_attr1_table.draw_index()
+    cate_pair_code =  self.cate_pair_table_list[cate_attr1_code].draw()
+
+    cate_attr1_val = self.cate_pair_val1_list[cate_pair_code]
+    cate_attr2_val = self.cate_pair_val2_list[cate_pair_code]
+
+    # Get the details of the function and generate the continuous value
+    #
+    funct_details = self.cate_pair_funct_list[cate_pair_code]
+    funct_name = funct_details[0]
+
+    if (funct_name == 'uniform'):
+      cont_attr_val = random.uniform(funct_details[1], funct_details[2])
+
+    elif (funct_name == 'normal'):
+      mu =      funct_details[1]
+      sigma =   funct_details[2]
+      min_val = funct_details[3]
+      max_val = funct_details[4]
+
+      cont_attr_val = get_truncated_normal(mu, sigma, min_val, max_val).draw()
+
+      if (min_val != None):
+        assert cont_attr_val >= min_val
+      if (max_val != None):
+        assert cont_attr_val <= max_val
+
+    else:
+      raise Exception( ('Illegal continuous function given:', funct_name))
+
+    cont_attr_val_str = self.continuous_value_formatter(cont_attr_val)
+ 
+    return cate_attr1_val, cate_attr2_val, cont_attr_val_str
+
+  # ---------------------------------------------------------------------------
+
+  def create_attribute_values_batch(self, n):
+    """Method which creates n records of two categorical and one continuous
+       attribute values, and returns them as a tuple of three columns, with
+       the categorical columns NumPy arrays if NumPy is available and
+       otherwise lists, and the continuous column a list of strings.
+    """
+
+    if (numpy == None):
+      return GenerateCompoundAttribute.create_attribute_values_batch(self, n)
+
+    basefunctions.check_is_integer('n', n)
+    basefunctions.check_is_not_negative('n', n)
+
+    if (self.cate_pair_val1_array is None):
+      self.cate_pair_val1_array = sampler.object_array(self.cate_pair_val1_list)
+      self.cate_pair_val2_array = sampler.object_array(self.cate_pair_val2_list)
+
+    # Draw the codes of the first values, then the codes of the pairs of
+    # categorical values for all records with the same first value at once,
+    # and then the continuous values for all records with the same pair, with
+    # the records grouped by sorting the codes once for each step
+    #
+    cate_attr1_code_col = self.cate_attr1_table.draw_index_many(n)
+    cate_pair_col = numpy.empty(n, dtype=numpy.int64)
+
+    for (cate_attr1_code, rec_index_array) in \
+        group_by_code(cate_attr1_code_col, self.cate_attr1_table.num_values):
+      cate_pair_table = self.cate_pair_table_list[cate_attr1_code]
+      cate_pair_col[rec_index_array] = \
+                                 cate_pair_table.draw_many(len(rec_index_array))
+
+    cont_attr_col = numpy.empty(n)
+
+    for (cate_pair_code, rec_index_array) in \
+        group_by_code(cate_pair_col, len(self.cate_pair_funct_list)):
+      funct_details = self.cate_pair_funct_list[cate_pair_code]
+      cont_attr_col[rec_index_array] = \
+          generate_cont_values_batch(funct_details[0], funct_details[1:],
+                                     len(rec_index_array))
+
+    return self.cate_pair_val1_array[cate_pair_col], \
+           self.cate_pair_val2_array[cate_pair_col], \
+           float_to_str_batch(cont_attr_col, self.continuous_value_type)
+
+# =============================================================================
+
+class GenerateContContCompoundAttribute(GenerateCompoundAttribute):
+  """Generate two continuous attribute values, where the value of the second
+     attribute depends upon the value of the first attribute.
+
+     This for example allows the modelling of:
+     - salary values that depend upon age values, or
+     - blood pressure values that depend upon age values.
+
+     The arguments that have to be set when this attribute type is initialised
+     are:
+
+     continuous1_attribute_name  The name of the first continuous attribute
+                                 that will be generated. This name will be
+                                 used in the header line to be written into
+                                 the output file.
+
+     continuous2_attribute_name  The name of the second continuous attribute
+                                 that will be generated. This name will be
+                                 used in the header line to be written into
+                                 the output file.
+
+     continuous1_funct_name      The name of the function that is used to
+                                 randomly generate the values of the first
+                                 attribute. Implemented functions currently
+                                 are:
+                                 - uniform
+                                 - normal
+
+     continuous1_funct_param     A list with the parameters required for the
+                                 function that generates the continuous values
+                                 in the first attribute. They are:
+                                 - uniform:  [min_val, max_val]
+                                 - normal:   [mu, sigma, min_val, max_val]
+                                             (min_val and max_val can be set
+                                             to None in which case no minimum
+                                             or maximum is enforced)
+
+     continuous2_function        A Python function that has a floating-point
+                                 value as input (assumed to be a value
+                                 generated for the first attribute) and that
+                                 returns a floating-point value (assumed to be
+                                 the value of the second attribute).
+
+     continuous1_value_type      The format of how the continuous values in
+                                 the first attribute are returned when they
+                                 are generated. Possible values are 'int', so
+                                 integer values are generated; or 'float1',
+                                 'float2', to 'float9', in which case
+                                 floating-point values with the specified
+                                 number of digits behind the comma are
+                                 generated.
+
+     continuous2_value_type      The same as for the first attribute.
+  """
+
+  # ---------------------------------------------------------------------------
+
+  def __init__(self, **kwargs):
+    """Constructor. Process the derived keywords first, then call the base
+       class constructor.
+    """
+
+    # General attributes for all data set generators
+    #
+    self.number_of_atttributes = 2
+    self.attribute_type =        'Compound-Continuous-Continuous'
+
+    for (keyword, value) in kwargs.items():
+
+      if (keyword.startswith('continuous1_a')):
+        basefunctions.check_is_non_empty_string('continuous1_attribute_name',
+                                                value)
+        self.continuous1_attribute_name = value
+
+      elif (keyword.startswith('continuous2_a')):
+        basefunctions.check_is_non_empty_string('continuous2_attribute_name',
+                                                value)
+        self.continuous2_attribute_name = value
+
+      elif (keyword.startswith('continuous1_funct_n')):
+        basefunctions.check_is_non_empty_string('continuous1_funct_name',
+                                                value)
+        self.continuous1_funct_name = value
+
+      elif (keyword.startswith('continuous1_funct_p')):
+        basefunctions.check_is_list('continuous1_funct_param', value)
+        self.continuous1_funct_param = value
+
+      elif (keyword.startswith('continuous2_f')):
+        basefunctions.check_is_function_or_method('continuous2_function',
+                                                   value)
+        self.continuous2_function = value
+
+      elif (keyword.startswith('continuous1_v')):
+        basefunctions.check_is_non_empty_string('continuous1_value_type',
+                                                value)
+        basefunctions.check_is_valid_format_str('continuous1_value_type',
+                                                value)
+        self.continuous1_value_type = value
+
+      elif (keyword.startswith('continuous2_v')):
+        basefunctions.check_is_non_empty_string('continuous2_value_type',
+                                                value)
+        basefunctions.check_is_valid_format_str('continuous2_value_type',
+                                                value)
+        self.continuous2_value_type = value
+
+      else:
+        raise Exception( 'Illegal constructor argument keyword: "%s"' % \
+              (str(keyword)))
+
+    # Check if the necessary variables have been set
+    #
+    basefunctions.check_is_non_empty_string('continuous1_attribute_name',
+                                            self.continuous1_attribute_name)
+    basefunctions.check_is_non_empty_string('continuous2_attribute_name',
+                                            self.continuous2_attribute_name)
+    basefunctions.check_is_non_empty_string('continuous1_funct_name',
+                                            self.continuous1_funct_name)
+    basefunctions.check_is_list('continuous1_funct_param',
+                                self.continuous1_funct_param)
+    basefunctions.check_is_function_or_method('continuous2_function',
+                                              self.continuous2_function)
+    basefunctions.check_is_non_empty_string('continuous1_value_type',
+                                            self.continuous1_value_type)
+    basefunctions.check_is_non_empty_string('continuous2_value_type',
+                                            self.continuous2_value_type)
+
+    if (self.continuous1_attribute_name == self.continuous2_attribute_name):
+      raise Exception( 'Both attribute names are the same')
+
+    basefunctions.check_is_valid_format_str('continuous1_value_type',
+                                            self.continuous1_value_type)
+    basefunctions.check_is_valid_format_str('continuous2_value_type',
+                                            self.continuous2_value_type)
+
+    self.continuous1_value_formatter = \
+                basefunctions.get_float_formatter(self.continuous1_value_type)
+    self.continuous2_value_formatter = \
+                basefunctions.get_float_formatter(self.continuous2_value_type)
+
+    # Check that the function for attribute 2 does return a float value
+    #
+    funct_ret = self.continuous2_function(1.0)
+    if (not isinstance(funct_ret, float)):
+      raise Exception( ('Function provided for attribute 2 does not return' + \
+                        ' a floating-point value:', type(funct_ret)))
+
+    # Check type and number of parameters given for attribute 1 functions
+    #
+    if (self.continuous1_funct_name not in ['uniform','normal']):
+      raise Exception( 'Illegal continuous attribute 1 function given: "%s"' % \
+                         (self.continuous1_funct_name))
+
+    # Get function parameters from file data
+    #
+    if (self.continuous1_funct_name == 'uniform'):
+      assert len(self.continuous1_funct_param) == 2
+
+      cont_attr1_funct_min_val = self.continuous1_funct_param[0]
+      cont_attr1_funct_max_val = self.continuous1_funct_param[1]
+      basefunctions.check_is_number('cont_attr1_funct_min_val',
+                                    cont_attr1_funct_min_val)
+      basefunctions.check_is_number('cont_attr1_funct_max_val',
+                                    cont_attr1_funct_max_val)
+
+      assert cont_attr1_funct_min_val < cont_attr1_funct_max_val
+
+      self.attr1_funct_param = [cont_attr1_funct_min_val,
+                                cont_attr1_funct_max_val]
+
+    elif (self.continuous1_funct_name == 'normal'):
+      assert len(self.continuous1_funct_param) == 4
+
+      cont_attr1_funct_mu =      self.continuous1_funct_param[0]
+      cont_attr1_funct_sigma =   self.continuous1_funct_param[1]
+      cont_attr1_funct_min_val = self.continuous1_funct_param[2]
+      cont_attr1_funct_max_val = self.continuous1_funct_param[3]
+
+      basefunctions.check_is_number('cont_attr1_funct_mu', cont_attr1_funct_mu)
+      basefunctions.check_is_number('cont_attr1_funct_sigma',
+                                    cont_attr1_funct_sigma)
+
+      basefunctions.check_is_positive('cont_attr1_funct_sigma',
+                                        cont_attr1_funct_sigma)
+
+      if (cont_attr1_funct_min_val != None):
+        basefunctions.check_is_number('cont_attr1_funct_min_val',
+                                      cont_attr1_funct_min_val)
+        assert cont_attr1_funct_min_val <= cont_attr1_funct_mu
+
+      if (cont_attr1_funct_max_val != None):
+        basefunctions.check_is_number('cont_attr1_funct_max_val',
+                                      cont_attr1_funct_max_val)
+        assert cont_attr1_funct_max_val >= cont_attr1_funct_mu
+
+      if (cont_attr1_funct_min_val != None) and \
+            (cont_attr1_funct_max_val) != None:
+        assert cont_attr1_funct_min_val < cont_attr1_funct_max_val
+
+      self.attr1_funct_param = [cont_attr1_funct_mu,
+                                cont_attr1_funct_sigma,
+                                cont_attr1_funct_min_val,
+                                cont_attr1_funct_max_val]
+
+  # ---------------------------------------------------------------------------
+
+  def get_attribute_name_list(self):
+    """Method which returns the list of the names of the attributes generated,
+       in the sequence their values are created.
+    """
+
+    return [self.continuous1_attribute_name,
+            self.continuous2_attribute_name]
+
+  # ---------------------------------------------------------------------------
+
+  def create_attribute_values(self):
+    """Method which creates and returns two continuous attribute values, with
+       the the first continuous value according to the selected function and
+       its parameters, and the second value depending upon the first value.
+    """
+
+    # Get the details of the function and generate the first continuous value
+    #
+    funct_name =    self.continuous1_funct_name
+    funct_details = self.attr1_funct_param
+
+    if (funct_name == 'uniform'):
+      cont_attr1_val = random.uniform(funct_details[0], funct_details[1])
+
+    elif (funct_name == 'normal'):
+      mu =      funct_details[0]
+      sigma =   funct_details[1]
+      min_val = funct_details[2]
+      max_val = funct_details[3]
+
+      cont_attr1_val = get_truncated_normal(mu, sigma, min_val, max_val).draw()
+
+      if (min_val != None):
+        assert cont_attr1_val >= min_val
+      if (max_val != None):
+        assert cont_attr1_val <= max_val
+
+    else:
+      raise Exception( ('Illegal continuous function given:', funct_name))
+
+    # Generate the second attribute value
+    #
+    cont_attr2_val = self.continuous2_function(cont_attr1_val)
+
+    cont_attr1_val_str = self.continuous1_value_formatter(cont_attr1_val)
+    cont_attr2_val_str = self.continuous2_value_formatter(cont_attr2_val)
+
+    return cont_attr1_val_str, cont_attr2_val_str
+
+  # ---------------------------------------------------------------------------
+
+  def create_attribute_values_batch(self, n):
+    """Method which creates n pairs of continuous attribute values, and
+       returns them as a tuple of two columns, each a list of strings.
+
+       The values of the first attribute are generated at once (using NumPy
+       if it is available). If an array version of the function for the
+       second attribute has been registered (see
+       contdepfunct.register_array_function()) the whole column is passed
+       through it, otherwise the function is called once for each value.
+    """
+
+    basefunctions.check_is_integer('n', n)
+    basefunctions.check_is_not_negative('n', n)
+
+    cont_attr1_col = generate_cont_values_batch(self.continuous1_funct_name,
+                                                self.attr1_funct_param, n)
+
+    array_funct = contdepfunct.get_array_function(self.continuous2_function)
+
+    if (array_funct != None):
+      cont_attr2_col = array_funct(cont_attr1_col)
+      if (len(cont_attr2_col) != n):
+        raise Exception( 'Array function for attribute 2 returned %d ' % \
+                         (len(cont_attr2_col)) + 'values instead of %d' % (n))
+
+    else:
+      if (numpy != None):
+        cont_attr1_col = cont_attr1_col.tolist()
+
+      continuous2_function = self.continuous2_function  # Short-hand
+
+      cont_attr2_col = [continuous2_function(cont_attr1_val) for \
+                        cont_attr1_val in cont_attr1_col]
+
+    return float_to_str_batch(cont_attr1_col, self.continuous1_value_type), \
+           float_to_str_batch(cont_attr2_col, self.continuous2_value_type)
 
 # =============================================================================
 
-class GenerateCateContCompoundAttribute(GenerateCompoundAttribute):
-  """Generate two attributes, one containing categorical values and the other
-     continuous values, where the continuous values depend upon the categorical
-     values.
+class GenerateConditionalChainAttribute(GenerateCompoundAttribute):
+  """Generate a chain of any number of categorical attributes, where the
+     values of each attribute depend upon the values of all attributes before
+     it in the chain.
 
      This for example allows the modelling of:
-     - salary values that depend upon gender values, or
-     - blood pressure values that depend upon age values.
+     - gender, state, city, postcode and area code values, where each
+       geographic value depends upon the values before it.
 
      The arguments that have to be set when this attribute type is initialised
      are:
 
-     categorical_attribute_name  The name of the categorical attribute that
-                                 will be generated. This name will be used in
-                                 the header line to be written into the output
-                                 file.
-
-     continuous_attribute_name   The name of the continuous attribute that will
-                                 be generated. This name will be used in the
-                                 header line to be written into the output
-                                 file.
-
-     lookup_file_name            Name of the file which contains the values of
-                                 the continuous attribute, and for each of these
-                                 values the name of a function (and its
-                                 parameters) that is used to generate the
-                                 continuous values. This file format is further
-                                 explained below.
+     attribute_name_list  A list with the names of the categorical attributes
+                          (at least two) in the order of the chain. These
+                          names will be used in the header line to be written
+                          into the output file.
 
-     has_header_line             A flag, set to True or False, that has to be
-                                 set according to if the look-up file starts
-                                 with a header line or not.
+     lookup_file_name     Name of the file which contains the combinations of
+                          values of all attributes in the chain, and their
+                          counts. This file format is further explained below.
 
-     unicode_encoding            The Unicode encoding (a string name) of the
-                                 file.
+     has_header_line      A flag, set to True or False, that has to be set
+                          according to if the look-up file starts with a
+                          header line or not.
 
-     continuous_value_type       The format of how continuous values are
-                                 returned when they are generated. Possible
-                                 values are 'int', so integer values are
-                                 returned; or 'float1', 'float2', to 'float9',
-                                 in which case floating-point values with the
-                                 specified number of digits behind the comma
-                                 are returned.
+     unicode_encoding     The Unicode encoding (a string name) of the file.
 
      The format of the look-up file is:
 
      # Comment lines start with the # character
-     cate_val,count,funct_name,funct_param_1,...,funct_param_N
-
-     The look-up file is a comma separated values (CSV) file with the following
-     columns:
-     1) A categorical value. For all possible categorical values of an
-        attribute, one row must be specified in this look-up file.
-
-     2) Count of this categorical value (a positive integer number). This
-        determines the likelihood of how often a certain categorical value will
-        be chosen.
+     cate_attr1_val,cate_attr2_val,...,cate_attrN_val,count
 
-     3) A function which generates the continuous value for this categorical
-        value. Implemented functions currently are:
-        - uniform
-        - normal
+     The look-up file is a comma separated values (CSV) file where each row
+     contains one value for each attribute in the chain (in the order of the
+     attribute name list), followed by the count (a positive integer number)
+     of this combination of values. Each combination can only occur once.
 
-     4) The parameters required for the function that generates the continuous
-        values. They are:
-        - uniform:  min_val, max_val
-        - normal:   mu, sigma, min_val, max_val
-                    (min_val and max_val can be set to None in which case no
-                    minimum or maximum is enforced)
+     For each combination of values of the first attributes in the chain (a
+     parent context), the values of the next attribute are drawn according to
+     the sum of the counts of all rows that start with this context. One alias
+     table is built for each parent context, so each value is drawn in
+     constant time.
 
      Example:
-       male,60,uniform,20000,100000  
-       female,40,normal,35000,100000,10000,None
+       male,act,canberra,2600,30
+       male,act,belconnen,2617,15
+       male,nsw,sydney,2000,80
+       female,act,canberra,2600,28
+       female,nsw,sydney,2000,75
   """
 
   # ---------------------------------------------------------------------------
@@ -888,27 +3269,18 @@ class GenerateCateContCompoundAttribute(GenerateCompoundAttribute):
 
     # General attributes for all data set generators
     #
-    self.number_of_atttributes = 2
-    self.attribute_type =        'Compound-Categorical-Continuous'
+    self.attribute_type = 'Compound-Conditional-Chain'
 
-    for (keyword, value) in kwargs.items():
-
-      if (keyword.startswith('cate')):
-        basefunctions.check_is_non_empty_string('categorical_attribute_name',
-                                                value)
-        self.categorical_attribute_name = value
+    self.attribute_name_list = None
+    self.lookup_file_name =    None
+    self.has_header_line =     None
+    self.unicode_encoding =    None
 
-      elif (keyword.startswith('continuous_a')):
-        basefunctions.check_is_non_empty_string('continuous_attribute_name',
-                                                value)
-        self.continuous_attribute_name = value
+    for (keyword, value) in kwargs.items():
 
-      elif (keyword.startswith('continuous_v')):
-        basefunctions.check_is_non_empty_string('continuous_value_type',
-                                                value)
-        basefunctions.check_is_valid_format_str('continuous_value_type',
-                                                value)
-        self.continuous_value_type = value
+      if (keyword.startswith('attribute_name')):
+        basefunctions.check_is_list('attribute_name_list', value)
+        self.attribute_name_list = value
 
       elif (keyword.startswith('look')):
         basefunctions.check_is_non_empty_string('lookup_file_name', value)
@@ -928,293 +3300,359 @@ class GenerateCateContCompoundAttribute(GenerateCompoundAttribute):
 
     # Check if the necessary variables have been set
     #
-    basefunctions.check_is_non_empty_string('categorical_attribute_name',
-                                            self.categorical_attribute_name)
-    basefunctions.check_is_non_empty_string('continuous_attribute_name',
-                                            self.continuous_attribute_name)
+    basefunctions.check_is_list('attribute_name_list',
+                                self.attribute_name_list)
     basefunctions.check_is_non_empty_string('lookup_file_name',
                                             self.lookup_file_name)
     basefunctions.check_is_flag('has_header_line', self.has_header_line)
     basefunctions.check_is_non_empty_string('unicode_encoding',
                                             self.unicode_encoding)
 
-    if (self.categorical_attribute_name == self.continuous_attribute_name):
-      raise Exception( 'Both attribute names are the same')
+    if (len(self.attribute_name_list) < 2):
+      raise Exception( 'At least two attribute names are needed for a ' + \
+                       'conditional chain: %s' % (self.attribute_name_list))
+    for attr_name in self.attribute_name_list:
+      basefunctions.check_is_non_empty_string('attribute_name', attr_name)
+    if (len(set(self.attribute_name_list)) != len(self.attribute_name_list)):
+      raise Exception( 'Attribute names in the chain are not all different')
 
-    basefunctions.check_is_valid_format_str('continuous_value_type',
-                                            self.continuous_value_type)
+    self.number_of_atttributes = len(self.attribute_name_list)
 
-    # Load the lookup file - - - - - - - - - - - - - - - - - - - - - - - - - -
+    # Load the lookup file and build one conditional alias table per level,
+    # with the parent nodes as contexts, the tables are shared with all other
+    # attributes that use the same file.
+    #
+    self.level_value_list, self.level_table_list = \
+           lookupcache.get_shared_table(self.lookup_file_name,
+                                        self.unicode_encoding,
+                                        self.has_header_line, 'chain-alias',
+                                        self.build_chain_tables)
+
+    if (len(self.level_value_list) != self.number_of_atttributes):
+      raise Exception( 'Look-up file %s contains %d attributes, but %d ' % \
+                       (self.lookup_file_name, len(self.level_value_list),
+                        self.number_of_atttributes) + 'attribute names are ' + \
+                       'given')
+
+    # NumPy versions of the value lists, only built when values are generated
+    # in bulk
     #
+    self.level_value_array_list = None
+
+  # ---------------------------------------------------------------------------
+
+  def build_chain_tables(self):
+    """Method which loads the look-up file and returns a pair made of:
+
+       - A list with one list per level (attribute) of the chain, containing
+         the attribute values of the nodes of this level (a node being a
+         combination of values of this and all previous attributes, identified
+         by its index in this list).
+       - A list with one conditional alias table per level, with the nodes of
+         the previous level as contexts (for the first level a single empty
+         context with index 0) and the indices of their child nodes as values.
+    """
+
     header_list, lookup_file_data = \
-                     basefunctions.read_csv_file(self.lookup_file_name,
-                                                 self.unicode_encoding,
-                                                 self.has_header_line)
+                     lookupcache.read_csv_file(self.lookup_file_name,
+                                               self.unicode_encoding,
+                                               self.has_header_line)
 
-    cate_val_dict = {}    # The categorical attribute values to be loaded from
-                          # file and their counts.
-    cont_funct_dict = {}  # For each categorical attribute value the details of
-                          # the function used for the continuous attribute.
+    if (lookup_file_data == []):
+      raise Exception( 'Empty lookup file %s' % (self.lookup_file_name))
+
+    num_levels = len(lookup_file_data[0]) - 1
+
+    if (num_levels < 2):
+      raise Exception( 'Lookup file %s needs at least two attribute ' % \
+                       (self.lookup_file_name) + 'values and a count per line')
+
+    level_value_list = [[] for j in range(num_levels)]
+
+    level_node_dict_list = [{} for j in range(num_levels)]  # Keys are pairs
+                           # (parent node index, value), values node indices
+
+    level_child_list = [[] for j in range(num_levels)]  # Per parent node a
+                       # list of its child nodes (in file order)
+
+    level_count_list = [[] for j in range(num_levels)]  # Per node the sum of
+                       # the counts of all combinations that start with it
+
+    level_child_list[0].append([])  # The single empty context of level 0
 
-    # Process attribute values from file and their details
-    #
     for rec_list in lookup_file_data:
-      if (len(rec_list) not in [5,7]):
+
+      if (len(rec_list) != num_levels+1):
         raise Exception( 'Illegal format in lookup file %s: %s' % \
                          (self.lookup_file_name, str(rec_list)))
-      cate_attr_val =  rec_list[0].strip()
+
       try:
-        cate_attr_count = int(rec_list[1])
+        val_count = int(rec_list[-1])
       except:
-        raise Exception( 'Value count given for categorical attribute is ' + \
-                         'not an integer number: %s' % (rec_list[1]))
-      cont_attr_funct = rec_list[2].strip()
+        raise Exception( 'Value count given is not an integer number: %s' % \
+                         (rec_list[-1]))
+      basefunctions.check_is_positive('val_count', val_count)
 
-      if (cate_attr_val == ''):
-        raise Exception( 'Empty categorical attribute value in lookup file %s'\
-                         % (self.lookup_file_name))
-      if (cate_attr_count <= 0):
-        raise Exception( 'Count given for categorical attribute is not ' + \
-                         'positive for value "%s" in lookup ' % \
-                         (cate_attr_val) + 'file %s' % (self.lookup_file_name))
+      parent_node = 0
 
-      if (cate_attr_val in cate_val_dict):
-        raise Exception( 'Attribute values "%s" occurs twice in ' % \
-                         (cate_attr_val) + 'lookup file %s' % \
-                         (self.lookup_file_name))
+      for j in range(num_levels):
+        attr_val = rec_list[j].strip()
 
-      if (cont_attr_funct not in ['uniform','normal']):
-        raise Exception( 'Illegal continuous attribute function given: "%s"' % \
-                         (cont_attr_funct) + ' in lookup file %s' % \
-                         (self.lookup_file_name))
+        if (attr_val == ''):
+          raise Exception( 'Empty categorical value for attribute %d in ' % \
+                           (j+1) + 'lookup file %s' % (self.lookup_file_name))
 
-      cate_val_dict[cate_attr_val] = cate_attr_count
+        node_dict = level_node_dict_list[j]
+        node_key = (parent_node, attr_val)
 
-      # Get function parameters from file data
-      #
-      if (cont_attr_funct == 'uniform'):
-        cont_attr_funct_min_val = float(rec_list[3])
-        basefunctions.check_is_number('cont_attr_funct_min_val',
-                                      cont_attr_funct_min_val)
+        if (node_key in node_dict):
+          node = node_dict[node_key]
+          if (j == num_levels-1):
+            raise Exception( 'Value combination "%s" occurs twice in ' % \
+                             (','.join(rec_list[:-1])) + 'lookup file %s' % \
+                             (self.lookup_file_name))
+        else:
+          node = len(level_value_list[j])
+          node_dict[node_key] = node
+          level_value_list[j].append(attr_val)
+          level_count_list[j].append(0)
+          level_child_list[j][parent_node].append(node)
+          if (j < num_levels-1):
+            level_child_list[j+1].append([])
 
-        cont_attr_funct_max_val = float(rec_list[4])
-        basefunctions.check_is_number('cont_attr_funct_max_val',
-                                      cont_attr_funct_max_val)
+        level_count_list[j][node] += val_count
 
-        cont_funct_dict[cate_attr_val] = [cont_attr_funct,
-                                          cont_attr_funct_min_val,
-                                          cont_attr_funct_max_val]
+        parent_node = node
 
-      elif (cont_attr_funct == 'normal'):
-        cont_attr_funct_mu =    float(rec_list[3])
-        basefunctions.check_is_number('cont_attr_funct_mu',
-                                      cont_attr_funct_mu)
+    # Build one conditional alias table per level over the child nodes of
+    # each parent context
+    #
+    level_table_list = []
 
-        cont_attr_funct_sigma = float(rec_list[4])
-        basefunctions.check_is_number('cont_attr_funct_sigma',
-                                      cont_attr_funct_sigma)
-        try:
-          cont_attr_funct_min_val = float(rec_list[5])
-        except:
-          cont_attr_funct_min_val = None
-        if (cont_attr_funct_min_val != None):
-          basefunctions.check_is_number('cont_attr_funct_min_val',
-                                        cont_attr_funct_min_val)
-        try:
-          cont_attr_funct_max_val = float(rec_list[6])
-        except:
-          cont_attr_funct_max_val = None
-        if (cont_attr_funct_max_val != None):
-          basefunctions.check_is_number('cont_attr_funct_max_val',
-                                        cont_attr_funct_max_val)
+    for j in range(num_levels):
+      count_list = level_count_list[j]
 
-        cont_funct_dict[cate_attr_val] = [cont_attr_funct,
-                                          cont_attr_funct_mu,
-                                          cont_attr_funct_sigma,
-                                          cont_attr_funct_min_val,
-                                          cont_attr_funct_max_val]
+      level_table_list.append(sampler.ConditionalAliasTable(
+                              [[(node, count_list[node]) for node in \
+                                child_list] for child_list in \
+                               level_child_list[j]]))
 
-    # Generate a list of values according to their counts
-    #
-    cate_attr_val_list = []
+    return level_value_list, level_table_list
+
+  # ---------------------------------------------------------------------------
+
+  def get_attribute_name_list(self):
+    """Method which returns the list of the names of the attributes generated,
+       in the sequence their values are created.
+    """
+
+    return list(self.attribute_name_list)
+
+  # ---------------------------------------------------------------------------
+
+  def create_attribute_values(self):
+    """Method which creates and returns one value for each attribute in the
+       chain, each randomly selected according to the counts of the values
+       given the values of all attributes before it.
+    """
+
+    assert self.level_table_list != None
+
+    attr_val_list = []
+
+    node = 0
+    for (value_list, level_table) in zip(self.level_value_list,
+                                         self.level_table_list):
+      node = level_table.draw(node)
+      attr_val_list.append(value_list[node])
+
+    return tuple(attr_val_list)
+
+  # ---------------------------------------------------------------------------
+
+  def create_attribute_values_batch(self, n):
+    """Method which creates n records of values of the attributes in the
+       chain, and returns them as a tuple of columns, as NumPy arrays if NumPy
+       is available, otherwise as lists.
+
+       The values are generated one level at a time, the values of all records
+       drawn at once from the conditional alias table of the level with the
+       parent nodes of the records as contexts.
+    """
+
+    if (numpy == None):
+      return GenerateCompoundAttribute.create_attribute_values_batch(self, n)
+
+    basefunctions.check_is_integer('n', n)
+    basefunctions.check_is_not_negative('n', n)
+
+    node_array = numpy.zeros(n, dtype=numpy.int64)  # Level 0 context
+
+    return tuple(self.create_level_values_batch(node_array, 0))
+
+  # ---------------------------------------------------------------------------
+
+  def create_level_values_batch(self, node_array, start_level):
+    """Method which creates the values of the attributes from the given
+       level on for records whose nodes of the level before are given in the
+       NumPy array 'node_array' (for level 0 all nodes are 0), and returns
+       them as a list of NumPy arrays, one per level.
+
+       The values are generated one level at a time, the child nodes of all
+       records drawn at once from the conditional alias table of the level
+       with the nodes of the level before as contexts.
+    """
+
+    if (self.level_value_array_list is None):
+      self.level_value_array_list = [sampler.object_array(value_list) for \
+                                     value_list in self.level_value_list]
 
-    for (cate_attr_val, val_count) in cate_val_dict.iteritems():
+    col_list = []
 
-      # Append value as many times as given in their counts
-      #
-      new_list = [cate_attr_val]* val_count
-      cate_attr_val_list += new_list
+    for j in range(start_level, self.number_of_atttributes):
+      node_array = self.level_table_list[j].draw_many(node_array)
 
-    random.shuffle(cate_attr_val_list)  # Randomly shuffle the list of values
+      col_list.append(self.level_value_array_list[j][node_array])
 
-    self.cate_attr_val_list = cate_attr_val_list
-    self.cont_funct_dict =    cont_funct_dict
+    return col_list
 
   # ---------------------------------------------------------------------------
 
-  def create_attribute_values(self):
-    """Method which creates and returns two attribute values, one categorical
-       and one continuous, with the categorical value randomly selected
-       according to the provided frequency distribution, and the continuous
-       value according to the selected function and its parameters.
+  def get_stratum_list(self, num_strata_attr):
+    """Method which returns a list of pairs (stratum values, weight) with one
+       stratum for each combination of values of the first 'num_strata_attr'
+       attributes in the chain, and its probability as weight.
     """
 
-    assert self.cate_attr_val_list != []
+    assert 1 <= num_strata_attr <= self.number_of_atttributes
 
-    cate_attr_val = random.choice(self.cate_attr_val_list)
+    path_list = [((), 0, 1.0)]  # Tuples (values, node, probability)
 
-    # Get the details of the function and generate the continuous value
-    #
-    funct_details = self.cont_funct_dict[cate_attr_val]
-    funct_name = funct_details[0]
+    for j in range(num_strata_attr):
+      value_list = self.level_value_list[j]
+      new_path_list = []
 
-    if (funct_name == 'uniform'):
-      cont_attr_val = random.uniform(funct_details[1], funct_details[2])
+      for (val_tuple, node, node_prob) in path_list:
+        table = self.level_table_list[j].table_list[node]
 
-    elif (funct_name == 'normal'):
-      mu =      funct_details[1]
-      sigma =   funct_details[2]
-      min_val = funct_details[3]
-      max_val = funct_details[4]
-      in_range = False
+        for (child_node, child_count) in zip(table.value_list,
+                                             table.count_list):
+          new_path_list.append((val_tuple+(value_list[child_node],),
+                                child_node,
+                                node_prob*child_count/table.total_count))
+      path_list = new_path_list
 
-      cont_attr_val = random.normalvariate(mu, sigma)
+    return [(val_tuple, node_prob) for (val_tuple, node, node_prob) in \
+            path_list]
 
-      while (in_range == False):
-        if (((min_val != None) and (cont_attr_val < min_val)) or
-            ((max_val != None) and (cont_attr_val > max_val))):
-          in_range = False
-          cont_attr_val = random.normalvariate(mu, sigma)
-        else:
-          in_range = True
+  # ---------------------------------------------------------------------------
 
-      if (min_val != None):
-        assert cont_attr_val >= min_val
-      if (max_val != None):
-        assert cont_attr_val <= max_val
+  def create_attribute_values_for_stratum(self, stratum_val_tuple, n):
+    """Method which creates n records of values of the attributes in the
+       chain that start with the given values, and returns them as a tuple of
+       columns.
+    """
 
-    else:
-      raise Exception( ('Illegal continuous function given:', funct_name))
+    basefunctions.check_is_integer('n', n)
+    basefunctions.check_is_not_negative('n', n)
 
-    cont_attr_val_str = basefunctions.float_to_str(cont_attr_val,
-                                                   self.continuous_value_type)
+    # Find the node of the last given value
+    #
+    node = 0
+    for (j, attr_val) in enumerate(stratum_val_tuple):
+      value_list = self.level_value_list[j]
+      for child_node in self.level_table_list[j].table_list[node].value_list:
+        if (value_list[child_node] == attr_val):
+          node = child_node
+          break
+      else:
+        raise Exception( 'Values "%s" are not in lookup file %s' % \
+                         (','.join(stratum_val_tuple[:j+1]),
+                          self.lookup_file_name))
 
-    return cate_attr_val, cont_attr_val_str
+    num_strata_attr = len(stratum_val_tuple)
 
-# =============================================================================
+    col_list = [[attr_val]*n for attr_val in stratum_val_tuple]
 
-class GenerateCateCateContCompoundAttribute(GenerateCompoundAttribute):
-  """Generate three attributes, thefirst two containing categorical values and
-     the third containing continuous values, where the values of the second
-     attribute depend upon the values in the first attribute, and the values
-     of the third attribute depend upon both the values of the first and second
-     attribute.
+    if (numpy != None):
+      node_array = numpy.empty(n, dtype=numpy.int64)
+      node_array.fill(node)
+      col_list += self.create_level_values_batch(node_array, num_strata_attr)
 
-     This for example allows the modelling of:
-     - blood pressure depending upon gender and city of residence values, or
-     - salary depending upon gender and profession values.
+    else:
+      level_col_list = [[] for j in range(num_strata_attr,
+                                          self.number_of_atttributes)]
+      for i in range(n):
+        child_node = node
+        for j in range(num_strata_attr, self.number_of_atttributes):
+          child_node = self.level_table_list[j].draw(child_node)
+          level_col_list[j-num_strata_attr].append(
+                                       self.level_value_list[j][child_node])
+      col_list += level_col_list
+
+    return tuple(col_list)
 
-     The arguments that have to be set when this attribute type is initialised
-     are:
+# =============================================================================
 
-     categorical1_attribute_name  The name of the first categorical attribute
-                                  that will be generated. This name will be
-                                  used in the header line to be written into
-                                  the output file.
+class GenerateDependencyTreeAttribute(GenerateCompoundAttribute):
+  """Generate any number of categorical attributes whose dependencies form a
+     tree, where the values of each attribute (except the root of the tree)
+     depend upon the values of its parent attribute.
 
-     categorical2_attribute_name  The name of the second categorical attribute
-                                  that will be generated. This name will be
-                                  used in the header line to be written into
-                                  the output file.
+     Such a tree can be learned from a sample file of records (as a Chow-Liu
+     tree, see the 'tree' format of freqbuilder.py), which keeps the
+     strongest dependencies between all pairs of the attributes.
 
-     continuous_attribute_name    The name of the continuous attribute that
-                                  will be generated. This name will be used in
-                                  the header line to be written into the output
-                                  file.
+     The arguments that have to be set when this attribute type is initialised
+     are:
 
-     lookup_file_name              Name of the file which contains the values
-                                   of the first categorical attribute, and for
-                                   each of these values the names of the
-                                   categories and their counts of the second
-                                   categorical attribute, and for each of these
-                                   values the name of a function (and its
-                                   parameters) that is used to generate the
-                                   continuous values. This file format is
-                                   further explained below.
+     attribute_name_list  A list with the names of the categorical attributes
+                          (at least two) in the tree, in the order their
+                          values are returned. These names must be the
+                          attribute names used in the look-up file, and will
+                          be used in the header line to be written into the
+                          output file.
 
-     has_header_line               A flag, set to True or False, that has to be
-                                   set according to if the look-up file starts
-                                   with a header line or not.
+     lookup_file_name     Name of the file which contains the tree and the
+                          counts of the values of its attributes. This file
+                          format is further explained below.
 
-     unicode_encoding              The Unicode encoding (a string name) of the
-                                   file.
+     has_header_line      A flag, set to True or False, that has to be set
+                          according to if the look-up file starts with a
+                          header line or not.
 
-     continuous_value_type         The format of how continuous values are
-                                   returned when they are generated. Possible
-                                   values are 'int', so integer values are
-                                   returned; or 'float1', 'float2', to
-                                   'float9', in which case floating-point
-                                   values with the specified number of digits
-                                   behind the comma are returned.
+     unicode_encoding     The Unicode encoding (a string name) of the file.
 
      The format of the look-up file is:
 
      # Comment lines start with the # character
-     cate_attr1_val1,count
-     cate_attr2_val1,count,funct_name,funct_param_1,...,funct_param_N
-     cate_attr2_val2,count,funct_name,funct_param_1,...,funct_param_N
-     cate_attr2_val3,count,funct_name,funct_param_1,...,funct_param_N
-     ...
-     cate_attr2_valX,count,funct_name,funct_param_1,...,funct_param_N
-     cate_attr1_val2,count
-     cate_attr2_val1,count,funct_name,funct_param_1,...,funct_param_N
-     cate_attr2_val2,count,funct_name,funct_param_1,...,funct_param_N
-     cate_attr2_val3,count,funct_name,funct_param_1,...,funct_param_N
-     ...
-     cate_attr2_valX,count,funct_name,funct_param_1,...,funct_param_N
-     cate_attr1_val3,count
-     ...
-
-
-     The look-up file is a comma separated values (CSV) file with the following
-     structure:
-
-     A) One row that contains two values:
-        1) A categorical value of the first attribute. For all possible values
-           of the first categorical attribute, one row must be specified in
-           this look-up file.
-        2) The count of this categorical value (a positive integer number).
-           This determines the likelihood of how often a certain categorical
-           value will be chosen.
-
-     B) After a row with two values, as described under A), one or more rows
-        containing the following values in columns must be given:
-        1) A categorical value from the second categorical attribute.
-        2) The count of this categorical value (a positive integer number).
-           This determines the likelihood of how often a certain categorical
-           value will be chosen.
-       3) A function which generates the continuous value for this categorical
-          value. Implemented functions currently are:
-          - uniform
-          - normal
-       4) The parameters required for the function that generates the
-          continuous values. They are:
-          - uniform:  min_val, max_val
-          - normal:   mu, sigma, min_val, max_val
-                      (min_val and max_val can be set to None in which case no
-                      minimum or maximum is enforced)
+     attr_name,parent_attr_name,parent_attr_val,attr_val,count
+
+     The look-up file is a comma separated values (CSV) file where each row
+     contains the count (a positive integer number) of a value of an
+     attribute together with a value of its parent attribute. For the root
+     attribute of the tree the parent attribute name and value are empty, and
+     the counts are those of its values. Each attribute has one parent
+     attribute, and each combination of parent value and value can only occur
+     once.
+
+     Values are generated in the order of the tree (ancestral sampling), each
+     drawn according to the counts given the value of its parent attribute.
+     For a parent value without any rows the values are drawn according to
+     the sum of the counts over all parent values. One alias table is built
+     for each parent value, and the tables of an attribute are packed
+     together so that the values of many records are drawn at once.
 
      Example:
-       male,60
-       canberra,20,uniform,50000,90000
-       sydney,30,normal,75000,50000,20000,None
-       melbourne,30,uniform,35000,200000
-       perth,20,normal,55000,250000,15000,None
-       female,40
-       canberra,10,normal,45000,10000,None,150000
-       sydney,40,uniform,60000,200000
-       melbourne,20,uniform,50000,1750000
-       brisbane,30,normal,55000,20000,20000,100000
+       gender,,,male,480
+       gender,,,female,520
+       state,gender,male,nsw,160
+       state,gender,male,act,320
+       state,gender,female,nsw,190
+       state,gender,female,act,330
+       city,state,nsw,sydney,350
+       city,state,act,canberra,600
+       city,state,act,belconnen,50
   """
 
   # ---------------------------------------------------------------------------
@@ -1226,32 +3664,18 @@ class GenerateCateCateContCompoundAttribute(GenerateCompoundAttribute):
 
     # General attributes for all data set generators
     #
-    self.number_of_atttributes = 3
-    self.attribute_type =        'Compound-Categorical-Categorical-Continuous'
-
-    for (keyword, value) in kwargs.items():
+    self.attribute_type = 'Compound-Dependency-Tree'
 
-      if (keyword.startswith('categorical1')):
-        basefunctions.check_is_non_empty_string('categorical1_attribute_name',
-                                                value)
-        self.categorical1_attribute_name = value
-
-      elif (keyword.startswith('categorical2')):
-        basefunctions.check_is_non_empty_string('categorical2_attribute_name',
-                                                value)
-        self.categorical2_attribute_name = value
+    self.attribute_name_list = None
+    self.lookup_file_name =    None
+    self.has_header_line =     None
+    self.unicode_encoding =    None
 
-      elif (keyword.startswith('continuous_a')):
-        basefunctions.check_is_non_empty_string('continuous_attribute_name',
-                                                value)
-        self.continuous_attribute_name = value
+    for (keyword, value) in kwargs.items():
 
-      elif (keyword.startswith('continuous_v')):
-        basefunctions.check_is_non_empty_string('continuous_value_type',
-                                                value)
-        basefunctions.check_is_valid_format_str('continuous_value_type',
-                                                value)
-        self.continuous_value_type = value
+      if (keyword.startswith('attribute_name')):
+        basefunctions.check_is_list('attribute_name_list', value)
+        self.attribute_name_list = value
 
       elif (keyword.startswith('look')):
         basefunctions.check_is_non_empty_string('lookup_file_name', value)
@@ -1271,510 +3695,482 @@ class GenerateCateCateContCompoundAttribute(GenerateCompoundAttribute):
 
     # Check if the necessary variables have been set
     #
-    basefunctions.check_is_non_empty_string('categorical1_attribute_name',
-                                            self.categorical1_attribute_name)
-    basefunctions.check_is_non_empty_string('categorical2_attribute_name',
-                                            self.categorical2_attribute_name)
-    basefunctions.check_is_non_empty_string('continuous_attribute_name',
-                                            self.continuous_attribute_name)
+    basefunctions.check_is_list('attribute_name_list',
+                                self.attribute_name_list)
     basefunctions.check_is_non_empty_string('lookup_file_name',
                                             self.lookup_file_name)
     basefunctions.check_is_flag('has_header_line', self.has_header_line)
     basefunctions.check_is_non_empty_string('unicode_encoding',
                                             self.unicode_encoding)
 
-    if (self.categorical1_attribute_name == self.categorical2_attribute_name) \
-       or \
-       (self.categorical1_attribute_name == self.continuous_attribute_name) \
-       or \
-       (self.categorical2_attribute_name == self.continuous_attribute_name):
-      raise Exception( 'Not all attribute names are different.')
+    if (len(self.attribute_name_list) < 2):
+      raise Exception( 'At least two attribute names are needed for a ' + \
+                       'dependency tree: %s' % (self.attribute_name_list))
+    for attr_name in self.attribute_name_list:
+      basefunctions.check_is_non_empty_string('attribute_name', attr_name)
+    if (len(set(self.attribute_name_list)) != len(self.attribute_name_list)):
+      raise Exception( 'Attribute names in the tree are not all different')
 
-    basefunctions.check_is_valid_format_str('continuous_value_type',
-                                            self.continuous_value_type)
+    self.number_of_atttributes = len(self.attribute_name_list)
 
-    # Load the lookup file - - - - - - - - - - - - - - - - - - - - - - - - - -
+    # Load the lookup file and build the tables of the tree, they are shared
+    # with all other attributes that use the same file.
     #
-    header_list, lookup_file_data = \
-                     basefunctions.read_csv_file(self.lookup_file_name,
-                                                 self.unicode_encoding,
-                                                 self.has_header_line)
-
-    cate_val1_dict = {}   # The categorical values from attribute 1 to be
-                          # loaded from file, and their counts.
-
-    cate_val2_dict = {}   # The categorical values from attribute 1 as keys
-                          # and lists of categorical values (according to their
-                          # counts) from attribute 2 as values.
-
-    cont_funct_dict = {}  # For each pair of categorical attribute values the
-                          # details of the function used for the continuous
-                          # attribute.
-
-    # Process attribute values from file and their details
+    self.tree_attr_name_list, self.parent_index_list, self.tree_value_list, \
+      self.tree_table_list = \
+           lookupcache.get_shared_table(self.lookup_file_name,
+                                        self.unicode_encoding,
+                                        self.has_header_line, 'tree-alias',
+                                        self.build_tree_tables)
+
+    if (sorted(self.tree_attr_name_list) != sorted(self.attribute_name_list)):
+      raise Exception( 'Look-up file %s contains attributes %s, but ' % \
+                       (self.lookup_file_name,
+                        ','.join(self.tree_attr_name_list)) + \
+                       'attribute names %s are given' % \
+                       (','.join(self.attribute_name_list)))
+
+    # The position in the tree order of each attribute in the attribute name
+    # list
     #
-    list_counter = 0  # Counter in the list of lookup file data
-    num_file_rows = len(lookup_file_data)
-    rec_list = lookup_file_data[list_counter]
-
-    while list_counter < num_file_rows:  # Process one row after another
-
-      if (len(rec_list) < 2):  # Need at least one categorical value and count
-        raise Exception( 'Illegal format in lookup file %s: %s' % \
-                         (self.lookup_file_name, str(rec_list)))
-      cate_attr1_val =  rec_list[0].strip()
-      try:
-        cate_attr1_count = int(rec_list[1])
-      except:
-        raise Exception( 'Value count given for attribute 1 is not an ' + \
-                         'integer number: %s' % (rec_list[1]))
-
-      if (cate_attr1_val == ''):
-        raise Exception( 'Empty categorical attribute value 1 in lookup ' + \
-                         'file %s' % (self.lookup_file_name))
-      basefunctions.check_is_positive('cate_attr1_count', cate_attr1_count)
-
-      if (cate_attr1_val in cate_val1_dict):
-        raise Exception( 'Attribute value "%s" occurs twice in ' % \
-                         (cate_attr1_val) + 'lookup file %s' % \
-                         (self.lookup_file_name))
-
-      cate_val1_dict[cate_attr1_val] = cate_attr1_count
-
-      # Loop to process values of the second categorical attribute and the
-      # corresponding continuous functions
-      #
-      list_counter += 1
-      rec_list = lookup_file_data[list_counter]  # Get values from next line
-
-      this_cate_val2_dict = {}  # Values of categorical attribute 2
-      this_cont_funct_dict = {}
-
-      # As long as there are data from the second categorical attribute 
-      #
-      while (len(rec_list) > 2):
-        cate_attr2_val =  rec_list[0].strip()
-        try:
-          cate_attr2_count = int(rec_list[1])
-        except:
-          raise Exception( 'Value count given for categorical attribute 2 ' + \
-                           'is not an integer number: %s' % (rec_list[1]))
-        cont_attr_funct = rec_list[2].strip()
-
-        if (cate_attr2_val == ''):
-          raise Exception( 'Empty categorical attribute 2 value in lookup ' + \
-                           'file %s' % (self.lookup_file_name))
-        basefunctions.check_is_positive('cate_attr2_count', cate_attr2_count)
-
-        if (cate_attr2_val in this_cate_val2_dict):
-          raise Exception( 'Attribute value "%s" occurs twice in ' % \
-                           (cate_attr2_val) + 'lookup file %s' % \
-                           (self.lookup_file_name))
+    self.tree_index_list = [self.tree_attr_name_list.index(attr_name) for \
+                            attr_name in self.attribute_name_list]
 
-        if (cont_attr_funct not in ['uniform','normal']):
-          raise Exception( 'Illegal continuous attribute function ' + \
-                           'given: "%s"' % (cont_attr_funct) + \
-                           ' in lookup file %s' % (self.lookup_file_name))
+    # NumPy versions of the value lists, only built when values are generated
+    # in bulk
+    #
+    self.tree_value_array_list = None
 
-        this_cate_val2_dict[cate_attr2_val] = cate_attr2_count
+  # ---------------------------------------------------------------------------
 
-        # Get function parameters from file data
-        #
-        if (cont_attr_funct == 'uniform'):
-          cont_attr_funct_min_val = float(rec_list[3])
-          basefunctions.check_is_number('cont_attr_funct_min_val',
-                                        cont_attr_funct_min_val)
-          cont_attr_funct_max_val = float(rec_list[4])
-          basefunctions.check_is_number('cont_attr_funct_max_val',
-                                        cont_attr_funct_max_val)
+  def build_tree_tables(self):
+    """Method which loads the look-up file and returns a tuple made of:
+
+       - The list of the attribute names in the order of the tree (each
+         attribute after its parent attribute).
+       - A list with the position of the parent attribute of each attribute
+         in this order (None for the root attribute).
+       - A list with one list of values per attribute, values being
+         identified by their index in this list.
+       - A list with one conditional alias table (see
+         sampler.ConditionalAliasTable) per attribute, with one context per
+         value of its parent attribute (and a single context 0 for the root
+         attribute), drawing the indices of the values of the attribute.
+    """
 
-          this_cont_funct_dict[cate_attr2_val] = [cont_attr_funct,
-                                                  cont_attr_funct_min_val,
-                                                  cont_attr_funct_max_val]
-        elif (cont_attr_funct == 'normal'):
-          cont_attr_funct_mu =    float(rec_list[3])
-          cont_attr_funct_sigma = float(rec_list[4])
-          try:
-            cont_attr_funct_min_val = float(rec_list[5])
-          except:
-            cont_attr_funct_min_val = None
-          if (cont_attr_funct_min_val != None):
-            basefunctions.check_is_number('cont_attr_funct_min_val',
-                                          cont_attr_funct_min_val)
-          try:
-            cont_attr_funct_max_val = float(rec_list[6])
-          except:
-            cont_attr_funct_max_val = None
-          if (cont_attr_funct_max_val != None):
-            basefunctions.check_is_number('cont_attr_funct_max_val',
-                                          cont_attr_funct_max_val)
-          this_cont_funct_dict[cate_attr2_val] = [cont_attr_funct,
-                                                  cont_attr_funct_mu,
-                                                  cont_attr_funct_sigma,
-                                                  cont_attr_funct_min_val,
-                                                  cont_attr_funct_max_val]
+    header_list, lookup_file_data = \
+                     lookupcache.read_csv_file(self.lookup_file_name,
+                                               self.unicode_encoding,
+                                               self.has_header_line)
+
+    if (lookup_file_data == []):
+      raise Exception( 'Empty lookup file %s' % (self.lookup_file_name))
+
+    parent_name_dict = {}  # Attribute names as keys, parent names as values
+    value_dict =       {}  # Attribute names as keys, list of values as values
+    value_index_dict = {}  # Keys are pairs (attribute name, value), values
+                           # the indices of the values
+    count_dict =       {}  # Keys are pairs (attribute name, parent value),
+                           # values lists of pairs (value index, count)
+    count_key_set =    set()  # Tuples (attribute name, parent value, value)
+    attr_name_list =   []  # Attribute names in file order
 
-        list_counter += 1
-        if (list_counter < num_file_rows):
-          rec_list = lookup_file_data[list_counter]
-        else:
-          rec_list = []
+    for rec_list in lookup_file_data:
 
-      # Generate a list of categorical 2 values according to their counts
-      #
-      cate_attr2_val_list = []
+      if (len(rec_list) != 5):
+        raise Exception( 'Illegal format in lookup file %s: %s' % \
+                         (self.lookup_file_name, str(rec_list)))
 
-      for (cate_attr2_val, val2_count) in this_cate_val2_dict.iteritems():
+      attr_name, parent_name, parent_val, attr_val, val_count = \
+                                         [val.strip() for val in rec_list]
 
-        # Append value as many times as given in their counts
-        #
-        new_list = [cate_attr2_val]* val2_count
-        cate_attr2_val_list += new_list
+      try:
+        val_count = int(val_count)
+      except:
+        raise Exception( 'Value count given is not an integer number: %s' % \
+                         (val_count))
+      basefunctions.check_is_positive('val_count', val_count)
+
+      if (attr_name == '') or (attr_val == ''):
+        raise Exception( 'Empty attribute name or value in lookup file ' + \
+                         '%s: %s' % (self.lookup_file_name, str(rec_list)))
+      if ((parent_name == '') != (parent_val == '')):
+        raise Exception( 'Parent attribute name and value must both be ' + \
+                         'given or both be empty in lookup file %s: %s' % \
+                         (self.lookup_file_name, str(rec_list)))
 
-      random.shuffle(cate_attr2_val_list)  # Randomly shuffle the list of values
+      if (attr_name not in parent_name_dict):
+        parent_name_dict[attr_name] = parent_name
+        value_dict[attr_name] = []
+        attr_name_list.append(attr_name)
+      elif (parent_name_dict[attr_name] != parent_name):
+        raise Exception( 'Attribute "%s" has more than one parent ' % \
+                         (attr_name) + 'attribute in lookup file %s' % \
+                         (self.lookup_file_name))
 
-      cate_val2_dict[cate_attr1_val] = cate_attr2_val_list
+      val_key = (attr_name, attr_val)
+      if (val_key not in value_index_dict):
+        value_index_dict[val_key] = len(value_dict[attr_name])
+        value_dict[attr_name].append(attr_val)
+      val_index = value_index_dict[val_key]
+
+      count_key = (attr_name, parent_val, attr_val)
+      if (count_key in count_key_set):
+        raise Exception( 'Value "%s" of attribute "%s" occurs twice for ' % \
+                         (attr_val, attr_name) + 'parent value "%s" in ' % \
+                         (parent_val) + 'lookup file %s' % \
+                         (self.lookup_file_name))
+      count_key_set.add(count_key)
 
-      # Store function data for each combination of categorial values
-      #
-      for cate_attr2_val in this_cont_funct_dict:
-        cont_dict_key = cate_attr1_val+'-'+cate_attr2_val
-        cont_funct_dict[cont_dict_key] = this_cont_funct_dict[cate_attr2_val]
+      count_dict.setdefault((attr_name, parent_val),
+                            []).append((val_index, val_count))
 
-    # Generate a list of values according to their counts for attribute 1
+    # Order the attributes so each comes after its parent (starting from the
+    # single root attribute)
     #
-    cate_attr1_val_list = []
+    root_name_list = [attr_name for attr_name in attr_name_list if \
+                      parent_name_dict[attr_name] == '']
+    if (len(root_name_list) != 1):
+      raise Exception( 'Lookup file %s must contain exactly one root ' % \
+                       (self.lookup_file_name) + 'attribute: %s' % \
+                       (','.join(root_name_list)))
+
+    tree_attr_name_list = root_name_list
+    j = 0
+    while (j < len(tree_attr_name_list)):
+      tree_attr_name_list += [attr_name for attr_name in attr_name_list if \
+                              parent_name_dict[attr_name] == \
+                              tree_attr_name_list[j]]
+      j += 1
+
+    if (len(tree_attr_name_list) != len(attr_name_list)):
+      raise Exception( 'Attributes %s in lookup file %s are not ' % \
+                       (','.join(set(attr_name_list) - \
+                                 set(tree_attr_name_list)),
+                        self.lookup_file_name) + 'connected to the root ' + \
+                       'attribute')
+
+    parent_index_list = []
+    tree_value_list =   []
+    tree_table_list =   []
+
+    for attr_name in tree_attr_name_list:
+      parent_name = parent_name_dict[attr_name]
+
+      if (parent_name == ''):
+        parent_index_list.append(None)
+        context_value_count_list = [count_dict[(attr_name, '')]]
 
-    for (cate_attr1_val, val1_count) in cate_val1_dict.iteritems():
+      else:
+        parent_index_list.append(tree_attr_name_list.index(parent_name))
+
+        parent_val_list = value_dict[parent_name]
+        for (count_attr_name, parent_val) in count_dict:
+          if (count_attr_name == attr_name) and \
+             ((parent_name, parent_val) not in value_index_dict):
+            raise Exception( 'Parent value "%s" of attribute "%s" is not ' % \
+                             (parent_val, attr_name) + 'a value of ' + \
+                             'attribute "%s" in lookup file %s' % \
+                             (parent_name, self.lookup_file_name))
+
+        # Counts over all parent values, for parent values without any rows
+        #
+        total_count_list = [0]*len(value_dict[attr_name])
+        for parent_val in parent_val_list:
+          for (val_index, val_count) in \
+              count_dict.get((attr_name, parent_val), []):
+            total_count_list[val_index] += val_count
+        total_value_count_list = list(enumerate(total_count_list))
 
-      # Append value as many times as given in their counts
-      #
-      new_list = [cate_attr1_val]* val1_count
-      cate_attr1_val_list += new_list
+        context_value_count_list = [count_dict.get((attr_name, parent_val),
+                                                   total_value_count_list) \
+                                    for parent_val in parent_val_list]
 
-    random.shuffle(cate_attr1_val_list)  # Randomly shuffle the list of values
+      tree_value_list.append(value_dict[attr_name])
+      tree_table_list.append(sampler.ConditionalAliasTable(
+                                                   context_value_count_list))
 
-    self.cate_attr1_val_list = cate_attr1_val_list
-    self.cate_val2_dict =      cate_val2_dict
-    self.cont_funct_dict =     cont_funct_dict
+    return tree_attr_name_list, parent_index_list, tree_value_list, \
+           tree_table_list
 
   # ---------------------------------------------------------------------------
 
-  def create_attribute_values(self):
-    """Method which creates and returns two categorical attribute values and
-       one continuous value, where the second categorical value depends upon
-       the first value, andthe continuous value depends on both categorical
-       values. The two categorical values are randomly selected according to
-       the provided frequency distributions, while  the continuous value is
-       generated according to the selected function and its parameters.
+  def get_attribute_name_list(self):
+    """Method which returns the list of the names of the attributes generated,
+       in the sequence their values are returned.
     """
 
-    assert self.cate_attr1_val_list != []
-    assert self.cate_val2_dict != {}
-    assert self.cont_funct_dict != {}
+    return list(self.attribute_name_list)
 
-    cate_attr1_val = random.choice(self.cate_attr1_val_list)
+  # ---------------------------------------------------------------------------
 
-    cate_attr2_list = self.cate_val2_dict[cate_attr1_val]
+  def create_attribute_values(self):
+    """Method which creates and returns one value for each attribute in the
+       tree, each randomly selected according to the counts of the values
+       given the value of its parent attribute.
+    """
 
-    cate_attr2_val = random.choice(cate_attr2_list)
+    tree_val_index_list = []
 
-    # Get the details of the function and generate the continuous value
-    #
-    cont_dict_key = cate_attr1_val+'-'+cate_attr2_val
-    funct_details = self.cont_funct_dict[cont_dict_key]
-    funct_name = funct_details[0]
+    for (parent_index, table) in zip(self.parent_index_list,
+                                     self.tree_table_list):
+      if (parent_index == None):
+        tree_val_index_list.append(table.draw(0))
+      else:
+        tree_val_index_list.append(table.draw(
+                                       tree_val_index_list[parent_index]))
 
-    if (funct_name == 'uniform'):
-      cont_attr_val = random.uniform(funct_details[1], funct_details[2])
+    tree_value_list = self.tree_value_list
 
-    elif (funct_name == 'normal'):
-      mu =      funct_details[1]
-      sigma =   funct_details[2]
-      min_val = funct_details[3]
-      max_val = funct_details[4]
-      in_range = False
+    return tuple([tree_value_list[j][tree_val_index_list[j]] for j in \
+                  self.tree_index_list])
 
-      cont_attr_val = random.normalvariate(mu, sigma)
+  # ---------------------------------------------------------------------------
 
-      while (in_range == False):
-        if (((min_val != None) and (cont_attr_val < min_val)) or
-            ((max_val != None) and (cont_attr_val > max_val))):
-          in_range = False
-          cont_attr_val = random.normalvariate(mu, sigma)
-        else:
-          in_range = True
+  def create_attribute_values_batch(self, n):
+    """Method which creates n records of values of the attributes in the
+       tree, and returns them as a tuple of columns, as NumPy arrays if NumPy
+       is available, otherwise as lists.
 
-      if (min_val != None):
-        assert cont_attr_val >= min_val
-      if (max_val != None):
-        assert cont_attr_val <= max_val
+       The values are generated one attribute at a time in the order of the
+       tree, with the values of all records drawn at once given the values of
+       their parent attribute.
+    """
 
-    else:
-      raise Exception( ('Illegal continuous function given:', funct_name))
+    if (numpy == None):
+      return GenerateCompoundAttribute.create_attribute_values_batch(self, n)
 
-    cont_attr_val_str = basefunctions.float_to_str(cont_attr_val,
-                                                   self.continuous_value_type)
- 
-    return cate_attr1_val, cate_attr2_val, cont_attr_val_str
+    basefunctions.check_is_integer('n', n)
+    basefunctions.check_is_not_negative('n', n)
 
-# =============================================================================
+    if (self.tree_value_array_list is None):
+      self.tree_value_array_list = [sampler.object_array(value_list) for \
+                                    value_list in self.tree_value_list]
 
-class GenerateContContCompoundAttribute(GenerateCompoundAttribute):
-  """Generate two continuous attribute values, where the value of the second
-     attribute depends upon the value of the first attribute.
+    tree_index_array_list = []
 
-     This for example allows the modelling of:
-     - salary values that depend upon age values, or
-     - blood pressure values that depend upon age values.
+    for (parent_index, table) in zip(self.parent_index_list,
+                                     self.tree_table_list):
+      if (parent_index == None):
+        context_array = numpy.zeros(n, dtype=numpy.int64)
+      else:
+        context_array = tree_index_array_list[parent_index]
+      tree_index_array_list.append(table.draw_many(context_array))
 
-     The arguments that have to be set when this attribute type is initialised
-     are:
+    return tuple([self.tree_value_array_list[j][tree_index_array_list[j]] \
+                  for j in self.tree_index_list])
 
-     continuous1_attribute_name  The name of the first continuous attribute
-                                 that will be generated. This name will be
-                                 used in the header line to be written into
-                                 the output file.
+# =============================================================================
+# Classes for generating a data set
+# =============================================================================
 
-     continuous2_attribute_name  The name of the second continuous attribute
-                                 that will be generated. This name will be
-                                 used in the header line to be written into
-                                 the output file.
+# The maximum number of records generated to replace a record whose values of
+# the unique attributes have already been generated
+#
+UNIQUE_MAX_REDRAWS = 1000
 
-     continuous1_funct_name      The name of the function that is used to
-                                 randomly generate the values of the first
-                                 attribute. Implemented functions currently
-                                 are:
-                                 - uniform
-                                 - normal
+# -----------------------------------------------------------------------------
 
-     continuous1_funct_param     A list with the parameters required for the
-                                 function that generates the continuous values
-                                 in the first attribute. They are:
-                                 - uniform:  [min_val, max_val]
-                                 - normal:   [mu, sigma, min_val, max_val]
-                                             (min_val and max_val can be set
-                                             to None in which case no minimum
-                                             or maximum is enforced)
+class GenerationPlan:
+  """A compiled plan of how the values of a record are generated from a list
+     of attribute objects.
 
-     continuous2_function        A Python function that has a floating-point
-                                 value as input (assumed to be a value
-                                 generated for the first attribute) and that
-                                 returns a floating-point value (assumed to be
-                                 the value of the second attribute).
+     The plan is a list of steps, one per attribute object, each made of the
+     bound method that creates the value (or values of a compound attribute)
+     and the position(s) in the output record where the values are stored.
+     Generating a record then only executes these steps, without checking
+     attribute types or looking up attribute names.
 
-     continuous1_value_type      The format of how the continuous values in
-                                 the first attribute are returned when they
-                                 are generated. Possible values are 'int', so
-                                 integer values are generated; or 'float1',
-                                 'float2', to 'float9', in which case
-                                 floating-point values with the specified
-                                 number of digits behind the comma are
-                                 generated.
+     The arguments that have to be given when a generation plan is
+     initialised are:
 
-     continuous2_value_type      The same as for the first attribute.
+     attribute_name_list  The list of attribute names in the sequence of the
+                          values in the generated records.
+
+     attribute_data_list  A list of attribute objects (from the classes
+                          GenerateAttribute and GenerateCompoundAttribute and
+                          their derived classes). Attributes not listed in the
+                          attribute name list are still generated (so the
+                          random numbers drawn do not change), but their
+                          values are not stored.
+
+     missing_val_str      The value stored for attributes in the attribute
+                          name list that are not generated by any attribute
+                          object (default is an empty string).
   """
 
   # ---------------------------------------------------------------------------
 
-  def __init__(self, **kwargs):
-    """Constructor. Process the derived keywords first, then call the base
-       class constructor.
+  def __init__(self, attribute_name_list, attribute_data_list,
+               missing_val_str=''):
+    """Constructor. Compile the generation steps.
     """
 
-    # General attributes for all data set generators
-    #
-    self.number_of_atttributes = 2
-    self.attribute_type =        'Compound-Continuous-Continuous'
-
-    for (keyword, value) in kwargs.items():
-
-      if (keyword.startswith('continuous1_a')):
-        basefunctions.check_is_non_empty_string('continuous1_attribute_name',
-                                                value)
-        self.continuous1_attribute_name = value
-
-      elif (keyword.startswith('continuous2_a')):
-        basefunctions.check_is_non_empty_string('continuous2_attribute_name',
-                                                value)
-        self.continuous2_attribute_name = value
+    basefunctions.check_is_list('attribute_name_list', attribute_name_list)
+    basefunctions.check_is_list('attribute_data_list', attribute_data_list)
+    basefunctions.check_is_string('missing_val_str', missing_val_str)
 
-      elif (keyword.startswith('continuous1_funct_n')):
-        basefunctions.check_is_non_empty_string('continuous1_funct_name',
-                                                value)
-        self.continuous1_funct_name = value
+    self.attribute_name_list = list(attribute_name_list)
+    self.attribute_data_list = list(attribute_data_list)
+    self.missing_val_str =     missing_val_str
 
-      elif (keyword.startswith('continuous1_funct_p')):
-        basefunctions.check_is_list('continuous1_funct_param', value)
-        self.continuous1_funct_param = value
+    self.compile()
 
-      elif (keyword.startswith('continuous2_f')):
-        basefunctions.check_is_function_or_method('continuous2_function',
-                                                   value)
-        self.continuous2_function = value
+  # ---------------------------------------------------------------------------
 
-      elif (keyword.startswith('continuous1_v')):
-        basefunctions.check_is_non_empty_string('continuous1_value_type',
-                                                value)
-        basefunctions.check_is_valid_format_str('continuous1_value_type',
-                                                value)
-        self.continuous1_value_type = value
+  def compile(self):
+    """Method which builds the list of generation steps, each being a tuple
+       (create_funct, attr_slot, attr_slot_list, batch_funct, attr_name_list):
 
-      elif (keyword.startswith('continuous2_v')):
-        basefunctions.check_is_non_empty_string('continuous2_value_type',
-                                                value)
-        basefunctions.check_is_valid_format_str('continuous2_value_type',
-                                                value)
-        self.continuous2_value_type = value
+       - For a single attribute 'create_funct' is its create_attribute_value()
+         method, and 'attr_slot' the position of its value in the record (and
+         'attr_slot_list' is None).
+       - For a compound attribute 'create_funct' is its
+         create_attribute_values() method, and 'attr_slot_list' a tuple with
+         the positions of its values (and 'attr_slot' is None).
 
-      else:
-        raise Exception( 'Illegal constructor argument keyword: "%s"' % \
-              (str(keyword)))
+       Values of attributes that are not in the attribute name list are stored
+       in an additional last position that is removed from the record.
+    """
 
-    # Check if the necessary variables have been set
-    #
-    basefunctions.check_is_non_empty_string('continuous1_attribute_name',
-                                            self.continuous1_attribute_name)
-    basefunctions.check_is_non_empty_string('continuous2_attribute_name',
-                                            self.continuous2_attribute_name)
-    basefunctions.check_is_non_empty_string('continuous1_funct_name',
-                                            self.continuous1_funct_name)
-    basefunctions.check_is_list('continuous1_funct_param',
-                                self.continuous1_funct_param)
-    basefunctions.check_is_function_or_method('continuous2_function',
-                                              self.continuous2_function)
-    basefunctions.check_is_non_empty_string('continuous1_value_type',
-                                            self.continuous1_value_type)
-    basefunctions.check_is_non_empty_string('continuous2_value_type',
-                                            self.continuous2_value_type)
+    num_slots = len(self.attribute_name_list)
 
-    if (self.continuous1_attribute_name == self.continuous2_attribute_name):
-      raise Exception( 'Both attribute names are the same')
+    attr_slot_dict = {}  # Attribute names as keys, positions as values
+    for (attr_slot, attr_name) in enumerate(self.attribute_name_list):
+      attr_slot_dict[attr_name] = attr_slot
 
-    basefunctions.check_is_valid_format_str('continuous1_value_type',
-                                            self.continuous1_value_type)
-    basefunctions.check_is_valid_format_str('continuous2_value_type',
-                                            self.continuous2_value_type)
+    step_list = []
 
-    # Check that the function for attribute 2 does return a float value
-    #
-    funct_ret = self.continuous2_function(1.0)
-    if (not isinstance(funct_ret, float)):
-      raise Exception( ('Function provided for attribute 2 does not return' + \
-                        ' a floating-point value:', type(funct_ret)))
+    for attr_data in self.attribute_data_list:
+      attr_name_list = attr_data.get_attribute_name_list()
+
+      if (isinstance(attr_data, GenerateCompoundAttribute)):
+        attr_slot_list = tuple([attr_slot_dict.get(attr_name, num_slots) \
+                                for attr_name in attr_name_list])
+        step_list.append((attr_data.create_attribute_values, None,
+                          attr_slot_list,
+                          attr_data.create_attribute_values_batch,
+                          attr_name_list))
+      else:
+        step_list.append((attr_data.create_attribute_value,
+                          attr_slot_dict.get(attr_name_list[0], num_slots),
+                          None, attr_data.create_attribute_values_batch,
+                          attr_name_list))
 
-    # Check type and number of parameters given for attribute 1 functions
-    #
-    if (self.continuous1_funct_name not in ['uniform','normal']):
-      raise Exception( 'Illegal continuous attribute 1 function given: "%s"' % \
-                         (self.continuous1_funct_name))
+    self.num_slots = num_slots
+    self.step_list = step_list
 
-    # Get function parameters from file data
-    #
-    if (self.continuous1_funct_name == 'uniform'):
-      assert len(self.continuous1_funct_param) == 2
+  # ---------------------------------------------------------------------------
 
-      cont_attr1_funct_min_val = self.continuous1_funct_param[0]
-      cont_attr1_funct_max_val = self.continuous1_funct_param[1]
-      basefunctions.check_is_number('cont_attr1_funct_min_val',
-                                    cont_attr1_funct_min_val)
-      basefunctions.check_is_number('cont_attr1_funct_max_val',
-                                    cont_attr1_funct_max_val)
+  def __getstate__(self):
+    """Bound methods cannot be pickled (for example to send a plan to another
+       process), so only the attributes are, and the plan is compiled again.
+    """
 
-      assert cont_attr1_funct_min_val < cont_attr1_funct_max_val
+    return (self.attribute_name_list, self.attribute_data_list,
+            self.missing_val_str)
 
-      self.attr1_funct_param = [cont_attr1_funct_min_val,
-                                cont_attr1_funct_max_val]
+  def __setstate__(self, state):
+    """Restore a pickled plan and compile its steps.
+    """
 
-    elif (self.continuous1_funct_name == 'normal'):
-      assert len(self.continuous1_funct_param) == 4
+    self.attribute_name_list, self.attribute_data_list, \
+      self.missing_val_str = state
 
-      cont_attr1_funct_mu =      self.continuous1_funct_param[0]
-      cont_attr1_funct_sigma =   self.continuous1_funct_param[1]
-      cont_attr1_funct_min_val = self.continuous1_funct_param[2]
-      cont_attr1_funct_max_val = self.continuous1_funct_param[3]
+    self.compile()
 
-      basefunctions.check_is_number('cont_attr1_funct_mu', cont_attr1_funct_mu)
-      basefunctions.check_is_number('cont_attr1_funct_sigma',
-                                    cont_attr1_funct_sigma)
+  # ---------------------------------------------------------------------------
 
-      basefunctions.check_is_positive('cont_attr1_funct_sigma',
-                                        cont_attr1_funct_sigma)
+  def generate_record_values(self):
+    """Method which generates the values of all attributes for one record,
+       and returns them as a list in the sequence of the attribute name list.
+    """
 
-      if (cont_attr1_funct_min_val != None):
-        basefunctions.check_is_number('cont_attr1_funct_min_val',
-                                      cont_attr1_funct_min_val)
-        assert cont_attr1_funct_min_val <= cont_attr1_funct_mu
+    this_rec_list = [self.missing_val_str]*(self.num_slots+1)
 
-      if (cont_attr1_funct_max_val != None):
-        basefunctions.check_is_number('cont_attr1_funct_max_val',
-                                      cont_attr1_funct_max_val)
-        assert cont_attr1_funct_max_val >= cont_attr1_funct_mu
+    for (create_funct, attr_slot, attr_slot_list, batch_funct,
+         attr_name_list) in self.step_list:
+      if (attr_slot_list == None):
+        this_rec_list[attr_slot] = create_funct()
+      else:
+        for (attr_slot, attr_val) in zip(attr_slot_list, create_funct()):
+          this_rec_list[attr_slot] = attr_val
 
-      if (cont_attr1_funct_min_val != None) and \
-            (cont_attr1_funct_max_val) != None:
-        assert cont_attr1_funct_min_val < cont_attr1_funct_max_val
+    del this_rec_list[-1]  # Values of attributes not in the attribute list
 
-      self.attr1_funct_param = [cont_attr1_funct_mu,
-                                cont_attr1_funct_sigma,
-                                cont_attr1_funct_min_val,
-                                cont_attr1_funct_max_val]
+    return this_rec_list
 
   # ---------------------------------------------------------------------------
 
-  def create_attribute_values(self):
-    """Method which creates and returns two continuous attribute values, with
-       the the first continuous value according to the selected function and
-       its parameters, and the second value depending upon the first value.
+  def generate_columns(self, num_recs, stratum_dict=None):
+    """Method which generates the values of all attributes for the given
+       number of records, one attribute (or compound attribute) at a time
+       using their create_attribute_values_batch() methods.
+
+       If a stratum dictionary is given, with attribute objects as keys and
+       tuples of stratum values as values (see the get_stratum_list() methods
+       of the attribute classes), the values of these attribute objects are
+       created with their create_attribute_values_for_stratum() methods
+       instead, so all records are in the given stratum.
+
+       This method returns a dictionary with the keys being attribute names
+       and values being lists with the 'num_recs' generated values of these
+       attributes.
     """
 
-    # Get the details of the function and generate the first continuous value
-    #
-    funct_name =    self.continuous1_funct_name
-    funct_details = self.attr1_funct_param
+    basefunctions.check_is_integer('num_recs', num_recs)
+    basefunctions.check_is_not_negative('num_recs', num_recs)
 
-    if (funct_name == 'uniform'):
-      cont_attr1_val = random.uniform(funct_details[0], funct_details[1])
+    if (stratum_dict == None):
+      stratum_dict = {}
 
-    elif (funct_name == 'normal'):
-      mu =      funct_details[0]
-      sigma =   funct_details[1]
-      min_val = funct_details[2]
-      max_val = funct_details[3]
-      in_range = False
+    col_dict = {}  # Attribute names as keys, value lists as values
 
-      cont_attr1_val = random.normalvariate(mu, sigma)
+    for (attr_data, (create_funct, attr_slot, attr_slot_list, batch_funct,
+         attr_name_list)) in zip(self.attribute_data_list, self.step_list):
 
-      while (in_range == False):
-        if (((min_val != None) and (cont_attr1_val < min_val)) or
-            ((max_val != None) and (cont_attr1_val > max_val))):
-          in_range = False
-          cont_attr1_val = random.normalvariate(mu, sigma)
-        else:
-          in_range = True
+      if (attr_data in stratum_dict):
+        attr_col_list = attr_data.create_attribute_values_for_stratum(
+                                              stratum_dict[attr_data], num_recs)
+        if (attr_slot_list == None):
+          attr_col_list = [attr_col_list]
 
-      if (min_val != None):
-        assert cont_attr1_val >= min_val
-      if (max_val != None):
-        assert cont_attr1_val <= max_val
+      elif (attr_slot_list == None):
+        attr_col_list = [batch_funct(num_recs)]
+      else:
+        attr_col_list = batch_funct(num_recs)
 
-    else:
-      raise Exception( ('Illegal continuous function given:', funct_name))
+      for (attr_name, attr_col) in zip(attr_name_list, attr_col_list):
+        if (numpy != None) and isinstance(attr_col, numpy.ndarray):
+          attr_col = attr_col.tolist()
+        assert len(attr_col) == num_recs, (attr_name, len(attr_col))
+        if (num_recs > 0):
+          assert isinstance(attr_col[0], str) or \
+                 isinstance(attr_col[0], unicode), attr_col[0]
+        col_dict[attr_name] = attr_col
 
-    # Generate the second attribute value
-    #
-    cont_attr2_val = self.continuous2_function(cont_attr1_val)
+    return col_dict
 
-    cont_attr1_val_str = basefunctions.float_to_str(cont_attr1_val,
-                                                   self.continuous1_value_type)
-    cont_attr2_val_str = basefunctions.float_to_str(cont_attr2_val,
-                                                   self.continuous2_value_type)
+  # ---------------------------------------------------------------------------
 
-    return cont_attr1_val_str, cont_attr2_val_str
+  def generate_record_chunk(self, num_recs, stratum_dict=None):
+    """Method which generates the given number of records column by column
+       (see generate_columns(), also for the optional stratum dictionary), and
+       returns them as a list of records, each being a list of attribute
+       values in the sequence of the attribute name list.
+    """
 
+    col_dict = self.generate_columns(num_recs, stratum_dict)
+
+    out_col_list = []  # Columns in the sequence of the attribute name list
+    for attr_name in self.attribute_name_list:
+      if (attr_name in col_dict):
+        out_col_list.append(col_dict[attr_name])
+      else:
+        out_col_list.append([self.missing_val_str]*num_recs)
+
+    return [list(this_rec_tuple) for this_rec_tuple in zip(*out_col_list)]
 
-# =============================================================================
-# Classes for generating a data set
 # =============================================================================
 
 class GenerateDataSet:
@@ -1818,6 +4214,81 @@ class GenerateDataSet:
                           derived classes).
 
      unicode_encoding     The Unicode encoding (a string name) of the file.
+
+     The following argument is optional:
+
+     generation_engine    Either 'record' (the default) or 'column'. With the
+                          record engine, all attribute values of one record
+                          are generated before the next record is started.
+                          With the column engine, each attribute generates all
+                          its values (in chunks of 'column_chunk_size' records)
+                          at once using its create_attribute_values_batch()
+                          method, and the records are only put together from
+                          these columns when they are stored.
+
+     progress_reporter    An object of class progress.ProgressReporter (or a
+                          derived class) which is informed how many records
+                          have been generated. The default reporter is
+                          silent.
+
+     record_seed          If a master seed (an integer) is given, then the
+                          random number generators are seeded before each
+                          record with a seed derived from this master seed and
+                          the record number. Each record then only depends on
+                          the master seed and its number, and any single
+                          record can be regenerated with generate_record().
+                          Records are then generated with the record engine.
+                          Seeding both generators costs several microseconds
+                          per record (it rebuilds their whole states), which
+                          can be more than generating a record of a few
+                          simple attributes. Default is None (no seeding).
+
+     unique_attribute_list  A list of names (from the attribute name list) of
+                          attributes whose combination of values must be
+                          different in all generated records. A record whose
+                          combination has already been generated is rejected
+                          and a new record is generated instead. Cannot be
+                          used together with a 'record_seed'. Default is None
+                          (no uniqueness constraint).
+
+     unique_filter        An object of class uniquefilter.UniqueFilter used to
+                          remember the generated combinations of values of the
+                          unique attributes. The default filter keeps up to
+                          one million combinations in an exact set, and then
+                          uses a Bloom filter sized for 'number_of_records'
+                          combinations with a false positive rate of 0.001 (so
+                          memory stays bounded, at the cost of rejecting that
+                          fraction of unique records). The numbers of accepted
+                          and rejected records, and the false positive budget,
+                          are returned by its get_report() method.
+
+     strata_attribute_list  A list of names of attributes whose combinations of
+                          values form strata of records (for example gender,
+                          age group and state). The number of records is first
+                          allocated to the strata according to their
+                          probabilities in the look-up tables, and then the
+                          records of each stratum are generated in batches
+                          with the stratum values fixed, so the numbers of
+                          records with each combination of values are exact.
+                          Each attribute must be one of the first attributes
+                          of an attribute object with a look-up table (see the
+                          get_stratum_list() methods of the attribute
+                          classes). Cannot be used together with a
+                          'record_seed' or with worker processes. Default is
+                          None (no strata).
+
+     strata_allocation    How the number of records is allocated to the
+                          strata, either 'quota' (the default, each stratum
+                          gets its share of the records rounded so the counts
+                          sum to the number of records, the same in every
+                          run) or 'multinomial' (the counts are drawn from a
+                          multinomial distribution).
+
+     Records can be generated in parallel by calling generate() with a number
+     of worker processes. The records are then generated in shards of
+     'shard_size' records, each with its own random seed derived from a master
+     seed, so the generated data only depends on the master seed and not on
+     the number of workers.
   """
 
   # ---------------------------------------------------------------------------
@@ -1835,11 +4306,32 @@ class GenerateDataSet:
     self.attribute_data_list = None
     self.unicode_encoding =    None
     self.missing_val_str =     ''
+    self.generation_engine =   'record'
+
+    # Number of records for which the column engine generates attribute values
+    # at once
+    #
+    self.column_chunk_size = 10000
+
+    self.progress_reporter = progress.ProgressReporter()  # Silent
+
+    # Number of records in a shard when records are generated in shards
+    #
+    self.shard_size = 10000
+
+    self.record_seed = None
+
+    self.unique_attribute_list = None
+    self.unique_filter =         None
+
+    self.strata_attribute_list = None
+    self.strata_allocation =     'quota'
 
     # The following dictionary will contain the generated records, with the
-    # dictionary keys being the record identifiers (unique for each record),
-    # while the dictionary values will be lists containing the actual attribute
-    # values of these generated records.
+    # dictionary keys being integer record keys (unique for each record, see
+    # basefunctions.get_rec_key(), only written as record identifier strings
+    # by write()), while the dictionary values will be lists containing the
+    # actual attribute values of these generated records.
     #
     self.rec_dict = {}
 
@@ -1858,6 +4350,10 @@ class GenerateDataSet:
         basefunctions.check_is_flag('write_header_line', value)
         self.write_header_line = value
 
+      elif (keyword.startswith('record_seed')):  # Before 'rec' below
+        basefunctions.check_is_integer('record_seed', value)
+        self.record_seed = value
+
       elif (keyword.startswith('rec')):
         basefunctions.check_is_non_empty_string('rec_id_attr_name', value)
         self.rec_id_attr_name = value
@@ -1881,10 +4377,46 @@ class GenerateDataSet:
         basefunctions.check_unicode_encoding_exists(value)
         self.unicode_encoding = value
 
+      elif (keyword.startswith('generation')):
+        if (value not in ['record', 'column']):
+          raise Exception( 'Value of "generation_engine" must be "record" ' + \
+                           'or "column": %s' % (str(value)))
+        self.generation_engine = value
+
+      elif (keyword.startswith('progress')):
+        if (not isinstance(value, progress.ProgressReporter)):
+          raise Exception( 'Value of "progress_reporter" is not a progress' + \
+                           ' reporter object: %s' % (type(value)))
+        self.progress_reporter = value
+
+      elif (keyword.startswith('unique_a')):
+        basefunctions.check_is_list('unique_attribute_list', value)
+        self.unique_attribute_list = value
+
+      elif (keyword.startswith('unique_f')):
+        if (not isinstance(value, uniquefilter.UniqueFilter)):
+          raise Exception( 'Value of "unique_filter" is not a unique filter' + \
+                           ' object: %s' % (type(value)))
+        self.unique_filter = value
+
+      elif (keyword.startswith('strata_att')):
+        basefunctions.check_is_list('strata_attribute_list', value)
+        self.strata_attribute_list = value
+
+      elif (keyword.startswith('strata_all')):
+        if (value not in ['quota', 'multinomial']):
+          raise Exception( 'Value of "strata_allocation" must be "quota" ' + \
+                           'or "multinomial": %s' % (str(value)))
+        self.strata_allocation = value
+
       else:
         raise Exception( 'Illegal constructor argument keyword: "%s"' % \
               (str(keyword)))
 
+    if (self.record_seed != None) and (self.generation_engine == 'column'):
+      raise Exception( 'Records generated with a "record_seed" cannot be ' + \
+                       'generated with the column engine')
+
     # Check if the necessary variables have been set
     #
     basefunctions.check_is_non_empty_string('output_file_name',
@@ -1932,180 +4464,647 @@ class GenerateDataSet:
     attr_name_set = set()
     for attr_data in self.attribute_data_list:
 
-      if (attr_data.attribute_type == 'Compound-Categorical-Categorical'):
-        attr1_name = attr_data.categorical1_attribute_name
-        attr2_name = attr_data.categorical2_attribute_name
-        attr3_name = ''
-
-      elif (attr_data.attribute_type == 'Compound-Categorical-Continuous'):
-        attr1_name = attr_data.categorical_attribute_name
-        attr2_name = attr_data.continuous_attribute_name
-        attr3_name = ''
-
-      elif (attr_data.attribute_type == 'Compound-Continuous-Continuous'):
-        attr1_name = attr_data.continuous1_attribute_name
-        attr2_name = attr_data.continuous2_attribute_name
-        attr3_name = ''
-
-      elif (attr_data.attribute_type == \
-            'Compound-Categorical-Categorical-Continuous'):
-        attr1_name = attr_data.categorical1_attribute_name
-        attr2_name = attr_data.categorical2_attribute_name
-        attr3_name = attr_data.continuous_attribute_name
-
-      else:  # A single attribute
-        attr1_name = attr_data.attribute_name
-        attr2_name = ''
-        attr3_name = ''
-
-      for attr_name in [attr1_name, attr2_name, attr3_name]:
-        if (attr_name != ''):
-          if (attr_name == self.rec_id_attr_name):
-            raise Exception( 'Attribute given has the same name as the ' + \
-                             'record identifier attribute')
-          if (attr_name in attr_name_set):
-            raise Exception( 'Attribute name "%s" is given twice' % \
-                             (attr_name) + ' in attribute data definitions')
-          attr_name_set.add(attr_name)
+      for attr_name in attr_data.get_attribute_name_list():
+        if (attr_name == self.rec_id_attr_name):
+          raise Exception( 'Attribute given has the same name as the ' + \
+                           'record identifier attribute')
+        if (attr_name in attr_name_set):
+          raise Exception( 'Attribute name "%s" is given twice' % \
+                           (attr_name) + ' in attribute data definitions')
+        attr_name_set.add(attr_name)
 
     # Check that there is an attribute definition provided for each attribute
     # listed in the attribute name list.
     #
     for attr_name in self.attribute_name_list:
-      found_attr_name = False
-      for attr_data in self.attribute_data_list:
-
-        # Get names from attribute data
-        #
-        if (attr_data.attribute_type == 'Compound-Categorical-Categorical'):
-          if ((attr_name == attr_data.categorical1_attribute_name) or \
-              (attr_name == attr_data.categorical2_attribute_name)):
-            found_attr_name = True
-        elif (attr_data.attribute_type == 'Compound-Categorical-Continuous'):
-          if ((attr_name == attr_data.categorical_attribute_name) or \
-              (attr_name == attr_data.continuous_attribute_name)):
-            found_attr_name = True
-        elif (attr_data.attribute_type == 'Compound-Continuous-Continuous'):
-          if ((attr_name == attr_data.continuous1_attribute_name) or \
-              (attr_name == attr_data.continuous2_attribute_name)):
-            found_attr_name = True
-        elif (attr_data.attribute_type == \
-              'Compound-Categorical-Categorical-Continuous'):
-          if ((attr_name == attr_data.categorical1_attribute_name) or \
-              (attr_name == attr_data.categorical2_attribute_name) or \
-              (attr_name == attr_data.continuous_attribute_name)):
-            found_attr_name = True
-        else:  # A single attribute
-          if (attr_name == attr_data.attribute_name):
-            found_attr_name = True
-
-      if (found_attr_name == False):
+      if (attr_name not in attr_name_set):
         raise Exception( 'No attribute data available for attribute "%s"' % \
                          (attr_name))
 
+    # Get the positions of the unique attributes in the generated records, and
+    # create the filter of generated combinations
+    #
+    if (self.unique_attribute_list != None):
+      if (self.unique_attribute_list == []):
+        raise Exception( 'unique_attribute_list is empty')
+      if (self.record_seed != None):
+        raise Exception( 'Records generated with a "record_seed" cannot ' + \
+                         'have unique attributes')
+
+      self.unique_slot_list = []
+      for attr_name in self.unique_attribute_list:
+        if (attr_name not in self.attribute_name_list):
+          raise Exception( 'Unique attribute "%s" is not in the attribute ' % \
+                           (attr_name) + 'name list')
+        self.unique_slot_list.append(self.attribute_name_list.index(attr_name))
+
+      if (self.unique_filter == None):
+        self.unique_filter = \
+               uniquefilter.UniqueFilter(capacity = self.number_of_records)
+
+    elif (self.unique_filter != None):
+      raise Exception( 'A "unique_filter" is given without a ' + \
+                       '"unique_attribute_list"')
+
+    # Find the attribute objects that generate the stratification attributes,
+    # as pairs (attribute object, number of its first attributes that are
+    # stratification attributes)
+    #
+    self.strata_attr_data_list = []
+
+    if (self.strata_attribute_list != None):
+      if (self.strata_attribute_list == []):
+        raise Exception( 'strata_attribute_list is empty')
+      if (self.record_seed != None):
+        raise Exception( 'Records generated with a "record_seed" cannot ' + \
+                         'be stratified')
+
+      strata_attr_name_set = set(self.strata_attribute_list)
+      if (len(strata_attr_name_set) != len(self.strata_attribute_list)):
+        raise Exception( 'A stratification attribute is given twice')
+
+      num_strata_attr_found = 0
+
+      for attr_data in self.attribute_data_list:
+        attr_name_list = attr_data.get_attribute_name_list()
+
+        num_strata_attr = len([attr_name for attr_name in attr_name_list \
+                               if attr_name in strata_attr_name_set])
+        if (num_strata_attr == 0):
+          continue
+
+        if (not strata_attr_name_set.issuperset(
+                                         attr_name_list[:num_strata_attr])):
+          raise Exception( 'Stratification attributes must be the first ' + \
+                           'attributes generated by an attribute object: ' + \
+                           '%s' % (','.join(attr_name_list)))
+
+        self.strata_attr_data_list.append((attr_data, num_strata_attr))
+        num_strata_attr_found += num_strata_attr
+
+      if (num_strata_attr_found != len(self.strata_attribute_list)):
+        raise Exception( 'No attribute data available for all ' + \
+                         'stratification attributes: %s' % \
+                         (str(self.strata_attribute_list)))
+
+    # Attributes that draw values without replacement change their counts
+    # with every value drawn, so their values depend on all records generated
+    # before
+    #
+    self.has_without_replacement = False
+    for attr_data in self.attribute_data_list:
+      if (getattr(attr_data, 'without_replacement', False) == True):
+        self.has_without_replacement = True
+
+    if (self.has_without_replacement == True) and (self.record_seed != None):
+      raise Exception( 'Records generated with a "record_seed" cannot ' + \
+                       'have attributes drawn without replacement')
+
+    # Compile the plan of how records are generated
+    #
+    self.generation_plan = GenerationPlan(self.attribute_name_list,
+                                          self.attribute_data_list,
+                                          self.missing_val_str)
+
   # ---------------------------------------------------------------------------
 
-  def generate(self):
+  def generate(self, workers=None, seed=None):
     """Method which runs the generation process and generates the specified
        number of records.
 
        This method return a list containing the 'number_of_records' generated
        records, each being a dictionary with the keys being attribute names and
        values the corresponding attribute values.
+
+       If a number of worker processes is given, the records are generated in
+       shards (see generate_in_shards()) using the given master seed.
     """
 
-    attr_name_list = self.attribute_name_list  # Short-hands to increase speed
-    rec_dict =       self.rec_dict
-    miss_val_str =   self.missing_val_str
+    if (self.strata_attribute_list != None):
+      if (workers != None):
+        raise Exception( 'Stratified records cannot be generated by worker' + \
+                         ' processes')
+      return self.generate_stratified()
 
-    num_rec_num_digit = len(str(self.number_of_records))-1  # For digit padding
+    if (workers != None):
+      return self.generate_in_shards(workers, seed)
+
+    if (self.generation_engine == 'column'):
+      return self.generate_column_wise()
+
+    rec_dict =         self.rec_dict  # Short-hands to increase speed
+    progress_update =  self.progress_reporter.update
+    generate_record_values = self.generation_plan.generate_record_values
+
+    if (self.unique_filter != None):
+      make_record_unique = self.make_record_unique
+    else:
+      make_record_unique = None
+
+    dup_key_bits = basefunctions.DUP_KEY_BITS
 
-    print('\n')
-    print( 'Generate records with attributes:')
-    print( ' ', attr_name_list)
-    print('\n')
+    self.progress_reporter.start('Generate records', self.number_of_records)
 
     for rec_id in range(self.number_of_records):
-      rec_id_str = 'rec-%s-org' % (str(rec_id).zfill(num_rec_num_digit))
 
-      this_rec_dict = {}  # The generated attribute values (attribute names as
-                          # keys, attribute values as values)
-      this_rec_list = []  # List of attribute values of the generated data set
+      if (self.record_seed != None):
+        this_rec_list = self.generate_record(rec_id)
+      else:
+        this_rec_list = generate_record_values()
 
-      for attr_data in self.attribute_data_list:
+      if (make_record_unique != None):
+        this_rec_list = make_record_unique(this_rec_list)
+
+      rec_dict[rec_id << dup_key_bits] = this_rec_list
+
+      progress_update(rec_id+1)
+
+    self.progress_reporter.finish()
+
+    return rec_dict
+
+  # ---------------------------------------------------------------------------
+
+  def generate_in_shards(self, workers, seed=None):
+    """Method which generates the specified number of records in shards of
+       'shard_size' records, using the given number of worker processes (if
+       'workers' is 1 all shards are generated in this process).
+
+       The random number generators are seeded for each shard with a seed
+       derived from the master seed and the shard number, so for a given
+       master seed the generated records are the same for any number of
+       workers. If no master seed is given, one is drawn from the 'random'
+       module. Apart from this the state of the random number generators is
+       not changed.
+
+       This method returns the same record dictionary as generate().
+    """
+
+    basefunctions.check_is_integer('workers', workers)
+    basefunctions.check_is_positive('workers', workers)
+
+    if (self.has_without_replacement == True):
+      raise Exception( 'Attributes drawn without replacement cannot be ' + \
+                       'generated in shards')
+
+    if (seed == None):
+      seed = random.randrange(2**32)
+
+    rec_dict = self.rec_dict  # Short-hand to increase speed
+
+    dup_key_bits = basefunctions.DUP_KEY_BITS
+
+    # A copy of this data set generator without the parts that do not need to
+    # be (or cannot be) sent to worker processes
+    #
+    shard_data_set = copy.copy(self)
+    shard_data_set.rec_dict = {}
+    shard_data_set.progress_reporter = progress.ProgressReporter()
+    shard_data_set.unique_filter = None
+
+    # Rejected records are replaced in this process (where all generated
+    # combinations are known), with random numbers derived from the master
+    # seed so the records still do not depend on the number of workers. The
+    # random number generators are switched to their own state only while
+    # records are replaced.
+    #
+    if (self.unique_filter != None):
+      caller_random_state = get_random_state()
+
+      unique_seed = sampler.derive_seed(seed, 'unique')
+      try:
+        random.seed(unique_seed)
+        if (numpy != None):
+          numpy.random.seed(unique_seed)
+        unique_random_state = get_random_state()
+      finally:
+        set_random_state(caller_random_state)
+
+    self.progress_reporter.start('Generate records in shards',
+                                 self.number_of_records)
+
+    rec_id = 0
+
+    for shard_rec_list in generate_sharded(generate_data_set_shard,
+                                           shard_data_set,
+                                           self.number_of_records, workers,
+                                           seed, self.shard_size):
+      if (self.unique_filter != None):
+        caller_random_state = get_random_state()
+        set_random_state(unique_random_state)
+        try:
+          shard_rec_list = self.make_records_unique(shard_rec_list)
+          unique_random_state = get_random_state()
+        finally:
+          set_random_state(caller_random_state)
+
+      for this_rec_list in shard_rec_list:
+        rec_dict[rec_id << dup_key_bits] = this_rec_list
+        rec_id += 1
+
+      self.progress_reporter.update(rec_id)
+
+    assert rec_id == self.number_of_records
+
+    self.progress_reporter.finish()
+
+    return rec_dict
+
+  # ---------------------------------------------------------------------------
+
+  def generate_record(self, rec_num):
+    """Method which generates the record with the given number (between 0
+       and 'number_of_records'-1) when a 'record_seed' has been set, and
+       returns its list of attribute values.
+
+       The random number generators are seeded with a seed derived from the
+       record seed and the record number, so the record is the same as the one
+       generated by generate() and it can be generated without generating any
+       of the records before it. Note this changes the state of the random
+       number generators.
+    """
+
+    if (self.record_seed == None):
+      raise Exception( 'Records can only be generated by their number if a' + \
+                       ' "record_seed" is given')
+
+    basefunctions.check_is_integer('rec_num', rec_num)
+    basefunctions.check_is_not_negative('rec_num', rec_num)
+
+    seed_random_state(sampler.derive_seed(self.record_seed, rec_num))
+
+    return self.generate_record_values()
+
+  # ---------------------------------------------------------------------------
+
+  def generate_record_list(self, start_rec_num, num_recs):
+    """Method which generates 'num_recs' records starting with the given
+       record number with the selected generation engine (or record by record
+       from their seeds if a 'record_seed' has been set), and returns them as
+       a list of lists of attribute values.
+    """
+
+    if (self.record_seed != None):
+      return [self.generate_record(rec_num) for rec_num in \
+              range(start_rec_num, start_rec_num+num_recs)]
+
+    elif (self.generation_engine == 'column'):
+      return self.generate_record_chunk(num_recs)
+
+    else:
+      return [self.generate_record_values() for i in range(num_recs)]
+
+  # ---------------------------------------------------------------------------
+
+  def generate_record_values(self):
+    """Method which generates the values of all attributes for one record,
+       and returns them as a list in the sequence of the attribute name list.
+    """
+
+    return self.generation_plan.generate_record_values()
+
+  # ---------------------------------------------------------------------------
+
+  def make_record_unique(self, rec_list, generate_funct=None):
+    """Method which checks if the combination of values of the unique
+       attributes in the given record has already been generated, and if so
+       generates new records (with the record engine, or by calling the given
+       function without arguments) until one has a new combination. Returns
+       the record with a new combination, which is added to the unique filter.
+
+       An exception is raised if no new combination is found after
+       UNIQUE_MAX_REDRAWS new records.
+    """
+
+    unique_filter = self.unique_filter
+    unique_slot_list = self.unique_slot_list
+
+    if (generate_funct == None):
+      generate_funct = self.generate_record_values
+
+    num_redraws = 0
+
+    while (unique_filter.add(tuple([rec_list[attr_slot] for attr_slot in \
+                                    unique_slot_list])) == False):
+      if (num_redraws == UNIQUE_MAX_REDRAWS):
+        raise Exception( 'No new combination of values for the unique ' + \
+                         'attributes %s found after %d ' % \
+                         (str(self.unique_attribute_list), num_redraws) + \
+                         'generated records')
+
+      rec_list = generate_funct()
+      num_redraws += 1
+
+    return rec_list
+
+  # ---------------------------------------------------------------------------
+
+  def make_records_unique(self, rec_list_list, generate_funct=None):
+    """Method which applies make_record_unique() to each record in the given
+       list, and returns the list of records with new combinations of values
+       of the unique attributes.
+    """
+
+    make_record_unique = self.make_record_unique
+
+    return [make_record_unique(rec_list, generate_funct) for rec_list in \
+            rec_list_list]
+
+  # ---------------------------------------------------------------------------
+
+  def generate_columns(self, num_recs):
+    """Method which generates the values of all attributes for the given
+       number of records, one attribute (or compound attribute) at a time.
+
+       This method returns a dictionary with the keys being attribute names
+       and values being lists with the 'num_recs' generated values of these
+       attributes.
+    """
+
+    return self.generation_plan.generate_columns(num_recs)
+
+  # ---------------------------------------------------------------------------
+
+  def generate_column_wise(self):
+    """Method which generates the specified number of records using the
+       column engine, i.e. all values of an attribute are generated at once
+       for a chunk of records, and only then put together into records.
+
+       This method returns the same record dictionary as generate().
+    """
+
+    rec_dict = self.rec_dict  # Short-hand to increase speed
+
+    dup_key_bits = basefunctions.DUP_KEY_BITS
+
+    self.progress_reporter.start('Generate records column-wise',
+                                 self.number_of_records)
+
+    start_rec_id = 0
+
+    while (start_rec_id < self.number_of_records):
+      num_recs = min(self.column_chunk_size,
+                     self.number_of_records - start_rec_id)
+
+      chunk_rec_list = self.generate_record_chunk(num_recs)
+      if (self.unique_filter != None):
+        chunk_rec_list = self.make_records_unique(chunk_rec_list)
+
+      rec_id = start_rec_id
+      for this_rec_list in chunk_rec_list:
+        rec_dict[rec_id << dup_key_bits] = this_rec_list
+        rec_id += 1
+
+      start_rec_id += num_recs
+
+      self.progress_reporter.update(start_rec_id)
+
+    self.progress_reporter.finish()
+
+    return rec_dict
+
+  # ---------------------------------------------------------------------------
+
+  def generate_record_chunk(self, num_recs):
+    """Method which generates the given number of records using the column
+       engine, and returns them as a list of records, each being a list of
+       attribute values in the sequence of the attribute name list.
+    """
+
+    return self.generation_plan.generate_record_chunk(num_recs)
+
+  # ---------------------------------------------------------------------------
+
+  def get_strata_counts(self):
+    """Method which allocates the number of records to the strata formed by
+       the combinations of values of the stratification attributes (with the
+       'strata_allocation' method, see sampler.allocate_counts()).
+
+       Returns a list of pairs (stratum dictionary, number of records) for all
+       strata with at least one record, where the stratum dictionary has the
+       attribute objects as keys and tuples with their stratum values as
+       values (as used by GenerationPlan.generate_columns()).
+    """
+
+    attr_stratum_list_list = []  # One list of strata per attribute object
+
+    for (attr_data, num_strata_attr) in self.strata_attr_data_list:
+      attr_stratum_list_list.append([(attr_data, val_tuple, weight) for \
+                                     (val_tuple, weight) in \
+                                     attr_data.get_stratum_list(num_strata_attr)])
 
-        if (attr_data.attribute_type == 'Compound-Categorical-Categorical'):
-          attr1_name = attr_data.categorical1_attribute_name
-          attr2_name = attr_data.categorical2_attribute_name
-          attr1_val, attr2_val = attr_data.create_attribute_values()
-          this_rec_dict[attr1_name] = attr1_val
-          this_rec_dict[attr2_name] = attr2_val
-
-        elif (attr_data.attribute_type == 'Compound-Categorical-Continuous'):
-          attr1_name = attr_data.categorical_attribute_name
-          attr2_name = attr_data.continuous_attribute_name
-          attr1_val, attr2_val = attr_data.create_attribute_values()
-          this_rec_dict[attr1_name] = attr1_val
-          this_rec_dict[attr2_name] = attr2_val
-
-        elif (attr_data.attribute_type == 'Compound-Continuous-Continuous'):
-          attr1_name = attr_data.continuous1_attribute_name
-          attr2_name = attr_data.continuous2_attribute_name
-          attr1_val, attr2_val = attr_data.create_attribute_values()
-          this_rec_dict[attr1_name] = attr1_val
-          this_rec_dict[attr2_name] = attr2_val
-
-        elif (attr_data.attribute_type == \
-              'Compound-Categorical-Categorical-Continuous'):
-          attr1_name = attr_data.categorical1_attribute_name
-          attr2_name = attr_data.categorical2_attribute_name
-          attr3_name = attr_data.continuous_attribute_name
-          attr1_val, attr2_val, attr3_val = attr_data.create_attribute_values()
-          this_rec_dict[attr1_name] = attr1_val
-          this_rec_dict[attr2_name] = attr2_val
-          this_rec_dict[attr3_name] = attr3_val
-
-        else:  # A single attribute
-          attr_name = attr_data.attribute_name
-          attr_val = attr_data.create_attribute_value()
-          this_rec_dict[attr_name] = attr_val
-
-      # Compile output record
+    # The strata of the records are all combinations of the strata of the
+    # attribute objects, which are generated independently
+    #
+    stratum_list = list(itertools.product(*attr_stratum_list_list))
+
+    weight_list = []
+    for stratum in stratum_list:
+      weight = 1.0
+      for (attr_data, val_tuple, attr_weight) in stratum:
+        weight *= attr_weight
+      weight_list.append(weight)
+
+    count_list = sampler.allocate_counts(weight_list, self.number_of_records,
+                                         self.strata_allocation)
+
+    return [(dict([(attr_data, val_tuple) for (attr_data, val_tuple, weight) \
+                   in stratum]), stratum_count) for (stratum, stratum_count) \
+            in zip(stratum_list, count_list) if stratum_count > 0]
+
+  # ---------------------------------------------------------------------------
+
+  def iter_stratified_records(self, chunk_size):
+    """Generator method which generates the records of all strata (see
+       get_strata_counts()), one stratum after the other in chunks of (at
+       most) 'chunk_size' records, and yields them one by one as lists of
+       attribute values.
+    """
+
+    generate_record_chunk = self.generation_plan.generate_record_chunk
+
+    for (stratum_dict, stratum_count) in self.get_strata_counts():
+
+      # Records of the stratum used to replace records with values of the
+      # unique attributes that have already been generated
       #
-      for attr_name in attr_name_list:
-        attr_val = this_rec_dict.get(attr_name, miss_val_str)
-        assert isinstance(attr_val, str) or isinstance(attr_val, unicode), \
-               attr_val
-        this_rec_list.append(attr_val)
+      def generate_stratum_record():
+        return generate_record_chunk(1, stratum_dict)[0]
+
+      start_rec_num = 0
+
+      while (start_rec_num < stratum_count):
+        num_recs = min(chunk_size, stratum_count - start_rec_num)
+
+        chunk_rec_list = generate_record_chunk(num_recs, stratum_dict)
+        if (self.unique_filter != None):
+          chunk_rec_list = self.make_records_unique(chunk_rec_list,
+                                                    generate_stratum_record)
+        for this_rec_list in chunk_rec_list:
+          yield this_rec_list
+
+        start_rec_num += num_recs
+
+  # ---------------------------------------------------------------------------
+
+  def generate_stratified(self):
+    """Method which generates the specified number of records stratum by
+       stratum (see get_strata_counts()), with the records of a stratum
+       generated in chunks of 'column_chunk_size' records. The records are
+       then shuffled, so their identifiers do not depend on their strata.
+
+       This method returns the same record dictionary as generate().
+    """
+
+    rec_dict =        self.rec_dict  # Short-hands to increase speed
+    progress_update = self.progress_reporter.update
+
+    dup_key_bits = basefunctions.DUP_KEY_BITS
+
+    self.progress_reporter.start('Generate stratified records',
+                                 self.number_of_records)
+
+    rec_list_list = []
 
-      rec_dict[rec_id_str] = this_rec_list
+    for this_rec_list in \
+        self.iter_stratified_records(self.column_chunk_size):
+      rec_list_list.append(this_rec_list)
+      progress_update(len(rec_list_list))
 
-      print( 'Generated record with ID: %s' % (rec_id_str))
-      print( '  %s' % (str(this_rec_list)))
-      print('\n')
+    assert len(rec_list_list) == self.number_of_records
 
-    print( 'Generated %d records' % (self.number_of_records))
-    print('\n')
-    print( '------------------------------------------------------------------')
-    print('\n)')
+    random.shuffle(rec_list_list)
+
+    for (rec_id, this_rec_list) in enumerate(rec_list_list):
+      rec_dict[rec_id << dup_key_bits] = this_rec_list
+
+    self.progress_reporter.finish()
 
     return rec_dict
 
   # ---------------------------------------------------------------------------
 
+  def iter_record_chunks(self, chunk_size=10000):
+    """Generator method which generates the specified number of records in
+       chunks of (at most) 'chunk_size' records, without storing them in the
+       record dictionary.
+
+       For each chunk a list of pairs (record key, list of attribute values)
+       is yielded, with records in the sequence of their keys (see
+       basefunctions.get_rec_key()).
+       Records are generated with the selected generation engine, or, if
+       stratification attributes are given, one stratum after the other (so
+       unlike with generate() the records are grouped by stratum).
+    """
+
+    basefunctions.check_is_integer('chunk_size', chunk_size)
+    basefunctions.check_is_positive('chunk_size', chunk_size)
+
+    if (self.strata_attribute_list != None):
+      strata_rec_iter = self.iter_stratified_records(chunk_size)
+
+    dup_key_bits = basefunctions.DUP_KEY_BITS
+
+    self.progress_reporter.start('Generate records in chunks',
+                                 self.number_of_records)
+
+    start_rec_id = 0
+
+    while (start_rec_id < self.number_of_records):
+      num_recs = min(chunk_size, self.number_of_records - start_rec_id)
+
+      if (self.strata_attribute_list != None):
+        chunk_rec_list = list(itertools.islice(strata_rec_iter, num_recs))
+      else:
+        chunk_rec_list = self.generate_record_list(start_rec_id, num_recs)
+        if (self.unique_filter != None):
+          chunk_rec_list = self.make_records_unique(chunk_rec_list)
+
+      rec_key_list = [rec_id << dup_key_bits for rec_id in \
+                      range(start_rec_id, start_rec_id+num_recs)]
+
+      yield list(zip(rec_key_list, chunk_rec_list))
+
+      start_rec_id += num_recs
+
+      self.progress_reporter.update(start_rec_id)
+
+    self.progress_reporter.finish()
+
+  # ---------------------------------------------------------------------------
+
+  def iter_records(self, chunk_size=10000):
+    """Generator method which generates the specified number of records one
+       chunk at a time (see iter_record_chunks()), and yields them one by one
+       as pairs (record key, list of attribute values).
+
+       At most 'chunk_size' records are kept in memory at any time.
+    """
+
+    for chunk_list in self.iter_record_chunks(chunk_size):
+      for rec_pair in chunk_list:
+        yield rec_pair
+
+  # ---------------------------------------------------------------------------
+
+  def write_stream(self, chunk_size=10000):
+    """Generate the specified number of records and write them into the
+       defined output file one chunk at a time, so memory use is bounded by
+       the chunk size rather than the number of records.
+
+       The records are not stored in the record dictionary. A header line is
+       written if the 'write_header_line' flag is set. This method returns
+       the number of records written.
+    """
+
+    try:
+      out_file = codecs.open(self.output_file_name, 'w',
+                             encoding=self.unicode_encoding)
+    except:
+      raise IOError( 'Cannot write CSV file "%s"' % (self.output_file_name))
+
+    if (self.write_header_line == True):
+      header_list = [self.rec_id_attr_name]+self.attribute_name_list
+      out_file.write(','.join(header_list)+os.linesep)
+
+    get_rec_id_str =    basefunctions.get_rec_id_str  # Short-hand
+    num_rec_num_digit = len(str(self.number_of_records))-1  # For digit padding
+
+    num_rec_written = 0
+
+    for chunk_list in self.iter_record_chunks(chunk_size):
+      out_file.write(''.join([','.join([get_rec_id_str(rec_key,
+                                                       num_rec_num_digit)]+ \
+                                       rec_list)+os.linesep for \
+                              (rec_key, rec_list) in chunk_list]))
+      num_rec_written += len(chunk_list)
+
+    out_file.close()
+
+    return num_rec_written
+
+  # ---------------------------------------------------------------------------
+
   def write(self):
-    """Write the generated records into the defined output file.
+    """Write the generated records into the defined output file, sorted by
+       their keys (so each original record is followed by its duplicates),
+       with the record keys written as identifiers 'rec-N-org' and
+       'rec-N-dup-D' (see basefunctions.get_rec_id_str()).
     """
 
-    rec_id_list = self.rec_dict.keys()
-    rec_id_list.sort()
+    rec_key_list = self.rec_dict.keys()
+    rec_key_list.sort()
+
+    num_rec_num_digit = len(str(self.number_of_records))-1  # For digit padding
 
     # Convert record dictionary into a list, with record identifier added
     #
     rec_list = []
 
-    for rec_id in rec_id_list:
-      this_rec_list = [rec_id]+self.rec_dict[rec_id]
+    for rec_key in rec_key_list:
+      this_rec_list = [basefunctions.get_rec_id_str(rec_key,
+                                                    num_rec_num_digit)]+ \
+                      self.rec_dict[rec_key]
       rec_list.append(this_rec_list)
 
     header_list = [self.rec_id_attr_name]+self.attribute_name_list
@@ -0,0 +1,263 @@
+# lookupcache.py - Python module providing a persistent cache for parsed and
+#                  validated look-up tables.
+#
+#                  Part of a flexible data generation system.
+#
+# =============================================================================
+#
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# =============================================================================
+
+"""Module containing functions that load look-up tables from CSV files, and
+   that store the parsed and validated tables in binary cache files, so later
+   loads of an unchanged file do not need to parse and validate it again.
+
+   A cache file is stored next to the CSV file (with the name of the CSV
+   file, the kind of table, and the extension '.cache'), or, if the variable
+   'cache_dir' is set (or the environment variable GECO_LOOKUP_CACHE_DIR),
+   in this directory. Each cache file contains a key made of the absolute
+   path, size, modification time and MD5 hash of the content of the CSV file
+   (as well as the encoding and header flag used); if any of these has
+   changed the table is rebuilt from the CSV file and the cache file is
+   written again.
+
+   If a cache file cannot be read or written (for example because the
+   directory is read-only) the table is simply built from the CSV file.
+
+   This module also contains a process-wide registry of shared tables (see
+   get_shared_table()), so that attributes that use the same look-up file
+   share one read-only table instead of each holding their own copy.
+"""
+
+# -----------------------------------------------------------------------------
+# Import necessary modules
+
+import hashlib
+import os
+import tempfile
+
+try:
+  import cPickle as pickle
+except ImportError:
+  import pickle
+
+import basefunctions
+
+# -----------------------------------------------------------------------------
+
+# Set to False to always build tables from their CSV files
+#
+use_cache = True
+
+# Directory for cache files, if None they are stored next to the CSV files
+#
+cache_dir = os.environ.get('GECO_LOOKUP_CACHE_DIR')
+
+# Changed whenever the format of cached tables changes, so old cache files
+# are rebuilt
+#
+CACHE_FORMAT_VERSION = 1
+
+# The process-wide registry of shared tables, with keys being tuples (absolute
+# file name, encoding, header line flag, table kind) and values pairs (file
+# size and modification time, table)
+#
+shared_table_dict = {}
+
+# -----------------------------------------------------------------------------
+
+def get_file_key(file_name, encoding, header_line, table_kind):
+  """Return the key that identifies the content of the given file as loaded
+     into a table of the given kind, as a tuple made of the absolute path,
+     size, modification time and MD5 hash of the file content, the encoding,
+     the header line flag, the table kind and the cache format version.
+  """
+
+  abs_file_name = os.path.abspath(file_name)
+
+  try:
+    file_stat = os.stat(abs_file_name)
+    in_file = open(abs_file_name, 'rb')
+    file_hash = hashlib.md5(in_file.read()).hexdigest()
+    in_file.close()
+  except:
+    raise IOError( 'Cannot read CSV file "%s"' % (file_name))
+
+  return (abs_file_name, file_stat.st_size, file_stat.st_mtime, file_hash,
+          encoding, header_line, table_kind, CACHE_FORMAT_VERSION)
+
+# -----------------------------------------------------------------------------
+
+def get_cache_file_name(file_name, table_kind):
+  """Return the name of the cache file for the given CSV file and table kind.
+  """
+
+  abs_file_name = os.path.abspath(file_name)
+
+  if (cache_dir == None):
+    return '%s.%s.cache' % (abs_file_name, table_kind)
+
+  path_hash = hashlib.md5(abs_file_name.encode('utf-8')).hexdigest()
+
+  return os.path.join(cache_dir, '%s-%s.%s.cache' % \
+                      (os.path.basename(abs_file_name), path_hash, table_kind))
+
+# -----------------------------------------------------------------------------
+
+def load_table(file_name, encoding, header_line, table_kind, build_funct):
+  """Load a table of the given kind from the given CSV file, either from its
+     cache file (if it is up-to-date) or by reading the CSV file with
+     basefunctions.read_csv_file() and calling build_funct(header_list,
+     file_data), which must parse and validate the file data and return the
+     table. Tables must be picklable (for example lists, tuples and
+     dictionaries of strings and numbers).
+
+     Arguments:
+     file_name    Name of the CSV file to load.
+
+     encoding     The name of the Unicode encoding of the file.
+
+     header_line  A flag, set to True or False, if the file starts with a
+                  header line or not.
+
+     table_kind   A short name for the kind of table (used in the name of the
+                  cache file, so one CSV file can be loaded into different
+                  kinds of tables).
+
+     build_funct  The function that builds the table from the header list and
+                  file data returned by basefunctions.read_csv_file().
+  """
+
+  basefunctions.check_is_non_empty_string('file_name', file_name)
+  basefunctions.check_is_flag('header_line', header_line)
+  basefunctions.check_is_non_empty_string('table_kind', table_kind)
+  basefunctions.check_is_function_or_method('build_funct', build_funct)
+
+  if (use_cache == False):
+    header_list, file_data = basefunctions.read_csv_file(file_name, encoding,
+                                                         header_line)
+    return build_funct(header_list, file_data)
+
+  file_key = get_file_key(file_name, encoding, header_line, table_kind)
+  cache_file_name = get_cache_file_name(file_name, table_kind)
+
+  # Try to load the table from the cache file - - - - - - - - - - - - - - - -
+  #
+  try:
+    cache_file = open(cache_file_name, 'rb')
+    cache_key, table = pickle.load(cache_file)
+    cache_file.close()
+
+    if (cache_key == file_key):
+      return table
+
+  except:  # No cache file, or it cannot be read
+    pass
+
+  # Build the table and write it into a new cache file - - - - - - - - - - - -
+  #
+  header_list, file_data = basefunctions.read_csv_file(file_name, encoding,
+                                                       header_line)
+  table = build_funct(header_list, file_data)
+
+  tmp_file_name = None
+
+  try:
+    cache_file_dir = os.path.dirname(cache_file_name)
+    if (not os.path.isdir(cache_file_dir)):
+      os.makedirs(cache_file_dir)
+
+    # Write into a temporary file first, so other processes never read a
+    # partially written cache file
+    #
+    tmp_fd, tmp_file_name = tempfile.mkstemp(dir=cache_file_dir,
+                                             suffix='.tmp')
+    tmp_file = os.fdopen(tmp_fd, 'wb')
+    pickle.dump((file_key, table), tmp_file, pickle.HIGHEST_PROTOCOL)
+    tmp_file.close()
+
+    if (os.name == 'nt') and os.path.exists(cache_file_name):
+      os.remove(cache_file_name)
+    os.rename(tmp_file_name, cache_file_name)
+
+  except:  # Cache file cannot be written, continue without caching
+    if (tmp_file_name != None) and os.path.exists(tmp_file_name):
+      try:
+        os.remove(tmp_file_name)
+      except:
+        pass
+
+  return table
+
+# -----------------------------------------------------------------------------
+
+def build_csv_table(header_list, file_data):
+  """Build function for load_table() that keeps the CSV file data as it is,
+     returning the pair (header_list, file_data).
+  """
+
+  return header_list, file_data
+
+# -----------------------------------------------------------------------------
+
+def read_csv_file(file_name, encoding, header_line):
+  """Read a comma separated values (CSV) file like
+     basefunctions.read_csv_file(), but load the parsed data from the cache
+     if the file has not changed.
+
+     Returns the pair (header_list, file_data).
+  """
+
+  return load_table(file_name, encoding, header_line, 'csv', build_csv_table)
+
+# -----------------------------------------------------------------------------
+
+def get_shared_table(file_name, encoding, header_line, table_kind,
+                     build_funct):
+  """Return the table of the given kind for the given look-up file from the
+     process-wide registry of shared tables. If it is not in the registry yet
+     (or the file has changed since it was added) the table is built by
+     calling build_funct() without arguments and added to the registry.
+
+     All callers asking for the same file, encoding, header line flag and
+     table kind get the same table object, so it must be treated as read-only.
+  """
+
+  basefunctions.check_is_non_empty_string('file_name', file_name)
+  basefunctions.check_is_flag('header_line', header_line)
+  basefunctions.check_is_non_empty_string('table_kind', table_kind)
+  basefunctions.check_is_function_or_method('build_funct', build_funct)
+
+  abs_file_name = os.path.abspath(file_name)
+
+  try:
+    file_stat = os.stat(abs_file_name)
+  except:
+    raise IOError( 'Cannot read CSV file "%s"' % (file_name))
+
+  file_state = (file_stat.st_size, file_stat.st_mtime)
+
+  table_key = (abs_file_name, encoding, header_line, table_kind)
+
+  if (table_key in shared_table_dict):
+    shared_file_state, table = shared_table_dict[table_key]
+    if (shared_file_state == file_state):
+      return table
+
+  table = build_funct()
+  shared_table_dict[table_key] = (file_state, table)
+
+  return table
+
+# -----------------------------------------------------------------------------
+
+def clear_shared_tables():
+  """Remove all tables from the process-wide registry of shared tables.
+  """
+
+  shared_table_dict.clear()
+
+# =============================================================================
@@ -0,0 +1,228 @@
+# progress.py - Python module providing progress reporters for long running
+#               generation and corruption processes.
+#
+#               Part of a flexible data generation system.
+#
+# =============================================================================
+#
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# =============================================================================
+
+"""Module containing classes that report the progress of generating or
+   corrupting records. The data set generator and corruptor classes call the
+   start(), update() and finish() methods of a progress reporter; the
+   default reporter does nothing, so these processes are silent unless a
+   reporter is given.
+"""
+
+# -----------------------------------------------------------------------------
+# Import necessary modules
+
+import sys
+import time
+
+import basefunctions
+
+# -----------------------------------------------------------------------------
+
+def print_progress(task_name, num_done, num_total, elapsed_time, rec_per_sec,
+                   eta_time):
+  """Default callback function of an interval progress reporter, which
+     writes one line with the progress of the given task to standard output.
+  """
+
+  if (eta_time == None):
+    eta_str = 'unknown'
+  else:
+    eta_str = '%.1f sec' % (eta_time)
+
+  sys.stdout.write('%s: %d of %d records (%.1f%%), %.1f sec elapsed, ' % \
+                   (task_name, num_done, num_total,
+                    100.0*num_done / max(num_total, 1), elapsed_time) + \
+                   '%.1f records/sec, ETA %s\n' % (rec_per_sec, eta_str))
+  sys.stdout.flush()
+
+# =============================================================================
+
+class ProgressReporter:
+  """Base class for progress reporters. This class does not report anything,
+     it is used as the default (silent) reporter.
+
+     A process calls start() once before it begins, update() with the total
+     number of records processed so far (as often as it likes), and finish()
+     once when it is done.
+  """
+
+  # ---------------------------------------------------------------------------
+
+  def start(self, task_name, num_total):
+    """Method called when a process with the given name starts, that will
+       process 'num_total' records.
+    """
+
+    pass
+
+  # ---------------------------------------------------------------------------
+
+  def update(self, num_done):
+    """Method called with the number of records processed so far.
+    """
+
+    pass
+
+  # ---------------------------------------------------------------------------
+
+  def finish(self):
+    """Method called when the process has finished.
+    """
+
+    pass
+
+# =============================================================================
+
+class IntervalProgressReporter(ProgressReporter):
+  """A progress reporter which reports every N records and/or every T seconds
+     the number of records processed, the elapsed time, the throughput
+     (records per second) and the estimated time until the process finishes.
+
+     The arguments that can be given when an interval progress reporter is
+     initialised are:
+
+     report_num_records  Report after every this many records (a positive
+                         integer). Default is None (not used).
+
+     report_num_seconds  Report when at least this many seconds have passed
+                         since the last report (a positive number). Default
+                         is None (not used).
+
+     callback            A function that is called for each report with the
+                         arguments: task_name, num_done, num_total,
+                         elapsed_time, rec_per_sec, eta_time (seconds, or
+                         None if unknown). The default is print_progress(),
+                         which writes one line to standard output.
+
+     At least one of 'report_num_records' and 'report_num_seconds' must be
+     given. A final report is always made when the process finishes.
+  """
+
+  # ---------------------------------------------------------------------------
+
+  def __init__(self, **kwargs):
+    """Constructor. Process the keyword arguments.
+    """
+
+    self.report_num_records = None
+    self.report_num_seconds = None
+    self.callback =           print_progress
+
+    for (keyword, value) in kwargs.items():
+
+      if (keyword.startswith('report_num_r')):
+        basefunctions.check_is_integer('report_num_records', value)
+        basefunctions.check_is_positive('report_num_records', value)
+        self.report_num_records = value
+
+      elif (keyword.startswith('report_num_s')):
+        basefunctions.check_is_number('report_num_seconds', value)
+        basefunctions.check_is_positive('report_num_seconds', value)
+        self.report_num_seconds = value
+
+      elif (keyword.startswith('call')):
+        basefunctions.check_is_function_or_method('callback', value)
+        self.callback = value
+
+      else:
+        raise Exception( 'Illegal constructor argument keyword: "%s"' % \
+              (str(keyword)))
+
+    if (self.report_num_records == None) and (self.report_num_seconds == None):
+      raise Exception( 'At least one of "report_num_records" and ' + \
+                       '"report_num_seconds" must be given')
+
+    self.task_name =   None
+    self.num_total =   0
+    self.num_done =    0
+    self.start_time =  None
+
+    self.next_report_num =  None  # Report when these are reached
+    self.next_report_time = None
+
+  # ---------------------------------------------------------------------------
+
+  def start(self, task_name, num_total):
+    """Method called when a process with the given name starts, that will
+       process 'num_total' records.
+    """
+
+    self.task_name =  task_name
+    self.num_total =  num_total
+    self.num_done =   0
+    self.start_time = time.time()
+
+    if (self.report_num_records != None):
+      self.next_report_num = self.report_num_records
+    else:
+      self.next_report_num = num_total+1  # Never reached by record counts
+
+    if (self.report_num_seconds != None):
+      self.next_report_time = self.start_time + self.report_num_seconds
+
+  # ---------------------------------------------------------------------------
+
+  def update(self, num_done):
+    """Method called with the number of records processed so far. Makes a
+       report if the record or the time interval has been reached.
+    """
+
+    self.num_done = num_done
+
+    if (num_done >= self.next_report_num):
+      while (self.next_report_num <= num_done):
+        self.next_report_num += self.report_num_records
+      self.report()
+
+    elif ((self.next_report_time != None) and \
+          (time.time() >= self.next_report_time)):
+      self.report()
+
+  # ---------------------------------------------------------------------------
+
+  def finish(self):
+    """Method called when the process has finished. Makes a final report.
+    """
+
+    self.report()
+
+  # ---------------------------------------------------------------------------
+
+  def report(self):
+    """Method which calculates the throughput and estimated remaining time,
+       and calls the callback function.
+    """
+
+    curr_time = time.time()
+
+    if (self.report_num_seconds != None):
+      self.next_report_time = curr_time + self.report_num_seconds
+
+    elapsed_time = curr_time - self.start_time
+
+    if (elapsed_time > 0.0):
+      rec_per_sec = self.num_done / elapsed_time
+    else:
+      rec_per_sec = 0.0
+
+    if (rec_per_sec > 0.0):
+      eta_time = (self.num_total - self.num_done) / rec_per_sec
+    elif (self.num_done >= self.num_total):
+      eta_time = 0.0
+    else:
+      eta_time = None
+
+    self.callback(self.task_name, self.num_done, self.num_total, elapsed_time,
+                  rec_per_sec, eta_time)
+
+# =============================================================================
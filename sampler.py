@@ -0,0 +1,1147 @@
+# sampler.py - Python module providing random samplers for discrete and
+#              continuous distributions.
+#
+#              Part of a flexible data generation system.
+#
+# =============================================================================
+#
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# =============================================================================
+
+"""Module containing classes that draw random values according to a given
+   distribution. They are used by the attribute generators in generator.py
+   so that look-up tables do not need to be expanded into lists with values
+   repeated according to their counts.
+"""
+
+# -----------------------------------------------------------------------------
+# Import necessary modules
+
+import bisect
+import hashlib
+import math
+import random
+
+try:
+  import numpy  # Optional, used to draw many values at once
+except ImportError:
+  numpy = None
+
+import basefunctions
+
+# -----------------------------------------------------------------------------
+
+def object_array(value_list):
+  """Convert the given list of values (of any type, including tuples) into a
+     one-dimensional NumPy array of objects.
+
+     NumPy must be available when this function is called.
+  """
+
+  val_array = numpy.empty(len(value_list), dtype=object)
+  for i in range(len(value_list)):
+    val_array[i] = value_list[i]
+
+  return val_array
+
+# -----------------------------------------------------------------------------
+
+def derive_seed(master_seed, *key_list):
+  """Derive a seed for a random number generator from the given master seed
+     and one or more keys (for example a shard or record number), so that
+     every combination of master seed and keys gets its own, reproducible,
+     stream of random numbers.
+
+     The derived seed is an integer between 0 and 2^32-1, so it can be used
+     both with the Python 'random' module and with NumPy.
+  """
+
+  key_str = '-'.join([str(master_seed)]+[str(key) for key in key_list])
+
+  return int(hashlib.md5(key_str.encode('ascii')).hexdigest()[:8], 16)
+
+# -----------------------------------------------------------------------------
+
+def allocate_counts(weight_list, n, method='quota'):
+  """Split the number 'n' into one count per weight in the given list
+     (numbers that are not negative, with a positive sum), such that the
+     counts sum to 'n'. The methods are:
+
+     quota        The largest remainder method: each count is the integer
+                  part of its share n*weight/sum(weights), and the remaining
+                  counts go to the largest fractional parts (ties to the first
+                  of them). Counts differ from their shares by less than one,
+                  and do not depend on the random number generators.
+
+     multinomial  The counts are drawn from the multinomial distribution with
+                  n trials and the normalised weights as probabilities.
+
+     Returns a list of counts (integers) in the order of the weights.
+  """
+
+  basefunctions.check_is_list('weight_list', weight_list)
+  basefunctions.check_is_integer('n', n)
+  basefunctions.check_is_not_negative('n', n)
+
+  for weight in weight_list:
+    basefunctions.check_is_number('weight', weight)
+    basefunctions.check_is_not_negative('weight', weight)
+
+  weight_sum = float(sum(weight_list))
+  if (weight_sum <= 0.0):
+    raise Exception( 'Sum of weights is not positive: %s' % (str(weight_sum)))
+
+  if (method == 'quota'):
+    share_list = [n*weight/weight_sum for weight in weight_list]
+    count_list = [int(math.floor(share)) for share in share_list]
+
+    num_left = n - sum(count_list)
+
+    remainder_order = sorted(range(len(share_list)),
+                             key=lambda i: count_list[i]-share_list[i])
+    for i in remainder_order[:num_left]:
+      count_list[i] += 1
+
+  elif (method == 'multinomial'):
+    if (numpy != None):
+      count_list = numpy.random.multinomial(n, [weight/weight_sum for weight \
+                                                in weight_list]).tolist()
+    else:
+      cumu_list = []  # Cumulative weights
+      cumu_weight = 0.0
+      for weight in weight_list:
+        cumu_weight += weight
+        cumu_list.append(cumu_weight)
+
+      count_list = [0]*len(weight_list)
+      for j in range(n):
+        i = bisect.bisect_right(cumu_list, random.random()*weight_sum)
+        count_list[min(i, len(weight_list)-1)] += 1
+
+  else:
+    raise Exception( 'Illegal allocation method: "%s"' % (str(method)))
+
+  assert sum(count_list) == n, (sum(count_list), n)
+
+  return count_list
+
+# =============================================================================
+
+class AliasTable:
+  """Draw values from a discrete distribution given as a list of values and
+     their counts, using the alias method of Walker (in the variant described
+     by Vose).
+
+     The table requires memory and construction time linear in the number of
+     distinct values, and each draw takes constant time independent of the
+     number of values and of the size of their counts.
+
+     All computations are done on integer numbers, so values are drawn with
+     exactly the probabilities count / (sum of all counts).
+
+     The argument that has to be given when an alias table is initialised is:
+
+     value_count_list  A list of pairs (value, count), where counts must be
+                       positive integer numbers. Values can be of any type.
+  """
+
+  # ---------------------------------------------------------------------------
+
+  def __init__(self, value_count_list):
+    """Constructor. Build the probability and alias tables.
+    """
+
+    basefunctions.check_is_list('value_count_list', value_count_list)
+    if (value_count_list == []):
+      raise Exception( 'Empty value count list given to alias table')
+
+    value_list = []
+    count_list = []
+
+    for (val, count) in value_count_list:
+      basefunctions.check_is_integer('count', count)
+      basefunctions.check_is_positive('count', count)
+      value_list.append(val)
+      count_list.append(count)
+
+    num_val =   len(value_list)
+    total_cnt = sum(count_list)
+
+    # Scale all counts by the number of values so the average scaled count
+    # equals the total count. Values with a scaled count below the total fill
+    # their slot only partially, and the rest of their slot is taken by a
+    # value with a scaled count above the total.
+    #
+    scaled_list = [count*num_val for count in count_list]
+
+    prob_list =  [total_cnt]*num_val   # Thresholds (between 0 and total)
+    alias_list = list(range(num_val))  # Index of the alias value for a slot
+
+    small_list = []
+    large_list = []
+    for i in range(num_val):
+      if (scaled_list[i] < total_cnt):
+        small_list.append(i)
+      else:
+        large_list.append(i)
+
+    while ((small_list != []) and (large_list != [])):
+      small_i = small_list.pop()
+      large_i = large_list.pop()
+
+      prob_list[small_i] =  scaled_list[small_i]
+      alias_list[small_i] = large_i
+
+      scaled_list[large_i] += scaled_list[small_i] - total_cnt
+      if (scaled_list[large_i] < total_cnt):
+        small_list.append(large_i)
+      else:
+        large_list.append(large_i)
+
+    # With integer arithmetic all remaining slots are exactly full, so their
+    # threshold stays at the total count
+    #
+    assert small_list == []
+
+    self.value_list =  value_list
+    self.count_list =  count_list
+    self.prob_list =   prob_list
+    self.alias_list =  alias_list
+    self.num_values =  num_val
+    self.total_count = total_cnt
+
+    # NumPy versions of the tables, only built when values are drawn in bulk
+    #
+    self.value_array = None
+    self.prob_array =  None
+    self.alias_array = None
+
+  # ---------------------------------------------------------------------------
+
+  def draw_index(self):
+    """Method which randomly draws and returns the index (into the list of
+       values) of one value.
+    """
+
+    # One random number selects both the slot and the position within the
+    # slot
+    #
+    slot_i, slot_pos = divmod(random.randrange(self.num_values * \
+                                               self.total_count),
+                              self.total_count)
+
+    if (slot_pos < self.prob_list[slot_i]):
+      return slot_i
+    else:
+      return self.alias_list[slot_i]
+
+  # ---------------------------------------------------------------------------
+
+  def draw(self):
+    """Method which randomly draws and returns one value.
+    """
+
+    return self.value_list[self.draw_index()]
+
+  # ---------------------------------------------------------------------------
+
+  def draw_index_many(self, n):
+    """Method which randomly draws the indices of n values, and returns them
+       as a NumPy integer array if NumPy is available, otherwise as a list.
+    """
+
+    basefunctions.check_is_integer('n', n)
+    basefunctions.check_is_not_negative('n', n)
+
+    if (numpy == None):
+      draw_index = self.draw_index  # Short-hand to increase speed
+      return [draw_index() for i in range(n)]
+
+    if (self.prob_array is None):
+      self.prob_array =  numpy.array(self.prob_list, dtype=numpy.int64)
+      self.alias_array = numpy.array(self.alias_list, dtype=numpy.int64)
+
+    slot_array = numpy.random.randint(0, self.num_values, size=n)
+    pos_array =  numpy.random.randint(0, self.total_count, size=n,
+                                      dtype=numpy.int64)
+
+    return numpy.where(pos_array < self.prob_array[slot_array], slot_array,
+                       self.alias_array[slot_array])
+
+  # ---------------------------------------------------------------------------
+
+  def draw_many(self, n):
+    """Method which randomly draws n values, and returns them as a NumPy
+       array (of objects) if NumPy is available, otherwise as a list.
+    """
+
+    index_list = self.draw_index_many(n)
+
+    if (numpy == None):
+      value_list = self.value_list
+      return [value_list[i] for i in index_list]
+
+    if (self.value_array is None):
+      self.value_array = object_array(self.value_list)
+
+    return self.value_array[index_list]
+
+# =============================================================================
+
+class ConditionalAliasTable:
+  """Draw values from one of several discrete distributions, one for each
+     context (for example each value of a parent attribute), where the
+     values for many records with different contexts can be drawn at once.
+
+     One alias table (see AliasTable) is built for each context. If NumPy is
+     available the tables of all contexts are packed into shared arrays, so
+     drawing the values for an array of n contexts takes a fixed number of
+     array operations, without grouping the records by their context. In
+     this bulk draw the slot and the position within the slot are taken from
+     one random floating-point number, so probabilities are only exact up to
+     its resolution.
+
+     The argument that has to be given when a conditional alias table is
+     initialised is:
+
+     context_value_count_list  A list with one list of pairs (value, count)
+                               for each context, contexts being identified by
+                               their index in this list. Values must be
+                               non-negative integer numbers (for example
+                               indices into a list of values kept by the
+                               caller), counts positive integer numbers.
+  """
+
+  # ---------------------------------------------------------------------------
+
+  def __init__(self, context_value_count_list):
+    """Constructor. Build one alias table per context.
+    """
+
+    basefunctions.check_is_list('context_value_count_list',
+                                context_value_count_list)
+    if (context_value_count_list == []):
+      raise Exception( 'Empty context list given to conditional alias table')
+
+    for value_count_list in context_value_count_list:
+      for (val, count) in value_count_list:
+        basefunctions.check_is_integer('value', val)
+        basefunctions.check_is_not_negative('value', val)
+
+    self.table_list = [AliasTable(value_count_list) for value_count_list in \
+                       context_value_count_list]
+    self.num_contexts = len(self.table_list)
+
+    # The packed NumPy arrays of all tables, only built when values are drawn
+    # in bulk
+    #
+    self.offset_array = None  # Position of the first slot of each context
+    self.size_array =   None  # Number of slots of each context
+    self.prob_array =   None  # Slot thresholds as fractions of a slot
+    self.alias_array =  None  # Index of the alias slot of each slot
+    self.value_array =  None  # Value of each slot
+
+  # ---------------------------------------------------------------------------
+
+  def draw(self, context):
+    """Method which randomly draws and returns one value for the given
+       context.
+    """
+
+    return self.table_list[context].draw()
+
+  # ---------------------------------------------------------------------------
+
+  def build_arrays(self):
+    """Method which packs the alias tables of all contexts into NumPy arrays.
+    """
+
+    offset_list = []
+    size_list =   []
+    prob_list =   []
+    alias_list =  []
+    value_list =  []
+
+    for table in self.table_list:
+      offset = len(value_list)
+      offset_list.append(offset)
+      size_list.append(table.num_values)
+
+      total_count = float(table.total_count)
+      prob_list +=  [prob / total_count for prob in table.prob_list]
+      alias_list += [offset+alias_i for alias_i in table.alias_list]
+      value_list += table.value_list
+
+    self.offset_array = numpy.array(offset_list, dtype=numpy.int64)
+    self.size_array =   numpy.array(size_list, dtype=numpy.int64)
+    self.prob_array =   numpy.array(prob_list)
+    self.alias_array =  numpy.array(alias_list, dtype=numpy.int64)
+    self.value_array =  numpy.array(value_list, dtype=numpy.int64)
+
+  # ---------------------------------------------------------------------------
+
+  def draw_many(self, context_list):
+    """Method which randomly draws one value for each context in the given
+       list (or NumPy integer array) of contexts, and returns the values as a
+       NumPy integer array if NumPy is available, otherwise as a list.
+    """
+
+    if (numpy == None):
+      table_list = self.table_list  # Short-hand to increase speed
+      return [table_list[context].draw() for context in context_list]
+
+    if (self.prob_array is None):
+      self.build_arrays()
+
+    context_array = numpy.asarray(context_list, dtype=numpy.int64)
+
+    size_array = self.size_array[context_array]
+
+    # The integer part selects the slot within the table of the context, the
+    # fractional part the position within the slot
+    #
+    slot_pos_array = numpy.random.random(len(context_array)) * size_array
+    slot_array = numpy.minimum(slot_pos_array.astype(numpy.int64),
+                               size_array-1)
+    pos_array =  slot_pos_array - slot_array
+    slot_array += self.offset_array[context_array]
+
+    slot_array = numpy.where(pos_array < self.prob_array[slot_array],
+                             slot_array, self.alias_array[slot_array])
+
+    return self.value_array[slot_array]
+
+# =============================================================================
+
+class CumulativeTable:
+  """Draw values from a discrete distribution given as a list of values and
+     their counts, using a binary search over the cumulative counts.
+
+     The cumulative counts are integer numbers computed once, so each draw
+     uses one exact integer random number and takes time logarithmic in the
+     number of distinct values.
+
+     The argument that has to be given when a cumulative table is initialised
+     is:
+
+     value_count_list  A list of pairs (value, count), where counts must be
+                       positive integer numbers. Values can be of any type.
+  """
+
+  # ---------------------------------------------------------------------------
+
+  def __init__(self, value_count_list):
+    """Constructor. Build the list of cumulative counts.
+    """
+
+    basefunctions.check_is_list('value_count_list', value_count_list)
+    if (value_count_list == []):
+      raise Exception( 'Empty value count list given to cumulative table')
+
+    value_list = []
+    cumu_list =  []  # Cumulative counts, the last being the total count
+    cumu_cnt =   0
+
+    for (val, count) in value_count_list:
+      basefunctions.check_is_integer('count', count)
+      basefunctions.check_is_positive('count', count)
+      cumu_cnt += count
+      value_list.append(val)
+      cumu_list.append(cumu_cnt)
+
+    self.value_list =  value_list
+    self.cumu_list =   cumu_list
+    self.num_values =  len(value_list)
+    self.total_count = cumu_cnt
+
+    # NumPy versions of the tables, only built when values are drawn in bulk
+    #
+    self.value_array = None
+    self.cumu_array =  None
+
+  # ---------------------------------------------------------------------------
+
+  def draw_index(self):
+    """Method which randomly draws and returns the index (into the list of
+       values) of one value.
+    """
+
+    return bisect.bisect_right(self.cumu_list,
+                               random.randrange(self.total_count))
+
+  # ---------------------------------------------------------------------------
+
+  def draw(self):
+    """Method which randomly draws and returns one value.
+    """
+
+    return self.value_list[self.draw_index()]
+
+  # ---------------------------------------------------------------------------
+
+  def draw_many(self, n):
+    """Method which randomly draws n values, and returns them as a NumPy
+       array (of objects) if NumPy is available, otherwise as a list.
+    """
+
+    basefunctions.check_is_integer('n', n)
+    basefunctions.check_is_not_negative('n', n)
+
+    if (numpy == None):
+      value_list =  self.value_list
+      cumu_list =   self.cumu_list
+      total_count = self.total_count
+
+      bisect_right = bisect.bisect_right  # Short-hands to increase speed
+      randrange =    random.randrange
+
+      return [value_list[bisect_right(cumu_list, randrange(total_count))] \
+              for i in range(n)]
+
+    if (self.cumu_array is None):
+      self.cumu_array =  numpy.array(self.cumu_list, dtype=numpy.int64)
+      self.value_array = object_array(self.value_list)
+
+    rand_array = numpy.random.randint(0, self.total_count, size=n,
+                                      dtype=numpy.int64)
+
+    return self.value_array[numpy.searchsorted(self.cumu_array, rand_array,
+                                               side='right')]
+
+# =============================================================================
+
+class FenwickTable:
+  """Draw values from a discrete distribution given as a list of values and
+     their counts, where counts can be changed after the table is built,
+     using a Fenwick tree (binary indexed tree) over the counts.
+
+     Each draw and each change of a count takes time logarithmic in the
+     number of distinct values, so counts can be changed between draws
+     without rebuilding the table. Draws can also be done without
+     replacement, in which case the count of each drawn value is decreased by
+     one, so a value is drawn at most as many times as its count.
+
+     All computations are done on integer numbers, so values are drawn with
+     exactly the probabilities count / (sum of all counts).
+
+     The argument that has to be given when a Fenwick table is initialised
+     is:
+
+     value_count_list  A list of pairs (value, count), where counts must be
+                       non-negative integer numbers. Each value must only
+                       occur once, and values must be hashable.
+  """
+
+  # ---------------------------------------------------------------------------
+
+  def __init__(self, value_count_list):
+    """Constructor. Build the Fenwick tree over the counts.
+    """
+
+    basefunctions.check_is_list('value_count_list', value_count_list)
+
+    self.value_list =  []
+    self.count_list =  []
+    self.value_index = {}  # Index of each value in the value list
+    self.tree_list =   [0]  # Fenwick tree, with position 0 not used
+    self.total_count = 0
+
+    # NumPy version of the tree, only built when values are drawn in bulk
+    # (and built again after counts have changed)
+    #
+    self.value_array = None
+    self.tree_array =  None
+
+    for (val, count) in value_count_list:
+      self.append_value(val, count)
+
+  # ---------------------------------------------------------------------------
+
+  def get_prefix_count(self, num_val):
+    """Method which returns the sum of the counts of the first 'num_val'
+       values.
+    """
+
+    tree_list = self.tree_list
+
+    prefix_cnt = 0
+    while (num_val > 0):
+      prefix_cnt += tree_list[num_val]
+      num_val &= num_val - 1  # Remove the lowest set bit
+
+    return prefix_cnt
+
+  # ---------------------------------------------------------------------------
+
+  def append_value(self, val, count):
+    """Method which adds a new value with the given count at the end of the
+       table.
+    """
+
+    basefunctions.check_is_integer('count', count)
+    basefunctions.check_is_not_negative('count', count)
+    if (val in self.value_index):
+      raise Exception( 'Value "%s" occurs twice in Fenwick table' % \
+                       (str(val)))
+
+    self.value_index[val] = len(self.value_list)
+    self.value_list.append(val)
+    self.count_list.append(count)
+
+    # The new tree node covers the counts of the values from position
+    # i - lowbit(i) + 1 to i
+    #
+    i = len(self.value_list)
+    self.tree_list.append(count + self.get_prefix_count(i-1) - \
+                          self.get_prefix_count(i - (i & -i)))
+    self.total_count += count
+
+    self.value_array = None
+    self.tree_array =  None
+
+  # ---------------------------------------------------------------------------
+
+  def add_count_at(self, val_index, count_diff):
+    """Method which adds the given (positive or negative) number to the count
+       of the value with the given index.
+    """
+
+    new_count = self.count_list[val_index] + count_diff
+    if (new_count < 0):
+      raise Exception( 'Count of value "%s" cannot become negative: %d' % \
+                       (str(self.value_list[val_index]), new_count))
+
+    self.count_list[val_index] = new_count
+    self.total_count += count_diff
+
+    tree_list = self.tree_list
+    tree_size = len(tree_list)
+
+    i = val_index + 1
+    while (i < tree_size):
+      tree_list[i] += count_diff
+      i += i & -i  # Add the lowest set bit
+
+    self.tree_array = None
+
+  # ---------------------------------------------------------------------------
+
+  def get_count(self, val):
+    """Method which returns the count of the given value (0 for values not in
+       the table).
+    """
+
+    if (val not in self.value_index):
+      return 0
+
+    return self.count_list[self.value_index[val]]
+
+  # ---------------------------------------------------------------------------
+
+  def set_count(self, val, count):
+    """Method which sets the count of the given value, adding the value to
+       the table if it is not in the table yet.
+    """
+
+    basefunctions.check_is_integer('count', count)
+    basefunctions.check_is_not_negative('count', count)
+
+    if (val not in self.value_index):
+      self.append_value(val, count)
+    else:
+      val_index = self.value_index[val]
+      self.add_count_at(val_index, count - self.count_list[val_index])
+
+  # ---------------------------------------------------------------------------
+
+  def add_count(self, val, count_diff):
+    """Method which adds the given (positive or negative) number to the count
+       of the given value, adding the value to the table if it is not in the
+       table yet.
+    """
+
+    basefunctions.check_is_integer('count_diff', count_diff)
+
+    if (val not in self.value_index):
+      self.append_value(val, count_diff)
+    else:
+      self.add_count_at(self.value_index[val], count_diff)
+
+  # ---------------------------------------------------------------------------
+
+  def draw_index(self):
+    """Method which randomly draws and returns the index (into the list of
+       values) of one value.
+    """
+
+    if (self.total_count == 0):
+      raise Exception( 'No values left to draw from Fenwick table')
+
+    rand_cnt =  random.randrange(self.total_count)
+    tree_list = self.tree_list
+    tree_size = len(tree_list)
+
+    # Descend the tree to find the last position whose prefix count is at
+    # most the random count, the value drawn is the one after it
+    #
+    pos =  0
+    step = 1 << (tree_size.bit_length() - 1)
+    while (step > 0):
+      next_pos = pos + step
+      if (next_pos < tree_size) and (tree_list[next_pos] <= rand_cnt):
+        pos = next_pos
+        rand_cnt -= tree_list[next_pos]
+      step >>= 1
+
+    return pos
+
+  # ---------------------------------------------------------------------------
+
+  def draw(self):
+    """Method which randomly draws and returns one value.
+    """
+
+    return self.value_list[self.draw_index()]
+
+  # ---------------------------------------------------------------------------
+
+  def draw_without_replacement(self):
+    """Method which randomly draws and returns one value, and decreases its
+       count by one.
+    """
+
+    val_index = self.draw_index()
+    self.add_count_at(val_index, -1)
+
+    return self.value_list[val_index]
+
+  # ---------------------------------------------------------------------------
+
+  def draw_many(self, n):
+    """Method which randomly draws n values, and returns them as a NumPy
+       array (of objects) if NumPy is available, otherwise as a list. Counts
+       are not changed.
+    """
+
+    basefunctions.check_is_integer('n', n)
+    basefunctions.check_is_not_negative('n', n)
+
+    if (n > 0) and (self.total_count == 0):
+      raise Exception( 'No values left to draw from Fenwick table')
+
+    if (numpy == None):
+      value_list = self.value_list
+      draw_index = self.draw_index  # Short-hand to increase speed
+      return [value_list[draw_index()] for i in range(n)]
+
+    if (self.tree_array is None):
+      self.tree_array = numpy.array(self.tree_list, dtype=numpy.int64)
+    if (self.value_array is None):
+      self.value_array = object_array(self.value_list)
+
+    tree_array = self.tree_array
+    tree_size =  len(tree_array)
+
+    rand_array = numpy.random.randint(0, self.total_count, size=n,
+                                      dtype=numpy.int64)
+    pos_array = numpy.zeros(n, dtype=numpy.int64)
+
+    # The same descent as in draw_index(), for all random counts at once
+    #
+    step = 1 << (tree_size.bit_length() - 1)
+    while (step > 0):
+      next_pos_array = pos_array + step
+      next_cnt_array = tree_array[numpy.minimum(next_pos_array, tree_size-1)]
+      move_array = (next_pos_array < tree_size) & \
+                   (next_cnt_array <= rand_array)
+      pos_array = numpy.where(move_array, next_pos_array, pos_array)
+      rand_array = rand_array - numpy.where(move_array, next_cnt_array, 0)
+      step >>= 1
+
+    return self.value_array[pos_array]
+
+  # ---------------------------------------------------------------------------
+
+  def draw_many_without_replacement(self, n):
+    """Method which randomly draws n values without replacement (see
+       draw_without_replacement()), and returns them as a list.
+    """
+
+    basefunctions.check_is_integer('n', n)
+    basefunctions.check_is_not_negative('n', n)
+
+    if (n > self.total_count):
+      raise Exception( 'Cannot draw %d values without replacement, ' % (n) + \
+                       'only %d left in Fenwick table' % (self.total_count))
+
+    draw_without_replacement = self.draw_without_replacement  # Short-hand
+
+    return [draw_without_replacement() for i in range(n)]
+
+# =============================================================================
+# Functions and a class to draw values from a truncated normal distribution
+
+# Coefficients of the rational approximations of the inverse of the standard
+# normal cumulative distribution function by P. J. Acklam (relative error of
+# less than 1.15e-9, which is refined further for single values)
+#
+NORM_INV_A = (-3.969683028665376e+01,  2.209460984245205e+02,
+              -2.759285104469687e+02,  1.383577518672690e+02,
+              -3.066479806614716e+01,  2.506628277459239e+00)
+NORM_INV_B = (-5.447609879822406e+01,  1.615858368580409e+02,
+              -1.556989798598866e+02,  6.680131188771972e+01,
+              -1.328068155288572e+01)
+NORM_INV_C = (-7.784894002430293e-03, -3.223964580411365e-01,
+              -2.400758277161838e+00, -2.549732539343734e+00,
+               4.374664141464968e+00,  2.938163982698783e+00)
+NORM_INV_D = ( 7.784695709041462e-03,  3.224671290700398e-01,
+               2.445134137142996e+00,  3.754408661907416e+00)
+
+NORM_INV_P_LOW = 0.02425  # Border between the central and the tail regions
+
+# Smallest and largest probabilities the inverse is calculated for
+#
+NORM_INV_P_MIN = 1.0e-300
+NORM_INV_P_MAX = 1.0 - 1.0e-16
+
+# -----------------------------------------------------------------------------
+
+def normal_cdf(x):
+  """Return the value of the standard normal cumulative distribution function
+     at x (which can also be minus or plus infinity).
+  """
+
+  return 0.5 * math.erfc(-x / math.sqrt(2.0))
+
+# -----------------------------------------------------------------------------
+
+def normal_inverse_cdf(p):
+  """Return the value x for which the standard normal cumulative distribution
+     function equals the given probability p, with p between 0 and 1.
+
+     An approximation is refined with one step of Halley's method, which
+     gives nearly full double precision.
+  """
+
+  p = min(max(p, NORM_INV_P_MIN), NORM_INV_P_MAX)
+
+  a, b, c, d = NORM_INV_A, NORM_INV_B, NORM_INV_C, NORM_INV_D
+
+  if (p < NORM_INV_P_LOW):  # Lower tail
+    q = math.sqrt(-2.0 * math.log(p))
+    x = (((((c[0]*q+c[1])*q+c[2])*q+c[3])*q+c[4])*q+c[5]) / \
+        ((((d[0]*q+d[1])*q+d[2])*q+d[3])*q+1.0)
+
+  elif (p <= 1.0 - NORM_INV_P_LOW):  # Central region
+    q = p - 0.5
+    r = q*q
+    x = (((((a[0]*r+a[1])*r+a[2])*r+a[3])*r+a[4])*r+a[5])*q / \
+        (((((b[0]*r+b[1])*r+b[2])*r+b[3])*r+b[4])*r+1.0)
+
+  else:  # Upper tail
+    q = math.sqrt(-2.0 * math.log(1.0 - p))
+    x = -(((((c[0]*q+c[1])*q+c[2])*q+c[3])*q+c[4])*q+c[5]) / \
+         ((((d[0]*q+d[1])*q+d[2])*q+d[3])*q+1.0)
+
+  # Refinement using Halley's rational method
+  #
+  e = normal_cdf(x) - p
+  u = e * math.sqrt(2.0*math.pi) * math.exp(x*x / 2.0)
+  x = x - u / (1.0 + x*u / 2.0)
+
+  return x
+
+# -----------------------------------------------------------------------------
+
+def normal_inverse_cdf_array(p_array):
+  """Return a NumPy array with the values of the inverse of the standard
+     normal cumulative distribution function for the probabilities in the
+     given NumPy array.
+
+     This uses the same approximation as normal_inverse_cdf() but without
+     the refinement step (NumPy has no vectorised error function), so values
+     have a relative error of less than 1.15e-9.
+  """
+
+  p_array = numpy.clip(p_array, NORM_INV_P_MIN, NORM_INV_P_MAX)
+
+  a, b, c, d = NORM_INV_A, NORM_INV_B, NORM_INV_C, NORM_INV_D
+
+  x_array = numpy.empty(len(p_array))
+
+  low_mask =  p_array < NORM_INV_P_LOW
+  high_mask = p_array > 1.0 - NORM_INV_P_LOW
+  mid_mask =  ~(low_mask | high_mask)
+
+  q = numpy.sqrt(-2.0 * numpy.log(p_array[low_mask]))
+  x_array[low_mask] = (((((c[0]*q+c[1])*q+c[2])*q+c[3])*q+c[4])*q+c[5]) / \
+                      ((((d[0]*q+d[1])*q+d[2])*q+d[3])*q+1.0)
+
+  q = p_array[mid_mask] - 0.5
+  r = q*q
+  x_array[mid_mask] = (((((a[0]*r+a[1])*r+a[2])*r+a[3])*r+a[4])*r+a[5])*q / \
+                      (((((b[0]*r+b[1])*r+b[2])*r+b[3])*r+b[4])*r+1.0)
+
+  q = numpy.sqrt(-2.0 * numpy.log(1.0 - p_array[high_mask]))
+  x_array[high_mask] = -(((((c[0]*q+c[1])*q+c[2])*q+c[3])*q+c[4])*q+c[5]) / \
+                        ((((d[0]*q+d[1])*q+d[2])*q+d[3])*q+1.0)
+
+  return x_array
+
+# =============================================================================
+
+class TruncatedNormal:
+  """Draw values from a normal distribution with mean 'mu' and standard
+     deviation 'sigma' that is truncated to the range from 'min_val' to
+     'max_val' (either can be None, meaning no minimum or maximum).
+
+     Values are drawn with the inverse cumulative distribution function: a
+     uniform random number is mapped into the probability range of the
+     truncated interval and then transformed back. Each draw therefore takes
+     the same time however narrow the range is relative to sigma, unlike
+     drawing normal values until one falls into the range.
+
+     If the range lies in the upper tail of the distribution it is mirrored
+     into the lower tail, where small probabilities can be represented much
+     more precisely.
+  """
+
+  # ---------------------------------------------------------------------------
+
+  def __init__(self, mu, sigma, min_val=None, max_val=None):
+    """Constructor. Calculate the probability range of the truncated interval.
+    """
+
+    basefunctions.check_is_number('mu', mu)
+    basefunctions.check_is_number('sigma', sigma)
+    basefunctions.check_is_positive('sigma', sigma)
+
+    if (min_val != None):
+      basefunctions.check_is_number('min_val', min_val)
+      std_min = float(min_val - mu) / sigma
+    else:
+      std_min = float('-inf')
+
+    if (max_val != None):
+      basefunctions.check_is_number('max_val', max_val)
+      std_max = float(max_val - mu) / sigma
+    else:
+      std_max = float('inf')
+
+    if (std_min > std_max):
+      raise Exception( 'Minimum value %s is larger than maximum value %s' % \
+                       (str(min_val), str(max_val)))
+
+    # Mirror ranges in the upper tail into the lower tail
+    #
+    self.mirror = (std_min > 0.0)
+    if (self.mirror == True):
+      std_min, std_max = -std_max, -std_min
+
+    self.mu =      mu
+    self.sigma =   sigma
+    self.min_val = min_val
+    self.max_val = max_val
+    self.std_min = std_min
+    self.std_max = std_max
+
+    self.p_min = normal_cdf(std_min)
+    self.p_range = normal_cdf(std_max) - self.p_min
+
+  # ---------------------------------------------------------------------------
+
+  def transform(self, std_val):
+    """Method which converts a value of the (mirrored) standard normal
+       distribution into a value of this distribution, making sure rounding
+       does not take it outside the range.
+    """
+
+    if (self.mirror == True):
+      std_val = -std_val
+
+    val = self.mu + self.sigma*std_val
+
+    if (self.min_val != None) and (val < self.min_val):
+      val = self.min_val
+    if (self.max_val != None) and (val > self.max_val):
+      val = self.max_val
+
+    return val
+
+  # ---------------------------------------------------------------------------
+
+  def draw(self):
+    """Method which randomly draws and returns one value.
+    """
+
+    if (self.p_range <= 0.0):  # Range too far in the tail to be represented
+      return self.transform(self.std_max)
+
+    std_val = normal_inverse_cdf(self.p_min + random.random()*self.p_range)
+
+    return self.transform(min(max(std_val, self.std_min), self.std_max))
+
+  # ---------------------------------------------------------------------------
+
+  def draw_many(self, n):
+    """Method which randomly draws n values, and returns them as a NumPy
+       floating-point array if NumPy is available, otherwise as a list.
+    """
+
+    basefunctions.check_is_integer('n', n)
+    basefunctions.check_is_not_negative('n', n)
+
+    if (numpy == None):
+      draw = self.draw  # Short-hand to increase speed
+      return [draw() for i in range(n)]
+
+    if (self.p_range <= 0.0):
+      return numpy.full(n, self.transform(self.std_max))
+
+    std_array = normal_inverse_cdf_array(self.p_min + \
+                                         numpy.random.random(n)*self.p_range)
+    std_array = numpy.clip(std_array, self.std_min, self.std_max)
+
+    if (self.mirror == True):
+      std_array = -std_array
+
+    val_array = self.mu + self.sigma*std_array
+
+    if (self.min_val != None) or (self.max_val != None):
+      val_array = numpy.clip(val_array, self.min_val, self.max_val)
+
+    return val_array
+
+# =============================================================================
+
+class EmpiricalDistribution:
+  """Draw continuous values from an empirical distribution given by points of
+     its cumulative distribution function, which is linear between the
+     points (so within a histogram bin values are uniformly distributed).
+
+     Values are drawn with the inverse cumulative distribution function: a
+     uniform random number is located among the cumulative probabilities with
+     a binary search, and the value is interpolated between the two points
+     around it. Each draw therefore takes time logarithmic in the number of
+     points, and many values are drawn with a few NumPy array operations.
+
+     The argument that has to be given when an empirical distribution is
+     initialised is:
+
+     point_list  A list of pairs (value, cumulative probability), where
+                 neither values nor probabilities must decrease, the first
+                 probability must be 0.0 and the last 1.0. Two points with the
+                 same probability (such as the borders of a gap between
+                 histogram bins) mean no values are drawn between them.
+  """
+
+  # ---------------------------------------------------------------------------
+
+  def __init__(self, point_list):
+    """Constructor. Check the points and build the lists of values and
+       cumulative probabilities.
+    """
+
+    basefunctions.check_is_list('point_list', point_list)
+    if (len(point_list) < 2):
+      raise Exception( 'At least two points are needed for an empirical ' + \
+                       'distribution: %s' % (str(point_list)))
+
+    value_list = []
+    prob_list =  []
+
+    for (val, prob) in point_list:
+      basefunctions.check_is_number('val', val)
+      basefunctions.check_is_normalised('prob', prob)
+
+      if (value_list != []) and ((val < value_list[-1]) or \
+                                 (prob < prob_list[-1])):
+        raise Exception( 'Values and probabilities of an empirical ' + \
+                         'distribution must not decrease: %s' % \
+                         (str(point_list)))
+      value_list.append(float(val))
+      prob_list.append(float(prob))
+
+    if (prob_list[0] != 0.0) or (prob_list[-1] != 1.0):
+      raise Exception( 'Cumulative probabilities of an empirical ' + \
+                       'distribution must start with 0.0 and end with 1.0: ' + \
+                       '%s' % (str(point_list)))
+
+    self.value_list = value_list
+    self.prob_list =  prob_list
+    self.min_val =    value_list[0]
+    self.max_val =    value_list[-1]
+
+    # NumPy versions of the lists, only built when values are drawn in bulk
+    #
+    self.value_array = None
+    self.prob_array =  None
+
+  # ---------------------------------------------------------------------------
+
+  def inverse_cdf(self, p):
+    """Method which returns the value where the cumulative distribution
+       function equals the given probability (0.0 <= p < 1.0).
+    """
+
+    prob_list = self.prob_list
+
+    # The first point with a probability larger than p, so the segment before
+    # it has a positive probability
+    #
+    i = bisect.bisect_right(prob_list, p)
+
+    low_prob = prob_list[i-1]
+    low_val =  self.value_list[i-1]
+
+    val = low_val + (p - low_prob) / (prob_list[i] - low_prob) * \
+                    (self.value_list[i] - low_val)
+
+    return min(val, self.max_val)
+
+  # ---------------------------------------------------------------------------
+
+  def draw(self):
+    """Method which randomly draws and returns one value.
+    """
+
+    return self.inverse_cdf(random.random())
+
+  # ---------------------------------------------------------------------------
+
+  def draw_many(self, n):
+    """Method which randomly draws n values, and returns them as a NumPy
+       floating-point array if NumPy is available, otherwise as a list.
+    """
+
+    basefunctions.check_is_integer('n', n)
+    basefunctions.check_is_not_negative('n', n)
+
+    if (numpy == None):
+      inverse_cdf = self.inverse_cdf  # Short-hands to increase speed
+      rand =        random.random
+      return [inverse_cdf(rand()) for i in range(n)]
+
+    if (self.prob_array is None):
+      self.prob_array =  numpy.array(self.prob_list)
+      self.value_array = numpy.array(self.value_list)
+
+    prob_array =  self.prob_array
+    value_array = self.value_array
+
+    p_array = numpy.random.random(n)
+    i_array = numpy.searchsorted(prob_array, p_array, side='right')
+
+    low_prob_array = prob_array[i_array-1]
+    low_val_array =  value_array[i_array-1]
+
+    val_array = low_val_array + (p_array - low_prob_array) / \
+                (prob_array[i_array] - low_prob_array) * \
+                (value_array[i_array] - low_val_array)
+
+    return numpy.minimum(val_array, self.max_val)
+
+# =============================================================================
@@ -24,6 +24,7 @@ import unittest
 sys.path.append('..')
 
 import attrgenfunct
+import lookupcache
 
 random.seed(42)  # Set seed for random generator
 
@@ -649,6 +650,96 @@ class TestCase(unittest.TestCase):
 
     return [test_result_str,'']
 
+  # ---------------------------------------------------------------------------
+
+  def testFunct_generate_address(self, num_tests):
+    """Test the functionality of 'generate_address', making sure it returns
+       street addresses from the address file, and that the file is only read
+       once, and again only after it has changed.
+    """
+
+    print 'Testing functionality of "generate_address"'
+
+    num_passed = 0
+    num_failed = 0
+
+    address_file_name = 'test-addresses.csv'
+
+    def write_address_file(address_list):
+      address_file = open(address_file_name, 'w')
+      address_file.write('address,type' + os.linesep)
+      for address in address_list:
+        address_file.write('"%s",home%s' % (address, os.linesep))
+      address_file.close()
+
+    read_list = []  # One entry for each time the address file is read
+
+    def read_address_list():
+      read_list.append(1)
+      return org_read_address_list()
+
+    org_address_file_name =  attrgenfunct.address_file_name
+    org_read_address_list =  attrgenfunct.read_address_list
+    attrgenfunct.address_file_name = address_file_name
+    attrgenfunct.read_address_list = read_address_list
+
+    lookupcache.clear_shared_tables()
+
+    try:
+      address_list = ['%d Main St, Apt %d' % (i, i) for i in range(20)]
+      write_address_file(address_list)
+
+      # The header line is skipped, quoted addresses are kept whole
+      #
+      if (org_read_address_list() == address_list):
+        num_passed += 1
+      else:
+        num_failed += 1
+
+      for i in range(num_tests):
+        if (attrgenfunct.generate_address() in address_list):
+          num_passed += 1
+        else:
+          num_failed += 1
+
+      if (len(read_list) == 1):
+        num_passed += 1
+      else:
+        num_failed += 1
+
+      # A changed address file must be read again, but only once
+      #
+      address_list = ['%d High St' % (i) for i in range(100, 130)]
+      write_address_file(address_list)
+
+      for i in range(num_tests):
+        if (attrgenfunct.generate_address() in address_list):
+          num_passed += 1
+        else:
+          num_failed += 1
+
+      if (len(read_list) == 2):
+        num_passed += 1
+      else:
+        num_failed += 1
+
+    finally:  # Restore the module and remove the file even if a test fails
+      attrgenfunct.address_file_name = org_address_file_name
+      attrgenfunct.read_address_list = org_read_address_list
+
+      lookupcache.clear_shared_tables()
+      if (os.path.exists(address_file_name)):
+        os.remove(address_file_name)
+
+    test_result_str = 'attrgenfunct,n/a,generate_address,' + \
+                      'n/a,funct,%d,' % (num_passed+num_failed)
+    if (num_failed == 0):
+      test_result_str += 'all tests passed'
+    else:
+      test_result_str += '%d tests failed' % (num_failed)
+
+    return [test_result_str,'']
+
 # =============================================================================
 # Generate a time string to be used for the log file
 #
@@ -704,6 +795,10 @@ test_case_ins = TestCase('testFunct_generate_normal_age')
 test_res_list += \
   test_case_ins.testFunct_generate_normal_age(num_tests)
 
+test_case_ins = TestCase('testFunct_generate_address')
+test_res_list += \
+  test_case_ins.testFunct_generate_address(num_tests)
+
 # Write test output results into the log file
 #
 for line in test_res_list:
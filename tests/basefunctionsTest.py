@@ -705,6 +705,8 @@ class TestCase(unittest.TestCase):
 
       this_format_test_cases = test_cases[format]
 
+      float_formatter = basefunctions.get_float_formatter(format)
+
       for input_num in this_format_test_cases:
         if basefunctions.float_to_str(input_num,format) == \
                             this_format_test_cases[input_num]:
@@ -715,6 +717,24 @@ class TestCase(unittest.TestCase):
                                 (str(input_num))
         num_tests += 1
 
+        if float_formatter(input_num) == this_format_test_cases[input_num]:
+          num_passed += 1
+        else:
+          num_failed += 1
+          failed_tests_desc += "Formatter failed with input number: '%s'; " \
+                               % (str(input_num))
+        num_tests += 1
+
+    for format in [None, '', 'float', 'float10', 5]:
+      try:
+        basefunctions.get_float_formatter(format)
+        num_failed += 1
+        failed_tests_desc += "Formatter created for format: '%s'; " % \
+                             (str(format))
+      except:
+        num_passed += 1
+      num_tests += 1
+
 
     test_result_str = 'basefunctions,n/a,float_to_str,' + \
                       'n/a,funct,%d,' % (num_tests)
@@ -906,6 +926,70 @@ class TestCase(unittest.TestCase):
 
     return [test_result_str,'']     
 
+  # ---------------------------------------------------------------------------
+
+  def testFunct_rec_key(self):
+    """Test the functionality of the record key functions, making sure keys
+       can be split into their record and duplicate numbers, are sorted with
+       each original record before its duplicates, and are formatted as the
+       expected record identifiers.
+    """
+
+    print 'Testing functionality of "get_rec_key"'
+
+    num_passed = 0
+    num_failed = 0
+    num_tests =  0
+    failed_tests_desc = ''
+
+    test_cases = [(0,None,3,'rec-000-org'),(0,0,3,'rec-000-dup-0'),
+                  (7,None,0,'rec-7-org'),(7,2,0,'rec-7-dup-2'),
+                  (123,None,3,'rec-123-org'),(99999,None,2,'rec-99999-org'),
+                  (5,basefunctions.MAX_DUP_PER_REC-1,2,
+                   'rec-05-dup-%d' % (basefunctions.MAX_DUP_PER_REC-1)),
+                  (2**40,4,1,'rec-%d-dup-4' % (2**40))]
+
+    for (org_index, dup_index, num_digit, rec_id_str) in test_cases:
+      rec_key = basefunctions.get_rec_key(org_index, dup_index)
+
+      if (basefunctions.split_rec_key(rec_key) == (org_index, dup_index)) and \
+         (basefunctions.get_rec_id_str(rec_key, num_digit) == rec_id_str) and \
+         ((dup_index == None) or \
+          (basefunctions.get_dup_rec_key(basefunctions.get_rec_key(org_index),
+                                         dup_index) == rec_key)):
+        num_passed += 1
+      else:
+        num_failed += 1
+        failed_tests_desc += "Failed with record key: '%s'; " % \
+                             (str((org_index, dup_index)))
+      num_tests += 1
+
+    # Sorted keys have each original record followed by its duplicates
+    #
+    rec_key_list = []
+    for org_index in range(20):
+      rec_key_list.append(basefunctions.get_rec_key(org_index))
+      for dup_index in range(org_index % 4):
+        rec_key_list.append(basefunctions.get_rec_key(org_index, dup_index))
+
+    if (sorted(rec_key_list[::-1]) == rec_key_list):
+      num_passed += 1
+    else:
+      num_failed += 1
+      failed_tests_desc += "Failed sorting record keys; "
+    num_tests += 1
+
+    test_result_str = 'basefunctions,n/a,get_rec_key,' + \
+                      'n/a,funct,%d,' % (num_tests)
+
+    if (num_failed == 0):
+      test_result_str += 'all tests passed'
+    else:
+      test_result_str += '%d tests failed,' % (num_failed)
+      test_result_str += '"'+failed_tests_desc[:-2]+'"'
+
+    return [test_result_str,'']
+
 # =============================================================================
 # Generate a time string to be used for the log file
 #
@@ -958,6 +1042,10 @@ test_case_ins = TestCase('testFunct_write_csv_file')
 test_res_list += \
   test_case_ins.testFunct_write_csv_file()
 
+test_case_ins = TestCase('testFunct_rec_key')
+test_res_list += \
+  test_case_ins.testFunct_rec_key()
+
 # Write test output results into the log file
 #
 for line in test_res_list:
@@ -345,6 +345,79 @@ class TestCase(unittest.TestCase):
 
     return [test_result_str,'']
 
+  # ---------------------------------------------------------------------------
+
+  def testFunct_array_functions(self, num_tests):
+    """Test the registered array versions of the dependency functions, making
+       sure they return one non-negative value per age value with the same
+       average as the scalar functions, reject illegal age values, and that
+       other functions can be registered.
+    """
+
+    print 'Testing functionality of the array dependency functions'
+
+    num_passed = 0
+    num_failed = 0
+
+    funct_list = [contdepfunct.blood_pressure_depending_on_age,
+                  contdepfunct.salary_depending_on_age]
+
+    if (contdepfunct.numpy == None):  # Without NumPy there are no array
+      for funct in funct_list:        # functions
+        if (contdepfunct.get_array_function(funct) == None):
+          num_passed += 1
+        else:
+          num_failed += 1
+
+    else:
+      numpy = contdepfunct.numpy
+
+      age_list = [random.uniform(0.0, 120.0) for i in range(num_tests)]
+
+      for funct in funct_list:
+        array_funct = contdepfunct.get_array_function(funct)
+
+        val_array = array_funct(numpy.array(age_list))
+
+        if (len(val_array) == num_tests) and (val_array.min() >= 0.0):
+          num_passed += 1
+        else:
+          num_failed += 1
+
+        scalar_mean = sum([funct(age) for age in age_list]) / num_tests
+        if (abs(val_array.mean() - scalar_mean) <= 0.01*scalar_mean):
+          num_passed += 1
+        else:
+          num_failed += 1
+
+        for illegal_age_list in [[-1.0, 20.0], [20.0, 130.5], ['test']]:
+          try:
+            array_funct(numpy.array(illegal_age_list))
+            num_failed += 1
+          except:
+            num_passed += 1
+
+      # Register a function that works on arrays itself
+      #
+      def double_age(age):
+        return 2.0*age
+
+      contdepfunct.register_array_function(double_age)
+      if (contdepfunct.get_array_function(double_age) == double_age):
+        num_passed += 1
+      else:
+        num_failed += 1
+      del contdepfunct.array_funct_dict[double_age]
+
+    test_result_str = 'contdepfunct,n/a,get_array_function,' + \
+                      'n/a,funct,%d,' % (num_passed + num_failed)
+    if (num_failed == 0):
+      test_result_str += 'all tests passed'
+    else:
+      test_result_str += '%d tests failed' % (num_failed)
+
+    return [test_result_str,'']
+
 # =============================================================================
 # Generate a time string to be used for the log file
 #
@@ -383,6 +456,9 @@ test_res_list += \
 test_case_ins = TestCase('testFunct_salary_depending_on_age')
 test_res_list += test_case_ins.testFunct_salary_depending_on_age(num_tests)
 
+test_case_ins = TestCase('testFunct_array_functions')
+test_res_list += test_case_ins.testFunct_array_functions(num_tests)
+
 # Write test output results into the log file
 #
 for line in test_res_list:
@@ -0,0 +1,366 @@
+# english_classTest.py - Test module that provides testing functions for the
+#                        household generation of the module english_class.py
+#                        of the data generation system.
+#
+# =============================================================================
+#
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# =============================================================================
+
+"""Test module for english_class.py.
+"""
+
+# =============================================================================
+# Import necessary modules (Python standard modules first, then system modules)
+
+import os
+import random
+import sys
+import time
+import unittest
+sys.path.append('..')
+
+import attrgenfunct
+
+# The street addresses are drawn from a temporary address file, as the address
+# file of english_class.py is not part of the look-up files
+#
+address_file_name = os.path.abspath('test-addresses.csv')
+
+address_file = open(address_file_name, 'w')
+address_file.write('address,type' + os.linesep)
+for i in range(200):
+  address_file.write('"%d Main St, Apt %d",home%s' % (i, i%7, os.linesep))
+address_file.close()
+
+attrgenfunct.address_file_name = address_file_name
+
+# english_class.py opens its look-up files relative to the package directory
+# (when it is imported and when attribute sets are created), and generates
+# records when it is imported. The address file is removed if this fails.
+#
+test_dir_name = os.getcwd()
+os.chdir('..')
+sys.path.insert(0, os.getcwd())
+
+try:
+  import english_class
+
+  female_attr_set = english_class.AttrSet()
+  male_attr_set =   english_class.AttrSetM()
+except:
+  os.remove(address_file_name)
+  raise
+finally:
+  os.chdir(test_dir_name)
+
+random.seed(42)  # Set seed for random generator
+
+# =============================================================================
+
+# Define the number of tests to be done for the functionality tests
+#
+num_tests = 1000
+
+# =============================================================================
+
+class TestCase(unittest.TestCase):
+
+  # Initialise test case  - - - - - - - - - - - - - - - - - - - - - - - - - - -
+  #
+  def setUp(self):
+    pass # Nothing to initialize
+
+  # Clean up test case  - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+  #
+  def tearDown(self):
+    pass  # Nothing to clean up
+
+  # ---------------------------------------------------------------------------
+  # Start test cases
+
+  def testFunct_household_synth(self, num_tests):
+    """Test that all members of a household share the values of the household
+       attributes, and that household sizes follow the size distribution.
+    """
+
+    print 'Testing functionality of "household_synth"'
+
+    num_passed = 0
+    num_failed = 0
+
+    genfunct_list = [female_attr_set, male_attr_set]
+    size_dist =     english_class.household_size_distribution
+    shared_names =  english_class.household_attr_list
+
+    size_count_dict = {}
+
+    for household in english_class.household_synth(genfunct_list, num_tests):
+      size = len(household)
+      size_count_dict[size] = size_count_dict.get(size, 0) + 1
+
+      shared_val_set = set([tuple([row[name] for name in shared_names]) for \
+                            row in household])
+      if (len(shared_val_set) == 1):
+        num_passed += 1
+      else:
+        num_failed += 1
+
+    # All households are generated, and each size occurs about as often as
+    # given by its weight
+    #
+    if (sum(size_count_dict.values()) == num_tests):
+      num_passed += 1
+    else:
+      num_failed += 1
+
+    total_weight = float(sum([weight for (size, weight) in size_dist]))
+
+    for (size, weight) in size_dist:
+      size_count = size_count_dict.pop(size, 0)
+      if (abs(float(size_count)/num_tests - weight/total_weight) < 0.05):
+        num_passed += 1
+      else:
+        num_failed += 1
+
+    if (size_count_dict == {}):  # No other sizes
+      num_passed += 1
+    else:
+      num_failed += 1
+
+    # Other size distributions and household attributes
+    #
+    for household in english_class.household_synth(genfunct_list, 50,
+                                                   [(2, 1), (4, 1)],
+                                                   ['surname']):
+      if (len(household) in [2, 4]) and \
+         (len(set([row['surname'] for row in household])) == 1):
+        num_passed += 1
+      else:
+        num_failed += 1
+
+    test_result_str = 'english_class,n/a,household_synth,n/a,funct,%d,' % \
+                      (num_passed+num_failed)
+    if (num_failed == 0):
+      test_result_str += 'all tests passed'
+    else:
+      test_result_str += '%d tests failed' % (num_failed)
+
+    return [test_result_str,'']
+
+  # ---------------------------------------------------------------------------
+
+  def testFunct_row_synth_households(self, num_tests):
+    """Test that exactly the requested number of rows is returned, with the
+       same attributes as the rows of row_synth().
+    """
+
+    print 'Testing functionality of "row_synth_households"'
+
+    num_passed = 0
+    num_failed = 0
+
+    genfunct_list = [female_attr_set, male_attr_set]
+    row_keys =      english_class.row_keys(female_attr_set)
+
+    for row_count in [0, 1, 2, 7, num_tests, num_tests+3]:
+      row_list = list(english_class.row_synth_households(genfunct_list,
+                                                         row_count))
+
+      if (len(row_list) == row_count) and \
+         (False not in [row.keys() == row_keys for row in row_list]):
+        num_passed += 1
+      else:
+        num_failed += 1
+
+    test_result_str = 'english_class,n/a,row_synth_households,n/a,funct,' + \
+                      '%d,' % (num_passed+num_failed)
+    if (num_failed == 0):
+      test_result_str += 'all tests passed'
+    else:
+      test_result_str += '%d tests failed' % (num_failed)
+
+    return [test_result_str,'']
+
+  # ---------------------------------------------------------------------------
+
+  def testFunct_AttrSet_household_plan(self, num_tests):
+    """Test that the household plan generates all primary attributes except
+       the shared ones, and is only compiled once per list of shared names.
+    """
+
+    print 'Testing functionality of "AttrSet.household_plan"'
+
+    num_passed = 0
+    num_failed = 0
+
+    for attr_set in [female_attr_set, male_attr_set]:
+      primary_name_list = attr_set.primary_plan().attribute_name_list
+
+      for shared_names in [english_class.household_attr_list, ['surname'],
+                           []]:
+        plan = attr_set.household_plan(shared_names)
+
+        if (plan.attribute_name_list == [name for name in primary_name_list \
+                                         if name not in shared_names]) and \
+           (attr_set.household_plan(list(shared_names)) is plan):
+          num_passed += 1
+        else:
+          num_failed += 1
+
+    test_result_str = 'english_class,AttrSet,household_plan,n/a,funct,' + \
+                      '%d,' % (num_passed+num_failed)
+    if (num_failed == 0):
+      test_result_str += 'all tests passed'
+    else:
+      test_result_str += '%d tests failed' % (num_failed)
+
+    return [test_result_str,'']
+
+  # ---------------------------------------------------------------------------
+
+  def testFunct_AttrSet_output_members(self, num_tests):
+    """Test that one row is generated for each list of shared values, that
+       the rows contain these shared values, and have the same attributes as
+       the rows of output().
+    """
+
+    print 'Testing functionality of "AttrSet.output_members"'
+
+    num_passed = 0
+    num_failed = 0
+
+    shared_names = ['surname', 'city']
+
+    for attr_set in [female_attr_set, male_attr_set]:
+      row_keys = attr_set.output().keys()
+
+      shared_rows = [['surname-%d' % (i), 'city-%d' % (i%3)] for i in \
+                     range(num_tests)]
+
+      row_list = attr_set.output_members(shared_names, shared_rows)
+
+      if (len(row_list) == num_tests):
+        num_passed += 1
+      else:
+        num_failed += 1
+
+      for (row, shared_row) in zip(row_list, shared_rows):
+        if ([row[name] for name in shared_names] == shared_row) and \
+           (row.keys() == row_keys):
+          num_passed += 1
+        else:
+          num_failed += 1
+
+    test_result_str = 'english_class,AttrSet,output_members,n/a,funct,' + \
+                      '%d,' % (num_passed+num_failed)
+    if (num_failed == 0):
+      test_result_str += 'all tests passed'
+    else:
+      test_result_str += '%d tests failed' % (num_failed)
+
+    return [test_result_str,'']
+
+  # ---------------------------------------------------------------------------
+
+  def testFunct_AttrSet_dependent_output(self, num_tests):
+    """Test that the dependent values are added after the given primary
+       values, which are kept unchanged.
+    """
+
+    print 'Testing functionality of "AttrSet.dependent_output"'
+
+    num_passed = 0
+    num_failed = 0
+
+    dependent_name_list = ['email', 'DOB', 'race', 'hispanic',
+                           'marital-status']
+
+    for attr_set in [female_attr_set, male_attr_set]:
+      plan = attr_set.primary_plan()
+
+      for i in range(num_tests):
+        primary_val_list = plan.generate_record_values()
+
+        row = attr_set.dependent_output(list(primary_val_list))
+
+        if (row.keys() == plan.attribute_name_list + dependent_name_list) and \
+           (row.values()[:len(primary_val_list)] == primary_val_list) and \
+           (row['email'].startswith(row['given-name'][0])):
+          num_passed += 1
+        else:
+          num_failed += 1
+
+    test_result_str = 'english_class,AttrSet,dependent_output,n/a,funct,' + \
+                      '%d,' % (num_passed+num_failed)
+    if (num_failed == 0):
+      test_result_str += 'all tests passed'
+    else:
+      test_result_str += '%d tests failed' % (num_failed)
+
+    return [test_result_str,'']
+
+# =============================================================================
+# Generate a time string to be used for the log file
+#
+curr_time_tuple = time.localtime()
+curr_time_str = str(curr_time_tuple[0]) + str(curr_time_tuple[1]).zfill(2) + \
+                str(curr_time_tuple[2]).zfill(2) + '-' + \
+                str(curr_time_tuple[3]).zfill(2) + \
+                str(curr_time_tuple[4]).zfill(2)
+
+# Write test output header line into the log file
+#
+out_file_name = './logs/english_classTest-%s.csv' % (curr_time_str)
+
+out_file = open(out_file_name, 'w')
+
+out_file.write('Test results generated by english_classTest.py'  + os.linesep)
+
+out_file.write('Test started: ' + curr_time_str + os.linesep)
+
+out_file.write(os.linesep)
+
+out_file.write('Module name,Class name,Method name,Arguments,Test_type,' + \
+               'Patterns tested,Summary,Failure description' + os.linesep)
+out_file.write(os.linesep)
+
+# Create instances for the testcase class that calls all tests, and remove
+# the address file afterwards, even if a test fails
+#
+test_res_list = []
+
+try:
+  test_case_ins = TestCase('testFunct_household_synth')
+  test_res_list += test_case_ins.testFunct_household_synth(num_tests)
+
+  test_case_ins = TestCase('testFunct_row_synth_households')
+  test_res_list += test_case_ins.testFunct_row_synth_households(num_tests)
+
+  test_case_ins = TestCase('testFunct_AttrSet_household_plan')
+  test_res_list += test_case_ins.testFunct_AttrSet_household_plan(num_tests)
+
+  test_case_ins = TestCase('testFunct_AttrSet_output_members')
+  test_res_list += test_case_ins.testFunct_AttrSet_output_members(num_tests)
+
+  test_case_ins = TestCase('testFunct_AttrSet_dependent_output')
+  test_res_list += test_case_ins.testFunct_AttrSet_dependent_output(num_tests)
+finally:
+  os.remove(address_file_name)
+
+# Write test output results into the log file
+#
+for line in test_res_list:
+  out_file.write(line + os.linesep)
+
+out_file.close()
+
+print 'Test results are written to', out_file_name
+
+for line in test_res_list:
+  print line
+
+# =============================================================================
@@ -0,0 +1,406 @@
+# freqbuilderTest.py - Test module that provides testing functions for the
+#                      module freqbuilder.py of the data generation system.
+#
+# =============================================================================
+#
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# =============================================================================
+
+"""Test module for freqbuilder.py.
+"""
+
+# =============================================================================
+# Import necessary modules (Python standard modules first, then system modules)
+
+import os
+import random
+import sys
+import time
+import unittest
+sys.path.append('..')
+
+import freqbuilder
+import generator
+import lookupcache
+
+random.seed(42)  # Set seed for random generator
+
+# =============================================================================
+
+# Define the number of tests to be done for the functionality tests
+#
+num_tests = 5
+
+# The source file used in the tests, and its columns
+#
+src_file_name = 'test-freqbuilder-src.csv'
+
+city_dict = {'nsw':['sydney','newcastle','wollongong'],
+             'vic':['melbourne','geelong','ballarat','bendigo'],
+             'act':['canberra']}
+
+# =============================================================================
+
+def write_src_file(num_recs):
+  """Write a source CSV file with random records (and some comment, short and
+     empty lines) and return the dictionary with the counts of (gender, state,
+     city) combinations and the dictionary with the list of income values for
+     each gender.
+  """
+
+  count_dict =  {}
+  income_dict = {}
+
+  src_file = open(src_file_name, 'w')
+  src_file.write('gender,state,city,income' + os.linesep)
+
+  for i in range(num_recs):
+    gender = random.choice(['m','f'])
+    state =  random.choice(sorted(city_dict))
+    city =   random.choice(city_dict[state])
+    income = random.randint(10000, 100000)
+
+    src_file.write('%s,%s,"%s",%d%s' % (gender, state, city, income,
+                                        os.linesep))
+
+    key = (gender, state, city)
+    count_dict[key] = count_dict.get(key, 0) + 1
+    income_dict.setdefault(gender, []).append(income)
+
+    if (random.random() < 0.01):
+      src_file.write(random.choice(['# A comment line', ',nsw,,10000',
+                                    'm,vic', '']) + os.linesep)
+
+  src_file.close()
+
+  return count_dict, income_dict
+
+# =============================================================================
+
+class TestCase(unittest.TestCase):
+
+  # Initialise test case  - - - - - - - - - - - - - - - - - - - - - - - - - - -
+  #
+  def setUp(self):
+    pass # Nothing to initialize
+
+  # Clean up test case  - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+  #
+  def tearDown(self):
+    pass  # Nothing to clean up
+
+  # ---------------------------------------------------------------------------
+  # Start test cases
+
+  def testFunct_count_file_values(self, num_tests):
+    """Test that the counts are correct and the same for any chunk size and
+       number of workers.
+    """
+
+    print 'Testing functionality of "count_file_values"'
+
+    num_passed = 0
+    num_failed = 0
+
+    for t in range(num_tests):
+      count_dict, income_dict = write_src_file(random.randint(1, 2000))
+
+      for (chunk_size, workers) in [(freqbuilder.DEFAULT_CHUNK_SIZE, 1),
+                                    (random.randint(1, 500), 1),
+                                    (random.randint(1, 500), 3)]:
+        test_count_dict, stats_dict, num_lines, num_skipped = \
+                   freqbuilder.count_file_values([src_file_name],
+                                                 ['gender', 2, 'state'],
+                                                 None, 'ascii', True,
+                                                 workers, chunk_size)
+
+        check_count_dict = {}
+        for ((gender, state, city), count) in count_dict.iteritems():
+          check_count_dict[(gender, city, state)] = count
+
+        if (test_count_dict == check_count_dict) and (stats_dict == {}) and \
+           (num_lines - num_skipped == sum(count_dict.values())):
+          num_passed += 1
+        else:
+          num_failed += 1
+
+      # Statistics of the value column
+      #
+      test_count_dict, stats_dict, num_lines, num_skipped = \
+                   freqbuilder.count_file_values([src_file_name], ['gender'],
+                                                 'income', 'ascii', True, 2,
+                                                 random.randint(1, 500))
+
+      for (gender, income_list) in income_dict.iteritems():
+        if (stats_dict[(gender,)] == [len(income_list), sum(income_list),
+                                      sum([x*x for x in income_list]),
+                                      min(income_list), max(income_list)]) \
+           and (test_count_dict[(gender,)] == len(income_list)):
+          num_passed += 1
+        else:
+          num_failed += 1
+
+      # Values that occur less often than the minimum count are removed
+      #
+      min_count = random.randint(1, 100)
+      test_count_dict = freqbuilder.count_file_values([src_file_name],
+                                                      ['gender', 'state',
+                                                       'city'], None,
+                                                      'ascii', True, 1,
+                                                      random.randint(1, 500),
+                                                      min_count)[0]
+      check_count_dict = dict([(key, count) for (key, count) in \
+                               count_dict.iteritems() if count >= min_count])
+      if (test_count_dict == check_count_dict):
+        num_passed += 1
+      else:
+        num_failed += 1
+
+      # Counts of the values in each pair of columns, with the minimum count
+      # applied to the pairs of values
+      #
+      test_count_dict = freqbuilder.count_file_values([src_file_name],
+                                                      ['gender', 'state',
+                                                       'city'], None,
+                                                      'ascii', True, 3,
+                                                      random.randint(1, 500),
+                                                      min_count, True)[0]
+      check_count_dict = {}
+      for (key, count) in count_dict.iteritems():
+        for j in range(3):
+          for k in range(j, 3):
+            pair_key = (j, k, key[j], key[k])
+            check_count_dict[pair_key] = \
+                                   check_count_dict.get(pair_key, 0) + count
+      check_count_dict = dict([(key, count) for (key, count) in \
+                               check_count_dict.iteritems() if \
+                               count >= min_count])
+      if (test_count_dict == check_count_dict):
+        num_passed += 1
+      else:
+        num_failed += 1
+
+    os.remove(src_file_name)
+
+    test_result_str = 'freqbuilder,n/a,count_file_values,n/a,funct,%d,' % \
+                      (num_passed+num_failed)
+    if (num_failed == 0):
+      test_result_str += 'all tests passed'
+    else:
+      test_result_str += '%d tests failed' % (num_failed)
+
+    return [test_result_str,'']
+
+  # ---------------------------------------------------------------------------
+
+  def testFunct_build_lookup_file(self, num_tests):
+    """Test that the written look-up files can be loaded by the attribute
+       classes, and only contain values from the source file.
+    """
+
+    print 'Testing functionality of "build_lookup_file"'
+
+    num_passed = 0
+    num_failed = 0
+
+    lookup_file_name = 'test-freqbuilder-lookup.csv'
+
+    lookupcache.use_cache = False
+
+    for t in range(num_tests):
+      count_dict, income_dict = write_src_file(random.randint(1, 2000))
+
+      lookupcache.clear_shared_tables()  # The look-up file is rewritten
+
+      freqbuilder.build_lookup_file(lookup_file_name, 'freq', [src_file_name],
+                                    ['city'], workers=2, chunk_size=997)
+      attr = generator.GenerateFreqAttribute(attribute_name = 'city',
+                                             freq_file_name = lookup_file_name,
+                                             has_header_line = False,
+                                             unicode_encoding = 'ascii')
+      city_count_dict = {}
+      for ((gender, state, city), count) in count_dict.iteritems():
+        city_count_dict[city] = city_count_dict.get(city, 0) + count
+      if (dict(generator.read_freq_file(lookup_file_name, 'ascii', False)) == \
+          city_count_dict) and \
+         (attr.create_attribute_value() in city_count_dict):
+        num_passed += 1
+      else:
+        num_failed += 1
+
+      freqbuilder.build_lookup_file(lookup_file_name, 'cate-cate',
+                                    [src_file_name], ['gender', 'city'],
+                                    workers=2, chunk_size=997)
+      attr = generator.GenerateCateCateCompoundAttribute( \
+                                  categorical1_attribute_name = 'gender',
+                                  categorical2_attribute_name = 'city',
+                                  lookup_file_name = lookup_file_name,
+                                  has_header_line = False,
+                                  unicode_encoding = 'ascii')
+      for i in range(100):
+        gender, city = attr.create_attribute_values()
+        if (True in [(gender, state, city) in count_dict for state in \
+                     city_dict]):
+          num_passed += 1
+        else:
+          num_failed += 1
+
+      freqbuilder.build_lookup_file(lookup_file_name, 'chain',
+                                    [src_file_name],
+                                    ['gender', 'state', 'city'], workers=2,
+                                    chunk_size=997)
+      attr = generator.GenerateConditionalChainAttribute( \
+                                  attribute_name_list = ['gender', 'state',
+                                                         'city'],
+                                  lookup_file_name = lookup_file_name,
+                                  has_header_line = True,
+                                  unicode_encoding = 'ascii')
+      for i in range(100):
+        if (tuple(attr.create_attribute_values()) in count_dict):
+          num_passed += 1
+        else:
+          num_failed += 1
+
+      freqbuilder.build_lookup_file(lookup_file_name, 'cate-cont',
+                                    [src_file_name], ['gender'], 'income',
+                                    workers=2, chunk_size=997)
+      attr = generator.GenerateCateContCompoundAttribute( \
+                                  categorical_attribute_name = 'gender',
+                                  continuous_attribute_name = 'income',
+                                  continuous_value_type = 'int',
+                                  lookup_file_name = lookup_file_name,
+                                  has_header_line = False,
+                                  unicode_encoding = 'ascii')
+      for i in range(100):
+        gender, income = attr.create_attribute_values()
+        if (gender in income_dict) and \
+           (min(income_dict[gender]) <= int(income) <= \
+            max(income_dict[gender])):
+          num_passed += 1
+        else:
+          num_failed += 1
+
+      freqbuilder.build_lookup_file(lookup_file_name, 'cate-cate-cont',
+                                    [src_file_name], ['gender', 'city'],
+                                    'income', workers=2, chunk_size=997)
+      attr = generator.GenerateCateCateContCompoundAttribute( \
+                                  categorical1_attribute_name = 'gender',
+                                  categorical2_attribute_name = 'city',
+                                  continuous_attribute_name = 'income',
+                                  continuous_value_type = 'int',
+                                  lookup_file_name = lookup_file_name,
+                                  has_header_line = False,
+                                  unicode_encoding = 'ascii')
+      for i in range(100):
+        gender, city, income = attr.create_attribute_values()
+        if (True in [(gender, state, city) in count_dict for state in \
+                     city_dict]) and (10000 <= int(income) <= 100000):
+          num_passed += 1
+        else:
+          num_failed += 1
+
+      # The city depends on the state only, so it must be its child
+      #
+      freqbuilder.build_lookup_file(lookup_file_name, 'tree', [src_file_name],
+                                    ['state', 'gender', 'city'], workers=2,
+                                    chunk_size=997)
+      attr = generator.GenerateDependencyTreeAttribute( \
+                                  attribute_name_list = ['gender', 'state',
+                                                         'city'],
+                                  lookup_file_name = lookup_file_name,
+                                  has_header_line = False,
+                                  unicode_encoding = 'ascii')
+      if (attr.tree_attr_name_list[attr.parent_index_list[
+                                attr.tree_attr_name_list.index('city')]] == \
+          'state'):
+        num_passed += 1
+      else:
+        num_failed += 1
+      for (gender, state, city) in \
+          zip(*attr.create_attribute_values_batch(100)):
+        if (gender in ['m','f']) and (city in city_dict[state]):
+          num_passed += 1
+        else:
+          num_failed += 1
+
+    # Illegal formats and columns
+    #
+    for (file_format, key_column_list, value_column) in \
+        [('freqs', ['city'], None), ('freq', ['gender', 'city'], None),
+         ('chain', ['city'], None), ('cate-cont', ['gender'], None),
+         ('cate-cate', ['gender', 'city'], 'income'),
+         ('freq', ['town'], None), ('tree', ['city'], None),
+         ('tree', [0, 1], None), ('tree', ['gender', 'city'], 'income')]:
+      try:
+        freqbuilder.build_lookup_file(lookup_file_name, file_format,
+                                      [src_file_name], key_column_list,
+                                      value_column)
+        num_failed += 1
+      except:
+        num_passed += 1
+
+    lookupcache.use_cache = True
+
+    os.remove(src_file_name)
+    os.remove(lookup_file_name)
+
+    test_result_str = 'freqbuilder,n/a,build_lookup_file,n/a,funct,%d,' % \
+                      (num_passed+num_failed)
+    if (num_failed == 0):
+      test_result_str += 'all tests passed'
+    else:
+      test_result_str += '%d tests failed' % (num_failed)
+
+    return [test_result_str,'']
+
+# =============================================================================
+# Generate a time string to be used for the log file
+#
+curr_time_tuple = time.localtime()
+curr_time_str = str(curr_time_tuple[0]) + str(curr_time_tuple[1]).zfill(2) + \
+                str(curr_time_tuple[2]).zfill(2) + '-' + \
+                str(curr_time_tuple[3]).zfill(2) + \
+                str(curr_time_tuple[4]).zfill(2)
+
+# Write test output header line into the log file
+#
+out_file_name = './logs/freqbuilderTest-%s.csv' % (curr_time_str)
+
+out_file = open(out_file_name, 'w')
+
+out_file.write('Test results generated by freqbuilderTest.py'  + os.linesep)
+
+out_file.write('Test started: ' + curr_time_str + os.linesep)
+
+out_file.write(os.linesep)
+
+out_file.write('Module name,Class name,Method name,Arguments,Test_type,' + \
+               'Patterns tested,Summary,Failure description' + os.linesep)
+out_file.write(os.linesep)
+
+# Create instances for the testcase class that calls all tests
+#
+test_res_list = []
+
+test_case_ins = TestCase('testFunct_count_file_values')
+test_res_list += test_case_ins.testFunct_count_file_values(num_tests)
+
+test_case_ins = TestCase('testFunct_build_lookup_file')
+test_res_list += test_case_ins.testFunct_build_lookup_file(num_tests)
+
+# Write test output results into the log file
+#
+for line in test_res_list:
+  out_file.write(line + os.linesep)
+
+out_file.close()
+
+print 'Test results are written to', out_file_name
+
+for line in test_res_list:
+  print line
+
+# =============================================================================
@@ -17,6 +17,7 @@
 # Import necessary modules (Python standard modules first, then system modules)
 
 import os
+import pickle
 import random
 import sys
 import time
@@ -27,6 +28,8 @@ import generator
 import basefunctions
 import attrgenfunct
 import contdepfunct
+import lookupcache
+import uniquefilter
 
 random.seed(42)  # Set seed for random generator
 
@@ -137,6 +140,13 @@ age_blood_pressure_comp_attr = \
           continuous1_value_type = 'int',
           continuous2_value_type = 'float3')
 
+gender_geo_chain_attr = \
+    generator.GenerateConditionalChainAttribute(\
+          attribute_name_list = ['gender4', 'state', 'city3', 'postcode2'],
+          lookup_file_name = '../lookup-files/gender-state-city-postcode.csv',
+          has_header_line = True,
+          unicode_encoding = 'ascii')
+
 # Define example attribute data lists 
 #
 attr_data_list1 = [gname_attr]
@@ -1542,6 +1552,1303 @@ class TestCase(unittest.TestCase):
 
     return [test_result_str,'']
 
+  # ---------------------------------------------------------------------------
+
+  def testFunct_GenerateConditionalChainAttribute(self):
+    """Test that this method returns combinations of values that occur in the
+       look-up file, both for single records and in batches, that the values
+       of an attribute are drawn according to their counts given the values
+       before them, and that the chain can be used in a data set.
+    """
+
+    print 'Testing functionality of "GenerateConditionalChainAttribute"'
+
+    num_passed = 0
+    num_failed = 0
+
+    header_list, file_data = basefunctions.read_csv_file(
+                           '../lookup-files/gender-state-city-postcode.csv',
+                           'ascii', True)
+
+    comb_count_dict = {}  # Value combinations and their counts from the file
+    for rec_list in file_data:
+      comb_count_dict[tuple(rec_list[:-1])] = int(rec_list[-1])
+
+    val_tuple_list = [gender_geo_chain_attr.create_attribute_values() for \
+                      t in range(num_tests)]
+
+    col_tuple = gender_geo_chain_attr.create_attribute_values_batch(num_tests)
+    if (len(col_tuple) != 4):
+      num_failed += 1
+    val_tuple_list += zip(*col_tuple)
+
+    if (len(val_tuple_list) != 2*num_tests):
+      num_failed += 1
+
+    for val_tuple in val_tuple_list:
+      if (tuple(val_tuple) in comb_count_dict):
+        num_passed += 1
+      else:
+        num_failed += 1
+
+    # Check the cities for female records in nsw are drawn according to their
+    # counts given these two values
+    #
+    city_count_dict = {}
+    for (comb_tuple, comb_count) in comb_count_dict.items():
+      if (comb_tuple[:2] == ('female', 'nsw')):
+        city_count_dict[comb_tuple[2]] = \
+                             city_count_dict.get(comb_tuple[2], 0) + comb_count
+    total_count = sum(city_count_dict.values())
+
+    nsw_city_list = [val_tuple[2] for val_tuple in val_tuple_list \
+                     if tuple(val_tuple[:2]) == ('female', 'nsw')]
+
+    for (city_val, city_count) in city_count_dict.items():
+      expected_freq = float(city_count) / total_count
+      draw_freq = float(nsw_city_list.count(city_val)) / len(nsw_city_list)
+      if (abs(draw_freq - expected_freq) > 0.05):
+        num_failed += 1
+
+    # Generate a data set with the chain using both engines
+    #
+    for generation_engine in ['record', 'column']:
+      test_data_generator = generator.GenerateDataSet(\
+                              output_file_name = 'test-chain.csv',
+                              rec_id_attr_name = 'rec-id',
+                              number_of_records = 100,
+                              attribute_name_list = ['attr1', 'gender4',
+                                                     'state', 'city3',
+                                                     'postcode2'],
+                              attribute_data_list = [gname_attr,
+                                                     gender_geo_chain_attr],
+                              unicode_encoding = 'ascii',
+                              generation_engine = generation_engine)
+
+      for rec_val_list in test_data_generator.generate().values():
+        if (tuple(rec_val_list[1:]) in comb_count_dict):
+          num_passed += 1
+        else:
+          num_failed += 1
+
+    test_result_str = 'generator,GenerateConditionalChainAttribute,create_'\
+                      + 'attribute_values,n/a,funct,%d,' % \
+                      (num_passed + num_failed)
+    if (num_failed == 0):
+      test_result_str += 'all tests passed'
+    else:
+      test_result_str += '%d tests failed' % (num_failed)
+
+    return [test_result_str,'']
+
+  # ---------------------------------------------------------------------------
+
+  def testFunct_GenerateDependencyTreeAttribute(self):
+    """Test that this method returns values whose parent values occur with
+       them in the look-up file, both for single records and in batches, that
+       the values of an attribute are drawn according to their counts given
+       the value of its parent attribute, and that illegal trees are rejected.
+    """
+
+    print 'Testing functionality of "GenerateDependencyTreeAttribute"'
+
+    num_passed = 0
+    num_failed = 0
+
+    lookup_file_name = 'test-tree.csv'
+
+    lookupcache.use_cache = False
+
+    def write_lookup_file(line_list):
+      lookup_file = open(lookup_file_name, 'w')
+      for line in line_list:
+        lookup_file.write(line + os.linesep)
+      lookup_file.close()
+      lookupcache.clear_shared_tables()  # The look-up file is rewritten
+
+    # A tree with the root gender, whose value 'other' has no states
+    #
+    tree_line_list = ['# attribute,parent,parent value,value,count',
+                      'gender,,,male,480', 'gender,,,female,500',
+                      'gender,,,other,20',
+                      'state,gender,male,nsw,160', 'state,gender,male,act,320',
+                      'state,gender,female,nsw,190',
+                      'state,gender,female,act,310',
+                      'city,state,nsw,sydney,350',
+                      'city,state,act,canberra,600',
+                      'city,state,act,belconnen,200',
+                      'age,gender,male,young,1', 'age,gender,female,old,1',
+                      'age,gender,other,young,1']
+    write_lookup_file(tree_line_list)
+
+    tree_attr = generator.GenerateDependencyTreeAttribute( \
+                                  attribute_name_list = ['city', 'state',
+                                                         'gender', 'age'],
+                                  lookup_file_name = lookup_file_name,
+                                  has_header_line = False,
+                                  unicode_encoding = 'ascii')
+
+    comb_set = set()  # Valid pairs (parent attribute, value) of all values
+    for line in tree_line_list[1:]:
+      attr_name, parent_name, parent_val, attr_val, count = line.split(',')
+      comb_set.add((attr_name, parent_val, attr_val))
+
+    val_tuple_list = [tree_attr.create_attribute_values() for \
+                      t in range(num_tests)]
+
+    col_tuple = tree_attr.create_attribute_values_batch(num_tests)
+    if (len(col_tuple) != 4):
+      num_failed += 1
+    val_tuple_list += zip(*col_tuple)
+
+    if (len(val_tuple_list) != 2*num_tests):
+      num_failed += 1
+
+    for (city, state, gender, age) in val_tuple_list:
+      if (('gender', '', gender) in comb_set) and \
+         (('city', state, city) in comb_set) and \
+         (('age', gender, age) in comb_set) and \
+         ((('state', gender, state) in comb_set) or (gender == 'other')):
+        num_passed += 1
+      else:
+        num_failed += 1
+
+    # Check the cities in act and the states of the 'other' gender (drawn
+    # according to the counts over all genders) follow their counts
+    #
+    act_city_list = [val_tuple[0] for val_tuple in val_tuple_list \
+                     if val_tuple[1] == 'act']
+    other_state_list = [val_tuple[1] for val_tuple in val_tuple_list \
+                        if val_tuple[2] == 'other']
+
+    for (val_list, val, expected_freq) in \
+        [(act_city_list, 'canberra', 0.75), (act_city_list, 'belconnen', 0.25),
+         (other_state_list, 'act', 630.0/980)]:
+      draw_freq = float(val_list.count(val)) / len(val_list)
+      if (abs(draw_freq - expected_freq) > 0.1):
+        num_failed += 1
+
+    # Generate a data set with the tree using both engines
+    #
+    for generation_engine in ['record', 'column']:
+      test_data_generator = generator.GenerateDataSet(\
+                              output_file_name = 'test-tree-data.csv',
+                              rec_id_attr_name = 'rec-id',
+                              number_of_records = 100,
+                              attribute_name_list = ['attr1', 'gender',
+                                                     'state', 'city'],
+                              attribute_data_list = [gname_attr, tree_attr],
+                              unicode_encoding = 'ascii',
+                              generation_engine = generation_engine)
+
+      for rec_val_list in test_data_generator.generate().values():
+        if (('city', rec_val_list[2], rec_val_list[3]) in comb_set):
+          num_passed += 1
+        else:
+          num_failed += 1
+
+    # Illegal trees: two roots, an attribute not connected to the root, a
+    # parent value that is not a value of the parent, a value given twice,
+    # and a missing attribute name
+    #
+    for line_list in [['a,,,x,1', 'b,,,y,1'],
+                      ['a,,,x,1', 'b,c,z,y,1', 'c,b,y,z,1'],
+                      ['a,,,x,1', 'b,a,z,y,1'],
+                      ['a,,,x,1', 'b,a,x,y,1', 'b,a,x,y,2'],
+                      ['a,,,x,1', 'b,a,x,y,1', 'c,a,x,y,1']]:
+      write_lookup_file(line_list)
+      try:
+        generator.GenerateDependencyTreeAttribute( \
+                                  attribute_name_list = ['a', 'b'],
+                                  lookup_file_name = lookup_file_name,
+                                  has_header_line = False,
+                                  unicode_encoding = 'ascii')
+        num_failed += 1
+      except:
+        num_passed += 1
+
+    lookupcache.use_cache = True
+
+    os.remove(lookup_file_name)
+
+    test_result_str = 'generator,GenerateDependencyTreeAttribute,create_'\
+                      + 'attribute_values,n/a,funct,%d,' % \
+                      (num_passed + num_failed)
+    if (num_failed == 0):
+      test_result_str += 'all tests passed'
+    else:
+      test_result_str += '%d tests failed' % (num_failed)
+
+    return [test_result_str,'']
+
+  # ---------------------------------------------------------------------------
+
+  def testFunct_without_replacement(self):
+    """Test that frequency attributes drawing values without replacement
+       draw each value exactly as many times as its count, and that changed
+       counts are used for later values.
+    """
+
+    print 'Testing functionality of frequency attributes without replacement'
+
+    num_passed = 0
+    num_failed = 0
+
+    freq_file_name = 'test-without-replacement.csv'
+    val_count_dict = {'a':3, 'b':50, 'c':7, 'd':1}
+    num_val = sum(val_count_dict.values())
+
+    freq_file = open(freq_file_name, 'w')
+    for (attr_val, val_count) in sorted(val_count_dict.items()):
+      freq_file.write('%s,%d%s' % (attr_val, val_count, os.linesep))
+    freq_file.close()
+
+    lookupcache.use_cache = False
+
+    for attr_class in [generator.GenerateFreqAttribute,
+                       generator.GenerateFreqAlt]:
+
+      # All values, drawn singly and in batches, then no value is left
+      #
+      for num_single in [0, 10, num_val]:
+        freq_attr = attr_class(attribute_name = 'attr',
+                               freq_file_name = freq_file_name,
+                               has_header_line = False,
+                               unicode_encoding = 'ascii',
+                               without_replacement = True)
+        val_list = [freq_attr.create_attribute_value() for i in \
+                    range(num_single)]
+        val_list += list(freq_attr.create_attribute_values_batch(num_val -
+                                                                 num_single))
+        draw_count_dict = {}
+        for attr_val in val_list:
+          draw_count_dict[attr_val] = draw_count_dict.get(attr_val, 0) + 1
+        if (draw_count_dict == val_count_dict):
+          num_passed += 1
+        else:
+          num_failed += 1
+
+        try:
+          freq_attr.create_attribute_value()
+          num_failed += 1
+        except:
+          num_passed += 1
+
+      # Changed counts, for values in the file and a new value
+      #
+      freq_attr = attr_class(attribute_name = 'attr',
+                             freq_file_name = freq_file_name,
+                             has_header_line = False,
+                             unicode_encoding = 'ascii')
+      freq_attr.set_value_count('b', 0)
+      freq_attr.set_value_count('e', 100)
+      val_list = [freq_attr.create_attribute_value() for i in range(100)]
+      val_list += list(freq_attr.create_attribute_values_batch(num_tests))
+      if ('b' not in val_list) and ('e' in val_list) and \
+         (set(val_list) <= set(['a', 'c', 'd', 'e'])):
+        num_passed += 1
+      else:
+        num_failed += 1
+
+      for (attr_val, val_count) in [('', 1), ('a', -1), ('a', 1.5)]:
+        try:
+          freq_attr.set_value_count(attr_val, val_count)
+          num_failed += 1
+        except:
+          num_passed += 1
+
+    # A data set with an attribute without replacement
+    #
+    freq_attr = generator.GenerateFreqAttribute(attribute_name = 'attr',
+                                                freq_file_name = freq_file_name,
+                                                has_header_line = False,
+                                                unicode_encoding = 'ascii',
+                                                without_replacement = True)
+
+    for generation_engine in ['record', 'column']:
+      freq_attr.set_value_count('a', 3)  # Refill the values drawn before
+      freq_attr.set_value_count('b', 50)
+      freq_attr.set_value_count('c', 7)
+      freq_attr.set_value_count('d', 1)
+
+      test_data_generator = generator.GenerateDataSet(
+                                     output_file_name = 'test.csv',
+                                     rec_id_attr_name = 'rec-id',
+                                     number_of_records = num_val,
+                                     attribute_name_list = ['attr', 'attr3'],
+                                     attribute_data_list = [freq_attr,
+                                                            age_uniform_attr],
+                                     unicode_encoding = 'ascii',
+                                     generation_engine = generation_engine)
+      rec_dict = test_data_generator.generate()
+
+      draw_count_dict = {}
+      for rec_list in rec_dict.itervalues():
+        draw_count_dict[rec_list[0]] = draw_count_dict.get(rec_list[0], 0) + 1
+      if (draw_count_dict == val_count_dict):
+        num_passed += 1
+      else:
+        num_failed += 1
+
+    try:
+      test_data_generator.generate(2, 42)
+      num_failed += 1
+    except:
+      num_passed += 1
+
+    try:
+      generator.GenerateDataSet(output_file_name = 'test.csv',
+                                rec_id_attr_name = 'rec-id',
+                                number_of_records = num_val,
+                                attribute_name_list = ['attr'],
+                                attribute_data_list = [freq_attr],
+                                unicode_encoding = 'ascii',
+                                record_seed = 42)
+      num_failed += 1
+    except:
+      num_passed += 1
+
+    lookupcache.use_cache = True
+
+    os.remove(freq_file_name)
+
+    test_result_str = 'generator,GenerateFreqAttribute,without_replacement,' \
+                      + 'n/a,funct,%d,' % (num_passed+num_failed)
+    if (num_failed == 0):
+      test_result_str += 'all tests passed'
+    else:
+      test_result_str += '%d tests failed' % (num_failed)
+
+    return [test_result_str,'']
+
+  # ---------------------------------------------------------------------------
+
+  def testFunct_GenerateEmpiricalAttribute(self):
+    """Test that values drawn singly and in batches from histogram and
+       quantile files are within the given ranges and follow the given
+       distributions.
+    """
+
+    print 'Testing functionality of "GenerateEmpiricalAttribute"'
+
+    num_passed = 0
+    num_failed = 0
+
+    lookup_file_name = 'test-empirical.csv'
+
+    lookupcache.use_cache = False
+
+    def write_lookup_file(line_list):
+      lookup_file = open(lookup_file_name, 'w')
+      for line in line_list:
+        lookup_file.write(line + os.linesep)
+      lookup_file.close()
+      lookupcache.clear_shared_tables()  # The look-up file is rewritten
+
+    # A histogram with an empty bin and a gap between bins
+    #
+    write_lookup_file(['# bin_min,bin_max,count', '0,10,1', '10,20,0',
+                       '30,40,3'])
+    hist_attr = generator.GenerateEmpiricalAttribute(attribute_name = 'val',
+                                            lookup_file_name = lookup_file_name,
+                                            table_type = 'histogram',
+                                            has_header_line = False,
+                                            unicode_encoding = 'ascii',
+                                            continuous_value_type = 'float3')
+
+    val_list = [hist_attr.create_attribute_value() for i in \
+                range(num_tests)]
+    val_list += hist_attr.create_attribute_values_batch(num_tests)
+
+    low_val_list =  []
+    high_val_list = []
+    for val_str in val_list:
+      val = float(val_str)
+      if (0.0 <= val <= 10.0):
+        low_val_list.append(val)
+        num_passed += 1
+      elif (30.0 <= val <= 40.0):
+        high_val_list.append(val)
+        num_passed += 1
+      else:
+        num_failed += 1
+
+    if (abs(float(len(low_val_list)) / len(val_list) - 0.25) > 0.02):
+      num_failed += 1
+    if (abs(sum(high_val_list) / len(high_val_list) - 35.0) > 0.3):
+      num_failed += 1
+
+    # A quantile table with integer values
+    #
+    write_lookup_file(['0.0,100', '0.5,150', '0.9,200', '1.0,400'])
+    quant_attr = generator.GenerateEmpiricalAttribute(attribute_name = 'val',
+                                            lookup_file_name = lookup_file_name,
+                                            table_type = 'quantile',
+                                            has_header_line = False,
+                                            unicode_encoding = 'ascii',
+                                            continuous_value_type = 'int')
+
+    val_list = [quant_attr.create_attribute_value() for i in \
+                range(num_tests)]
+    val_list += quant_attr.create_attribute_values_batch(num_tests)
+
+    for val_str in val_list:
+      if (isinstance(val_str, str)) and (100 <= int(val_str) <= 400):
+        num_passed += 1
+      else:
+        num_failed += 1
+
+    num_below_median = len([val_str for val_str in val_list if \
+                            int(val_str) < 150])
+    num_above_200 = len([val_str for val_str in val_list if \
+                         int(val_str) > 200])
+    if (abs(float(num_below_median) / len(val_list) - 0.5) > 0.02) or \
+       (abs(float(num_above_200) / len(val_list) - 0.1) > 0.02):
+      num_failed += 1
+
+    # Illegal look-up files and table types
+    #
+    for (table_type, line_list) in [('histogram', ['0,10,1', '5,20,1']),
+                                    ('histogram', ['10,0,1']),
+                                    ('histogram', ['0,10,0']),
+                                    ('histogram', ['0,10,-1']),
+                                    ('quantile', ['0.1,100', '1.0,200']),
+                                    ('quantile', ['0.0,100', '0.9,200']),
+                                    ('quantile', ['0.0,200', '1.0,100']),
+                                    ('quantile', ['0.0,100', '1.0,200', '1']),
+                                    ('quantiles', ['0.0,100', '1.0,200'])]:
+      write_lookup_file(line_list)
+      try:
+        generator.GenerateEmpiricalAttribute(attribute_name = 'val',
+                                            lookup_file_name = lookup_file_name,
+                                            table_type = table_type,
+                                            has_header_line = False,
+                                            unicode_encoding = 'ascii',
+                                            continuous_value_type = 'int')
+        num_failed += 1
+      except:
+        num_passed += 1
+
+    lookupcache.use_cache = True
+
+    os.remove(lookup_file_name)
+
+    test_result_str = 'generator,GenerateEmpiricalAttribute,create_' + \
+                      'attribute_value,n/a,funct,%d,' % \
+                      (num_passed+num_failed)
+    if (num_failed == 0):
+      test_result_str += 'all tests passed'
+    else:
+      test_result_str += '%d tests failed' % (num_failed)
+
+    return [test_result_str,'']
+
+  # ---------------------------------------------------------------------------
+
+  def testFunct_GenerateNgramNameAttribute(self):
+    """Test that head values are generated with their frequencies in the
+       frequency file, that synthesised names, drawn singly and in batches,
+       are not head values and only contain n-grams of the values in the file,
+       and that the head fraction selects how many values are synthesised.
+    """
+
+    print 'Testing functionality of "GenerateNgramNameAttribute"'
+
+    num_passed = 0
+    num_failed = 0
+
+    freq_file_name = '../lookup-files/lastname.csv'
+
+    val_count_list = generator.read_freq_file(freq_file_name, 'ascii', False)
+    val_count_dict = dict(val_count_list)
+    total_count = float(sum(val_count_dict.values()))
+    max_name_length = max([len(val) for val in val_count_dict])
+
+    for ngram_length in [2, 3, 4]:
+
+      # All n-grams of the values, with '^' and '$' marking their start and end
+      #
+      ngram_set = set()
+      for val in val_count_dict:
+        pad_val = '^'*(ngram_length-1) + val + '$'
+        for i in range(len(pad_val)-ngram_length+1):
+          ngram_set.add(pad_val[i:i+ngram_length])
+
+      name_attr = generator.GenerateNgramNameAttribute( \
+                                          attribute_name = 'surname',
+                                          freq_file_name = freq_file_name,
+                                          has_header_line = False,
+                                          unicode_encoding = 'ascii',
+                                          ngram_length = ngram_length,
+                                          head_fraction = 0.3)
+
+      val_list = [name_attr.create_attribute_value() for i in \
+                  range(num_tests)]
+      val_list += list(name_attr.create_attribute_values_batch(num_tests))
+
+      if (len(val_list) != 2*num_tests):
+        num_failed += 1
+
+      num_head = 0
+      for val in val_list:
+        if (val in name_attr.head_val_set):
+          num_head += 1
+          continue
+
+        pad_val = '^'*(ngram_length-1) + val + '$'
+        if (val != '') and (len(val) <= max_name_length) and \
+           (False not in [pad_val[i:i+ngram_length] in ngram_set for i in \
+                          range(len(pad_val)-ngram_length+1)]):
+          num_passed += 1
+        else:
+          num_failed += 1
+
+      # The head covers (at least) the head fraction, and its most frequent
+      # values have their frequencies in the file
+      #
+      if (name_attr.head_prob < 0.3) or \
+         (abs(float(num_head)/len(val_list) - name_attr.head_prob) > 0.02):
+        num_failed += 1
+      else:
+        num_passed += 1
+
+      for (val, count) in sorted(val_count_list, key=lambda item: -item[1])[:3]:
+        if (abs(float(val_list.count(val))/len(val_list) - \
+                count/total_count) > 0.01):
+          num_failed += 1
+        else:
+          num_passed += 1
+
+    # Without a head all values are synthesised, with the whole file as head
+    # all values are from the file
+    #
+    for (head_fraction, check_funct) in \
+        [(0.0, lambda val: len(val) <= max_name_length),
+         (1.0, lambda val: val in val_count_dict)]:
+      name_attr = generator.GenerateNgramNameAttribute( \
+                                          attribute_name = 'surname',
+                                          freq_file_name = freq_file_name,
+                                          has_header_line = False,
+                                          unicode_encoding = 'ascii',
+                                          head_fraction = head_fraction)
+      for val in name_attr.create_attribute_values_batch(1000):
+        if (check_funct(val)):
+          num_passed += 1
+        else:
+          num_failed += 1
+
+    # Illegal arguments
+    #
+    for (ngram_length, head_fraction) in [(1, 0.5), (3, 1.5), (3, -0.1),
+                                          (2.5, 0.5)]:
+      try:
+        generator.GenerateNgramNameAttribute(attribute_name = 'surname',
+                                             freq_file_name = freq_file_name,
+                                             has_header_line = False,
+                                             unicode_encoding = 'ascii',
+                                             ngram_length = ngram_length,
+                                             head_fraction = head_fraction)
+        num_failed += 1
+      except:
+        num_passed += 1
+
+    test_result_str = 'generator,GenerateNgramNameAttribute,create_' + \
+                      'attribute_value,n/a,funct,%d,' % \
+                      (num_passed + num_failed)
+    if (num_failed == 0):
+      test_result_str += 'all tests passed'
+    else:
+      test_result_str += '%d tests failed' % (num_failed)
+
+    return [test_result_str,'']
+
+  # ---------------------------------------------------------------------------
+
+  def testFunct_float_to_str_batch(self):
+    """Test that converting many numbers (in a list or a NumPy array) at once
+       gives the same strings as converting them one by one.
+    """
+
+    print 'Testing functionality of "float_to_str_batch"'
+
+    num_passed = 0
+    num_failed = 0
+
+    val_list = [random.uniform(-1000.0, 1000.0) for t in range(num_tests/10)]
+    val_list += [0.0, -0.0, -0.4, 0.5, 1.5, 2.5, 1.0e17, 123456789.987654321]
+
+    pos_val_list = [abs(val) for val in val_list]
+
+    for format_str in ['int', 'float1', 'float3', 'float9']:
+      for test_val_list in [val_list, pos_val_list]:
+        str_list = [basefunctions.float_to_str(val, format_str) for val in \
+                    test_val_list]
+
+        test_val_seq_list = [test_val_list]
+        if (generator.numpy != None):
+          test_val_seq_list.append(generator.numpy.array(test_val_list))
+
+        for test_val_seq in test_val_seq_list:
+          if (generator.float_to_str_batch(test_val_seq, format_str) == \
+              str_list):
+            num_passed += 1
+          else:
+            num_failed += 1
+
+    test_result_str = 'generator,n/a,float_to_str_batch,' \
+                      + 'n/a,funct,%d,' % (num_passed + num_failed)
+    if (num_failed == 0):
+      test_result_str += 'all tests passed'
+    else:
+      test_result_str += '%d tests failed' % (num_failed)
+
+    return [test_result_str,'']
+
+  # ---------------------------------------------------------------------------
+
+  def testFunct_create_attribute_values_batch(self):
+    """Test that the batch methods of all attribute generators return the
+       requested number of values, and that these values are correct.
+    """
+
+    print 'Testing functionality of "create_attribute_values_batch"'
+
+    num_passed = 0
+    num_failed = 0
+
+    # Values that can be generated for the attributes with a frequency file
+    #
+    gname_val_set = set(gname_attr.attr_alias_table.value_list)
+    postcode_val_set = set(postcode_attr.attr_alias_table.value_list)
+
+    for (test_attr, val_set) in [(gname_attr, gname_val_set),
+                                 (postcode_attr, postcode_val_set)]:
+      val_col = list(test_attr.create_attribute_values_batch(num_tests))
+      if (len(val_col) != num_tests):
+        num_failed += 1
+      for val in val_col:
+        if (val in val_set):
+          num_passed += 1
+        else:
+          num_failed += 1
+
+    for age_val in age_uniform_attr.create_attribute_values_batch(num_tests):
+      if (isinstance(age_val, str) and (0 <= int(age_val) <= 120)):
+        num_passed += 1
+      else:
+        num_failed += 1
+
+    gender_col, city_col = \
+       gender_city_comp_attr.create_attribute_values_batch(num_tests)
+    if (len(gender_col) != num_tests) or (len(city_col) != num_tests):
+      num_failed += 1
+    city_table_dict = gender_city_comp_attr.cate_val2_table_dict
+    for (gender_val, city_val) in zip(gender_col, city_col):
+      if ((gender_val in city_table_dict) and
+          (city_val in city_table_dict[gender_val].value_list)):
+        num_passed += 1
+      else:
+        num_failed += 1
+
+    # Check the first values are drawn according to their counts (60 male and
+    # 40 female in the look-up file)
+    #
+    male_freq = float(list(gender_col).count('male')) / num_tests
+    if (abs(male_freq - 0.6) > 0.02):
+      num_failed += 1
+
+    gender_col, income_col = \
+       gender_income_comp_attr.create_attribute_values_batch(num_tests)
+    if (len(gender_col) != num_tests) or (len(income_col) != num_tests):
+      num_failed += 1
+    for (gender_val, income_val) in zip(gender_col, income_col):
+      if ((gender_val in gender_income_comp_attr.cont_funct_dict) and
+          (basefunctions.float_to_str(float(income_val), 'float1') == \
+           income_val)):
+        num_passed += 1
+      else:
+        num_failed += 1
+
+    gender_col, city_col, income_col = \
+       gender_city_income_comp_attr.create_attribute_values_batch(num_tests)
+    if (len(gender_col) != num_tests) or (len(income_col) != num_tests):
+      num_failed += 1
+    for (gender_val, city_val, income_val) in zip(gender_col, city_col,
+                                                  income_col):
+      if ((gender_val+'-'+city_val in \
+           gender_city_income_comp_attr.cont_funct_dict) and
+          (basefunctions.float_to_str(float(income_val), 'float4') == \
+           income_val)):
+        num_passed += 1
+      else:
+        num_failed += 1
+
+    age_col, bp_col = \
+       age_blood_pressure_comp_attr.create_attribute_values_batch(num_tests)
+    if (len(age_col) != num_tests) or (len(bp_col) != num_tests):
+      num_failed += 1
+    for (age_val, bp_val) in zip(age_col, bp_col):
+      if ((10 <= int(age_val) <= 110) and
+          (basefunctions.float_to_str(float(bp_val), 'float3') == bp_val)):
+        num_passed += 1
+      else:
+        num_failed += 1
+
+    # Zero values must also work
+    #
+    if (len(gname_attr.create_attribute_values_batch(0)) != 0) or \
+       (len(gender_city_comp_attr.create_attribute_values_batch(0)[0]) != 0):
+      num_failed += 1
+
+    test_result_str = 'generator,n/a,create_attribute_values_batch,' + \
+                      'n/a,funct,%d,' % (num_passed + num_failed)
+    if (num_failed == 0):
+      test_result_str += 'all tests passed'
+    else:
+      test_result_str += '%d tests failed' % (num_failed)
+
+    return [test_result_str,'']
+
+  # ---------------------------------------------------------------------------
+
+  def testFunct_GenerationPlan(self):
+    """Test that a generation plan stores the values of single and compound
+       attributes at their positions in the attribute name list, uses the
+       missing value for attributes without data, and can be pickled.
+    """
+
+    print 'Testing functionality of "GenerationPlan"'
+
+    num_passed = 0
+    num_failed = 0
+
+    attr_name_list = ['city', 'attr1', 'unknown', 'gender', 'attr3']
+
+    test_plan = generator.GenerationPlan(attr_name_list,
+                                         [gname_attr, gender_city_comp_attr,
+                                          age_uniform_attr, postcode_attr],
+                                         'missing')
+
+    gname_val_set = set(gname_attr.attr_alias_table.value_list)
+
+    for test_plan in [test_plan, pickle.loads(pickle.dumps(test_plan))]:
+      rec_list = [test_plan.generate_record_values() for t in \
+                  range(num_tests/10)]
+      rec_list += test_plan.generate_record_chunk(num_tests/10)
+
+      for rec_val_list in rec_list:
+        city_val, gname_val, unknown_val, gender_val, age_val = rec_val_list
+        city_table = gender_city_comp_attr.cate_val2_table_dict.get(gender_val)
+
+        if ((len(rec_val_list) == len(attr_name_list)) and
+            (gname_val in gname_val_set) and (unknown_val == 'missing') and
+            (city_table != None) and (city_val in city_table.value_list) and
+            (0 <= int(age_val) <= 120)):
+          num_passed += 1
+        else:
+          num_failed += 1
+
+    test_result_str = 'generator,GenerationPlan,generate_record_values,' \
+                      + 'n/a,funct,%d,' % (num_passed + num_failed)
+    if (num_failed == 0):
+      test_result_str += 'all tests passed'
+    else:
+      test_result_str += '%d tests failed' % (num_failed)
+
+    return [test_result_str,'']
+
+  # ---------------------------------------------------------------------------
+
+  def testFunct_GenerateDataSet_stream(self):
+    """Test that records generated one chunk at a time, and written into a
+       file one chunk at a time, are complete and have the expected
+       identifiers, for both generation engines.
+    """
+
+    print 'Testing functionality of "GenerateDataSet" streaming'
+
+    num_passed = 0
+    num_failed = 0
+
+    attr_name_list = ['attr1', 'attr3', 'gender', 'city', 'age',
+                      'blood-pressure']
+    num_rec = 2345
+
+    for generation_engine in ['record', 'column']:
+      test_data_generator = generator.GenerateDataSet(\
+                              output_file_name = 'test-stream.csv',
+                              write_header_line = True,
+                              rec_id_attr_name = 'rec-id',
+                              number_of_records = num_rec,
+                              attribute_name_list = attr_name_list,
+                              attribute_data_list = [gname_attr,
+                                age_uniform_attr, gender_city_comp_attr,
+                                age_blood_pressure_comp_attr],
+                              unicode_encoding = 'ascii',
+                              generation_engine = generation_engine)
+
+      rec_id_list = []
+      for (rec_id, rec_list) in test_data_generator.iter_records(1000):
+        rec_id_list.append(rec_id)
+        if (len(rec_list) == len(attr_name_list)) and ('' not in rec_list):
+          num_passed += 1
+        else:
+          num_failed += 1
+
+      rec_num_list = [basefunctions.split_rec_key(rec_key)[0] for rec_key \
+                      in rec_id_list]
+      if (len(set(rec_id_list)) != num_rec) or \
+         (rec_num_list != list(range(num_rec))):
+        num_failed += 1
+
+      if (test_data_generator.rec_dict != {}):  # Nothing must be stored
+        num_failed += 1
+
+      num_rec_written = test_data_generator.write_stream(chunk_size=1000)
+
+      header_list, file_data = basefunctions.read_csv_file('test-stream.csv',
+                                                           'ascii', True)
+      os.remove('test-stream.csv')
+
+      num_rec_num_digit = len(str(num_rec))-1
+      check_rec_id_list = ['rec-%s-org' % (str(rec_num).zfill(num_rec_num_digit))
+                           for rec_num in range(num_rec)]
+
+      if (num_rec_written != num_rec) or (len(file_data) != num_rec) or \
+         (header_list != ['rec-id']+attr_name_list) or \
+         ([rec_val_list[0] for rec_val_list in file_data] != \
+          check_rec_id_list):
+        num_failed += 1
+      else:
+        num_passed += 1
+
+    test_result_str = 'generator,GenerateDataSet,iter_records/write_stream,' \
+                      + 'n/a,funct,%d,' % (num_passed + num_failed)
+    if (num_failed == 0):
+      test_result_str += 'all tests passed'
+    else:
+      test_result_str += '%d tests failed' % (num_failed)
+
+    return [test_result_str,'']
+
+  # ---------------------------------------------------------------------------
+
+  def testFunct_GenerateDataSet_shards(self):
+    """Test that records generated in shards for a given master seed are the
+       same for different numbers of worker processes, for both generation
+       engines.
+    """
+
+    print 'Testing functionality of "GenerateDataSet" sharded generation'
+
+    num_passed = 0
+    num_failed = 0
+
+    attr_name_list = ['attr1', 'attr3', 'gender', 'city', 'age',
+                      'blood-pressure']
+    num_rec = 2345
+
+    for generation_engine in ['record', 'column']:
+      rec_dict_list = []
+
+      for (workers, seed) in [(1, 42), (3, 42), (1, 43)]:
+        test_data_generator = generator.GenerateDataSet(\
+                                output_file_name = 'test-shards.csv',
+                                rec_id_attr_name = 'rec-id',
+                                number_of_records = num_rec,
+                                attribute_name_list = attr_name_list,
+                                attribute_data_list = [gname_attr,
+                                  age_uniform_attr, gender_city_comp_attr,
+                                  age_blood_pressure_comp_attr],
+                                unicode_encoding = 'ascii',
+                                generation_engine = generation_engine)
+        test_data_generator.shard_size = 500
+
+        rec_dict_list.append(test_data_generator.generate(workers, seed))
+
+      for rec_dict in rec_dict_list:
+        if (len(rec_dict) == num_rec):
+          num_passed += 1
+        else:
+          num_failed += 1
+
+      # Same seed must give the same records, another seed different ones
+      #
+      if (rec_dict_list[0] == rec_dict_list[1]):
+        num_passed += 1
+      else:
+        num_failed += 1
+
+      if (rec_dict_list[0] != rec_dict_list[2]):
+        num_passed += 1
+      else:
+        num_failed += 1
+
+    test_result_str = 'generator,GenerateDataSet,generate,workers/seed,' \
+                      + 'funct,%d,' % (num_passed + num_failed)
+    if (num_failed == 0):
+      test_result_str += 'all tests passed'
+    else:
+      test_result_str += '%d tests failed' % (num_failed)
+
+    return [test_result_str,'']
+
+  # ---------------------------------------------------------------------------
+
+  def testFunct_GenerateDataSet_record_seed(self):
+    """Test that with a record seed each record can be regenerated on its own,
+       and that the records are the same however they are generated.
+    """
+
+    print 'Testing functionality of "GenerateDataSet" with record seed'
+
+    num_passed = 0
+    num_failed = 0
+
+    attr_name_list = ['attr1', 'attr3', 'gender', 'city', 'age',
+                      'blood-pressure']
+    num_rec = 1234
+
+    test_data_generator = generator.GenerateDataSet(\
+                            output_file_name = 'test-seed.csv',
+                            rec_id_attr_name = 'rec-id',
+                            number_of_records = num_rec,
+                            attribute_name_list = attr_name_list,
+                            attribute_data_list = [gname_attr,
+                              age_uniform_attr, gender_city_comp_attr,
+                              age_blood_pressure_comp_attr],
+                            unicode_encoding = 'ascii',
+                            record_seed = 42)
+    test_data_generator.shard_size = 500
+
+    rec_list = [rec_val_list for (rec_id, rec_val_list) in \
+                test_data_generator.iter_records(100)]
+
+    rec_dict = test_data_generator.generate()
+    shard_rec_dict = dict(rec_dict)
+    test_data_generator.rec_dict = {}
+    if (test_data_generator.generate(2, 7) == shard_rec_dict):
+      num_passed += 1
+    else:
+      num_failed += 1
+
+    for rec_num in random.sample(range(num_rec), 100):
+      rec_id = basefunctions.get_rec_key(rec_num)
+      rec_val_list = test_data_generator.generate_record(rec_num)
+
+      if (rec_val_list == rec_dict[rec_id]) and \
+         (rec_val_list == rec_list[rec_num]):
+        num_passed += 1
+      else:
+        num_failed += 1
+
+    # Records without a record seed cannot be generated by their number
+    #
+    try:
+      age_uniform_data_generator = generator.GenerateDataSet(\
+                                     output_file_name = 'test-seed.csv',
+                                     rec_id_attr_name = 'rec-id',
+                                     number_of_records = num_rec,
+                                     attribute_name_list = ['attr3'],
+                                     attribute_data_list = [age_uniform_attr],
+                                     unicode_encoding = 'ascii')
+      age_uniform_data_generator.generate_record(0)
+      num_failed += 1
+    except:
+      num_passed += 1
+
+    test_result_str = 'generator,GenerateDataSet,generate_record,' \
+                      + 'n/a,funct,%d,' % (num_passed + num_failed)
+    if (num_failed == 0):
+      test_result_str += 'all tests passed'
+    else:
+      test_result_str += '%d tests failed' % (num_failed)
+
+    return [test_result_str,'']
+
+  # ---------------------------------------------------------------------------
+
+  def testFunct_GenerateDataSet_unique(self):
+    """Test that the combinations of values of the unique attributes are
+       different in all records, for all ways of generating records and with
+       both exact and Bloom filters.
+    """
+
+    print 'Testing functionality of "GenerateDataSet" with unique attributes'
+
+    num_passed = 0
+    num_failed = 0
+
+    attr_name_list = ['attr1', 'attr3', 'gender', 'city']
+    num_rec = 3000
+
+    def get_data_generator(**kwargs):
+      return generator.GenerateDataSet(output_file_name = 'test-unique.csv',
+                                       rec_id_attr_name = 'rec-id',
+                                       number_of_records = num_rec,
+                                       attribute_name_list = attr_name_list,
+                                       attribute_data_list = [gname_attr,
+                                         age_uniform_attr,
+                                         gender_city_comp_attr],
+                                       unicode_encoding = 'ascii',
+                                       unique_attribute_list = ['attr3',
+                                                                'attr1'],
+                                       **kwargs)
+
+    rec_dict_list = []
+
+    for (generation_engine, exact_limit, workers) in \
+        [('record', None, None), ('column', None, None),
+         ('record', 0, None), ('column', 100, None),
+         ('record', None, 1), ('record', None, 3)]:
+      unique_filter = uniquefilter.UniqueFilter(capacity = num_rec,
+                                                exact_limit = exact_limit)
+      test_data_generator = get_data_generator(
+                              generation_engine = generation_engine,
+                              unique_filter = unique_filter)
+      test_data_generator.shard_size = 500
+
+      random_state = random.getstate()
+
+      rec_dict = test_data_generator.generate(workers, 42)
+      rec_dict_list.append(rec_dict)
+
+      # Generating in shards must not change the caller's random state
+      #
+      if (workers != None):
+        if (random.getstate() == random_state):
+          num_passed += 1
+        else:
+          num_failed += 1
+
+      val_set = set([(rec_list[0], rec_list[1]) for rec_list in \
+                     rec_dict.itervalues()])
+
+      report_dict = unique_filter.get_report()
+
+      if (len(rec_dict) == num_rec) and (len(val_set) == num_rec) and \
+         (report_dict['num_accepted'] == num_rec) and \
+         (report_dict['num_rejected'] > 0):
+        num_passed += 1
+      else:
+        num_failed += 1
+
+    # Records generated in shards must not depend on the number of workers
+    #
+    if (rec_dict_list[-2] == rec_dict_list[-1]):
+      num_passed += 1
+    else:
+      num_failed += 1
+
+    # Streamed records must be unique as well
+    #
+    test_data_generator = get_data_generator()
+    val_set = set([(rec_list[0], rec_list[1]) for (rec_id, rec_list) in \
+                   test_data_generator.iter_records(700)])
+    if (len(val_set) == num_rec):
+      num_passed += 1
+    else:
+      num_failed += 1
+
+    # Too few combinations, a record seed, and attributes that are not
+    # generated must raise exceptions
+    #
+    for kwargs in [{'unique_attribute_list':['gender']},
+                   {'record_seed':42},
+                   {'unique_attribute_list':['attr2']},
+                   {'unique_attribute_list':[]}]:
+      try:
+        test_data_generator = generator.GenerateDataSet(\
+                                output_file_name = 'test-unique.csv',
+                                rec_id_attr_name = 'rec-id',
+                                number_of_records = num_rec,
+                                attribute_name_list = attr_name_list,
+                                attribute_data_list = [gname_attr,
+                                  age_uniform_attr, gender_city_comp_attr],
+                                unicode_encoding = 'ascii',
+                                **dict([('unique_attribute_list',
+                                         ['attr1', 'attr3'])] + \
+                                       kwargs.items()))
+        test_data_generator.generate()
+        num_failed += 1
+      except:
+        num_passed += 1
+
+    test_result_str = 'generator,GenerateDataSet,generate,' \
+                      + 'unique_attribute_list,funct,%d,' % \
+                      (num_passed + num_failed)
+    if (num_failed == 0):
+      test_result_str += 'all tests passed'
+    else:
+      test_result_str += '%d tests failed' % (num_failed)
+
+    return [test_result_str,'']
+
+  # ---------------------------------------------------------------------------
+
+  def testFunct_GenerateDataSet_strata(self):
+    """Test that stratified records have exactly the allocated number of
+       records in each stratum, that the values of the other attributes are
+       consistent with the stratum values, and that illegal stratification
+       attributes raise exceptions.
+    """
+
+    print 'Testing functionality of "GenerateDataSet" with strata'
+
+    num_passed = 0
+    num_failed = 0
+
+    attr_name_list = ['attr1', 'gender', 'city', 'gender4', 'state', 'city3',
+                      'postcode2', 'gender2', 'income']
+    attr_data_list = [gname_attr, gender_city_comp_attr,
+                      gender_geo_chain_attr, gender_income_comp_attr]
+    num_rec = 2345
+
+    geo_rec_set = set([tuple(rec_list[:-1]) for rec_list in \
+                       basefunctions.read_csv_file(
+                         '../lookup-files/gender-state-city-postcode.csv',
+                         'ascii', True)[1]])
+
+    for (strata_attr_list, strata_allocation, unique_attr_list) in \
+        [(['gender'], 'quota', None),
+         (['gender4', 'state', 'gender'], 'quota', None),
+         (['city', 'gender', 'gender2'], 'multinomial', None),
+         (['gender', 'gender2'], 'quota', ['attr1', 'city3']),
+         (['state', 'gender4', 'attr1'], 'quota', None)]:
+
+      if (unique_attr_list != None):
+        unique_kwargs = {'unique_attribute_list':unique_attr_list}
+      else:
+        unique_kwargs = {}
+
+      test_data_generator = generator.GenerateDataSet(\
+                              output_file_name = 'test-strata.csv',
+                              rec_id_attr_name = 'rec-id',
+                              number_of_records = num_rec,
+                              attribute_name_list = attr_name_list,
+                              attribute_data_list = attr_data_list,
+                              unicode_encoding = 'ascii',
+                              strata_attribute_list = strata_attr_list,
+                              strata_allocation = strata_allocation,
+                              **unique_kwargs)
+      test_data_generator.column_chunk_size = 100
+
+      strata_slot_list = [attr_name_list.index(attr_name) for attr_name in \
+                          strata_attr_list]
+
+      # The expected number of records in each stratum, with strata given as
+      # tuples of values in the sequence of the stratification attributes
+      #
+      strata_count_list = test_data_generator.get_strata_counts()
+      strata_count_dict = {}
+      for (stratum_dict, stratum_count) in strata_count_list:
+        stratum_val_dict = {}
+        for (attr_data, val_tuple) in stratum_dict.items():
+          for (attr_name, attr_val) in \
+              zip(attr_data.get_attribute_name_list(), val_tuple):
+            stratum_val_dict[attr_name] = attr_val
+        stratum = tuple([stratum_val_dict[attr_name] for attr_name in \
+                         strata_attr_list])
+        strata_count_dict[stratum] = stratum_count
+
+      if (sum(strata_count_dict.values()) == num_rec):
+        num_passed += 1
+      else:
+        num_failed += 1
+
+      # Quota allocations do not depend on the random number generators
+      #
+      if (strata_allocation == 'quota'):
+        if (test_data_generator.get_strata_counts() == strata_count_list):
+          num_passed += 1
+        else:
+          num_failed += 1
+
+      rec_dict = test_data_generator.generate()
+
+      for rec_list_list in [rec_dict.values(),
+                            [rec_list for (rec_id, rec_list) in \
+                             test_data_generator.iter_records(500)]]:
+        test_count_dict = {}
+        for rec_list in rec_list_list:
+          stratum = tuple([rec_list[attr_slot] for attr_slot in \
+                           strata_slot_list])
+          test_count_dict[stratum] = test_count_dict.get(stratum, 0) + 1
+
+        # Multinomial counts are drawn again for each generation
+        #
+        if (len(rec_list_list) == num_rec) and \
+           ((test_count_dict == strata_count_dict) or \
+            (strata_allocation == 'multinomial')):
+          num_passed += 1
+        else:
+          num_failed += 1
+
+        for rec_list in rec_list_list:
+          city_table = gender_city_comp_attr.cate_val2_table_dict[rec_list[1]]
+          if (rec_list[2] in city_table.value_list) and \
+             (tuple(rec_list[3:7]) in geo_rec_set) and \
+             (float(rec_list[8]) >= 0.0):
+            num_passed += 1
+          else:
+            num_failed += 1
+
+        if (unique_attr_list != None):
+          if (len(set([(rec_list[0], rec_list[5]) for rec_list in \
+                       rec_list_list])) == num_rec):
+            num_passed += 1
+          else:
+            num_failed += 1
+
+    # Stratification attributes that are not the first attributes of an
+    # attribute object, are generated by a function, or are not generated,
+    # and strata with a record seed or worker processes must raise exceptions
+    #
+    for kwargs in [{'strata_attribute_list':['city']},
+                   {'strata_attribute_list':['income']},
+                   {'strata_attribute_list':['gender', 'attr3']},
+                   {'strata_attribute_list':[]},
+                   {'strata_attribute_list':['gender'], 'record_seed':42},
+                   {'strata_attribute_list':['gender'],
+                    'strata_allocation':'exact'}]:
+      try:
+        test_data_generator = generator.GenerateDataSet(\
+                                output_file_name = 'test-strata.csv',
+                                rec_id_attr_name = 'rec-id',
+                                number_of_records = num_rec,
+                                attribute_name_list = attr_name_list,
+                                attribute_data_list = attr_data_list,
+                                unicode_encoding = 'ascii',
+                                **kwargs)
+        test_data_generator.generate()
+        num_failed += 1
+      except:
+        num_passed += 1
+
+    try:
+      test_data_generator = generator.GenerateDataSet(\
+                              output_file_name = 'test-strata.csv',
+                              rec_id_attr_name = 'rec-id',
+                              number_of_records = num_rec,
+                              attribute_name_list = attr_name_list,
+                              attribute_data_list = attr_data_list,
+                              unicode_encoding = 'ascii',
+                              strata_attribute_list = ['gender'])
+      test_data_generator.generate(2, 42)
+      num_failed += 1
+    except:
+      num_passed += 1
+
+    test_result_str = 'generator,GenerateDataSet,generate,' \
+                      + 'strata_attribute_list,funct,%d,' % \
+                      (num_passed + num_failed)
+    if (num_failed == 0):
+      test_result_str += 'all tests passed'
+    else:
+      test_result_str += '%d tests failed' % (num_failed)
+
+    return [test_result_str,'']
+
 # =============================================================================
 # Generate a time string to be used for the log file
 #
@@ -1599,6 +2906,58 @@ test_case_ins = TestCase('testFunct_GenerateContContCompoundAttribute')
 test_res_list += \
   test_case_ins.testFunct_GenerateContContCompoundAttribute()
 
+test_case_ins = TestCase('testFunct_GenerateConditionalChainAttribute')
+test_res_list += \
+  test_case_ins.testFunct_GenerateConditionalChainAttribute()
+
+test_case_ins = TestCase('testFunct_GenerateDependencyTreeAttribute')
+test_res_list += \
+  test_case_ins.testFunct_GenerateDependencyTreeAttribute()
+
+test_case_ins = TestCase('testFunct_without_replacement')
+test_res_list += \
+  test_case_ins.testFunct_without_replacement()
+
+test_case_ins = TestCase('testFunct_GenerateEmpiricalAttribute')
+test_res_list += \
+  test_case_ins.testFunct_GenerateEmpiricalAttribute()
+
+test_case_ins = TestCase('testFunct_GenerateNgramNameAttribute')
+test_res_list += \
+  test_case_ins.testFunct_GenerateNgramNameAttribute()
+
+test_case_ins = TestCase('testFunct_float_to_str_batch')
+test_res_list += \
+  test_case_ins.testFunct_float_to_str_batch()
+
+test_case_ins = TestCase('testFunct_create_attribute_values_batch')
+test_res_list += \
+  test_case_ins.testFunct_create_attribute_values_batch()
+
+test_case_ins = TestCase('testFunct_GenerationPlan')
+test_res_list += \
+  test_case_ins.testFunct_GenerationPlan()
+
+test_case_ins = TestCase('testFunct_GenerateDataSet_stream')
+test_res_list += \
+  test_case_ins.testFunct_GenerateDataSet_stream()
+
+test_case_ins = TestCase('testFunct_GenerateDataSet_shards')
+test_res_list += \
+  test_case_ins.testFunct_GenerateDataSet_shards()
+
+test_case_ins = TestCase('testFunct_GenerateDataSet_record_seed')
+test_res_list += \
+  test_case_ins.testFunct_GenerateDataSet_record_seed()
+
+test_case_ins = TestCase('testFunct_GenerateDataSet_unique')
+test_res_list += \
+  test_case_ins.testFunct_GenerateDataSet_unique()
+
+test_case_ins = TestCase('testFunct_GenerateDataSet_strata')
+test_res_list += \
+  test_case_ins.testFunct_GenerateDataSet_strata()
+
 # Write test output results into the log file
 #
 for line in test_res_list:
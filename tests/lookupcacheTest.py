@@ -0,0 +1,246 @@
+# lookupcacheTest.py - Test module that provides testing functions for the
+#                  module lookupcache.py of the data generation system.
+#
+# =============================================================================
+#
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# =============================================================================
+
+"""Test module for lookupcache.py.
+"""
+
+# =============================================================================
+# Import necessary modules (Python standard modules first, then system modules)
+
+import os
+import random
+import sys
+import time
+import unittest
+sys.path.append('..')
+
+import lookupcache
+
+random.seed(42)  # Set seed for random generator
+
+# =============================================================================
+
+# Define the number of tests to be done for the functionality tests
+#
+num_tests = 10
+
+# =============================================================================
+
+class TestCase(unittest.TestCase):
+
+  # Initialise test case  - - - - - - - - - - - - - - - - - - - - - - - - - - -
+  #
+  def setUp(self):
+    pass # Nothing to initialize
+
+  # Clean up test case  - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+  #
+  def tearDown(self):
+    pass  # Nothing to clean up
+
+  # ---------------------------------------------------------------------------
+  # Start test cases
+
+  def testFunct_load_table(self, num_tests):
+    """Test that tables are built from the CSV file only when there is no
+       up-to-date cache file, and that cached tables are the same as built
+       ones.
+    """
+
+    print 'Testing functionality of "load_table"'
+
+    num_passed = 0
+    num_failed = 0
+
+    csv_file_name = 'test-lookupcache.csv'
+    cache_file_name = lookupcache.get_cache_file_name(csv_file_name, 'test')
+
+    build_list = []  # One entry for each time the table is built
+
+    def build_table(header_list, file_data):
+      build_list.append(len(file_data))
+      return [(rec_list[0], int(rec_list[1])) for rec_list in file_data]
+
+    for t in range(num_tests):
+      val_count_list = [('val%d' % (i), random.randint(1, 100)) for i in \
+                        range(random.randint(1, 50))]
+
+      csv_file = open(csv_file_name, 'w')
+      for (val, count) in val_count_list:
+        csv_file.write('%s,%d%s' % (val, count, os.linesep))
+      csv_file.close()
+
+      num_build = len(build_list)
+
+      # The first load after the file changed must rebuild the table, the
+      # second must use the cache
+      #
+      table1 = lookupcache.load_table(csv_file_name, 'ascii', False, 'test',
+                                      build_table)
+      table2 = lookupcache.load_table(csv_file_name, 'ascii', False, 'test',
+                                      build_table)
+
+      if (table1 == val_count_list) and (table2 == val_count_list) and \
+         (len(build_list) == num_build+1) and os.path.exists(cache_file_name):
+        num_passed += 1
+      else:
+        num_failed += 1
+
+    # A cache file that cannot be read must lead to a rebuild
+    #
+    cache_file = open(cache_file_name, 'wb')
+    cache_file.write('not a cache file')
+    cache_file.close()
+
+    num_build = len(build_list)
+    if (lookupcache.load_table(csv_file_name, 'ascii', False, 'test',
+                               build_table) == val_count_list) and \
+       (len(build_list) == num_build+1):
+      num_passed += 1
+    else:
+      num_failed += 1
+
+    os.remove(csv_file_name)
+    os.remove(cache_file_name)
+
+    test_result_str = 'lookupcache,n/a,load_table,n/a,funct,%d,' % \
+                      (num_passed+num_failed)
+    if (num_failed == 0):
+      test_result_str += 'all tests passed'
+    else:
+      test_result_str += '%d tests failed' % (num_failed)
+
+    return [test_result_str,'']
+
+  # ---------------------------------------------------------------------------
+
+  def testFunct_get_shared_table(self, num_tests):
+    """Test that shared tables are only built once for the same file, encoding,
+       header line flag and table kind, and rebuilt when the file changes.
+    """
+
+    print 'Testing functionality of "get_shared_table"'
+
+    num_passed = 0
+    num_failed = 0
+
+    csv_file_name = 'test-lookupcache.csv'
+
+    csv_file = open(csv_file_name, 'w')
+    csv_file.write('a,1%sb,2%s' % (os.linesep, os.linesep))
+    csv_file.close()
+
+    build_list = []  # One entry for each time a table is built
+
+    def build_table():
+      build_list.append(1)
+      return [len(build_list)]
+
+    lookupcache.clear_shared_tables()
+
+    table = lookupcache.get_shared_table(csv_file_name, 'ascii', False,
+                                         'test', build_table)
+
+    for t in range(num_tests):
+      if (lookupcache.get_shared_table(csv_file_name, 'ascii', False, 'test',
+                                       build_table) is table):
+        num_passed += 1
+      else:
+        num_failed += 1
+
+    # A different encoding, header flag or table kind gives another table
+    #
+    for (encoding, header_line, table_kind) in [('utf-8', False, 'test'),
+                                                ('ascii', True, 'test'),
+                                                ('ascii', False, 'other')]:
+      if (lookupcache.get_shared_table(csv_file_name, encoding, header_line,
+                                       table_kind, build_table) is not table):
+        num_passed += 1
+      else:
+        num_failed += 1
+
+    if (len(build_list) == 4):
+      num_passed += 1
+    else:
+      num_failed += 1
+
+    # A changed file must lead to a rebuild
+    #
+    csv_file = open(csv_file_name, 'w')
+    csv_file.write('a,1%sb,2%sc,3%s' % (os.linesep, os.linesep, os.linesep))
+    csv_file.close()
+
+    if (lookupcache.get_shared_table(csv_file_name, 'ascii', False, 'test',
+                                     build_table) is not table):
+      num_passed += 1
+    else:
+      num_failed += 1
+
+    lookupcache.clear_shared_tables()
+    os.remove(csv_file_name)
+
+    test_result_str = 'lookupcache,n/a,get_shared_table,n/a,funct,%d,' % \
+                      (num_passed+num_failed)
+    if (num_failed == 0):
+      test_result_str += 'all tests passed'
+    else:
+      test_result_str += '%d tests failed' % (num_failed)
+
+    return [test_result_str,'']
+
+# =============================================================================
+# Generate a time string to be used for the log file
+#
+curr_time_tuple = time.localtime()
+curr_time_str = str(curr_time_tuple[0]) + str(curr_time_tuple[1]).zfill(2) + \
+                str(curr_time_tuple[2]).zfill(2) + '-' + \
+                str(curr_time_tuple[3]).zfill(2) + \
+                str(curr_time_tuple[4]).zfill(2)
+
+# Write test output header line into the log file
+#
+out_file_name = './logs/lookupcacheTest-%s.csv' % (curr_time_str)
+
+out_file = open(out_file_name, 'w')
+
+out_file.write('Test results generated by lookupcacheTest.py'  + os.linesep)
+
+out_file.write('Test started: ' + curr_time_str + os.linesep)
+
+out_file.write(os.linesep)
+
+out_file.write('Module name,Class name,Method name,Arguments,Test_type,' + \
+               'Patterns tested,Summary,Failure description' + os.linesep)
+out_file.write(os.linesep)
+
+# Create instances for the testcase class that calls all tests
+#
+test_res_list = []
+
+test_case_ins = TestCase('testFunct_load_table')
+test_res_list += test_case_ins.testFunct_load_table(num_tests)
+
+test_case_ins = TestCase('testFunct_get_shared_table')
+test_res_list += test_case_ins.testFunct_get_shared_table(num_tests)
+
+# Write test output results into the log file
+#
+for line in test_res_list:
+  out_file.write(line + os.linesep)
+
+out_file.close()
+
+print 'Test results are written to', out_file_name
+
+for line in test_res_list:
+  print line
+
+# =============================================================================
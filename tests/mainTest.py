@@ -46,6 +46,7 @@ random.seed(42)  # Set seed for random generator
 # 5) num_duplicates_distribution ('uniform', 'poisson', 'zipf')
 # 6) max_modification_per_attr
 # 7) num_modification_per_record
+# 8) generation_engine (optional, 'record' or 'column', default is 'record')
 #
 test_cases = [['rec_id',    100,    100, 1, 'uniform', 1, 1],
               ['rec_id',    100,    100, 1, 'poisson', 1, 1],
@@ -101,6 +102,10 @@ if (do_large_tests == True):
   test_cases += [['rec_num', 654321, 123456, 11, 'uniform', 2, 7],
                  ['rec_num', 654321, 123456, 11, 'poisson', 2, 7],
                  ['rec_num', 654321, 123456, 11, 'zipf',    2, 7]]
+#
+test_cases += [['rec_id',    100,    100, 1, 'uniform', 1, 1, 'column'],
+               ['rec_num',  12345,  14321, 5, 'poisson', 1, 3, 'column'],
+               ['rec_num',  43210,  14321, 11, 'zipf',   2, 7, 'column']]
 
 # Set the Unicode encoding for all test data generation
 #
@@ -140,6 +145,10 @@ class TestCase(unittest.TestCase):
     num_duplicates_distribution = test_case[4]
     max_modification_per_attr =   test_case[5]
     num_modification_per_record = test_case[6]
+    if (len(test_case) > 7):
+      generation_engine =         test_case[7]
+    else:
+      generation_engine =         'record'
 
     test_res_list = ['', 'Test case parameters:']
     test_res_list.append('  rec_id_attr_name = %s' % (rec_id_attr_name))
@@ -153,6 +162,7 @@ class TestCase(unittest.TestCase):
                          (max_modification_per_attr))
     test_res_list.append('  num_modification_per_record = %s' % \
                          (num_modification_per_record))
+    test_res_list.append('  generation_engine = %s' % (generation_engine))
     test_res_list.append('')
 
     # Define the attributes to be generated (based on methods from - - - - -
@@ -344,7 +354,8 @@ class TestCase(unittest.TestCase):
                             number_of_records = num_org_rec,
                             attribute_name_list = attr_name_list,
                             attribute_data_list = attr_data_list,
-                            unicode_encoding = unicode_encoding_used)
+                            unicode_encoding = unicode_encoding_used,
+                            generation_engine = generation_engine)
 
     # Define distribution of how likely an attribute will be selected for
     # modification (sum of probabilities must be 1.0)
@@ -439,6 +450,8 @@ class TestCase(unittest.TestCase):
     # Do tests on all generated records
     #
     for (rec_id,rec_list) in rec_dict.iteritems():
+      rec_num, dup_num = basefunctions.split_rec_key(rec_id)
+
       if (len(rec_list) != len(attr_name_list)):
         passed = False
         test_res_list.append('  Record with identifier "%s" contains wrong' % \
@@ -446,15 +459,14 @@ class TestCase(unittest.TestCase):
                              ' %d, expected %d' % (len(rec_list),
                              len(attr_name_list)))
 
-      if ('org' in rec_id):  # An original record
+      if (dup_num == None):  # An original record
 
         # Check the number of duplicates for this record is what is expected
         #
         num_dups = 0
-        rec_num = rec_id.split('-')[1]
 
         for d in range(max_duplicate_per_record*2):
-          tmp_rec_id = 'rec-%s-dup-%d' % (rec_num,d)
+          tmp_rec_id = basefunctions.get_rec_key(rec_num,d)
           if tmp_rec_id in rec_dict:
             num_dups += 1
         if (num_dups > max_duplicate_per_record):
@@ -468,7 +480,7 @@ class TestCase(unittest.TestCase):
         # Check no duplicate number is outside expected range
         #
         for d in range(max_duplicate_per_record,max_duplicate_per_record*2):
-          tmp_rec_id = 'rec-%s-dup-%d' % (rec_num,d)
+          tmp_rec_id = basefunctions.get_rec_key(rec_num,d)
           if (tmp_rec_id in rec_dict):
             passed = False
             test_res_list.append('  Illegal duplicate number: %s' % \
@@ -549,16 +561,15 @@ class TestCase(unittest.TestCase):
           test_res_list.append('  "alt-gender-2" value is out of range:')
           test_res_list.append('    Org: %s' % (str(rec_list)))
 
-      if ('dup' in rec_id):  # A duplicate record
+      else:  # A duplicate record
 
         # Get the corresponding original record
         #
-        org_rec_id = 'rec-%s-org' % (rec_id.split('-')[1])
+        org_rec_id = basefunctions.get_rec_key(rec_num)
         org_rec_list = rec_dict[org_rec_id]
 
         # Check the duplicate number
         #
-        dup_num = int(rec_id.split('-')[-1])
         if ((dup_num < 0) or (dup_num > max_duplicate_per_record-1)):
           passed = False
           test_res_list.append('  Duplicate record with identifier "%s" ' % \
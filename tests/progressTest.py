@@ -0,0 +1,193 @@
+# progressTest.py - Test module that provides testing functions for the
+#                  module progress.py of the data generation system.
+#
+# =============================================================================
+#
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# =============================================================================
+
+"""Test module for progress.py.
+"""
+
+# =============================================================================
+# Import necessary modules (Python standard modules first, then system modules)
+
+import os
+import random
+import sys
+import time
+import unittest
+sys.path.append('..')
+
+import progress
+
+random.seed(42)  # Set seed for random generator
+
+# =============================================================================
+
+# Define the number of tests to be done for the functionality tests
+#
+num_tests = 100000
+
+# =============================================================================
+
+class TestCase(unittest.TestCase):
+
+  # Initialise test case  - - - - - - - - - - - - - - - - - - - - - - - - - - -
+  #
+  def setUp(self):
+    pass # Nothing to initialize
+
+  # Clean up test case  - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+  #
+  def tearDown(self):
+    pass  # Nothing to clean up
+
+  # ---------------------------------------------------------------------------
+  # Start test cases
+
+  def testArguments(self):
+    """Test that illegal constructor arguments raise exceptions.
+    """
+
+    print 'Testing arguments of "IntervalProgressReporter"'
+
+    num_passed = 0
+    num_failed = 0
+
+    for kwargs in [{}, {'report_num_records':0},
+                   {'report_num_records':1.5},
+                   {'report_num_seconds':-1.0},
+                   {'report_num_records':10, 'callback':'print'},
+                   {'report_num_records':10, 'illegal':True}]:
+      try:
+        progress.IntervalProgressReporter(**kwargs)
+        num_failed += 1
+      except:
+        num_passed += 1
+
+    for kwargs in [{'report_num_records':10}, {'report_num_seconds':0.5},
+                   {'report_num_records':10, 'report_num_seconds':2}]:
+      try:
+        progress.IntervalProgressReporter(**kwargs)
+        num_passed += 1
+      except:
+        num_failed += 1
+
+    test_result_str = 'progress,IntervalProgressReporter,constructor ' + \
+                      '(__init__),n/a,argument,%d,' % (num_passed+num_failed)
+    if (num_failed == 0):
+      test_result_str += 'all tests passed'
+    else:
+      test_result_str += '%d tests failed' % (num_failed)
+
+    return [test_result_str,'']
+
+  # ---------------------------------------------------------------------------
+
+  def testFunct_IntervalProgressReporter(self, num_tests):
+    """Test that the interval progress reporter reports after the given number
+       of records and when finished, with correct counts.
+    """
+
+    print 'Testing functionality of "IntervalProgressReporter"'
+
+    num_passed = 0
+    num_failed = 0
+
+    report_list = []
+
+    def test_callback(task_name, num_done, num_total, elapsed_time,
+                      rec_per_sec, eta_time):
+      report_list.append((task_name, num_done, num_total, eta_time))
+
+    reporter = progress.IntervalProgressReporter(report_num_records = 100,
+                                                 callback = test_callback)
+    reporter.start('test', num_tests)
+    for i in range(num_tests):
+      reporter.update(i+1)
+    reporter.finish()
+
+    if (len(report_list) == num_tests/100 + 1):
+      num_passed += 1
+    else:
+      num_failed += 1
+
+    for (task_name, num_done, num_total, eta_time) in report_list[:-1]:
+      if (task_name == 'test') and (num_done % 100 == 0) and \
+         (num_total == num_tests) and (eta_time >= 0.0):
+        num_passed += 1
+      else:
+        num_failed += 1
+
+    if (report_list[-1][1] != num_tests) or (report_list[-1][3] != 0.0):
+      num_failed += 1
+
+    # The default reporter must not report anything
+    #
+    silent_reporter = progress.ProgressReporter()
+    silent_reporter.start('test', num_tests)
+    for i in range(num_tests):
+      silent_reporter.update(i+1)
+    silent_reporter.finish()
+
+    test_result_str = 'progress,IntervalProgressReporter,update,n/a,' + \
+                      'funct,%d,' % (num_passed+num_failed)
+    if (num_failed == 0):
+      test_result_str += 'all tests passed'
+    else:
+      test_result_str += '%d tests failed' % (num_failed)
+
+    return [test_result_str,'']
+
+# =============================================================================
+# Generate a time string to be used for the log file
+#
+curr_time_tuple = time.localtime()
+curr_time_str = str(curr_time_tuple[0]) + str(curr_time_tuple[1]).zfill(2) + \
+                str(curr_time_tuple[2]).zfill(2) + '-' + \
+                str(curr_time_tuple[3]).zfill(2) + \
+                str(curr_time_tuple[4]).zfill(2)
+
+# Write test output header line into the log file
+#
+out_file_name = './logs/progressTest-%s.csv' % (curr_time_str)
+
+out_file = open(out_file_name, 'w')
+
+out_file.write('Test results generated by progressTest.py'  + os.linesep)
+
+out_file.write('Test started: ' + curr_time_str + os.linesep)
+
+out_file.write(os.linesep)
+
+out_file.write('Module name,Class name,Method name,Arguments,Test_type,' + \
+               'Patterns tested,Summary,Failure description' + os.linesep)
+out_file.write(os.linesep)
+
+# Create instances for the testcase class that calls all tests
+#
+test_res_list = []
+
+test_case_ins = TestCase('testArguments')
+test_res_list += test_case_ins.testArguments()
+
+test_case_ins = TestCase('testFunct_IntervalProgressReporter')
+test_res_list += test_case_ins.testFunct_IntervalProgressReporter(num_tests)
+
+# Write test output results into the log file
+#
+for line in test_res_list:
+  out_file.write(line + os.linesep)
+
+out_file.close()
+
+print 'Test results are written to', out_file_name
+
+for line in test_res_list:
+  print line
+
+# =============================================================================
@@ -0,0 +1,581 @@
+# samplerTest.py - Test module that provides testing functions for the
+#                  module sampler.py of the data generation system.
+#
+# =============================================================================
+#
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# =============================================================================
+
+"""Test module for sampler.py.
+"""
+
+# =============================================================================
+# Import necessary modules (Python standard modules first, then system modules)
+
+import os
+import random
+import sys
+import time
+import unittest
+sys.path.append('..')
+
+import sampler
+
+random.seed(42)  # Set seed for random generator
+
+# =============================================================================
+
+# Define the number of tests to be done for the functionality tests
+#
+num_tests = 100000
+
+# Define example value and count lists
+#
+value_count_list = [('a',1), ('b',2), ('c',7), ('d',10), ('e',80)]
+
+# =============================================================================
+
+class TestCase(unittest.TestCase):
+
+  # Initialise test case  - - - - - - - - - - - - - - - - - - - - - - - - - - -
+  #
+  def setUp(self):
+    pass # Nothing to initialize
+
+  # Clean up test case  - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+  #
+  def tearDown(self):
+    pass  # Nothing to clean up
+
+  # ---------------------------------------------------------------------------
+  # Start test cases
+
+  def testFunct_AliasTable(self, num_tests):
+    """Test that the alias table only returns values from the given list, and
+       that the values are drawn according to their counts.
+    """
+
+    print 'Testing functionality of "AliasTable"'
+
+    num_passed = 0
+    num_failed = 0
+
+    alias_table = sampler.AliasTable(value_count_list)
+
+    total_count = sum([count for (val, count) in value_count_list])
+    val_count_dict = dict(value_count_list)
+
+    draw_count_dict = {}
+
+    for i in range(num_tests):
+      val = alias_table.draw()
+
+      if (val in val_count_dict):
+        num_passed += 1
+      else:
+        num_failed += 1
+
+      draw_count_dict[val] = draw_count_dict.get(val, 0) + 1
+
+    assert num_passed + num_failed == num_tests
+
+    # Check the drawn frequencies are close to the expected ones
+    #
+    for (val, count) in value_count_list:
+      expected_freq = float(count) / total_count
+      draw_freq = float(draw_count_dict.get(val, 0)) / num_tests
+      if (abs(draw_freq - expected_freq) > 0.01):
+        num_failed += 1
+
+    test_result_str = 'sampler,AliasTable,draw,n/a,funct,%d,' % (num_tests)
+    if (num_failed == 0):
+      test_result_str += 'all tests passed'
+    else:
+      test_result_str += '%d tests failed' % (num_failed)
+
+    return [test_result_str,'']
+
+  # ---------------------------------------------------------------------------
+
+  def testFunct_ConditionalAliasTable(self, num_tests):
+    """Test that the conditional alias table only returns values of the given
+       context, both for single and for many draws, and that the values are
+       drawn according to their counts in this context.
+    """
+
+    print 'Testing functionality of "ConditionalAliasTable"'
+
+    num_passed = 0
+    num_failed = 0
+
+    # Contexts with the example counts, a single value, and the example
+    # counts in reverse order of their values
+    #
+    context_value_count_list = [list(enumerate([count for (val, count) in \
+                                                value_count_list])),
+                                [(7, 3)],
+                                [(4-i, count) for (i, (val, count)) in \
+                                 enumerate(value_count_list)]]
+
+    cond_table = sampler.ConditionalAliasTable(context_value_count_list)
+
+    context_list = [random.randint(0, 2) for i in range(num_tests)]
+
+    draw_list = [cond_table.draw(context) for context in \
+                 context_list[:num_tests/2]]
+    draw_list.extend(cond_table.draw_many(context_list[num_tests/2:]))
+
+    if (len(draw_list) != num_tests):
+      num_failed += 1
+
+    draw_count_dict = {}  # Keys are pairs (context, value)
+    context_count_list = [0, 0, 0]
+
+    for (context, val) in zip(context_list, draw_list):
+      if (val in dict(context_value_count_list[context])):
+        num_passed += 1
+      else:
+        num_failed += 1
+
+      draw_count_dict[(context, val)] = \
+                                     draw_count_dict.get((context, val), 0) + 1
+      context_count_list[context] += 1
+
+    # Check the drawn frequencies are close to the expected ones
+    #
+    for (context, value_count_list_c) in enumerate(context_value_count_list):
+      total_count = sum([count for (val, count) in value_count_list_c])
+      for (val, count) in value_count_list_c:
+        expected_freq = float(count) / total_count
+        draw_freq = float(draw_count_dict.get((context, val), 0)) / \
+                    context_count_list[context]
+        if (abs(draw_freq - expected_freq) > 0.01):
+          num_failed += 1
+
+    # Illegal values and contexts
+    #
+    for illegal_list in [[], [[]], [[('a', 1)]], [[(-1, 1)]], [[(0, 0)]]]:
+      try:
+        sampler.ConditionalAliasTable(illegal_list)
+        num_failed += 1
+      except:
+        num_passed += 1
+
+    test_result_str = 'sampler,ConditionalAliasTable,draw,n/a,funct,%d,' % \
+                      (num_tests)
+    if (num_failed == 0):
+      test_result_str += 'all tests passed'
+    else:
+      test_result_str += '%d tests failed' % (num_failed)
+
+    return [test_result_str,'']
+
+  # ---------------------------------------------------------------------------
+
+  def testFunct_CumulativeTable(self, num_tests):
+    """Test that the cumulative table only returns values from the given list,
+       both for single and for many draws, and that the values are drawn
+       according to their counts.
+    """
+
+    print 'Testing functionality of "CumulativeTable"'
+
+    num_passed = 0
+    num_failed = 0
+
+    cumu_table = sampler.CumulativeTable(value_count_list)
+
+    total_count = sum([count for (val, count) in value_count_list])
+    val_count_dict = dict(value_count_list)
+
+    draw_count_dict = {}
+
+    draw_list = [cumu_table.draw() for i in range(num_tests/2)]
+    draw_list.extend(cumu_table.draw_many(num_tests - len(draw_list)))
+
+    if (len(draw_list) != num_tests):
+      num_failed += 1
+
+    for val in draw_list:
+      if (val in val_count_dict):
+        num_passed += 1
+      else:
+        num_failed += 1
+
+      draw_count_dict[val] = draw_count_dict.get(val, 0) + 1
+
+    # Check the drawn frequencies are close to the expected ones
+    #
+    for (val, count) in value_count_list:
+      expected_freq = float(count) / total_count
+      draw_freq = float(draw_count_dict.get(val, 0)) / num_tests
+      if (abs(draw_freq - expected_freq) > 0.01):
+        num_failed += 1
+
+    test_result_str = 'sampler,CumulativeTable,draw,n/a,funct,%d,' % \
+                      (num_tests)
+    if (num_failed == 0):
+      test_result_str += 'all tests passed'
+    else:
+      test_result_str += '%d tests failed' % (num_failed)
+
+    return [test_result_str,'']
+
+  # ---------------------------------------------------------------------------
+
+  def testFunct_FenwickTable(self, num_tests):
+    """Test that the Fenwick table draws values according to their counts,
+       also after counts have been changed, and that values drawn without
+       replacement are drawn exactly as many times as their counts.
+    """
+
+    print 'Testing functionality of "FenwickTable"'
+
+    num_passed = 0
+    num_failed = 0
+
+    def check_draw_freq(fenwick_table, check_count_dict):
+      draw_list = [fenwick_table.draw() for i in range(num_tests/10)]
+      draw_list.extend(fenwick_table.draw_many(num_tests - len(draw_list)))
+
+      draw_count_dict = {}
+      for val in draw_list:
+        draw_count_dict[val] = draw_count_dict.get(val, 0) + 1
+
+      total_count = sum(check_count_dict.values())
+
+      num_val_failed = 0
+      for val in set(draw_count_dict) | set(check_count_dict):
+        expected_freq = float(check_count_dict.get(val, 0)) / total_count
+        draw_freq = float(draw_count_dict.get(val, 0)) / num_tests
+        if (abs(draw_freq - expected_freq) > 0.01) or \
+           ((expected_freq == 0.0) and (draw_freq > 0.0)):
+          num_val_failed += 1
+      return num_val_failed
+
+    fenwick_table = sampler.FenwickTable(value_count_list)
+    check_count_dict = dict(value_count_list)
+
+    num_failed += check_draw_freq(fenwick_table, check_count_dict)
+
+    # Change counts (including to zero and for new values)
+    #
+    for (val, count) in [('e', 0), ('a', 30), ('f', 25), ('g', 0)]:
+      fenwick_table.set_count(val, count)
+      check_count_dict[val] = count
+    fenwick_table.add_count('b', 10)
+    check_count_dict['b'] += 10
+
+    if (fenwick_table.total_count == sum(check_count_dict.values())) and \
+       (fenwick_table.get_count('b') == 12) and \
+       (fenwick_table.get_count('x') == 0):
+      num_passed += 1
+    else:
+      num_failed += 1
+
+    num_failed += check_draw_freq(fenwick_table, check_count_dict)
+
+    # Draw all values without replacement, singly and in a batch
+    #
+    many_value_count_list = [(i, random.randint(0, 20)) for i in range(500)]
+    fenwick_table = sampler.FenwickTable(many_value_count_list)
+    total_count = fenwick_table.total_count
+
+    draw_list = [fenwick_table.draw_without_replacement() for i in \
+                 range(total_count/2)]
+    draw_list += fenwick_table.draw_many_without_replacement(total_count -
+                                                             len(draw_list))
+    if (sorted(draw_list) == sorted([val for (val, count) in \
+                                     many_value_count_list \
+                                     for i in range(count)])) and \
+       (fenwick_table.total_count == 0):
+      num_passed += 1
+    else:
+      num_failed += 1
+
+    # Nothing left to draw, and illegal counts
+    #
+    for test_funct in [fenwick_table.draw, lambda: fenwick_table.draw_many(1),
+                       lambda: fenwick_table.draw_many_without_replacement(1),
+                       lambda: fenwick_table.add_count(0, -1),
+                       lambda: fenwick_table.set_count(1, -1),
+                       lambda: fenwick_table.set_count(1, 0.5),
+                       lambda: sampler.FenwickTable([('a', 1), ('a', 2)])]:
+      try:
+        test_funct()
+        num_failed += 1
+      except:
+        num_passed += 1
+
+    test_result_str = 'sampler,FenwickTable,draw,n/a,funct,%d,' % \
+                      (num_passed + num_failed)
+    if (num_failed == 0):
+      test_result_str += 'all tests passed'
+    else:
+      test_result_str += '%d tests failed' % (num_failed)
+
+    return [test_result_str,'']
+
+  # ---------------------------------------------------------------------------
+
+  def testFunct_TruncatedNormal(self, num_tests):
+    """Test that the inverse normal cumulative distribution function inverts
+       the cumulative distribution function, and that truncated normal values
+       drawn singly and in batches are within their range, also for ranges far
+       in the tails, and follow the expected mean.
+    """
+
+    print 'Testing functionality of "TruncatedNormal"'
+
+    num_passed = 0
+    num_failed = 0
+
+    # Check the inverse function for probabilities across the whole range
+    #
+    for p in [1.0e-20, 1.0e-5, 0.01, 0.02425, 0.2, 0.5, 0.8, 0.99, 0.99999]:
+      x = sampler.normal_inverse_cdf(p)
+      if (abs(sampler.normal_cdf(x) - p) <= 1.0e-12*max(p, 1.0e-3)):
+        num_passed += 1
+      else:
+        num_failed += 1
+
+    # Parameters mu, sigma, min_val, max_val with narrow, one-sided, open and
+    # far tail ranges
+    #
+    param_list = [(0.0, 1.0, -1.0, 1.0), (40.0, 10.0, 35.0, None),
+                  (100.0, 20.0, None, 70.0), (5.0, 2.0, None, None),
+                  (0.0, 1.0, 6.0, 6.5), (0.0, 1.0, -9.0, -8.0),
+                  (50.0, 0.5, 49.999, 50.001)]
+
+    for (mu, sigma, min_val, max_val) in param_list:
+      trunc_norm = sampler.TruncatedNormal(mu, sigma, min_val, max_val)
+
+      val_list = [trunc_norm.draw() for i in range(num_tests/20)]
+      val_list.extend(trunc_norm.draw_many(num_tests/20))
+
+      if (len(val_list) != 2*(num_tests/20)):
+        num_failed += 1
+
+      for val in val_list:
+        if (((min_val != None) and (val < min_val)) or
+            ((max_val != None) and (val > max_val))):
+          num_failed += 1
+        else:
+          num_passed += 1
+
+    # Check the mean of an untruncated distribution
+    #
+    trunc_norm = sampler.TruncatedNormal(5.0, 2.0)
+    val_list = list(trunc_norm.draw_many(num_tests))
+    val_mean = sum(val_list) / len(val_list)
+    if (abs(val_mean - 5.0) > 0.05):
+      num_failed += 1
+
+    # Check a range in the upper tail is filled towards its lower end
+    #
+    trunc_norm = sampler.TruncatedNormal(0.0, 1.0, 3.0, 10.0)
+    val_list = [trunc_norm.draw() for i in range(num_tests/10)]
+    val_mean = sum(val_list) / len(val_list)
+    if (abs(val_mean - 3.283) > 0.02):  # Mean of the truncated distribution
+      num_failed += 1
+
+    test_result_str = 'sampler,TruncatedNormal,draw,n/a,funct,%d,' % \
+                      (num_passed + num_failed)
+    if (num_failed == 0):
+      test_result_str += 'all tests passed'
+    else:
+      test_result_str += '%d tests failed' % (num_failed)
+
+    return [test_result_str,'']
+
+  # ---------------------------------------------------------------------------
+
+  def testFunct_EmpiricalDistribution(self, num_tests):
+    """Test that the inverse cumulative distribution function interpolates
+       between the points, and that values drawn singly and in batches are
+       within the range of the points and follow their probabilities.
+    """
+
+    print 'Testing functionality of "EmpiricalDistribution"'
+
+    num_passed = 0
+    num_failed = 0
+
+    # Points with a gap (two points with the same probability) between the
+    # values 2.0 and 4.0
+    #
+    point_list = [(0.0, 0.0), (1.0, 0.5), (2.0, 0.6), (4.0, 0.6),
+                  (8.0, 1.0)]
+    empi_dist = sampler.EmpiricalDistribution(point_list)
+
+    for (p, check_val) in [(0.0, 0.0), (0.25, 0.5), (0.5, 1.0), (0.55, 1.5),
+                           (0.6, 4.0), (0.7, 5.0), (0.99, 7.9)]:
+      if (abs(empi_dist.inverse_cdf(p) - check_val) < 1.0e-9):
+        num_passed += 1
+      else:
+        num_failed += 1
+
+    val_list = [empi_dist.draw() for i in range(num_tests/2)]
+    val_list.extend(empi_dist.draw_many(num_tests - len(val_list)))
+
+    if (len(val_list) != num_tests):
+      num_failed += 1
+
+    for val in val_list:
+      if (0.0 <= val <= 2.0) or (4.0 <= val <= 8.0):
+        num_passed += 1
+      else:
+        num_failed += 1
+
+    for (val, prob) in point_list:
+      draw_prob = float(len([x for x in val_list if x < val])) / num_tests
+      if (abs(draw_prob - prob) > 0.01):
+        num_failed += 1
+
+    # Illegal points
+    #
+    for point_list in [[(0.0, 0.0)], [(0.0, 0.1), (1.0, 1.0)],
+                       [(0.0, 0.0), (1.0, 0.9)], [(1.0, 0.0), (0.0, 1.0)],
+                       [(0.0, 0.0), (1.0, 0.6), (2.0, 0.5), (3.0, 1.0)],
+                       [(0.0, 0.0), ('a', 1.0)]]:
+      try:
+        sampler.EmpiricalDistribution(point_list)
+        num_failed += 1
+      except:
+        num_passed += 1
+
+    test_result_str = 'sampler,EmpiricalDistribution,draw,n/a,funct,%d,' % \
+                      (num_passed + num_failed)
+    if (num_failed == 0):
+      test_result_str += 'all tests passed'
+    else:
+      test_result_str += '%d tests failed' % (num_failed)
+
+    return [test_result_str,'']
+
+  # ---------------------------------------------------------------------------
+
+  def testFunct_allocate_counts(self, num_tests):
+    """Test that the allocated counts sum to the number of items, that quota
+       counts differ from their shares by less than one, and that illegal
+       weights and methods raise exceptions.
+    """
+
+    print 'Testing functionality of "allocate_counts"'
+
+    num_passed = 0
+    num_failed = 0
+
+    for t in range(num_tests/100):
+      weight_list = [random.choice([0, random.randint(1, 100),
+                                    random.random()]) for i in \
+                     range(random.randint(1, 20))]
+      weight_list.append(random.randint(1, 100))  # Positive sum
+      weight_sum = float(sum(weight_list))
+
+      n = random.randint(0, 10000)
+
+      count_list = sampler.allocate_counts(weight_list, n)
+
+      if (sum(count_list) == n) and \
+         (False not in [abs(count - n*weight/weight_sum) < 1.0 for \
+                        (count, weight) in zip(count_list, weight_list)]) and \
+         (count_list == sampler.allocate_counts(weight_list, n)):
+        num_passed += 1
+      else:
+        num_failed += 1
+
+      count_list = sampler.allocate_counts(weight_list, n, 'multinomial')
+
+      if (sum(count_list) == n) and \
+         (False not in [count == 0 for (count, weight) in \
+                        zip(count_list, weight_list) if weight == 0]):
+        num_passed += 1
+      else:
+        num_failed += 1
+
+    for (weight_list, n, method) in [([], 10, 'quota'), ([0, 0], 10, 'quota'),
+                                     ([1, -1, 2], 10, 'quota'),
+                                     ([1, 2], -1, 'quota'),
+                                     ([1, 2], 10, 'exact')]:
+      try:
+        sampler.allocate_counts(weight_list, n, method)
+        num_failed += 1
+      except:
+        num_passed += 1
+
+    test_result_str = 'sampler,n/a,allocate_counts,n/a,funct,%d,' % \
+                      (num_passed + num_failed)
+    if (num_failed == 0):
+      test_result_str += 'all tests passed'
+    else:
+      test_result_str += '%d tests failed' % (num_failed)
+
+    return [test_result_str,'']
+
+# =============================================================================
+# Generate a time string to be used for the log file
+#
+curr_time_tuple = time.localtime()
+curr_time_str = str(curr_time_tuple[0]) + str(curr_time_tuple[1]).zfill(2) + \
+                str(curr_time_tuple[2]).zfill(2) + '-' + \
+                str(curr_time_tuple[3]).zfill(2) + \
+                str(curr_time_tuple[4]).zfill(2)
+
+# Write test output header line into the log file
+#
+out_file_name = './logs/samplerTest-%s.csv' % (curr_time_str)
+
+out_file = open(out_file_name, 'w')
+
+out_file.write('Test results generated by samplerTest.py'  + os.linesep)
+
+out_file.write('Test started: ' + curr_time_str + os.linesep)
+
+out_file.write(os.linesep)
+
+out_file.write('Module name,Class name,Method name,Arguments,Test_type,' + \
+               'Patterns tested,Summary,Failure description' + os.linesep)
+out_file.write(os.linesep)
+
+# Create instances for the testcase class that calls all tests
+#
+test_res_list = []
+
+test_case_ins = TestCase('testFunct_AliasTable')
+test_res_list += test_case_ins.testFunct_AliasTable(num_tests)
+
+test_case_ins = TestCase('testFunct_ConditionalAliasTable')
+test_res_list += test_case_ins.testFunct_ConditionalAliasTable(num_tests)
+
+test_case_ins = TestCase('testFunct_CumulativeTable')
+test_res_list += test_case_ins.testFunct_CumulativeTable(num_tests)
+
+test_case_ins = TestCase('testFunct_FenwickTable')
+test_res_list += test_case_ins.testFunct_FenwickTable(num_tests)
+
+test_case_ins = TestCase('testFunct_TruncatedNormal')
+test_res_list += test_case_ins.testFunct_TruncatedNormal(num_tests)
+
+test_case_ins = TestCase('testFunct_EmpiricalDistribution')
+test_res_list += test_case_ins.testFunct_EmpiricalDistribution(num_tests)
+
+test_case_ins = TestCase('testFunct_allocate_counts')
+test_res_list += test_case_ins.testFunct_allocate_counts(num_tests)
+
+# Write test output results into the log file
+#
+for line in test_res_list:
+  out_file.write(line + os.linesep)
+
+out_file.close()
+
+print 'Test results are written to', out_file_name
+
+for line in test_res_list:
+  print line
+
+# =============================================================================
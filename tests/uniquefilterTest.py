@@ -0,0 +1,215 @@
+# uniquefilterTest.py - Test module that provides testing functions for the
+#                      module uniquefilter.py of the data generation system.
+#
+# =============================================================================
+#
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# =============================================================================
+
+"""Test module for uniquefilter.py.
+"""
+
+# =============================================================================
+# Import necessary modules (Python standard modules first, then system modules)
+
+import os
+import random
+import sys
+import time
+import unittest
+sys.path.append('..')
+
+import uniquefilter
+
+random.seed(42)  # Set seed for random generator
+
+# =============================================================================
+
+# Define the number of tests to be done for the functionality tests
+#
+num_tests = 10000
+
+# =============================================================================
+
+class TestCase(unittest.TestCase):
+
+  # Initialise test case  - - - - - - - - - - - - - - - - - - - - - - - - - - -
+  #
+  def setUp(self):
+    pass # Nothing to initialize
+
+  # Clean up test case  - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+  #
+  def tearDown(self):
+    pass  # Nothing to clean up
+
+  # ---------------------------------------------------------------------------
+  # Start test cases
+
+  def testFunct_BloomFilter(self, num_tests):
+    """Test that a Bloom filter never misses an added key, and that its false
+       positive rate is close to the configured rate.
+    """
+
+    print 'Testing functionality of "BloomFilter"'
+
+    num_passed = 0
+    num_failed = 0
+
+    for false_positive_rate in [0.1, 0.01, 0.001]:
+      bloom_filter = uniquefilter.BloomFilter(num_tests, false_positive_rate)
+
+      key_list = [('key%d' % (i), u'val%d' % (random.randint(0, 9))) for i \
+                  in range(num_tests)]
+
+      num_new = 0
+      for key in key_list:
+        if (bloom_filter.add(key) == True):
+          num_new += 1
+
+      # Each added key must be found, and rejected when added again
+      #
+      if (False not in [key in bloom_filter for key in key_list]) and \
+         (True not in [bloom_filter.add(key) for key in key_list]) and \
+         (bloom_filter.num_keys == num_new):
+        num_passed += 1
+      else:
+        num_failed += 1
+
+      num_false_positive = 0
+      for i in range(num_tests):
+        if (('other%d' % (i), u'val0') in bloom_filter):
+          num_false_positive += 1
+
+      if (num_false_positive <= 2*false_positive_rate*num_tests + 10) and \
+         (bloom_filter.get_false_positive_rate() <= 2*false_positive_rate):
+        num_passed += 1
+      else:
+        num_failed += 1
+
+    for (capacity, false_positive_rate) in [(0, 0.1), (100, 0.0), (100, 1.0),
+                                            (1.5, 0.1), (100, 'x')]:
+      try:
+        uniquefilter.BloomFilter(capacity, false_positive_rate)
+        num_failed += 1
+      except:
+        num_passed += 1
+
+    test_result_str = 'uniquefilter,BloomFilter,add,n/a,funct,%d,' % \
+                      (num_passed+num_failed)
+    if (num_failed == 0):
+      test_result_str += 'all tests passed'
+    else:
+      test_result_str += '%d tests failed' % (num_failed)
+
+    return [test_result_str,'']
+
+  # ---------------------------------------------------------------------------
+
+  def testFunct_UniqueFilter(self, num_tests):
+    """Test that a unique filter accepts each key once, in both exact and
+       Bloom filter mode, and that it counts accepted and rejected keys.
+    """
+
+    print 'Testing functionality of "UniqueFilter"'
+
+    num_passed = 0
+    num_failed = 0
+
+    for (exact_limit, mode) in [(None, 'exact'), (0, 'bloom'),
+                                (num_tests/10, 'bloom'),
+                                (num_tests, 'exact')]:
+      unique_filter = uniquefilter.UniqueFilter(capacity = num_tests,
+                                                false_positive_rate = 1e-6,
+                                                exact_limit = exact_limit)
+
+      key_list = [str(random.randint(0, num_tests)) for i in range(num_tests)]
+
+      num_accepted = 0
+      for key in key_list:
+        if (unique_filter.add(key) == True):
+          num_accepted += 1
+
+      report_dict = unique_filter.get_report()
+
+      # With a false positive rate this small no new key is rejected
+      #
+      if (num_accepted == len(set(key_list))) and \
+         (report_dict['num_accepted'] == num_accepted) and \
+         (report_dict['num_rejected'] == num_tests-num_accepted) and \
+         (report_dict['mode'] == mode) and \
+         (False not in [key in unique_filter for key in key_list]) and \
+         (mode in unique_filter.get_report_str()):
+        num_passed += 1
+      else:
+        num_failed += 1
+
+    for kwargs in [{}, {'capacity':0}, {'capacity':10, 'exact_limit':-1},
+                   {'capacity':10, 'false_positive_rate':2.0},
+                   {'capacity':10, 'illegal':True}]:
+      try:
+        uniquefilter.UniqueFilter(**kwargs)
+        num_failed += 1
+      except:
+        num_passed += 1
+
+    test_result_str = 'uniquefilter,UniqueFilter,add,n/a,funct,%d,' % \
+                      (num_passed+num_failed)
+    if (num_failed == 0):
+      test_result_str += 'all tests passed'
+    else:
+      test_result_str += '%d tests failed' % (num_failed)
+
+    return [test_result_str,'']
+
+# =============================================================================
+# Generate a time string to be used for the log file
+#
+curr_time_tuple = time.localtime()
+curr_time_str = str(curr_time_tuple[0]) + str(curr_time_tuple[1]).zfill(2) + \
+                str(curr_time_tuple[2]).zfill(2) + '-' + \
+                str(curr_time_tuple[3]).zfill(2) + \
+                str(curr_time_tuple[4]).zfill(2)
+
+# Write test output header line into the log file
+#
+out_file_name = './logs/uniquefilterTest-%s.csv' % (curr_time_str)
+
+out_file = open(out_file_name, 'w')
+
+out_file.write('Test results generated by uniquefilterTest.py'  + os.linesep)
+
+out_file.write('Test started: ' + curr_time_str + os.linesep)
+
+out_file.write(os.linesep)
+
+out_file.write('Module name,Class name,Method name,Arguments,Test_type,' + \
+               'Patterns tested,Summary,Failure description' + os.linesep)
+out_file.write(os.linesep)
+
+# Create instances for the testcase class that calls all tests
+#
+test_res_list = []
+
+test_case_ins = TestCase('testFunct_BloomFilter')
+test_res_list += test_case_ins.testFunct_BloomFilter(num_tests)
+
+test_case_ins = TestCase('testFunct_UniqueFilter')
+test_res_list += test_case_ins.testFunct_UniqueFilter(num_tests)
+
+# Write test output results into the log file
+#
+for line in test_res_list:
+  out_file.write(line + os.linesep)
+
+out_file.close()
+
+print 'Test results are written to', out_file_name
+
+for line in test_res_list:
+  print line
+
+# =============================================================================
@@ -0,0 +1,327 @@
+# uniquefilter.py - Python module providing membership filters that are used
+#                   to keep combinations of attribute values unique.
+#
+#                   Part of a flexible data generation system.
+#
+# =============================================================================
+#
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# =============================================================================
+
+"""Module containing classes that remember which keys (for example tuples of
+   attribute values) have been seen, so that a generator can reject and
+   redraw records whose combination of values has already been generated.
+
+   A Bloom filter uses a fixed amount of memory for a given number of keys
+   and false positive rate. It never misses a key that has been added (so no
+   duplicate key is ever accepted), but with a small probability it reports
+   a new key as seen; such a key is rejected and redrawn even though it is
+   unique.
+
+   A unique filter keeps the keys in an exact set as long as their number is
+   at most its exact limit, and only moves them into a Bloom filter once more
+   keys are added, so small data sets get exact results while large ones use
+   bounded memory.
+"""
+
+# -----------------------------------------------------------------------------
+# Import necessary modules
+
+import hashlib
+import math
+import struct
+
+import basefunctions
+
+# -----------------------------------------------------------------------------
+
+def get_key_str(key):
+  """Return the byte string used to hash the given key, which is a string or
+     a tuple (or list) of strings.
+  """
+
+  if (isinstance(key, tuple) or isinstance(key, list)):
+    key = u'\x00'.join(key)
+
+  if (isinstance(key, unicode)):
+    key = key.encode('utf-8')
+
+  return key
+
+# =============================================================================
+
+class BloomFilter:
+  """A Bloom filter, i.e. a bit array of size 'num_bits' where each key sets
+     'num_hashes' bits, with the bit positions calculated by double hashing
+     of the MD5 hash of the key.
+
+     The arguments that have to be given when a Bloom filter is initialised
+     are:
+
+     capacity             The expected number of keys to be added (a positive
+                          integer).
+
+     false_positive_rate  The probability that a new key is reported as seen
+                          once 'capacity' keys have been added (a number
+                          between 0 and 1).
+
+     The size of the bit array and the number of hashes are set so that the
+     given false positive rate is reached with the fewest bits.
+  """
+
+  # ---------------------------------------------------------------------------
+
+  def __init__(self, capacity, false_positive_rate):
+    """Constructor. Calculate the size of the filter and allocate its bits.
+    """
+
+    basefunctions.check_is_integer('capacity', capacity)
+    basefunctions.check_is_positive('capacity', capacity)
+    basefunctions.check_is_number('false_positive_rate', false_positive_rate)
+    basefunctions.check_is_positive('false_positive_rate',
+                                    false_positive_rate)
+    if (false_positive_rate >= 1.0):
+      raise Exception( 'Value of "false_positive_rate" must be smaller ' + \
+                       'than 1.0: %f' % (false_positive_rate))
+
+    self.capacity =            capacity
+    self.false_positive_rate = false_positive_rate
+
+    self.num_bits = int(math.ceil(-capacity*math.log(false_positive_rate) / \
+                                  (math.log(2.0)**2)))
+    self.num_bits = max(self.num_bits, 8)
+    self.num_hashes = max(1, int(round(float(self.num_bits) / capacity * \
+                                       math.log(2.0))))
+
+    self.bit_array = bytearray((self.num_bits+7) // 8)
+    self.num_keys = 0
+
+  # ---------------------------------------------------------------------------
+
+  def get_bit_pos_list(self, key):
+    """Return the list of bit positions for the given key.
+    """
+
+    hash1, hash2 = struct.unpack('<QQ', hashlib.md5(get_key_str(key)).digest())
+    hash2 |= 1  # Odd, so positions do not repeat
+
+    num_bits = self.num_bits
+
+    return [(hash1 + i*hash2) % num_bits for i in range(self.num_hashes)]
+
+  # ---------------------------------------------------------------------------
+
+  def add(self, key):
+    """Add the given key. Returns True if the key was new, or False if it was
+       (possibly) added before, in which case the filter is not changed.
+    """
+
+    bit_array = self.bit_array
+    bit_pos_list = self.get_bit_pos_list(key)
+
+    is_new = False
+    for bit_pos in bit_pos_list:
+      if (not (bit_array[bit_pos >> 3] & (1 << (bit_pos & 7)))):
+        is_new = True
+        break
+
+    if (is_new == False):
+      return False
+
+    for bit_pos in bit_pos_list:
+      bit_array[bit_pos >> 3] |= (1 << (bit_pos & 7))
+
+    self.num_keys += 1
+
+    return True
+
+  # ---------------------------------------------------------------------------
+
+  def __contains__(self, key):
+    """Return True if the given key has (possibly) been added.
+    """
+
+    bit_array = self.bit_array
+
+    for bit_pos in self.get_bit_pos_list(key):
+      if (not (bit_array[bit_pos >> 3] & (1 << (bit_pos & 7)))):
+        return False
+
+    return True
+
+  # ---------------------------------------------------------------------------
+
+  def get_false_positive_rate(self):
+    """Return the estimated probability that a new key is reported as seen,
+       given the number of keys added so far.
+    """
+
+    return (1.0 - math.exp(-float(self.num_hashes)*self.num_keys / \
+                           self.num_bits))**self.num_hashes
+
+# =============================================================================
+
+class UniqueFilter:
+  """A filter that accepts each key only once, which keeps keys in an exact
+     set until more than 'exact_limit' keys have been added, and then moves
+     them into a Bloom filter.
+
+     The arguments that can be given when a unique filter is initialised are:
+
+     capacity             The expected number of keys to be added (a positive
+                          integer), used to size the Bloom filter.
+
+     false_positive_rate  The false positive rate of the Bloom filter once
+                          'capacity' keys have been added. Default is 0.001.
+
+     exact_limit          The maximum number of keys kept in an exact set.
+                          Default is 1,000,000. If set to None keys are
+                          always kept in an exact set, if set to 0 the Bloom
+                          filter is used from the start.
+
+     The filter counts how many keys it accepted and rejected; get_report()
+     returns these counts together with the false positive budget.
+  """
+
+  # ---------------------------------------------------------------------------
+
+  def __init__(self, **kwargs):
+    """Constructor. Process the keyword arguments.
+    """
+
+    self.capacity =            None
+    self.false_positive_rate = 0.001
+    self.exact_limit =         1000000
+
+    for (keyword, value) in kwargs.items():
+
+      if (keyword.startswith('cap')):
+        basefunctions.check_is_integer('capacity', value)
+        basefunctions.check_is_positive('capacity', value)
+        self.capacity = value
+
+      elif (keyword.startswith('false')):
+        basefunctions.check_is_number('false_positive_rate', value)
+        basefunctions.check_is_positive('false_positive_rate', value)
+        if (value >= 1.0):
+          raise Exception( 'Value of "false_positive_rate" must be smaller ' + \
+                           'than 1.0: %f' % (value))
+        self.false_positive_rate = value
+
+      elif (keyword.startswith('exact')):
+        if (value != None):
+          basefunctions.check_is_integer('exact_limit', value)
+          basefunctions.check_is_not_negative('exact_limit', value)
+        self.exact_limit = value
+
+      else:
+        raise Exception( 'Illegal constructor argument keyword: "%s"' % \
+              (str(keyword)))
+
+    basefunctions.check_is_integer('capacity', self.capacity)
+    basefunctions.check_is_positive('capacity', self.capacity)
+
+    self.num_accepted = 0
+    self.num_rejected = 0
+
+    self.key_set =      set()
+    self.bloom_filter = None
+
+    if (self.exact_limit == 0):
+      self.bloom_filter = BloomFilter(self.capacity, self.false_positive_rate)
+
+  # ---------------------------------------------------------------------------
+
+  def add(self, key):
+    """Add the given key (a string or a tuple of strings). Returns True if the
+       key was accepted (as a new key), or False if it was rejected because it
+       was (possibly) added before.
+    """
+
+    if (self.bloom_filter != None):
+      is_new = self.bloom_filter.add(key)
+
+    elif (key in self.key_set):
+      is_new = False
+
+    else:
+      self.key_set.add(key)
+      is_new = True
+
+      if (self.exact_limit != None) and \
+         (len(self.key_set) > self.exact_limit):
+        self.bloom_filter = BloomFilter(max(self.capacity,
+                                            len(self.key_set)),
+                                        self.false_positive_rate)
+        for old_key in self.key_set:
+          self.bloom_filter.add(old_key)
+        self.key_set = set()
+
+    if (is_new == True):
+      self.num_accepted += 1
+    else:
+      self.num_rejected += 1
+
+    return is_new
+
+  # ---------------------------------------------------------------------------
+
+  def __contains__(self, key):
+    """Return True if the given key has (possibly) been added.
+    """
+
+    if (self.bloom_filter != None):
+      return key in self.bloom_filter
+
+    return key in self.key_set
+
+  # ---------------------------------------------------------------------------
+
+  def get_report(self):
+    """Return a dictionary with the mode of the filter ('exact' or 'bloom'),
+       the numbers of accepted and rejected keys, the configured false positive
+       rate, and (for the Bloom filter) its size in bits, its number of hashes
+       and the false positive rate estimated from the keys added so far.
+    """
+
+    report_dict = {'num_accepted':self.num_accepted,
+                   'num_rejected':self.num_rejected,
+                   'false_positive_rate':self.false_positive_rate}
+
+    if (self.bloom_filter == None):
+      report_dict['mode'] = 'exact'
+      report_dict['estimated_false_positive_rate'] = 0.0
+    else:
+      report_dict['mode'] = 'bloom'
+      report_dict['num_bits'] =   self.bloom_filter.num_bits
+      report_dict['num_hashes'] = self.bloom_filter.num_hashes
+      report_dict['estimated_false_positive_rate'] = \
+                                   self.bloom_filter.get_false_positive_rate()
+
+    return report_dict
+
+  # ---------------------------------------------------------------------------
+
+  def get_report_str(self):
+    """Return the report of get_report() as a string of one line.
+    """
+
+    report_dict = self.get_report()
+
+    report_str = 'Unique filter (%s): %d keys accepted, %d rejected, ' % \
+                 (report_dict['mode'], report_dict['num_accepted'],
+                  report_dict['num_rejected']) + \
+                 'false positive budget %g' % \
+                 (report_dict['false_positive_rate'])
+
+    if (report_dict['mode'] == 'bloom'):
+      report_str += ' (%d bits, %d hashes, estimated rate %g)' % \
+                    (report_dict['num_bits'], report_dict['num_hashes'],
+                     report_dict['estimated_false_positive_rate'])
+
+    return report_str
+
+# =============================================================================